@@ -10,47 +10,66 @@ REST API do scrapowania i pobierania danych o meczach
 - ✅ Endpoint dla pojedynczego meczu
 
 Użycie:
-    python api_server.py
+    python api_server.py                 # serwer deweloperski Flask, scraping w wątkach
+    python api_server.py --prod          # waitress (wiele wątków), scraping w scrape_worker.py
+    gunicorn -c gunicorn.conf.py wsgi:app  # Linux: wiele procesów + python scrape_worker.py
 
 API będzie dostępne pod: http://localhost:5000
 
+Tryb scrapowania (SCRAPE_MODE):
+    thread - zadania wykonywane w wątkach procesu API (domyślnie, tryb deweloperski)
+    worker - API tylko dodaje zadania do outputs/scrape_jobs.db, wykonuje je scrape_worker.py
+             (domyślnie przy --prod i wsgi.py; SCRAPE_MODE=thread wymusza wątki)
+
 Endpointy:
     GET  /api/health              - Status API
     GET  /api/matches             - Lista kwalifikujących się meczów (z filtrowaniem)
     GET  /api/match/<id>          - Pojedynczy mecz ze szczegółami
-    POST /api/scrape              - Uruchom scraping
-    GET  /api/scrape/status       - Status aktualnego scrapingu
+    POST /api/scrape              - Uruchom scraping (zadanie w kolejce, zwraca job_id)
+    GET  /api/scrape/status       - Status zadania (?job=<id>)
+    GET  /api/scrape/jobs         - Lista zadań scrapowania
+    GET  /api/scrape/stream       - Postęp na żywo (Server-Sent Events, ?job=<id>)
+    DELETE /api/scrape/<job_id>   - Anuluj zadanie
     GET  /api/sports              - Dostępne sporty (football, basketball, tennis, etc.)
     GET  /api/history             - Historia poprzednich scrapingów
     GET  /api/download/<date>     - Pobierz plik CSV
 """
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file, stream_with_context
 from flask_cors import CORS
-import pandas as pd
 import os
+import sys
 from datetime import datetime, timedelta
-import threading
 import time
 from typing import Dict, List, Optional
 import glob
 
 # Import z naszego scrapera
+from browser_memory import RecyclePolicy, RecycleStats
 from livesport_h2h_scraper import start_driver, get_match_links_from_day, process_match, process_match_tennis
+from match_store import get_match_store, is_partial_output
+from http_cache import check_not_modified, init_http_cache, make_etag, with_etag
+from result_sink import ResultSink
+from scrape_jobs import JobContext, JobManager, with_progress
+from progress_bus import TERMINAL_EVENT, get_progress_bus, sse_format
+
+# Baza meczów (indeks event_id dla /api/match/<id>) - opcjonalna
+try:
+    from db_manager import MatchDatabase
+    DB_AVAILABLE = True
+except ImportError:
+    DB_AVAILABLE = False
+
+_match_db = None
 
 app = Flask(__name__)
 CORS(app)  # Pozwala na requesty z innych domen (ważne dla web/mobile app)
+init_http_cache(app)  # ETag/304 + gzip/brotli dla odpowiedzi GET
+
+# Krótki cache listy historii (glob + stat wszystkich plików outputs/)
+HISTORY_CACHE_TTL = 30  # sekundy
+_history_cache = {}  # limit -> (timestamp, etag, history)
 
-# Globalne zmienne do śledzenia statusu scrapingu
-scraping_status = {
-    'is_running': False,
-    'progress': 0,
-    'total': 0,
-    'current_match': '',
-    'start_time': None,
-    'qualifying_count': 0,
-    'error': None
-}
 
 
 # ============================================
@@ -120,191 +139,95 @@ def get_matches():
     limit = request.args.get('limit', None)
     sort_by = request.args.get('sort', 'time')
     
-    # Znajdź najnowszy plik CSV dla tej daty
-    csv_files = glob.glob(f'outputs/livesport_h2h_{date}*.csv')
+    # Najnowszy plik dla tej daty - wczytany i sparsowany raz (cache po mtime)
+    try:
+        table = get_match_store().latest(date)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
     
-    if not csv_files:
+    if table is None:
         return jsonify({
             'error': 'Brak danych dla tej daty',
             'date': date,
             'suggestion': f'Uruchom scraping: POST /api/scrape z body: {{"date": "{date}"}}'
         }), 404
     
-    # Weź najnowszy plik
-    latest_csv = max(csv_files, key=os.path.getmtime)
+    # Klient ma aktualną wersję pliku -> 304 bez budowania odpowiedzi
+    etag = make_etag(table.file, table.version)
+    not_modified = check_not_modified(etag)
+    if not_modified:
+        return not_modified
+    
+    matches = table.query(
+        sport=sport_filter,
+        min_wins=min_wins,
+        sort_by=sort_by,
+        limit=int(limit) if limit else None
+    )
     
-    try:
-        # Wczytaj dane
-        df = pd.read_csv(latest_csv)
-        
-        # Filtruj kwalifikujące się mecze
-        qualified = df[df['qualifies'] == True].copy()
-        
-        # Filtruj po sporcie (jeśli podano)
-        if sport_filter:
-            qualified = qualified[qualified['match_url'].str.contains(sport_filter, na=False)]
-        
-        # Filtruj po minimum wygranych (tylko dla sportów drużynowych, nie tenisa)
-        # Tennis ma advanced_score zamiast prostego liczenia wygranych
-        if min_wins > 0:
-            qualified = qualified[qualified['home_wins_in_h2h_last5'] >= min_wins]
-        
-        # Sortowanie
-        if sort_by == 'time':
-            # Sortuj po match_time
-            qualified = qualified.sort_values('match_time', na_position='last')
-        elif sort_by == 'wins':
-            qualified = qualified.sort_values('home_wins_in_h2h_last5', ascending=False)
-        elif sort_by == 'team':
-            qualified = qualified.sort_values('home_team')
-        
-        # Limit
-        if limit:
-            qualified = qualified.head(int(limit))
-        
-        # Konwertuj do listy słowników
-        matches = []
-        for _, row in qualified.iterrows():
-            # Wykryj czy to tenis (ma kolumnę 'favorite' lub 'advanced_score')
-            is_tennis = pd.notna(row.get('favorite')) or pd.notna(row.get('advanced_score'))
-            
-            match = {
-                'id': row.get('match_url', '').split('/')[-1],
-                'home_team': row.get('home_team', ''),
-                'away_team': row.get('away_team', ''),
-                'match_time': row.get('match_time', ''),
-                'home_wins': int(row.get('home_wins_in_h2h_last5', 0)),
-                'h2h_count': int(row.get('h2h_count', 0)),
-                'match_url': row.get('match_url', ''),
-                'qualifies': bool(row.get('qualifies', False)),
-                'is_tennis': is_tennis
-            }
-            
-            # Kursy bukmacherskie
-            if pd.notna(row.get('home_odds')):
-                match['home_odds'] = float(row['home_odds'])
-            if pd.notna(row.get('away_odds')):
-                match['away_odds'] = float(row['away_odds'])
-            
-            # Tennis-specific data
-            if is_tennis:
-                if pd.notna(row.get('advanced_score')):
-                    match['advanced_score'] = float(row['advanced_score'])
-                if pd.notna(row.get('favorite')):
-                    match['favorite'] = row['favorite']
-                if pd.notna(row.get('ranking_a')):
-                    match['ranking_a'] = int(row['ranking_a'])
-                if pd.notna(row.get('ranking_b')):
-                    match['ranking_b'] = int(row['ranking_b'])
-                if pd.notna(row.get('surface')):
-                    match['surface'] = row['surface']
-            
-            # Forma drużyn/zawodników (dla wszystkich sportów)
-            if pd.notna(row.get('home_form_overall')):
-                try:
-                    import ast
-                    match['home_form_overall'] = ast.literal_eval(row['home_form_overall'])
-                except:
-                    pass
-            if pd.notna(row.get('away_form_overall')):
-                try:
-                    import ast
-                    match['away_form_overall'] = ast.literal_eval(row['away_form_overall'])
-                except:
-                    pass
-            
-            # Dodatkowe dane formy dla sportów drużynowych
-            if pd.notna(row.get('home_form_home')):
-                try:
-                    import ast
-                    match['home_form_home'] = ast.literal_eval(row['home_form_home'])
-                except:
-                    pass
-            if pd.notna(row.get('away_form_away')):
-                try:
-                    import ast
-                    match['away_form_away'] = ast.literal_eval(row['away_form_away'])
-                except:
-                    pass
-            
-            # Przewaga formy
-            if pd.notna(row.get('form_advantage')):
-                match['form_advantage'] = bool(row['form_advantage'])
-            
-            # Win rate
-            if pd.notna(row.get('win_rate')):
-                match['win_rate'] = float(row['win_rate'])
-            
-            # Dodaj szczegóły H2H jeśli dostępne
-            if pd.notna(row.get('h2h_last5')):
-                try:
-                    import ast
-                    match['h2h_details'] = ast.literal_eval(row['h2h_last5'])
-                except:
-                    match['h2h_details'] = []
-            
-            matches.append(match)
-        
-        return jsonify({
-            'date': date,
-            'total_matches': len(df),
-            'qualified_count': len(matches),
-            'filters': {
-                'sport': sport_filter,
-                'min_wins': min_wins,
-                'limit': limit,
-                'sort': sort_by
-            },
-            'matches': matches,
-            'file': os.path.basename(latest_csv)
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            'error': str(e),
-            'file': latest_csv
-        }), 500
+    return with_etag(jsonify({
+        'date': date,
+        'total_matches': table.total,
+        'qualified_count': len(matches),
+        'filters': {
+            'sport': sport_filter,
+            'min_wins': min_wins,
+            'limit': limit,
+            'sort': sort_by
+        },
+        'matches': matches,
+        'file': table.file
+    }), etag), 200
 
 
 # ============================================
 # 3. URUCHOM SCRAPING
 # ============================================
 
-def run_scraping_task(date: str, sports: List[str], max_matches: Optional[int] = None):
-    """Funkcja do uruchamiania scrapingu w osobnym wątku"""
-    global scraping_status
+def run_scraping_task(job: JobContext, date: str, sports: List[str], max_matches: Optional[int] = None) -> str:
+    """
+    Zadanie scrapowania (uruchamiane w puli JobManager)
+    
+    Returns:
+        Ścieżka pliku wyników
+    """
+    # Start driver
+    driver = start_driver(headless=True)
+    sink = None
     
     try:
-        scraping_status['is_running'] = True
-        scraping_status['start_time'] = datetime.now().isoformat()
-        scraping_status['error'] = None
-        scraping_status['progress'] = 0
-        scraping_status['qualifying_count'] = 0
-        
-        # Start driver
-        driver = start_driver(headless=True)
-        
         # Zbierz linki
-        scraping_status['current_match'] = 'Zbieranie linków...'
-        all_urls = []
-        for sport in sports:
-            urls = get_match_links_from_day(driver, date, sports=[sport])
-            all_urls.extend(urls)
-        
-        scraping_status['total'] = len(all_urls)
+        job.update(current_match='Zbieranie linków...')
+        job.check_cancelled()
+        # Lista meczów dnia z fixture_cache, jeśli inny skrypt już ją zebrał
+        all_urls = get_match_links_from_day(driver, date, sports=sports)
+        job.check_cancelled()
         
         # Limit
         if max_matches and max_matches < len(all_urls):
             all_urls = all_urls[:max_matches]
-            scraping_status['total'] = max_matches
+        job.update(total=len(all_urls))
+        
+        # Osobny plik per zadanie - równoległe zadania tej samej daty się nie nadpisują.
+        # Plik z job.id jest częściowy (MatchStore go pomija) - po zakończeniu zadania
+        # dostaje nazwę końcową
+        sports_str = '_'.join(sports)
+        output_file = f'outputs/livesport_h2h_{date}_{sports_str}_API_{job.id}.csv'
+        final_file = f'outputs/livesport_h2h_{date}_{sports_str}_API.csv'
+        sink = ResultSink(output_file)
+        # Indeks /api/match/<id> - wiersz po wierszu, razem z CSV
+        db = _get_match_db(create=True)
+        db_sport = sports[0] if len(sports) == 1 else ''
         
         # Scrapuj mecze
-        rows = []
-        RESTART_INTERVAL = 200
+        qualifying_count = 0
+        recycle_policy = RecyclePolicy()
+        recycle_stats = RecycleStats()
+        uses_since_restart = 0
         
         for i, url in enumerate(all_urls, 1):
-            scraping_status['progress'] = i
-            scraping_status['current_match'] = url[:80]
+            job.check_cancelled()
+            job.update(progress=i, current_match=url)
             
             try:
                 # Wykryj sport z URL (tennis ma '/tenis/' w URLu)
@@ -317,48 +240,83 @@ def run_scraping_task(date: str, sports: List[str], max_matches: Optional[int] =
                     # Sporty drużynowe
                     info = process_match(url, driver)
                 
-                rows.append(info)
+                sink.write(info)
+                if db:
+                    db.insert_result(info, date, db_sport, source_file=os.path.basename(final_file))
                 
                 if info['qualifies']:
-                    scraping_status['qualifying_count'] += 1
+                    qualifying_count += 1
+                    job.update(qualifying_count=qualifying_count)
+                
+                # Wynik meczu na żywo dla klientów /api/scrape/stream
+                job.publish('match', {
+                    'progress': i,
+                    'total': len(all_urls),
+                    'qualifying_count': qualifying_count,
+                    'match_url': url,
+                    'home_team': info.get('home_team'),
+                    'away_team': info.get('away_team'),
+                    'match_time': info.get('match_time'),
+                    'qualifies': bool(info.get('qualifies')),
+                    'home_odds': info.get('home_odds'),
+                    'away_odds': info.get('away_odds'),
+                })
                     
             except Exception as e:
                 print(f'Błąd przy meczu {url}: {e}')
             
-            # Auto-restart
-            if i % RESTART_INTERVAL == 0 and i < len(all_urls):
+            # Auto-restart po przekroczeniu budżetu pamięci przeglądarki
+            uses_since_restart += 1
+            restart_reason = recycle_policy.check(driver, uses_since_restart, recycle_stats) if i < len(all_urls) else None
+            if restart_reason:
+                restart_started = time.time()
                 try:
                     driver.quit()
-                    time.sleep(2)
                     driver = start_driver(headless=True)
                 except Exception as e:
                     print(f'Błąd restartu: {e}')
                     driver = start_driver(headless=True)
+                recycle_stats.record(restart_reason, time.time() - restart_started)
+                uses_since_restart = 0
+                job.publish('restart', {'progress': i, 'reason': restart_reason,
+                                        **recycle_stats.summary(i)})
             
             time.sleep(1.5)
         
-        # Zapisz wyniki
-        df = pd.DataFrame(rows)
-        sports_str = '_'.join(sports)
-        output_file = f'outputs/livesport_h2h_{date}_{sports_str}_API.csv'
-        df.to_csv(output_file, index=False, encoding='utf-8-sig')
-        
-        scraping_status['output_file'] = output_file
-        scraping_status['is_running'] = False
-        scraping_status['current_match'] = 'Zakończono!'
-        
+        # Komplet wyników - publikacja pod nazwą końcową (atomowo)
+        sink.close()
+        os.replace(output_file, final_file)
+        return final_file
+    
+    finally:
+        # Zapisz wyniki (częściowe po anulowaniu/błędzie zostają w pliku z job.id)
+        if sink:
+            sink.close()
+            get_match_store().invalidate(date)
+            _history_cache.clear()
         driver.quit()
-        
-    except Exception as e:
-        scraping_status['is_running'] = False
-        scraping_status['error'] = str(e)
-        scraping_status['current_match'] = 'Błąd!'
+
+
+# SCRAPE_MODE=worker: zadania wykonuje osobny proces (scrape_worker.py), API tylko je kolejkuje.
+# --prod (jak wsgi.py) domyślnie w trybie worker - scraping nie konkuruje z API o GIL
+PROD_MODE = __name__ == '__main__' and '--prod' in sys.argv
+SCRAPE_MODE = os.environ.get('SCRAPE_MODE', 'worker' if PROD_MODE else 'thread')
+
+progress_bus = get_progress_bus()
+job_manager = JobManager(run_scraping_task,
+                         max_workers=0 if SCRAPE_MODE == 'worker' else int(os.environ.get('SCRAPE_MAX_JOBS', 2)),
+                         bus=progress_bus)
+
+# Co ile sekund komentarz keep-alive w strumieniu SSE (proxy zamykają "ciche" połączenia)
+SSE_HEARTBEAT_SECONDS = 15
+# Zadania w osobnym procesie nie publikują do szyny tego procesu - status i zdarzenia z bazy co tyle sekund
+SSE_POLL_SECONDS = 1.0
 
 
 @app.route('/api/scrape', methods=['POST'])
 def start_scraping():
     """
-    Uruchom scraping
+    Uruchom scraping (zadanie w kolejce - kilka zadań może działać jednocześnie)
     
     Body (JSON):
         date - Data (YYYY-MM-DD), wymagane
@@ -375,14 +333,6 @@ def start_scraping():
         POST /api/scrape
         Body: {"date": "2025-10-05", "sports": ["football"], "max_matches": 100}
     """
-    global scraping_status
-    
-    if scraping_status['is_running']:
-        return jsonify({
-            'error': 'Scraping już trwa',
-            'status': scraping_status
-        }), 409
-    
     data = request.get_json()
     
     if not data or 'date' not in data:
@@ -408,51 +358,156 @@ def start_scraping():
             'example': '2025-10-05'
         }), 400
     
-    # Uruchom w osobnym wątku
-    thread = threading.Thread(
-        target=run_scraping_task,
-        args=(date, sports, max_matches)
-    )
-    thread.daemon = True
-    thread.start()
+    # To samo zadanie (data + sporty) już trwa
+    active = job_manager.find_active(date, sports)
+    if active:
+        return jsonify({
+            'error': 'Scraping dla tej daty i sportów już trwa',
+            'job_id': active['job_id'],
+            'status': with_progress(active)
+        }), 409
+    
+    job = job_manager.submit(date, sports, max_matches)
     
     return jsonify({
-        'message': 'Scraping rozpoczęty',
+        'message': 'Scraping dodany do kolejki',
+        'job_id': job['job_id'],
         'date': date,
         'sports': sports,
         'max_matches': max_matches,
-        'status_url': '/api/scrape/status'
+        'status_url': f"/api/scrape/status?job={job['job_id']}"
     }), 202
 
 
 @app.route('/api/scrape/status', methods=['GET'])
 def get_scraping_status():
     """
-    Sprawdź status aktualnego scrapingu
+    Sprawdź status zadania scrapowania
+    
+    Query params:
+        job - ID zadania (domyślnie: ostatnio dodane zadanie)
     
     Przykład:
-        GET /api/scrape/status
+        GET /api/scrape/status?job=3f2a9c1d4e5b
     """
-    global scraping_status
+    job_id = request.args.get('job')
+    if job_id:
+        job = job_manager.get(job_id)
+        if not job:
+            return jsonify({'error': f'Nie znaleziono zadania {job_id}'}), 404
+    else:
+        jobs = job_manager.list_jobs(limit=1)
+        if not jobs:
+            return jsonify({'is_running': False, 'status': 'idle', 'progress': 0, 'total': 0, 'percent': 0}), 200
+        job = jobs[0]
     
-    status_copy = scraping_status.copy()
+    return jsonify(with_progress(job)), 200
+
+
+@app.route('/api/scrape/jobs', methods=['GET'])
+def list_scraping_jobs():
+    """
+    Lista zadań scrapowania (najnowsze pierwsze)
     
-    # Dodaj procent postępu
-    if status_copy['total'] > 0:
-        status_copy['percent'] = round((status_copy['progress'] / status_copy['total']) * 100, 1)
-    else:
-        status_copy['percent'] = 0
+    Query params:
+        limit - Limit wyników (default: 20)
+        active - 1 = tylko w kolejce / uruchomione
+    """
+    limit = int(request.args.get('limit', 20))
+    active_only = request.args.get('active') in ('1', 'true')
+    jobs = [with_progress(job) for job in job_manager.list_jobs(limit=limit, active_only=active_only)]
+    return jsonify({'jobs': jobs, 'count': len(jobs)}), 200
+
+
+@app.route('/api/scrape/stream', methods=['GET'])
+def stream_scraping_progress():
+    """
+    Postęp zadania na żywo (Server-Sent Events) - zamiast odpytywania /api/scrape/status
+    
+    Zdarzenia:
+        status - zmiana postępu/statusu zadania
+        match  - wynik przetworzonego meczu
+        restart - restart przeglądarki (powód + statystyki restartów zadania)
+        done   - zadanie zakończone (completed/failed/cancelled), strumień się zamyka
+    
+    Query params:
+        job - ID zadania (bez parametru: zdarzenia wszystkich zadań, bez końca)
     
-    # Oszacuj czas pozostały
-    if status_copy['is_running'] and status_copy['start_time'] and status_copy['progress'] > 0:
-        start = datetime.fromisoformat(status_copy['start_time'])
-        elapsed = (datetime.now() - start).total_seconds()
-        avg_time_per_match = elapsed / status_copy['progress']
-        remaining_matches = status_copy['total'] - status_copy['progress']
-        estimated_seconds = remaining_matches * avg_time_per_match
-        status_copy['estimated_time_remaining'] = f"{int(estimated_seconds // 60)}m {int(estimated_seconds % 60)}s"
+    SCRAPE_MODE=worker: status z bazy zadań, match/restart z tabeli scrape_job_events
+    (zapisywanej przez scrape_worker.py) - opóźnienie do SSE_POLL_SECONDS
+    
+    Przykład:
+        GET /api/scrape/stream?job=3f2a9c1d4e5b
+    """
+    job_id = request.args.get('job')
+    job = None
+    if job_id:
+        job = job_manager.get(job_id)
+        if not job:
+            return jsonify({'error': f'Nie znaleziono zadania {job_id}'}), 404
+    
+    subscription = progress_bus.subscribe(job_id)
+    # Worker w osobnym procesie: zdarzenia match/restart z bazy (scrape_job_events), od ostatnich
+    external = job_manager.external
+    tail, last_event_id = [], 0
+    if external:
+        tail = job_manager.events(job_id, tail=progress_bus.replay) if job_id else []
+        last_event_id = tail[-1]['id'] if tail else job_manager.last_event_id()
+    
+    def generate():
+        nonlocal last_event_id
+        with subscription:
+            if job:
+                # Stan początkowy - klient nie czeka na kolejny mecz
+                yield sse_format({'id': 0, 'event': 'status', 'data': with_progress(job)})
+                if external:
+                    for message in tail:
+                        yield sse_format(message)
+                # Zakończone przed restartem serwera - brak historii w szynie
+                if job['status'] not in ('queued', 'running') and subscription.queue.empty():
+                    yield sse_format({'id': 0, 'event': TERMINAL_EVENT, 'data': job})
+                    return
+            last_snapshot = job
+            while True:
+                message = subscription.get(timeout=SSE_POLL_SECONDS if external else SSE_HEARTBEAT_SECONDS)
+                if message is None:
+                    if external:
+                        # Najpierw status: zdarzenia zapisane przed zakończeniem zadania są już w bazie
+                        snapshot = job_manager.get(job_id) if job_id else None
+                        for event in job_manager.events(job_id, after_id=last_event_id):
+                            last_event_id = event['id']
+                            yield sse_format(event)
+                        if snapshot:
+                            if snapshot != last_snapshot:
+                                last_snapshot = snapshot
+                                yield sse_format({'id': 0, 'event': 'status', 'data': with_progress(snapshot)})
+                            if snapshot['status'] not in ('queued', 'running'):
+                                yield sse_format({'id': 0, 'event': TERMINAL_EVENT, 'data': snapshot})
+                                return
+                    yield ': keep-alive\n\n'
+                    continue
+                yield sse_format(message)
+                if job_id and message['event'] == TERMINAL_EVENT:
+                    return
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # nginx: nie buforuj strumienia
+    })
+
+
+@app.route('/api/scrape/<job_id>', methods=['DELETE'])
+def cancel_scraping_job(job_id):
+    """
+    Anuluj zadanie (w kolejce - nie wystartuje; uruchomione - kończy po bieżącym meczu)
     
-    return jsonify(status_copy), 200
+    Przykład:
+        DELETE /api/scrape/3f2a9c1d4e5b
+    """
+    if not job_manager.cancel(job_id):
+        return jsonify({'error': f'Zadanie {job_id} nie istnieje lub już się zakończyło'}), 404
+    return jsonify({'message': 'Anulowanie zlecone', 'job_id': job_id,
+                    'status_url': f'/api/scrape/status?job={job_id}'}), 202
 
 
 # ============================================
@@ -505,24 +560,40 @@ def get_history():
     """
     limit = int(request.args.get('limit', 10))
     
-    # Znajdź wszystkie pliki CSV
-    csv_files = glob.glob('outputs/livesport_h2h_*.csv')
+    cached = _history_cache.get(limit)
+    if cached and time.time() - cached[0] < HISTORY_CACHE_TTL:
+        _, etag, history = cached
+    else:
+        etag, history = _build_history(limit)
+        _history_cache[limit] = (time.time(), etag, history)
     
-    if not csv_files:
-        return jsonify({
-            'history': [],
-            'count': 0
-        }), 200
+    not_modified = check_not_modified(etag)
+    if not_modified:
+        return not_modified
+    
+    return with_etag(jsonify({
+        'history': history,
+        'count': len(history)
+    }), etag), 200
+
+
+def _build_history(limit: int) -> tuple:
+    """Lista ostatnich plików wyników -> (etag, history)"""
+    # Znajdź wszystkie pliki CSV
+    csv_files = [f for f in glob.glob('outputs/livesport_h2h_*.csv') if not is_partial_output(f)]
     
     # Sortuj po dacie modyfikacji (najnowsze pierwsze)
     csv_files.sort(key=os.path.getmtime, reverse=True)
     csv_files = csv_files[:limit]
     
     history = []
+    versions = []
+    store = get_match_store()
     for csv_file in csv_files:
         try:
-            df = pd.read_csv(csv_file)
-            qualified = df[df['qualifies'] == True]
+            # Tabela z MatchStore - CSV parsowany tylko po zmianie pliku
+            table = store.table(csv_file)
+            versions.append(f'{table.file}:{table.version}')
             
             # Wyciągnij datę z nazwy pliku
             filename = os.path.basename(csv_file)
@@ -531,153 +602,79 @@ def get_history():
             history.append({
                 'date': date_part,
                 'file': filename,
-                'total_matches': len(df),
-                'qualified_count': len(qualified),
+                'total_matches': table.total,
+                'qualified_count': table.qualified_count,
                 'modified': datetime.fromtimestamp(os.path.getmtime(csv_file)).isoformat(),
                 'size_kb': round(os.path.getsize(csv_file) / 1024, 2)
             })
         except Exception as e:
             print(f'Błąd przy przetwarzaniu {csv_file}: {e}')
     
-    return jsonify({
-        'history': history,
-        'count': len(history)
-    }), 200
+    return make_etag(*versions), history
 
 
 # ============================================
 # 6. POBIERZ POJEDYNCZY MECZ
 # ============================================
 
+def _get_match_db(create: bool = False):
+    """
+    Wspólna instancja MatchDatabase (połączenia per wątek)
+    
+    Args:
+        create: Utwórz bazę, jeśli jeszcze nie istnieje (zapis wyników zadania scrapowania);
+                odczyt tylko gdy scraper już ją utworzył
+    """
+    global _match_db
+    if _match_db is None and DB_AVAILABLE and (create or os.path.exists('outputs/matches.db')):
+        _match_db = MatchDatabase()
+    return _match_db
+
+
 @app.route('/api/match/<match_id>', methods=['GET'])
 def get_single_match(match_id):
     """
     Pobierz szczegóły pojedynczego meczu
     
     Query params:
-        date - Data (YYYY-MM-DD), domyślnie dzisiaj
+        date - Data (YYYY-MM-DD), domyślnie dowolna (ostatnio zapisany mecz o tym id)
     
     Przykład:
         GET /api/match/abc123?date=2025-10-05
     """
-    date = request.args.get('date', datetime.now().strftime('%Y-%m-%d'))
+    requested_date = request.args.get('date')
     
-    # Znajdź pliki CSV dla tej daty
-    csv_files = glob.glob(f'outputs/livesport_h2h_{date}*.csv')
-    
-    if not csv_files:
+    # 1. Indeks match_records w bazie (event_id / klucz URL) - pełny rekord zapisany
+    #    przez scraper razem z wierszem CSV, bez czytania plików
+    db = _get_match_db()
+    if db:
+        try:
+            found = db.get_match_record(match_id, match_date=requested_date)
+        except Exception as e:
+            print(f'Błąd odczytu meczu z bazy: {e}')
+            found = None
+        if found:
+            return jsonify({
+                'match': dict(found['match'], id=match_id),
+                'found_in': found['source_file']
+            }), 200
+    
+    # 2. Zapas: pliki CSV dla daty sprzed indeksu (indeks id -> mecz w tabelach MatchStore)
+    date = requested_date or datetime.now().strftime('%Y-%m-%d')
+    store = get_match_store()
+    if not store.files_for_date(date):
         return jsonify({
             'error': f'Brak danych dla daty {date}',
             'match_id': match_id
         }), 404
     
-    # Szukaj w wszystkich plikach dla tej daty
-    for csv_file in csv_files:
-        try:
-            df = pd.read_csv(csv_file)
-            
-            # Znajdź mecz po ID (ostatnia część URL)
-            match_row = df[df['match_url'].str.contains(match_id, na=False)]
-            
-            if len(match_row) > 0:
-                row = match_row.iloc[0]
-                
-                # Wykryj czy to tenis
-                is_tennis = pd.notna(row.get('favorite')) or pd.notna(row.get('advanced_score'))
-                
-                # Zbuduj pełny obiekt meczu
-                match = {
-                    'id': match_id,
-                    'home_team': row.get('home_team', ''),
-                    'away_team': row.get('away_team', ''),
-                    'match_time': row.get('match_time', ''),
-                    'match_url': row.get('match_url', ''),
-                    'qualifies': bool(row.get('qualifies', False)),
-                    'is_tennis': is_tennis,
-                    'h2h_count': int(row.get('h2h_count', 0)),
-                    'home_wins': int(row.get('home_wins_in_h2h_last5', 0)),
-                }
-                
-                # Kursy
-                if pd.notna(row.get('home_odds')):
-                    match['home_odds'] = float(row['home_odds'])
-                if pd.notna(row.get('away_odds')):
-                    match['away_odds'] = float(row['away_odds'])
-                
-                # Tennis-specific
-                if is_tennis:
-                    if pd.notna(row.get('advanced_score')):
-                        match['advanced_score'] = float(row['advanced_score'])
-                    if pd.notna(row.get('favorite')):
-                        match['favorite'] = row['favorite']
-                    if pd.notna(row.get('ranking_a')):
-                        match['ranking_a'] = int(row['ranking_a'])
-                    if pd.notna(row.get('ranking_b')):
-                        match['ranking_b'] = int(row['ranking_b'])
-                    if pd.notna(row.get('surface')):
-                        match['surface'] = row['surface']
-                    
-                    # Forma zawodników
-                    if pd.notna(row.get('form_a')):
-                        try:
-                            import ast
-                            match['form_a'] = ast.literal_eval(row['form_a'])
-                        except:
-                            pass
-                    if pd.notna(row.get('form_b')):
-                        try:
-                            import ast
-                            match['form_b'] = ast.literal_eval(row['form_b'])
-                        except:
-                            pass
-                
-                # Forma drużyn
-                if pd.notna(row.get('home_form_overall')):
-                    try:
-                        import ast
-                        match['home_form_overall'] = ast.literal_eval(row['home_form_overall'])
-                    except:
-                        pass
-                if pd.notna(row.get('away_form_overall')):
-                    try:
-                        import ast
-                        match['away_form_overall'] = ast.literal_eval(row['away_form_overall'])
-                    except:
-                        pass
-                if pd.notna(row.get('home_form_home')):
-                    try:
-                        import ast
-                        match['home_form_home'] = ast.literal_eval(row['home_form_home'])
-                    except:
-                        pass
-                if pd.notna(row.get('away_form_away')):
-                    try:
-                        import ast
-                        match['away_form_away'] = ast.literal_eval(row['away_form_away'])
-                    except:
-                        pass
-                
-                # Przewaga formy i win rate
-                if pd.notna(row.get('form_advantage')):
-                    match['form_advantage'] = bool(row['form_advantage'])
-                if pd.notna(row.get('win_rate')):
-                    match['win_rate'] = float(row['win_rate'])
-                
-                # H2H details
-                if pd.notna(row.get('h2h_last5')):
-                    try:
-                        import ast
-                        match['h2h_details'] = ast.literal_eval(row['h2h_last5'])
-                    except:
-                        match['h2h_details'] = []
-                
-                return jsonify({
-                    'match': match,
-                    'found_in': os.path.basename(csv_file)
-                }), 200
-        
-        except Exception as e:
-            continue
+    found = store.find_match(date, match_id)
+    if found:
+        match, found_in = found
+        return jsonify({
+            'match': dict(match, id=match_id),
+            'found_in': found_in
+        }), 200
     
     # Nie znaleziono
     return jsonify({
@@ -699,20 +696,23 @@ def download_csv(date):
     Przykład:
         GET /api/download/2025-10-05
     """
-    csv_files = glob.glob(f'outputs/livesport_h2h_{date}*.csv')
+    csv_files = get_match_store().files_for_date(date)
     
     if not csv_files:
         return jsonify({
             'error': f'Brak pliku dla daty {date}'
         }), 404
     
-    latest_csv = max(csv_files, key=os.path.getmtime)
+    latest_csv = csv_files[0]  # Najnowszy (bez plików shardów / zadań w toku)
     
+    # conditional=True: ETag/Last-Modified z pliku -> 304 dla niezmienionego CSV
     return send_file(
-        latest_csv,
+        os.path.abspath(latest_csv),  # Względna ścieżka byłaby liczona od katalogu aplikacji, nie cwd
         mimetype='text/csv',
         as_attachment=True,
-        download_name=os.path.basename(latest_csv)
+        download_name=os.path.basename(latest_csv),
+        conditional=True,
+        etag=True
     )
 
 
@@ -733,7 +733,10 @@ if __name__ == '__main__':
     print('   GET  /api/matches          - Lista meczów (z filtrowaniem)')
     print('   GET  /api/match/<id>       - Pojedynczy mecz (szczegóły)')
     print('   POST /api/scrape           - Uruchom scraping')
-    print('   GET  /api/scrape/status    - Status scrapingu')
+    print('   GET  /api/scrape/status    - Status zadania (?job=<id>)')
+    print('   GET  /api/scrape/jobs      - Lista zadań scrapowania')
+    print('   GET  /api/scrape/stream    - Postęp na żywo (SSE, ?job=<id>)')
+    print('   DELETE /api/scrape/<id>    - Anuluj zadanie')
     print('   GET  /api/sports           - Dostępne sporty')
     print('   GET  /api/history          - Historia scrapingów')
     print('   GET  /api/download/<date>  - Pobierz CSV')
@@ -745,11 +748,28 @@ if __name__ == '__main__':
     # Utwórz folder outputs jeśli nie istnieje
     os.makedirs('outputs', exist_ok=True)
     
-    # Uruchom server
-    app.run(
-        host='0.0.0.0',  # Dostępne z innych urządzeń w sieci
-        port=5000,
-        debug=True
-    )
+    port = int(os.environ.get('PORT', 5000))
+    
+    if PROD_MODE:
+        # Produkcja: waitress (działa też na Windows), scraping w scrape_worker.py
+        try:
+            from waitress import serve
+        except ImportError:
+            print('❌ Brak waitress: pip install waitress (lub gunicorn -c gunicorn.conf.py wsgi:app)')
+            sys.exit(1)
+        if SCRAPE_MODE == 'worker':
+            print('📥 SCRAPE_MODE=worker - zadania wykonuje osobny proces: python scrape_worker.py')
+        else:
+            print('⚠️  SCRAPE_MODE=thread - scraping w procesie API (zalecane: SCRAPE_MODE=worker + scrape_worker.py)')
+        print(f'🏭 Tryb produkcyjny: waitress, {os.environ.get("WEB_THREADS", 8)} wątków, port {port}')
+        serve(app, host='0.0.0.0', port=port, threads=int(os.environ.get('WEB_THREADS', 8)))
+    else:
+        # Uruchom server
+        app.run(
+            host='0.0.0.0',  # Dostępne z innych urządzeń w sieci
+            port=port,
+            debug=True,
+            use_reloader='--no-reload' not in sys.argv
+        )
 
 
@@ -8,6 +8,8 @@ do Twojej aplikacji UI przez różne metody.
 
 import requests
 import json
+import queue
+import threading
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -32,6 +34,11 @@ class AppIntegrator:
         
         if api_key:
             self.headers['Authorization'] = f'Bearer {api_key}'
+        
+        # Postęp wysyłany w tle - pętla scrapowania nie czeka na HTTP
+        self._progress_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._progress_thread: Optional[threading.Thread] = None
+        self._progress_lock = threading.Lock()
     
     def send_matches(self, matches: List[Dict], date: str, sport: str, endpoint: str = '/api/webhook/matches') -> bool:
         """
@@ -126,7 +133,11 @@ class AppIntegrator:
     
     def send_progress(self, progress: int, total: int, current_match: str, endpoint: str = '/api/webhook/progress') -> bool:
         """
-        Wyślij postęp scrapingu (dla real-time updates)
+        Wyślij postęp scrapingu (dla real-time updates) - NIE blokuje
+        
+        Postęp trafia do kolejki, którą opróżnia wątek w tle. Gdy aplikacja
+        odpowiada wolniej niż scraper, wysyłany jest tylko najnowszy stan
+        (starsze, niewysłane aktualizacje są pomijane).
         
         Args:
             progress: Aktualna liczba przetworzonych meczów
@@ -135,10 +146,8 @@ class AppIntegrator:
             endpoint: Endpoint w Twojej aplikacji
         
         Returns:
-            True jeśli sukces, False jeśli błąd
+            True - postęp dodany do kolejki wysyłki
         """
-        url = f"{self.app_url}{endpoint}"
-        
         payload = {
             'progress': progress,
             'total': total,
@@ -147,11 +156,41 @@ class AppIntegrator:
             'timestamp': datetime.now().isoformat()
         }
         
-        try:
-            response = requests.post(url, json=payload, headers=self.headers, timeout=5)
-            return response.status_code in [200, 201, 202]
-        except:
-            return False
+        self._ensure_progress_sender()
+        while True:
+            try:
+                self._progress_queue.put_nowait((f"{self.app_url}{endpoint}", payload))
+                return True
+            except queue.Full:
+                try:
+                    self._progress_queue.get_nowait()  # Najnowszy stan wygrywa
+                    self._progress_queue.task_done()
+                except queue.Empty:
+                    pass
+    
+    def _ensure_progress_sender(self):
+        with self._progress_lock:
+            if self._progress_thread is None or not self._progress_thread.is_alive():
+                self._progress_thread = threading.Thread(target=self._progress_sender, daemon=True,
+                                                         name='progress-sender')
+                self._progress_thread.start()
+    
+    def _progress_sender(self):
+        """Wątek w tle: wysyłaj postęp z kolejki"""
+        while True:
+            item = self._progress_queue.get()
+            url, payload = item
+            try:
+                requests.post(url, json=payload, headers=self.headers, timeout=5)
+            except Exception:
+                pass
+            finally:
+                self._progress_queue.task_done()
+    
+    def flush_progress(self):
+        """Poczekaj, aż ostatni postęp zostanie wysłany (np. na koniec scrapowania)"""
+        if self._progress_thread is not None and self._progress_thread.is_alive():
+            self._progress_queue.join()
     
     def test_connection(self) -> bool:
         """
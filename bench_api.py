@@ -0,0 +1,258 @@
+"""
+BENCH API - Test obciążenia /api/matches (p50 / p99)
+====================================================
+
+Generuje pliki CSV z wynikami (fixture), uruchamia api_server w osobnym
+procesie w katalogu tymczasowym i zasypuje /api/matches zapytaniami z kilku
+wątków (HTTP keep-alive). Porównuje:
+
+    dev  - python api_server.py (serwer deweloperski Flask)          = PRZED
+    prod - python api_server.py --prod (waitress, SCRAPE_MODE=worker) = PO
+
+Użycie:
+    python bench_api.py                                  # dev + prod
+    python bench_api.py --modes dev --requests 5000 --concurrency 16
+    python bench_api.py --url http://localhost:5000      # już uruchomiony serwer
+"""
+
+import argparse
+import http.client
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from result_sink import ResultSink
+
+
+BENCH_DATE = '2025-11-01'
+TEAMS = ['Legia', 'Lech', 'Raków', 'Pogoń', 'Górnik', 'Wisła', 'Cracovia', 'Jagiellonia',
+         'Śląsk', 'Zagłębie', 'Piast', 'Widzew', 'Korona', 'Stal', 'Motor', 'Puszcza']
+
+# Mieszanka zapytań jak z aplikacji (różne filtry i sortowania)
+QUERIES = [
+    f'/api/matches?date={BENCH_DATE}',
+    f'/api/matches?date={BENCH_DATE}&sort=wins',
+    f'/api/matches?date={BENCH_DATE}&min_wins=4',
+    f'/api/matches?date={BENCH_DATE}&sort=team&limit=20',
+    f'/api/matches?date={BENCH_DATE}&sport=football',
+]
+
+SERVER_COMMANDS = {
+    'dev': ['--no-reload'],
+    'prod': ['--prod'],
+}
+
+
+def write_fixtures(outputs_dir: str, rows: int, seed: int = 42) -> str:
+    """Plik CSV z losowymi (powtarzalnymi) wynikami meczów"""
+    rng = random.Random(seed)
+    path = os.path.join(outputs_dir, f'livesport_h2h_{BENCH_DATE}_football.csv')
+    with ResultSink(path) as sink:
+        for i in range(rows):
+            home, away = rng.sample(TEAMS, 2)
+            home_wins = rng.randint(0, 5)
+            sink.write({
+                'match_url': f'https://www.livesport.com/pl/mecz/pilka-nozna/{home}-{away}/?mid=B{i:07d}',
+                'home_team': home,
+                'away_team': away,
+                'match_time': f'{rng.randint(12, 22)}:{rng.choice(["00", "15", "30", "45"])}',
+                'h2h_count': 5,
+                'home_wins_in_h2h_last5': home_wins,
+                'qualifies': home_wins >= 3,
+                'home_odds': round(rng.uniform(1.2, 4.0), 2),
+                'away_odds': round(rng.uniform(1.2, 6.0), 2),
+                'home_form_overall': rng.choices('WDL', k=5),
+                'away_form_overall': rng.choices('WDL', k=5),
+                'h2h_last5': [{'home': home, 'away': away, 'score': f'{rng.randint(0, 4)}-{rng.randint(0, 4)}'}
+                              for _ in range(5)],
+            })
+    return path
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _wait_for_server(base_url: str, timeout: float = 30.0):
+    parsed = urlparse(base_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=2)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'Serwer {base_url} nie odpowiada')
+
+
+def run_load(base_url: str, total_requests: int, concurrency: int, warmup: int = 50) -> Dict:
+    """
+    Wyślij total_requests zapytań GET /api/matches z `concurrency` wątków
+
+    Returns:
+        Statystyki: p50/p90/p99/max [ms], zapytania/s, błędy
+    """
+    parsed = urlparse(base_url)
+    headers = {'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'}
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(total_requests + warmup))
+
+    def worker():
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+        local = []
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                break
+            path = QUERIES[n % len(QUERIES)]
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+            elapsed = (time.perf_counter() - start) * 1000
+            if n < warmup:
+                continue
+            if ok:
+                local.append(elapsed)
+            else:
+                with lock:
+                    errors[0] += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'p50_ms': percentile(latencies, 50),
+        'p90_ms': percentile(latencies, 90),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': latencies[-1] if latencies else 0.0,
+        'rps': len(latencies) / duration if duration else 0.0,
+    }
+
+
+def bench_mode(mode: str, workdir: str, port: int, args) -> Optional[Dict]:
+    """Uruchom api_server w danym trybie i zmierz obciążenie"""
+    if mode == 'prod':
+        try:
+            import waitress  # noqa: F401
+        except ImportError:
+            print('⚠️  prod: brak waitress (pip install waitress) - pomijam')
+            return None
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_server.py')
+    env = dict(os.environ, PORT=str(port), SCRAPE_MODE='worker', PYTHONUNBUFFERED='1')
+    log_path = os.path.join(workdir, f'server_{mode}.log')
+    with open(log_path, 'w', encoding='utf-8') as log:
+        server = subprocess.Popen([sys.executable, script, *SERVER_COMMANDS[mode]], cwd=workdir, env=env,
+                                  stdout=log, stderr=subprocess.STDOUT)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        _wait_for_server(base_url)
+        return run_load(base_url, args.requests, args.concurrency)
+    except RuntimeError as e:
+        print(f'❌ {mode}: {e} (log: {log_path})')
+        return None
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def print_results(results: Dict[str, Dict]):
+    print()
+    print(f"{'tryb':<8}{'zapytań':>9}{'błędy':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'req/s':>9}")
+    print('-' * 69)
+    for mode, stats in results.items():
+        print(f"{mode:<8}{stats['requests']:>9}{stats['errors']:>7}{stats['p50_ms']:>9.1f}"
+              f"{stats['p90_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}{stats['rps']:>9.0f}")
+
+    if 'dev' in results and 'prod' in results:
+        before, after = results['dev'], results['prod']
+        print()
+        for key in ('p50_ms', 'p99_ms'):
+            if after[key]:
+                print(f"   {key[:3]}: {before[key]:.1f} ms -> {after[key]:.1f} ms ({before[key] / after[key]:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test obciążenia /api/matches (p50/p99)')
+    parser.add_argument('--modes', default='dev,prod', help='Tryby serwera: dev,prod')
+    parser.add_argument('--url', help='Testuj już uruchomiony serwer (bez fixture i startu serwera)')
+    parser.add_argument('--requests', type=int, default=2000, help='Liczba zapytań na tryb')
+    parser.add_argument('--concurrency', type=int, default=8, help='Liczba równoległych klientów')
+    parser.add_argument('--rows', type=int, default=800, help='Liczba meczów w pliku fixture')
+    parser.add_argument('--port', type=int, default=5077, help='Port serwera testowego')
+    args = parser.parse_args()
+
+    print('='*60)
+    print('⏱️  BENCH API: GET /api/matches')
+    print('='*60)
+    print(f'   {args.requests} zapytań, {args.concurrency} klientów')
+
+    results = {}
+    if args.url:
+        _wait_for_server(args.url)
+        results['url'] = run_load(args.url, args.requests, args.concurrency)
+    else:
+        workdir = tempfile.mkdtemp(prefix='bench_api_')
+        try:
+            outputs_dir = os.path.join(workdir, 'outputs')
+            os.makedirs(outputs_dir)
+            path = write_fixtures(outputs_dir, args.rows)
+            print(f'   Fixture: {args.rows} meczów ({os.path.getsize(path) // 1024} KB)')
+            for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+                if mode not in SERVER_COMMANDS:
+                    print(f'⚠️  Nieznany tryb: {mode}')
+                    continue
+                print(f'   ▶️  {mode}...')
+                stats = bench_mode(mode, workdir, args.port, args)
+                if stats:
+                    results[mode] = stats
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if not results:
+        print('❌ Brak wyników')
+        return 1
+    print_results(results)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
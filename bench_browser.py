@@ -0,0 +1,113 @@
+"""
+BENCH BROWSER - Pełny vs lekki profil Chrome (bajty / czas / RAM na stronę)
+===========================================================================
+
+Otwiera te same strony Livesport w dwóch profilach przeglądarki:
+
+    full - start_driver(lean=False) - wszystko jak w zwykłym Chrome = PRZED
+    lean - start_driver(lean=True)  - bez obrazków, fontów, reklam   = PO
+
+i dla każdej strony mierzy bajty + liczbę zapytań (Performance API), czas do
+gotowości strony (wait_utils) oraz RSS wszystkich procesów Chrome (psutil).
+
+Użycie:
+    python bench_browser.py                                 # listy meczów kilku sportów
+    python bench_browser.py --urls https://www.livesport.com/pl/mecz/... --rounds 2
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+from browser_profile import measure_page
+from livesport_h2h_scraper import MATCH_LINK_SELECTOR, start_driver
+from wait_utils import AdaptiveTimeouts, wait_for_page
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+DEFAULT_URLS = [
+    'https://www.livesport.com/pl/pilka-nozna/',
+    'https://www.livesport.com/pl/koszykowka/',
+    'https://www.livesport.com/pl/siatkowka/',
+    'https://www.livesport.com/pl/tenis/',
+]
+
+
+def browser_rss_mb(driver) -> Optional[float]:
+    """RSS chromedriver + wszystkich procesów Chrome (MB)"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+        return round(sum(p.memory_info().rss for p in processes) / 1024 / 1024, 1)
+    except (psutil.Error, AttributeError):
+        return None
+
+
+def run_profile(lean: bool, urls: List[str], rounds: int, headless: bool) -> Dict:
+    """Odwiedź strony w jednym profilu i zwróć średnie"""
+    driver = start_driver(headless=headless, lean=lean)
+    timeouts = AdaptiveTimeouts(defaults={'bench': 15.0})
+    pages = []
+    try:
+        for _ in range(rounds):
+            for url in urls:
+                start = time.monotonic()
+                driver.get(url)
+                wait_for_page(driver, 'bench', MATCH_LINK_SELECTOR, rows_selector=MATCH_LINK_SELECTOR,
+                              timeouts=timeouts)
+                ready_ms = (time.monotonic() - start) * 1000
+                measurement = measure_page(driver) or {'bytes': 0, 'requests': 0}
+                pages.append({'ready_ms': ready_ms, **measurement})
+        rss = browser_rss_mb(driver)
+    finally:
+        driver.quit()
+
+    count = len(pages) or 1
+    return {
+        'pages': len(pages),
+        'avg_kb': sum(p['bytes'] for p in pages) / count / 1024,
+        'avg_requests': sum(p['requests'] for p in pages) / count,
+        'avg_ready_ms': sum(p['ready_ms'] for p in pages) / count,
+        'rss_mb': rss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Porównanie pełnego i lekkiego profilu Chrome')
+    parser.add_argument('--urls', nargs='+', default=DEFAULT_URLS, help='Strony do odwiedzenia')
+    parser.add_argument('--rounds', type=int, default=1, help='Ile razy odwiedzić każdą stronę')
+    parser.add_argument('--show', action='store_true', help='Chrome z GUI (domyślnie headless)')
+    args = parser.parse_args()
+
+    print("="*70)
+    print(f"🏁 BENCH: profil Chrome - {len(args.urls)} stron x {args.rounds}")
+    print("="*70)
+
+    results = {}
+    for name, lean in (('full', False), ('lean', True)):
+        print(f"\n🌐 Profil: {name}")
+        results[name] = run_profile(lean, args.urls, args.rounds, headless=not args.show)
+        r = results[name]
+        rss = f"{r['rss_mb']} MB" if r['rss_mb'] is not None else 'n/d'
+        print(f"   Średnio: {r['avg_kb']:.0f} KB, {r['avg_requests']:.0f} zapytań, "
+              f"gotowa po {r['avg_ready_ms']:.0f} ms, RAM Chrome: {rss}")
+
+    full, lean = results['full'], results['lean']
+    print(f"\n📊 Lekki profil vs pełny:")
+    if full['avg_kb']:
+        print(f"   Bajty:   -{(1 - lean['avg_kb'] / full['avg_kb']) * 100:.0f}%")
+    if full['avg_ready_ms']:
+        print(f"   Czas:    -{(1 - lean['avg_ready_ms'] / full['avg_ready_ms']) * 100:.0f}%")
+    if full['rss_mb'] and lean['rss_mb']:
+        print(f"   RAM:     -{(1 - lean['rss_mb'] / full['rss_mb']) * 100:.0f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,189 @@
+"""
+BROWSER MEMORY - Restart przeglądarki wtedy, gdy naprawdę trzeba
+================================================================
+
+Wcześniej przeglądarka była restartowana "na ślepo" co RESTART_INTERVAL meczów
+(25/40 w scrape_and_notify, 30/80 w scraperze, 200 w API) - zależnie tylko od
+GITHUB_ACTIONS. Zdrowa, rozgrzana przeglądarka była wyrzucana, a ciężka strona
+i tak potrafiła doprowadzić do OOM między restartami.
+
+RecyclePolicy decyduje na podstawie POMIARÓW (po każdym meczu):
+- RSS całego drzewa procesów Chrome (chromedriver + Chrome + renderery, psutil)
+- sterta JS karty (performance.memory.usedJSHeapSize)
+- wolna pamięć systemu (ostatnia linia obrony przed OOM)
+- awaryjny limit liczby meczów (wycieki, których nie widać w RSS)
+
+RecycleStats zapisuje częstotliwość i koszt restartów do statystyk przebiegu.
+
+Ciepły Chrome (BROWSER_SERVICE_ADDRESS, browser_service.py): Chrome nie jest
+dzieckiem chromedrivera, więc mierzone jest drzewo procesu z
+outputs/browser_service.json (AttachedChrome.service_pid). To RSS WSPÓLNEGO
+Chrome (wszystkie karty/sesje) - restart zamyka tylko kartę, więc przy wielu
+sesjach budżet RSS warto podnieść. Chrome uruchomiony bez start_service (brak
+PID) -> RSS pominięty, decydują sterta JS, wolna pamięć i limit meczów.
+
+Konfiguracja (zmienne środowiskowe):
+    BROWSER_RSS_BUDGET_MB    - budżet RSS jednej przeglądarki (domyślnie 1500, GitHub Actions 1000)
+    BROWSER_HEAP_BUDGET_MB   - budżet sterty JS karty (domyślnie 400)
+    BROWSER_MIN_FREE_MB      - restart gdy w systemie zostało mniej (domyślnie 500)
+    BROWSER_MAX_USES         - awaryjny limit meczów na przeglądarkę (domyślnie 500)
+"""
+
+import os
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+DEFAULT_RSS_BUDGET_MB = 1500
+GITHUB_RSS_BUDGET_MB = 1000
+DEFAULT_HEAP_BUDGET_MB = 400
+DEFAULT_MIN_FREE_MB = 500
+DEFAULT_MAX_USES = 500
+
+_HEAP_JS = "return (performance.memory && performance.memory.usedJSHeapSize) || null;"
+
+
+def _tree_rss(pid: int) -> int:
+    root = psutil.Process(pid)
+    total = root.memory_info().rss
+    for child in root.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass  # Proces zakończył się w trakcie pomiaru
+    return total
+
+
+def browser_rss_mb(driver) -> Optional[float]:
+    """
+    RSS drzewa procesów przeglądarki (MB): chromedriver + Chrome + renderery.
+    Przy ciepłym Chrome (driver.service_pid) także drzewo tego procesu.
+
+    Returns:
+        None jeśli psutil niedostępny lub proces nie istnieje
+    """
+    if not PSUTIL_AVAILABLE:
+        return None
+    try:
+        total = _tree_rss(driver.service.process.pid)
+    except (psutil.Error, AttributeError):
+        return None
+    service_pid = getattr(driver, 'service_pid', None)
+    if service_pid:
+        try:
+            total += _tree_rss(service_pid)
+        except psutil.Error:
+            pass  # Ciepły Chrome zakończony - zostaje chromedriver
+    return total / (1024 ** 2)
+
+
+def js_heap_mb(driver) -> Optional[float]:
+    """Zajęta sterta JS aktualnej karty (MB) lub None"""
+    try:
+        used = driver.execute_script(_HEAP_JS)
+    except Exception:
+        return None
+    return used / (1024 ** 2) if isinstance(used, (int, float)) else None
+
+
+def system_free_mb() -> Optional[float]:
+    if not PSUTIL_AVAILABLE:
+        return None
+    return psutil.virtual_memory().available / (1024 ** 2)
+
+
+class RecyclePolicy:
+    """Decyzja o restarcie przeglądarki na podstawie zmierzonej pamięci"""
+
+    def __init__(self,
+                 rss_budget_mb: Optional[float] = None,
+                 heap_budget_mb: Optional[float] = None,
+                 min_free_mb: Optional[float] = None,
+                 max_uses: Optional[int] = None):
+        """
+        Args:
+            rss_budget_mb: Budżet RSS drzewa procesów jednej przeglądarki
+            heap_budget_mb: Budżet sterty JS karty
+            min_free_mb: Minimalna wolna pamięć systemu
+            max_uses: Awaryjny limit meczów od ostatniego restartu (0 = brak)
+        """
+        is_github = os.environ.get('GITHUB_ACTIONS') == 'true'
+        default_rss = GITHUB_RSS_BUDGET_MB if is_github else DEFAULT_RSS_BUDGET_MB
+        self.rss_budget_mb = rss_budget_mb or float(os.environ.get('BROWSER_RSS_BUDGET_MB', default_rss))
+        self.heap_budget_mb = heap_budget_mb or float(os.environ.get('BROWSER_HEAP_BUDGET_MB', DEFAULT_HEAP_BUDGET_MB))
+        self.min_free_mb = min_free_mb if min_free_mb is not None else \
+            float(os.environ.get('BROWSER_MIN_FREE_MB', DEFAULT_MIN_FREE_MB))
+        self.max_uses = max_uses if max_uses is not None else int(os.environ.get('BROWSER_MAX_USES', DEFAULT_MAX_USES))
+
+    def check(self, driver, uses: int, stats: Optional['RecycleStats'] = None) -> Optional[str]:
+        """
+        Zmierz przeglądarkę po meczu.
+
+        Args:
+            uses: Mecze od ostatniego (re)startu tej przeglądarki
+            stats: Gdzie zapisać szczyt RSS (opcjonalnie)
+
+        Returns:
+            Powód restartu ('rss ...', 'heap ...', 'free ...', 'uses ...') lub None
+        """
+        rss = browser_rss_mb(driver)
+        if stats is not None and rss is not None:
+            stats.observe(rss)
+        if rss is not None and rss > self.rss_budget_mb:
+            return f'rss {rss:.0f} MB > {self.rss_budget_mb:.0f} MB'
+
+        heap = js_heap_mb(driver)
+        if heap is not None and heap > self.heap_budget_mb:
+            return f'heap {heap:.0f} MB > {self.heap_budget_mb:.0f} MB'
+
+        free = system_free_mb()
+        if free is not None and free < self.min_free_mb:
+            return f'free {free:.0f} MB < {self.min_free_mb:.0f} MB'
+
+        if self.max_uses and uses >= self.max_uses:
+            return f'uses {uses} ≥ {self.max_uses} (limit awaryjny)'
+        return None
+
+    def describe(self) -> str:
+        return (f"RSS ≤ {self.rss_budget_mb:.0f} MB, sterta JS ≤ {self.heap_budget_mb:.0f} MB, "
+                f"wolne ≥ {self.min_free_mb:.0f} MB")
+
+
+class RecycleStats:
+    """Częstotliwość i koszt restartów przeglądarek w przebiegu"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.restarts = 0
+        self.restart_seconds = 0.0
+        self.reasons: Counter = Counter()
+        self.peak_rss_mb = 0.0
+
+    def observe(self, rss_mb: float):
+        with self._lock:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+
+    def record(self, reason: str, seconds: float):
+        # 'rss 1620 MB > 1500 MB' -> 'rss' (grupowanie powodów: rss / heap / free / uses)
+        kind = reason.split(' ')[0] if reason else 'inne'
+        with self._lock:
+            self.restarts += 1
+            self.restart_seconds += seconds
+            self.reasons[kind] += 1
+
+    def summary(self, matches: int = 0) -> Dict:
+        with self._lock:
+            return {
+                'restarts': self.restarts,
+                'restart_s': round(self.restart_seconds, 1),
+                'avg_restart_s': round(self.restart_seconds / self.restarts, 2) if self.restarts else 0.0,
+                'matches_per_restart': round(matches / self.restarts, 1) if self.restarts else None,
+                'reasons': dict(self.reasons),
+                'peak_rss_mb': round(self.peak_rss_mb),
+            }
@@ -0,0 +1,272 @@
+"""
+BROWSER POOL - Pula przeglądarek dla trybu równoległego
+=======================================================
+
+Każdy wątek roboczy dostaje WŁASNĄ instancję webdriver.Chrome (lease),
+zamiast współdzielić jedną kartę Chrome między wszystkimi wątkami.
+
+Funkcje:
+- N niezależnych przeglądarek (1 przeglądarka = 1 wątek roboczy)
+- Auto-restart per przeglądarka gdy przekroczy budżet pamięci (RecyclePolicy:
+  RSS drzewa procesów Chrome, sterta JS) - restartuje się tylko ta przeglądarka,
+  reszta (rozgrzana) pracuje dalej
+- Health check przed każdym wypożyczeniem (martwa przeglądarka = restart)
+- Nieudany restart nie gubi miejsca w puli: przeglądarka wraca jako martwa
+  i jest restartowana przy następnym wypożyczeniu; gdy i to się nie uda,
+  pula się zmniejsza (pusta pula = RuntimeError zamiast wiecznego czekania)
+- Licznik przepustowości (mecze/min, restarty, ich powody i koszt, błędy)
+
+Użycie:
+    pool = BrowserPool(size=8, headless=True, policy=RecyclePolicy())
+    pool.start()
+    try:
+        with pool.lease() as driver:
+            info = process_match(url, driver)
+        pool.record_result(success=True)
+    finally:
+        pool.close()
+"""
+
+import gc
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from browser_memory import RecyclePolicy, RecycleStats
+
+# Ile najdłużej czekać na wolną przeglądarkę (mecz z ponowieniami trwa do kilku minut)
+LEASE_TIMEOUT_S = 600
+
+
+class PooledBrowser:
+    """Pojedyncza przeglądarka w puli + jej liczniki"""
+
+    def __init__(self, slot_id: int, driver):
+        self.slot_id = slot_id
+        self.driver = driver  # None = martwa (restart nieudany) - restart przy wypożyczeniu
+        self.uses_since_restart = 0  # Mecze od ostatniego (re)startu
+        self.total_uses = 0
+        self.restarts = 0
+
+
+class BrowserPool:
+    """Pula przeglądarek Chrome wypożyczanych wątkom roboczym"""
+
+    def __init__(self,
+                 size: int,
+                 headless: bool = True,
+                 policy: Optional[RecyclePolicy] = None,
+                 driver_factory: Optional[Callable] = None):
+        """
+        Args:
+            size: Liczba przeglądarek (= maksymalna liczba równoległych meczów)
+            headless: Czy uruchamiać Chrome bez GUI
+            policy: Kiedy restartować przeglądarkę (domyślnie RecyclePolicy() - budżety z env)
+            driver_factory: Funkcja tworząca driver (domyślnie start_driver ze scrapera)
+        """
+        self.size = max(1, size)
+        self.headless = headless
+        self.policy = policy or RecyclePolicy()
+        self.recycle_stats = RecycleStats()
+        self._driver_factory = driver_factory or self._default_factory
+        self.restart_retry_delay = 2.0  # Przerwa przed drugą próbą restartu (np. port jeszcze zajęty)
+
+        self._available: "queue.Queue[PooledBrowser]" = queue.Queue()
+        self._slots: List[PooledBrowser] = []
+        self._lock = threading.Lock()
+
+        # Liczniki przepustowości
+        self._completed = 0
+        self._failed = 0
+        self._started_at: Optional[float] = None
+
+    def _default_factory(self):
+        # Import lokalny - unikamy cyklicznego importu ze scraperem
+        from livesport_h2h_scraper import start_driver
+        return start_driver(headless=self.headless)
+
+    # ------------------------------------------------------------------
+    # Cykl życia puli
+    # ------------------------------------------------------------------
+
+    def start(self) -> int:
+        """
+        Uruchom wszystkie przeglądarki (równolegle - start Chrome trwa kilka sekund).
+
+        Returns:
+            Liczba przeglądarek, które udało się uruchomić
+        """
+        def _create(slot_id: int) -> Optional[PooledBrowser]:
+            try:
+                return PooledBrowser(slot_id, self._driver_factory())
+            except Exception as e:
+                print(f"   ⚠️ Pula: nie udało się uruchomić przeglądarki #{slot_id}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            created = list(executor.map(_create, range(self.size)))
+
+        for slot in created:
+            if slot is not None:
+                self._slots.append(slot)
+                self._available.put(slot)
+
+        if not self._slots:
+            raise RuntimeError("Nie udało się uruchomić żadnej przeglądarki w puli")
+
+        self._started_at = time.time()
+        print(f"   🌐 Pula przeglądarek gotowa: {len(self._slots)}/{self.size}")
+        return len(self._slots)
+
+    def close(self):
+        """Zamknij wszystkie przeglądarki"""
+        for slot in self._slots:
+            if slot.driver is None:
+                continue
+            try:
+                slot.driver.quit()
+            except Exception:
+                pass
+        self._slots = []
+        gc.collect()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------
+    # Wypożyczanie
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = LEASE_TIMEOUT_S):
+        """
+        Wypożycz przeglądarkę na czas przetwarzania JEDNEGO meczu.
+
+        Przed wydaniem sprawdza czy przeglądarka żyje, po zwrocie
+        restartuje ją tylko jeśli przekroczyła budżet pamięci (`policy`).
+        Przeglądarka wraca do puli zawsze - także gdy restart się nie udał.
+
+        Raises:
+            RuntimeError: Brak wolnej przeglądarki po `timeout` s
+                          albo w puli nie została żadna działająca przeglądarka
+        """
+        slot = self._acquire(timeout)
+        try:
+            yield slot.driver
+        finally:
+            try:
+                slot.uses_since_restart += 1
+                slot.total_uses += 1
+                reason = self.policy.check(slot.driver, slot.uses_since_restart, self.recycle_stats)
+                if reason:
+                    self._restart(slot, reason=reason)
+            except Exception as e:
+                print(f"   ⚠️ Przeglądarka #{slot.slot_id} martwa po nieudanym restarcie: {e}")
+                slot.driver = None  # Restart przy następnym wypożyczeniu
+            finally:
+                self._available.put(slot)
+
+    def _acquire(self, timeout: Optional[float]) -> PooledBrowser:
+        """Weź wolną przeglądarkę z puli (martwą najpierw restartuje, nieudaną usuwa z puli)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                if not self._slots:
+                    raise RuntimeError("Pula przeglądarek pusta - żadna przeglądarka nie działa")
+            wait = 1.0  # Krótkie czekanie - pula mogła się w tym czasie opróżnić
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(f"Brak wolnej przeglądarki w puli po {timeout:.0f}s "
+                                       f"({len(self._slots)} przeglądarek)")
+                wait = min(wait, remaining)
+            try:
+                slot = self._available.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+            if slot.driver is not None and self._is_healthy(slot):
+                return slot
+            try:
+                self._restart(slot, reason='health check nieudany')
+                return slot
+            except Exception as e:
+                self._drop(slot, e)
+
+    def _drop(self, slot: PooledBrowser, error: Exception):
+        """Usuń z puli przeglądarkę, której nie da się zrestartować"""
+        with self._lock:
+            if slot in self._slots:
+                self._slots.remove(slot)
+            left = len(self._slots)
+        print(f"   ❌ Przeglądarka #{slot.slot_id} usunięta z puli ({error}) - zostało {left}")
+
+    def _is_healthy(self, slot: PooledBrowser) -> bool:
+        """Szybki health check - jeden round-trip do przeglądarki"""
+        try:
+            return slot.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _restart(self, slot: PooledBrowser, reason: str = ''):
+        """Zrestartuj JEDNĄ przeglądarkę (pozostałe pracują dalej)"""
+        print(f"\n🔄 AUTO-RESTART przeglądarki #{slot.slot_id} po {slot.uses_since_restart} meczach ({reason})...")
+        started = time.time()
+        if slot.driver is not None:
+            try:
+                slot.driver.quit()
+            except Exception:
+                pass
+            slot.driver = None  # Do udanego startu nowej przeglądarka jest martwa
+        gc.collect()
+
+        try:
+            slot.driver = self._driver_factory()
+        except Exception as e:
+            # Druga próba po krótkiej przerwie (np. port jeszcze zajęty)
+            print(f"   ⚠️ Błąd restartu #{slot.slot_id}: {e} - ponawiam...")
+            time.sleep(self.restart_retry_delay)
+            slot.driver = self._driver_factory()
+
+        slot.uses_since_restart = 0
+        slot.restarts += 1
+        self.recycle_stats.record(reason, time.time() - started)
+
+    # ------------------------------------------------------------------
+    # Statystyki
+    # ------------------------------------------------------------------
+
+    def record_result(self, success: bool):
+        """Zarejestruj wynik przetworzenia meczu (licznik przepustowości)"""
+        with self._lock:
+            if success:
+                self._completed += 1
+            else:
+                self._failed += 1
+
+    def stats(self) -> Dict:
+        """Zwróć statystyki puli (przepustowość, restarty, błędy)"""
+        with self._lock:
+            elapsed = time.time() - self._started_at if self._started_at else 0.0
+            processed = self._completed + self._failed
+            recycle = self.recycle_stats.summary(processed)
+            return {
+                'browsers': len(self._slots),
+                'completed': self._completed,
+                'failed': self._failed,
+                'restarts': recycle['restarts'],
+                'restart_s': recycle['restart_s'],
+                'restart_reasons': recycle['reasons'],
+                'peak_rss_mb': recycle['peak_rss_mb'],
+                'elapsed_s': round(elapsed, 1),
+                'matches_per_minute': round(processed / (elapsed / 60), 2) if elapsed > 0 else 0.0,
+                'per_browser': {s.slot_id: s.total_uses for s in self._slots},
+            }
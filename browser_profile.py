@@ -0,0 +1,163 @@
+"""
+BROWSER PROFILE - "Lekki" profil Chrome dla scraperów
+=====================================================
+
+Każda strona Livesport ciągnie obrazki (herby, flagi, banery), fonty, skrypty
+reklamowe i analityczne - nic z tego nie parsujemy, a to większość bajtów,
+czasu ładowania i pamięci karty (przez którą restartujemy przeglądarkę co
+RESTART_INTERVAL meczów na GitHub Actions).
+
+Lekki profil:
+- flagi Chrome: bez rozszerzeń, sieci w tle, synchronizacji, tłumacza, audio
+- preferencje: obrazki i powiadomienia wyłączone
+- CDP Network.setBlockedURLs: obrazki, fonty, media, reklamy i trackery
+  (elementy <img> zostają w DOM z atrybutami alt/title - blokowane jest tylko pobieranie)
+
+Pomiar: measure_page() czyta Performance API aktualnej strony (bajty, liczba
+zapytań, czas load) - PageLoadStats zbiera pomiary per nawigacja, gdy
+LIVESPORT_PAGE_STATS=1 (PageContext.navigate). Porównanie: bench_browser.py.
+
+Konfiguracja (zmienne środowiskowe):
+    LIVESPORT_LEAN_BROWSER=0   - pełny profil Chrome (jak wcześniej)
+    LIVESPORT_PAGE_STATS=1     - zbieraj pomiar każdej strony
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+IMAGE_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.ico', '*.svg']
+FONT_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+MEDIA_PATTERNS = ['*.mp4', '*.webm', '*.mp3']
+TRACKER_PATTERNS = [
+    '*doubleclick.net*', '*googlesyndication.com*', '*googletagservices.com*', '*googletagmanager.com*',
+    '*google-analytics.com*', '*adservice.google.*', '*amazon-adsystem.com*', '*adnxs.com*',
+    '*criteo.*', '*taboola.com*', '*outbrain.com*', '*scorecardresearch.com*', '*quantserve.com*',
+    '*hotjar.com*', '*facebook.net*', '*connect.facebook.*', '*hit.gemius.pl*', '*gemius.pl*',
+]
+BLOCKED_URL_PATTERNS = IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS
+
+LEAN_ARGUMENTS = [
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-features=Translate,OptimizationHints,MediaRouter',
+    '--metrics-recording-only',
+    '--no-first-run',
+    '--mute-audio',
+    '--blink-settings=imagesEnabled=false',
+]
+LEAN_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+}
+
+_MEASURE_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? (nav.transferSize || nav.encodedBodySize || 0) : 0;
+for (const r of resources) { bytes += r.transferSize || r.encodedBodySize || 0; }
+return {
+    bytes: bytes,
+    requests: resources.length + (nav ? 1 : 0),
+    load_ms: nav ? Math.round(nav.loadEventEnd > 0 ? nav.loadEventEnd : performance.now()) : null
+};
+"""
+
+
+def lean_enabled() -> bool:
+    return os.environ.get('LIVESPORT_LEAN_BROWSER', '1') != '0'
+
+
+def apply_lean_options(chrome_options):
+    """Dodaj flagi i preferencje lekkiego profilu do ChromeOptions"""
+    for argument in LEAN_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    chrome_options.add_experimental_option('prefs', dict(LEAN_PREFS))
+    return chrome_options
+
+
+def apply_url_blocking(driver, patterns: Optional[List[str]] = None) -> bool:
+    """
+    Blokuj pobieranie zasobów pasujących do wzorców (CDP Network.setBlockedURLs).
+
+    Returns:
+        False jeśli przeglądarka nie obsługuje CDP (np. nie-Chromium)
+    """
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns or BLOCKED_URL_PATTERNS)})
+        return True
+    except Exception as e:
+        print(f"   ⚠️ Blokowanie zasobów niedostępne: {e}")
+        return False
+
+
+def measure_page(driver) -> Optional[Dict]:
+    """
+    Bajty, liczba zapytań i czas ładowania aktualnej strony (Performance API).
+
+    Zasoby z innych domen bez Timing-Allow-Origin raportują 0 bajtów, więc
+    liczba bajtów jest dolnym oszacowaniem - wystarcza do porównań profili.
+    """
+    try:
+        result = driver.execute_script(_MEASURE_JS)
+    except Exception:
+        return None
+    if not isinstance(result, dict):
+        return None
+    return {'bytes': int(result.get('bytes') or 0),
+            'requests': int(result.get('requests') or 0),
+            'load_ms': result.get('load_ms')}
+
+
+class PageLoadStats:
+    """Suma pomiarów stron (bajty / zapytania / czas) dla całego procesu"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.bytes = 0
+        self.requests = 0
+        self.load_ms = 0
+
+    def record(self, measurement: Optional[Dict]):
+        if not measurement:
+            return
+        with self._lock:
+            self.pages += 1
+            self.bytes += measurement['bytes']
+            self.requests += measurement['requests']
+            self.load_ms += measurement['load_ms'] or 0
+
+    def summary(self) -> Dict:
+        with self._lock:
+            pages = self.pages or 1
+            return {
+                'pages': self.pages,
+                'avg_kb': round(self.bytes / pages / 1024, 1),
+                'avg_requests': round(self.requests / pages, 1),
+                'avg_load_ms': round(self.load_ms / pages),
+            }
+
+
+_page_stats: Optional[PageLoadStats] = None
+_page_stats_lock = threading.Lock()
+
+
+def get_page_stats() -> Optional[PageLoadStats]:
+    """
+    Współdzielone pomiary procesu.
+
+    Returns:
+        PageLoadStats lub None jeśli pomiar wyłączony (domyślnie - LIVESPORT_PAGE_STATS=1 włącza)
+    """
+    global _page_stats
+    if os.environ.get('LIVESPORT_PAGE_STATS', '0') != '1':
+        return None
+    with _page_stats_lock:
+        if _page_stats is None:
+            _page_stats = PageLoadStats()
+        return _page_stats
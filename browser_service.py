@@ -0,0 +1,285 @@
+"""
+BROWSER SERVICE - Szybki start przeglądarki (cache chromedrivera + ciepły Chrome)
+=================================================================================
+
+Start przeglądarki kosztował kilka sekund i wymagał sieci:
+- ChromeDriverManager().install() pyta GitHub/Google o najnowszą wersję przy
+  KAŻDYM start_driver - też przy auto-restarcie co 25-80 meczów i przy retry
+- Chrome startuje "na zimno" za każdym razem
+
+1. Cache ścieżki chromedrivera (resolve_chromedriver):
+       CHROMEDRIVER_PATH (zmienna)  ->  cache w procesie  ->  cache na dysku
+       (outputs/chromedriver.json, ważny CHROMEDRIVER_CACHE_TTL, domyślnie 24h)
+       ->  ChromeDriverManager().install()  ->  (offline) przeterminowany cache
+       ->  None = Selenium Manager sam szuka sterownika
+   Nieudany start sesji z ścieżką z cache (Chrome się zaktualizował) ->
+   start_driver odświeża ścieżkę i próbuje jeszcze raz.
+
+2. Ciepły Chrome (opcjonalnie) - długo żyjący proces z portem CDP:
+       python browser_service.py start [--port 9222] [--show]
+       set BROWSER_SERVICE_ADDRESS=127.0.0.1:9222
+       python scrape_and_notify.py ...        # start_driver podłącza się
+       python browser_service.py stop
+   Każda sesja dostaje własną kartę; quit() zamyka tylko tę kartę, Chrome
+   działa dalej - "restart" przeglądarki to nowa karta zamiast nowego procesu.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Dict, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from browser_profile import LEAN_ARGUMENTS
+
+DEFAULT_DRIVER_CACHE_PATH = os.path.join('outputs', 'chromedriver.json')
+DEFAULT_DRIVER_CACHE_TTL = 24 * 3600
+DEFAULT_SERVICE_PORT = 9222
+SERVICE_STATE_PATH = os.path.join('outputs', 'browser_service.json')
+CHROME_BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+_resolved_path: Optional[str] = None
+_resolve_lock = threading.Lock()
+
+
+def _driver_cache_path() -> str:
+    return os.environ.get('CHROMEDRIVER_CACHE_PATH', DEFAULT_DRIVER_CACHE_PATH)
+
+
+def _read_driver_cache() -> Optional[Dict]:
+    try:
+        with open(_driver_cache_path(), encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not entry.get('path') or not os.path.isfile(entry['path']):
+        return None
+    return entry
+
+
+def _write_driver_cache(path: str):
+    cache_path = _driver_cache_path()
+    try:
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'resolved_at': time.time()}, f)
+    except OSError:
+        pass
+
+
+def _install_chromedriver() -> str:
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def resolve_chromedriver(refresh: bool = False) -> Optional[str]:
+    """
+    Ścieżka chromedrivera bez pytania sieci przy każdym starcie.
+
+    Args:
+        refresh: Pomiń cache (np. wersja sterownika nie pasuje do Chrome)
+
+    Returns:
+        Ścieżka pliku lub None (Selenium Manager rozwiąże sterownik sam)
+    """
+    global _resolved_path
+    env_path = os.environ.get('CHROMEDRIVER_PATH')
+    if env_path:
+        return env_path
+
+    with _resolve_lock:
+        if _resolved_path and not refresh and os.path.isfile(_resolved_path):
+            return _resolved_path
+
+        cached = _read_driver_cache()
+        ttl = float(os.environ.get('CHROMEDRIVER_CACHE_TTL', DEFAULT_DRIVER_CACHE_TTL))
+        if cached and not refresh and time.time() - cached.get('resolved_at', 0) < ttl:
+            _resolved_path = cached['path']
+            return _resolved_path
+
+        try:
+            _resolved_path = _install_chromedriver()
+            _write_driver_cache(_resolved_path)
+        except Exception as e:
+            if cached and not refresh:
+                # Offline - przeterminowany cache jest lepszy niż brak startu
+                print(f"   ⚠️ ChromeDriverManager niedostępny ({e}) - chromedriver z cache")
+                _resolved_path = cached['path']
+            else:
+                print(f"   ⚠️ ChromeDriverManager niedostępny ({e}) - Selenium Manager")
+                _resolved_path = None
+        return _resolved_path
+
+
+def invalidate_chromedriver_cache():
+    """Zapomnij ścieżkę (cache procesu i plik) - następny start pobierze sterownik"""
+    global _resolved_path
+    with _resolve_lock:
+        _resolved_path = None
+        try:
+            os.remove(_driver_cache_path())
+        except OSError:
+            pass
+
+
+# ==========================================
+# Ciepły Chrome (port CDP)
+# ==========================================
+
+def service_address() -> Optional[str]:
+    """Adres ciepłego Chrome (BROWSER_SERVICE_ADDRESS) lub None"""
+    return os.environ.get('BROWSER_SERVICE_ADDRESS') or None
+
+
+def service_alive(address: str, timeout: float = 1.0) -> bool:
+    """Czy pod adresem odpowiada Chrome z portem CDP"""
+    try:
+        with urllib.request.urlopen(f'http://{address}/json/version', timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def service_chrome_pid(address: str) -> Optional[int]:
+    """PID ciepłego Chrome pod adresem (z outputs/browser_service.json) lub None"""
+    try:
+        with open(SERVICE_STATE_PATH, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state.get('pid') if state.get('address') == address else None
+
+
+class AttachedChrome(webdriver.Chrome):
+    """
+    Sesja podłączona do ciepłego Chrome - quit() zamyka tylko własną kartę.
+
+    service_pid: PID procesu Chrome z start_service (None = Chrome uruchomiony
+    inaczej) - Chrome nie jest dzieckiem chromedrivera, browser_memory mierzy
+    jego drzewo osobno.
+    """
+
+    service_pid: Optional[int] = None
+
+    def quit(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+        super().quit()
+
+
+def attach_to_service(address: str, service) -> AttachedChrome:
+    """
+    Podłącz sesję do działającego Chrome i otwórz dla niej nową kartę.
+    Flagi i preferencje ustawia start_service - chromedriver ich nie przyjmuje
+    przy debuggerAddress, więc opcje zawierają tylko adres.
+    """
+    chrome_options = Options()
+    chrome_options.debugger_address = address
+    driver = AttachedChrome(service=service, options=chrome_options)
+    driver.service_pid = service_chrome_pid(address)
+    driver.switch_to.new_window('tab')
+    return driver
+
+
+def _find_chrome() -> Optional[str]:
+    binary = os.environ.get('CHROME_BINARY')
+    if binary:
+        return binary
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def start_service(port: int = DEFAULT_SERVICE_PORT, headless: bool = True) -> Dict:
+    """Uruchom długo żyjący Chrome z portem CDP (lekki profil)"""
+    address = f'127.0.0.1:{port}'
+    if service_alive(address):
+        print(f"✅ Chrome już działa: {address}")
+        return {'address': address}
+
+    binary = _find_chrome()
+    if not binary:
+        raise RuntimeError('Nie znaleziono Chrome - ustaw CHROME_BINARY')
+
+    profile_dir = tempfile.mkdtemp(prefix='livesport_chrome_')
+    command = [binary, f'--remote-debugging-port={port}', f'--user-data-dir={profile_dir}',
+               '--no-sandbox', '--disable-dev-shm-usage', '--window-size=1920,1080'] + LEAN_ARGUMENTS
+    if headless:
+        command.append('--headless=new')
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+
+    deadline = time.time() + 15
+    while not service_alive(address):
+        if process.poll() is not None or time.time() > deadline:
+            process.kill()
+            raise RuntimeError(f'Chrome nie wystartował na {address}')
+        time.sleep(0.2)
+
+    state = {'address': address, 'pid': process.pid, 'profile_dir': profile_dir}
+    os.makedirs(os.path.dirname(SERVICE_STATE_PATH), exist_ok=True)
+    with open(SERVICE_STATE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    print(f"✅ Chrome gotowy: {address} (PID {process.pid})")
+    print(f"   Ustaw BROWSER_SERVICE_ADDRESS={address}")
+    return state
+
+
+def stop_service() -> bool:
+    """Zatrzymaj Chrome uruchomiony przez start_service"""
+    try:
+        with open(SERVICE_STATE_PATH, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        print("ℹ️ Brak uruchomionego Chrome")
+        return False
+    try:
+        os.kill(state['pid'], signal.SIGTERM)
+    except OSError:
+        pass
+    shutil.rmtree(state.get('profile_dir', ''), ignore_errors=True)
+    os.remove(SERVICE_STATE_PATH)
+    print(f"🛑 Chrome zatrzymany (PID {state['pid']})")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ciepły Chrome dla scraperów (port CDP)')
+    parser.add_argument('command', choices=['start', 'stop', 'status'])
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVICE_PORT, help='Port CDP (domyślnie 9222)')
+    parser.add_argument('--show', action='store_true', help='Chrome z GUI (domyślnie headless)')
+    args = parser.parse_args()
+
+    if args.command == 'start':
+        try:
+            start_service(args.port, headless=not args.show)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+    elif args.command == 'stop':
+        stop_service()
+    else:
+        address = f'127.0.0.1:{args.port}'
+        print(f"{'✅ działa' if service_alive(address) else '❌ nie działa'}: {address}")
+        print(f"   chromedriver: {resolve_chromedriver() or 'Selenium Manager'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,26 +2,219 @@
 Database Manager - SQLite dla meczów H2H
 Automatyczne zapisywanie wyników scrapera + API dla aplikacji webowej
 """
+import base64
 import sqlite3
 import json
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
 import os
 
+from livesport_odds_api_client import extract_event_id_from_url
+from match_store import result_to_match, url_match_key
+
+# Kolumny zapisywane przez insert_match / insert_matches_batch (kolejność = kolejność parametrów)
+MATCH_COLUMNS = [
+    'match_date', 'match_time', 'sport', 'league', 'home_team', 'away_team', 'match_url',
+    'home_odds', 'draw_odds', 'away_odds',
+    'bookmakers_found', 'best_home_bookmaker', 'best_away_bookmaker', 'all_odds',
+    'home_wins_in_h2h_last5', 'away_wins_in_h2h', 'draws_last_5', 'h2h_count', 'win_rate', 'h2h_last5',
+    'home_form', 'away_form', 'home_form_overall', 'away_form_overall', 'form_advantage',
+    'qualifies', 'focus_team', 'event_id',
+]
+
+# Kolumny NIE nadpisywane przy ponownym zapisie tego samego meczu (identyfikacja meczu)
+_UPSERT_KEEP = {'match_time', 'league', 'home_team', 'away_team', 'match_url', 'event_id'}
+
+# Kolumny uzupełniane przy ponownym zapisie - pusta wartość nie kasuje zapisanej,
+# a rekordy zapisane wcześniej bez daty/sportu dostają je przy kolejnym upsercie
+_UPSERT_FILL = {'match_date', 'sport'}
+
+
+def _upsert_update(column: str) -> str:
+    if column in _UPSERT_FILL:
+        return f"{column} = COALESCE(NULLIF(excluded.{column}, ''), {column})"
+    return f'{column} = excluded.{column}'
+
+# Zapytanie budowane RAZ (sqlite3 cache'uje skompilowane zapytanie per połączenie)
+UPSERT_SQL = """
+    INSERT INTO matches ({columns}) VALUES ({placeholders})
+    ON CONFLICT(match_url) DO UPDATE SET
+        {updates},
+        updated_at = CURRENT_TIMESTAMP
+""".format(
+    columns=', '.join(MATCH_COLUMNS),
+    placeholders=', '.join('?' * len(MATCH_COLUMNS)),
+    updates=',\n        '.join(_upsert_update(c) for c in MATCH_COLUMNS if c not in _UPSERT_KEEP),
+)
+
+
+def _join_list(value, sep: str):
+    return sep.join(str(v) for v in value) if isinstance(value, list) else value
+
+
+def _json_value(value):
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+
+
+def match_params(match_data: Dict) -> tuple:
+    """Wynik process_match -> parametry UPSERT_SQL (kolejność MATCH_COLUMNS)"""
+    return (
+        match_data.get('date') or match_data.get('match_date') or '',
+        match_data.get('time') or match_data.get('match_time') or '',
+        match_data.get('sport', ''),
+        match_data.get('league', ''),
+        match_data.get('home_team', ''),
+        match_data.get('away_team', ''),
+        match_data.get('match_url', ''),
+        match_data.get('home_odds'),
+        match_data.get('draw_odds'),
+        match_data.get('away_odds'),
+        _join_list(match_data.get('bookmakers_found', []), ', '),
+        match_data.get('best_home_bookmaker'),
+        match_data.get('best_away_bookmaker'),
+        _json_value(match_data.get('all_odds', {})),
+        match_data.get('home_wins_in_h2h_last5', 0),
+        match_data.get('away_wins_in_h2h', 0),
+        match_data.get('draws_last_5', 0),
+        match_data.get('h2h_count', 0),
+        match_data.get('win_rate', 0.0),
+        _json_value(match_data.get('h2h_last5', [])),
+        _join_list(match_data.get('home_form', []), '-'),
+        _join_list(match_data.get('away_form', []), '-'),
+        _join_list(match_data.get('home_form_overall', []), '-'),
+        _join_list(match_data.get('away_form_overall', []), '-'),
+        1 if match_data.get('form_advantage') else 0,
+        1 if match_data.get('qualifies') else 0,
+        match_data.get('focus_team', 'home'),
+        extract_event_id_from_url(match_data.get('match_url') or ''),
+    )
+
+
+# Indeks /api/match/<id>: pełny rekord API meczu (jak z CSV) + plik wyników, zapisywany
+# przez scrapery wiersz po wierszu (insert_result) - odczyt bez skanowania plików CSV
+RECORD_UPSERT_SQL = """
+    INSERT INTO match_records (match_url, event_id, match_key, match_date, source_file, record)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(match_url) DO UPDATE SET
+        event_id = excluded.event_id,
+        match_key = excluded.match_key,
+        match_date = COALESCE(NULLIF(excluded.match_date, ''), match_date),
+        source_file = excluded.source_file,
+        record = excluded.record,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def _backfill_event_ids(conn: sqlite3.Connection):
+    """Uzupełnij event_id dla meczów zapisanych przed migracją v2"""
+    rows = conn.execute("SELECT id, match_url FROM matches WHERE event_id IS NULL").fetchall()
+    conn.executemany(
+        "UPDATE matches SET event_id = ? WHERE id = ?",
+        [(extract_event_id_from_url(url), match_id) for match_id, url in rows]
+    )
+
+
+# Migracje schematu (PRAGMA user_version) - każda wersja wykonywana RAZ, w kolejności.
+# Krok migracji: zapytanie SQL albo funkcja(conn)
+SCHEMA_MIGRATIONS = [
+    (1, 'Indeksy złożone dopasowane do get_matches (filtr + ORDER BY bez sortowania)', [
+        # Zastąpione przez indeksy złożone poniżej (prefiks match_date / sport)
+        "DROP INDEX IF EXISTS idx_match_date",
+        "DROP INDEX IF EXISTS idx_sport",
+        "DROP INDEX IF EXISTS idx_qualifies",
+        # Kolejność kolumn = ORDER BY match_date DESC, home_team, id (keyset pagination)
+        """CREATE INDEX IF NOT EXISTS idx_matches_date_home
+           ON matches(match_date DESC, home_team, id)""",
+        """CREATE INDEX IF NOT EXISTS idx_matches_sport_date_home
+           ON matches(sport, match_date DESC, home_team, id)""",
+        # Częściowe indeksy dla qualifies_only (również pokrywają COUNT(*) WHERE qualifies = 1)
+        """CREATE INDEX IF NOT EXISTS idx_matches_qual_date_home
+           ON matches(match_date DESC, home_team, id) WHERE qualifies = 1""",
+        """CREATE INDEX IF NOT EXISTS idx_matches_qual_sport_date_home
+           ON matches(sport, match_date DESC, home_team, id) WHERE qualifies = 1""",
+    ]),
+    (2, 'Indeks event_id (Livesport ?mid=) dla /api/match/<id>', [
+        "ALTER TABLE matches ADD COLUMN event_id TEXT",
+        _backfill_event_ids,
+        "CREATE INDEX IF NOT EXISTS idx_matches_event_id ON matches(event_id)",
+    ]),
+    (3, 'Tabela match_records - pełny rekord meczu dla /api/match/<id> (event_id / klucz URL)', [
+        """CREATE TABLE IF NOT EXISTS match_records (
+               match_url TEXT PRIMARY KEY,
+               event_id TEXT,
+               match_key TEXT,
+               match_date TEXT,
+               source_file TEXT,
+               record TEXT NOT NULL,
+               updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           )""",
+        """CREATE INDEX IF NOT EXISTS idx_match_records_event_id
+           ON match_records(event_id, match_date)""",
+        """CREATE INDEX IF NOT EXISTS idx_match_records_match_key
+           ON match_records(match_key, match_date)""",
+    ]),
+]
+
+
+def encode_cursor(match: Dict) -> str:
+    """Kursor keyset pagination z ostatniego meczu strony (nieprzezroczysty token dla API)"""
+    key = [match['match_date'], match['home_team'], match['id']]
+    return base64.urlsafe_b64encode(json.dumps(key, ensure_ascii=False).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token: str) -> tuple:
+    """
+    Token -> (match_date, home_team, id)
+
+    Raises:
+        ValueError: niepoprawny token
+    """
+    try:
+        match_date, home_team, match_id = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        return str(match_date), str(home_team), int(match_id)
+    except Exception as e:
+        raise ValueError(f"Niepoprawny kursor: {token}") from e
+
+
 class MatchDatabase:
     def __init__(self, db_path: str = "outputs/matches.db"):
         """Inicjalizuj bazę danych SQLite"""
         self.db_path = db_path
         
+        # Jedno połączenie na wątek (Flask obsługuje requesty w wielu wątkach)
+        self._local = threading.local()
+        
         # Utwórz folder outputs jeśli nie istnieje
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
         
         # Inicjalizuj tabele
         self._init_tables()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Połączenie bieżącego wątku (tworzone raz, potem reużywane)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # WAL: odczyty API nie blokują zapisu scrapera; NORMAL = fsync tylko przy checkpoint
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Zamknij połączenie bieżącego wątku"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
     def _init_tables(self):
         """Stwórz tabele jeśli nie istnieją"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Tabela meczów
@@ -71,29 +264,45 @@ class MatchDatabase:
             )
         """)
         
-        # Index dla szybkich zapytań
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_match_date 
-            ON matches(match_date)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_sport 
-            ON matches(sport)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_qualifies 
-            ON matches(qualifies)
-        """)
-        
+        # Index dla szybkich zapytań (indeksy pod get_matches - patrz SCHEMA_MIGRATIONS)
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_created_at 
             ON matches(created_at)
         """)
         
         conn.commit()
-        conn.close()
+        
+        self._migrate()
+    
+    def _migrate(self):
+        """Wykonaj brakujące migracje schematu (wersja w PRAGMA user_version)"""
+        conn = self._connect()
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+        pending = [m for m in SCHEMA_MIGRATIONS if m[0] > current]
+        if not pending:
+            return
+        
+        # IMMEDIATE: kilka procesów (shardy) startujących naraz nie wykona migracji dwa razy
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+            for version, description, statements in pending:
+                if version <= current:
+                    continue
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                print(f"🗄️  Migracja bazy v{version}: {description}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        # Statystyki dla planera zapytań po zmianie indeksów
+        conn.execute("PRAGMA optimize")
     
     def insert_match(self, match_data: Dict) -> int:
         """
@@ -105,127 +314,116 @@ class MatchDatabase:
         Returns:
             ID wstawionego/zaktualizowanego rekordu
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Konwertuj listy/słowniki na JSON/string
-        bookmakers_found = match_data.get('bookmakers_found', [])
-        if isinstance(bookmakers_found, list):
-            bookmakers_found = ', '.join(bookmakers_found)
-        
-        all_odds = match_data.get('all_odds', {})
-        if isinstance(all_odds, dict):
-            all_odds = json.dumps(all_odds, ensure_ascii=False)
-        
-        h2h_last5 = match_data.get('h2h_last5', [])
-        if isinstance(h2h_last5, list):
-            h2h_last5 = json.dumps(h2h_last5, ensure_ascii=False)
-        
-        # Konwertuj formy z list na stringi
-        home_form = match_data.get('home_form', [])
-        if isinstance(home_form, list):
-            home_form = '-'.join(home_form)
-        
-        away_form = match_data.get('away_form', [])
-        if isinstance(away_form, list):
-            away_form = '-'.join(away_form)
-        
-        home_form_overall = match_data.get('home_form_overall', [])
-        if isinstance(home_form_overall, list):
-            home_form_overall = '-'.join(home_form_overall)
+        conn = self._connect()
+        try:
+            params = match_params(match_data)
+            with conn:  # Transakcja: commit / rollback przy wyjątku
+                conn.execute(UPSERT_SQL, params)
+                # lastrowid po UPDATE (mecz już był) wskazuje poprzedni INSERT tego połączenia
+                row = conn.execute("SELECT id FROM matches WHERE match_url = ?",
+                                   (params[MATCH_COLUMNS.index('match_url')],)).fetchone()
+            return row[0]
+        except Exception as e:
+            print(f"❌ Błąd zapisu do DB: {e}")
+            return -1
+    
+    def insert_result(self, result: Dict, date: str, sport: str = '', source_file: str = '') -> int:
+        """
+        Zapisz wynik meczu zaraz po przetworzeniu (obok ResultSink.write):
+        upsert do matches + pełny rekord API do indeksu match_records - jedna transakcja
         
-        away_form_overall = match_data.get('away_form_overall', [])
-        if isinstance(away_form_overall, list):
-            away_form_overall = '-'.join(away_form_overall)
+        Args:
+            result: Wynik process_match / process_match_tennis
+            date: Data przebiegu (YYYY-MM-DD)
+            sport: Sport (pusty = nieznany, nie kasuje zapisanego)
+            source_file: Plik CSV z wynikami (pole found_in w /api/match/<id>)
         
+        Returns:
+            ID meczu w tabeli matches lub -1 przy błędzie
+        """
+        conn = self._connect()
         try:
-            cursor.execute("""
-                INSERT INTO matches (
-                    match_date, match_time, sport, league, home_team, away_team, match_url,
-                    home_odds, draw_odds, away_odds, 
-                    bookmakers_found, best_home_bookmaker, best_away_bookmaker, all_odds,
-                    home_wins_in_h2h_last5, away_wins_in_h2h, draws_last_5, h2h_count, win_rate, h2h_last5,
-                    home_form, away_form, home_form_overall, away_form_overall, form_advantage,
-                    qualifies, focus_team
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(match_url) DO UPDATE SET
-                    home_odds = excluded.home_odds,
-                    draw_odds = excluded.draw_odds,
-                    away_odds = excluded.away_odds,
-                    bookmakers_found = excluded.bookmakers_found,
-                    best_home_bookmaker = excluded.best_home_bookmaker,
-                    best_away_bookmaker = excluded.best_away_bookmaker,
-                    all_odds = excluded.all_odds,
-                    home_wins_in_h2h_last5 = excluded.home_wins_in_h2h_last5,
-                    away_wins_in_h2h = excluded.away_wins_in_h2h,
-                    draws_last_5 = excluded.draws_last_5,
-                    h2h_count = excluded.h2h_count,
-                    win_rate = excluded.win_rate,
-                    h2h_last5 = excluded.h2h_last5,
-                    home_form = excluded.home_form,
-                    away_form = excluded.away_form,
-                    home_form_overall = excluded.home_form_overall,
-                    away_form_overall = excluded.away_form_overall,
-                    form_advantage = excluded.form_advantage,
-                    qualifies = excluded.qualifies,
-                    focus_team = excluded.focus_team,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (
-                match_data.get('date', ''),
-                match_data.get('time', ''),
-                match_data.get('sport', ''),
-                match_data.get('league', ''),
-                match_data.get('home_team', ''),
-                match_data.get('away_team', ''),
-                match_data.get('match_url', ''),
-                match_data.get('home_odds'),
-                match_data.get('draw_odds'),
-                match_data.get('away_odds'),
-                bookmakers_found,
-                match_data.get('best_home_bookmaker'),
-                match_data.get('best_away_bookmaker'),
-                all_odds,
-                match_data.get('home_wins_in_h2h_last5', 0),
-                match_data.get('away_wins_in_h2h', 0),
-                match_data.get('draws_last_5', 0),
-                match_data.get('h2h_count', 0),
-                match_data.get('win_rate', 0.0),
-                h2h_last5,
-                home_form,
-                away_form,
-                home_form_overall,
-                away_form_overall,
-                1 if match_data.get('form_advantage') else 0,
-                1 if match_data.get('qualifies') else 0,
-                match_data.get('focus_team', 'home')
-            ))
-            
-            match_id = cursor.lastrowid
-            conn.commit()
-            return match_id
-        
+            params = match_params({'date': date, 'sport': sport, **result})
+            match_url = params[MATCH_COLUMNS.index('match_url')]
+            record = json.dumps(result_to_match(result), ensure_ascii=False, default=str)
+            with conn:
+                conn.execute(UPSERT_SQL, params)
+                conn.execute(RECORD_UPSERT_SQL, (match_url, extract_event_id_from_url(match_url),
+                                                 url_match_key(match_url), date, source_file, record))
+                row = conn.execute("SELECT id FROM matches WHERE match_url = ?", (match_url,)).fetchone()
+            return row[0]
         except Exception as e:
             print(f"❌ Błąd zapisu do DB: {e}")
-            conn.rollback()
             return -1
-        
-        finally:
-            conn.close()
     
     def insert_matches_batch(self, matches: List[Dict]) -> int:
-        """Wstaw wiele meczów na raz (szybsze)"""
-        inserted = 0
+        """
+        Wstaw wiele meczów na raz - JEDNA transakcja (executemany), jeden commit
+        
+        Returns:
+            Liczba zapisanych meczów
+        """
+        params = []
         for match_data in matches:
-            match_id = self.insert_match(match_data)
-            if match_id > 0:
-                inserted += 1
-        return inserted
+            try:
+                params.append(match_params(match_data))
+            except Exception as e:
+                print(f"⚠️ Pomijam mecz {match_data.get('match_url', '?')}: {e}")
+        
+        if not params:
+            return 0
+        
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(UPSERT_SQL, params)
+            return len(params)
+        except Exception as e:
+            print(f"❌ Błąd zapisu batch do DB: {e}")
+            return 0
+    
+    @staticmethod
+    def _matches_query(date: Optional[str] = None,
+                       sport: Optional[str] = None,
+                       qualifies_only: bool = False,
+                       limit: int = 100,
+                       after: Optional[tuple] = None) -> tuple:
+        """Zapytanie get_matches -> (sql, params)"""
+        query = "SELECT * FROM matches WHERE 1=1"
+        params = []
+        
+        if date:
+            query += " AND match_date = ?"
+            params.append(date)
+        
+        if sport:
+            query += " AND sport = ?"
+            params.append(sport)
+        
+        if qualifies_only:
+            query += " AND qualifies = 1"
+        
+        if after:
+            # Keyset: wszystko PO ostatnim meczu poprzedniej strony (bez OFFSET)
+            after_date, after_home, after_id = after
+            if date:
+                # Jedna data - kursor tylko w obrębie (home_team, id)
+                query += " AND (home_team, id) > (?, ?)"
+                params.extend([after_home, after_id])
+            else:
+                query += " AND match_date <= ? AND (match_date < ? OR (home_team, id) > (?, ?))"
+                params.extend([after_date, after_date, after_home, after_id])
+        
+        query += " ORDER BY match_date DESC, home_team ASC, id ASC LIMIT ?"
+        params.append(limit)
+        return query, params
     
     def get_matches(self, 
                    date: Optional[str] = None,
                    sport: Optional[str] = None,
                    qualifies_only: bool = False,
-                   limit: int = 100) -> List[Dict]:
+                   limit: int = 100,
+                   after: Optional[tuple] = None) -> List[Dict]:
         """
         Pobierz mecze z bazy
         
@@ -234,69 +432,134 @@ class MatchDatabase:
             sport: Sport lub None (wszystkie)
             qualifies_only: Tylko kwalifikujące się mecze
             limit: Max liczba wyników
+            after: Kursor (match_date, home_team, id) ostatniego meczu poprzedniej strony
         
         Returns:
             Lista słowników z meczami
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = self._connect().cursor()
         
-        query = "SELECT * FROM matches WHERE 1=1"
-        params = []
+        query, params = self._matches_query(date, sport, qualifies_only, limit, after)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
         
-        if date:
-            query += " AND match_date = ?"
-            params.append(date)
+        return [self._row_to_match(row) for row in rows]
+    
+    @staticmethod
+    def _row_to_match(row: sqlite3.Row) -> Dict:
+        """Konwertuj Row na dict i parsuj JSON"""
+        match = dict(row)
+        
+        # Parsuj JSON fields
+        if match.get('all_odds'):
+            try:
+                match['all_odds'] = json.loads(match['all_odds'])
+            except:
+                match['all_odds'] = {}
+        
+        if match.get('h2h_last5'):
+            try:
+                match['h2h_last5'] = json.loads(match['h2h_last5'])
+            except:
+                match['h2h_last5'] = []
+        
+        if match.get('bookmakers_found'):
+            match['bookmakers_found'] = match['bookmakers_found'].split(', ')
+        
+        # Konwertuj formy z string na list
+        for form_field in ['home_form', 'away_form', 'home_form_overall', 'away_form_overall']:
+            if match.get(form_field):
+                match[form_field] = match[form_field].split('-')
+        
+        return match
+    
+    def get_match_by_event_id(self, event_id: str, match_date: Optional[str] = None) -> Optional[Dict]:
+        """
+        Mecz po event_id Livesport (?mid=) - wyszukiwanie po indeksie, niezależne od plików CSV
         
-        if sport:
-            query += " AND sport = ?"
-            params.append(sport)
+        Args:
+            match_date: Tylko mecz z tej daty (YYYY-MM-DD), None = dowolna
         
-        if qualifies_only:
-            query += " AND qualifies = 1"
+        Returns:
+            Ostatnio zaktualizowany mecz lub None
+        """
+        query = "SELECT * FROM matches WHERE event_id = ?"
+        params = [event_id]
+        if match_date:
+            query += " AND match_date = ?"
+            params.append(match_date)
+        cursor = self._connect().execute(query + " ORDER BY updated_at DESC LIMIT 1", params)
+        row = cursor.fetchone()
+        return self._row_to_match(row) if row else None
+    
+    def get_match_record(self, match_id: str, match_date: Optional[str] = None) -> Optional[Dict]:
+        """
+        Pełny rekord meczu dla /api/match/<id> z indeksu match_records
         
-        query += " ORDER BY match_date DESC, home_team ASC LIMIT ?"
-        params.append(limit)
+        Args:
+            match_id: event_id (?mid=) lub klucz z URL meczu
+            match_date: Tylko mecz z tej daty (YYYY-MM-DD), None = dowolna
         
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        Returns:
+            {'match': rekord API, 'source_file': plik CSV, 'match_date': data} lub None
+        """
+        query = "SELECT record, source_file, match_date FROM match_records WHERE (event_id = ? OR match_key = ?)"
+        params = [match_id, match_id]
+        if match_date:
+            query += " AND match_date = ?"
+            params.append(match_date)
+        row = self._connect().execute(query + " ORDER BY updated_at DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        return {'match': json.loads(row['record']), 'source_file': row['source_file'],
+                'match_date': row['match_date']}
+    
+    def get_matches_page(self,
+                         date: Optional[str] = None,
+                         sport: Optional[str] = None,
+                         qualifies_only: bool = False,
+                         limit: int = 100,
+                         cursor: Optional[str] = None) -> Dict:
+        """
+        Strona wyników z kursorem na następną (historia we frontendzie)
         
-        # Konwertuj Row na dict i parsuj JSON
-        matches = []
-        for row in rows:
-            match = dict(row)
-            
-            # Parsuj JSON fields
-            if match.get('all_odds'):
-                try:
-                    match['all_odds'] = json.loads(match['all_odds'])
-                except:
-                    match['all_odds'] = {}
-            
-            if match.get('h2h_last5'):
-                try:
-                    match['h2h_last5'] = json.loads(match['h2h_last5'])
-                except:
-                    match['h2h_last5'] = []
-            
-            if match.get('bookmakers_found'):
-                match['bookmakers_found'] = match['bookmakers_found'].split(', ')
-            
-            # Konwertuj formy z string na list
-            for form_field in ['home_form', 'away_form', 'home_form_overall', 'away_form_overall']:
-                if match.get(form_field):
-                    match[form_field] = match[form_field].split('-')
-            
-            matches.append(match)
-        
-        conn.close()
-        return matches
+        Returns:
+            {'matches': [...], 'next_cursor': token lub None (ostatnia strona)}
+        """
+        after = decode_cursor(cursor) if cursor else None
+        matches = self.get_matches(date, sport, qualifies_only, limit, after)
+        next_cursor = encode_cursor(matches[-1]) if len(matches) == limit else None
+        return {'matches': matches, 'next_cursor': next_cursor}
+    
+    def check_query_plans(self) -> List[str]:
+        """
+        Sprawdź EXPLAIN QUERY PLAN dla kształtów zapytań get_matches.
+        
+        Returns:
+            Lista problemów (pusta = każde zapytanie idzie indeksem, bez sortowania w pamięci)
+        """
+        conn = self._connect()
+        shapes = []
+        for date in (None, '2025-01-01'):
+            for sport in (None, 'football'):
+                for qualifies_only in (False, True):
+                    for after in (None, ('2025-01-01', 'A', 1)):
+                        shapes.append((date, sport, qualifies_only, after))
+        
+        problems = []
+        for date, sport, qualifies_only, after in shapes:
+            query, params = self._matches_query(date, sport, qualifies_only, 100, after)
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+            label = f"date={date} sport={sport} qualifies_only={qualifies_only} after={bool(after)}"
+            if any(step.startswith('SCAN matches') and 'INDEX' not in step for step in plan):
+                problems.append(f"{label}: pełny skan tabeli ({'; '.join(plan)})")
+            if any('TEMP B-TREE' in step for step in plan):
+                problems.append(f"{label}: sortowanie w pamięci ({'; '.join(plan)})")
+        return problems
     
     def get_stats(self) -> Dict:
         """Pobierz statystyki bazy"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._connect().cursor()
         
         cursor.execute("SELECT COUNT(*) FROM matches")
         total = cursor.fetchone()[0]
@@ -313,8 +576,6 @@ class MatchDatabase:
         cursor.execute("SELECT MAX(scraped_at) FROM matches")
         last_update = cursor.fetchone()[0]
         
-        conn.close()
-        
         return {
             'total_matches': total,
             'qualifying_matches': qualifying,
@@ -325,19 +586,15 @@ class MatchDatabase:
     
     def cleanup_old_matches(self, days: int = 7):
         """Usuń mecze starsze niż X dni"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            DELETE FROM matches 
-            WHERE match_date < date('now', '-' || ? || ' days')
-        """, (days,))
-        
-        deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
-        
-        return deleted
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("""
+                DELETE FROM matches 
+                WHERE match_date < date('now', '-' || ? || ' days')
+            """, (days,))
+            conn.execute("DELETE FROM match_records WHERE match_date < date('now', '-' || ? || ' days')", (days,))
+        
+        return cursor.rowcount
 
 
 # Test
@@ -385,3 +642,7 @@ if __name__ == "__main__":
     # Stats
     stats = db.get_stats()
     print(f"📊 Stats: {stats}")
+    
+    # Plany zapytań
+    problems = db.check_query_plans()
+    print(f"🔍 Query plans: {'OK' if not problems else problems}")
@@ -0,0 +1,145 @@
+"""
+FAKE DRIVER - Wspólny driver Selenium bez przeglądarki dla testów
+=================================================================
+
+Jeden konfigurowalny odpowiednik webdriver.Chrome zamiast osobnych klas
+FakeDriver w każdym pliku testów. Obsługuje to, czego używa kod pod testem:
+
+- nawigacja: get() zapisuje URL-e (navigations), page_source podawany przez
+  test lub per URL (pages), licznik odczytów page_source
+- czekanie (wait_utils): element gotowy po ready_after s, wiersze dochodzące
+  w czasie (rows), scroll dociągający wiersze (scroll_rows), zasoby sieci (resources)
+- pamięć (browser_memory): PID procesu chromedrivera (pid), PID ciepłego Chrome
+  (service_pid), sterta JS karty (heap_mb)
+- profil (browser_profile): komendy CDP (execute_cdp_cmd), pomiar strony (page_metrics)
+- cykl życia: health check 'return 1' (alive=False -> błąd), quit()
+
+Użycie:
+    from fake_driver import FakeDriver
+    driver = FakeDriver(ready_after=0.2, rows=[(0.2, 3), (0.4, 8)])
+"""
+
+import os
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+
+DEFAULT_PAGE_METRICS = {'bytes': 150 * 1024, 'requests': 12, 'load_ms': 800}
+
+
+class _Process:
+    def __init__(self, pid):
+        self.pid = pid
+
+
+class _Service:
+    def __init__(self, pid):
+        self.process = _Process(pid)
+
+
+class FakeDriver:
+    """Driver bez przeglądarki - zachowanie strony konfigurowane przez test"""
+
+    def __init__(self, name='fake', page_source='', pages=None, ready_after=0.0, rows=(), scroll_rows=0,
+                 resources=(), pid=None, service_pid=None, heap_mb=50, page_metrics=None, cdp=True):
+        """
+        Args:
+            name: Nazwa (rozróżnianie przeglądarek w testach puli / wątków)
+            page_source: HTML aktualnej strony (test może go podmieniać)
+            pages: {url: HTML} - page_source po get(url)
+            ready_after: Po ilu sekundach find_element znajduje element (i readyState=complete)
+            rows: [(czas, liczba wierszy), ...] - wiersze dochodzące w czasie (lazy-loading)
+            scroll_rows: Ile kolejnych scrolli dociąga po 10 wierszy
+            resources: [(czas, liczba zasobów), ...] - zasoby sieci w czasie
+            pid: PID "chromedrivera" (domyślnie bieżący proces)
+            service_pid: PID ciepłego Chrome (browser_service)
+            heap_mb: Sterta JS karty (performance.memory)
+            page_metrics: Wynik pomiaru strony (browser_profile.measure_page)
+            cdp: Czy driver obsługuje execute_cdp_cmd
+        """
+        self.name = name
+        self.pages = pages or {}
+        self.ready_after = ready_after
+        self.rows = list(rows)
+        self.scroll_rows = scroll_rows
+        self.resources = list(resources)
+        self.service = _Service(pid or os.getpid())
+        self.service_pid = service_pid
+        self.heap_mb = heap_mb
+        self.page_metrics = page_metrics or DEFAULT_PAGE_METRICS
+        self.cdp = cdp
+
+        self.start = time.monotonic()
+        self.current_url = ''
+        self.navigations = []
+        self.commands = []
+        self.scrolls = 0
+        self.page_source_reads = 0
+        self.alive = True
+        self.quit_called = False
+        self._page_source = page_source
+
+    # ------------------------------------------------------------------
+    # Nawigacja
+    # ------------------------------------------------------------------
+
+    @property
+    def page_source(self):
+        self.page_source_reads += 1
+        return self._page_source
+
+    @page_source.setter
+    def page_source(self, html):
+        self._page_source = html
+
+    def get(self, url):
+        self.navigations.append(url)
+        self.current_url = url
+        if url in self.pages:
+            self._page_source = self.pages[url]
+
+    # ------------------------------------------------------------------
+    # Strona doładowywana w czasie
+    # ------------------------------------------------------------------
+
+    def _elapsed(self):
+        return time.monotonic() - self.start
+
+    def _at(self, timeline):
+        value = 0
+        for at, count in timeline:
+            if self._elapsed() >= at:
+                value = count
+        return value
+
+    def find_element(self, by, css):
+        if self._elapsed() < self.ready_after:
+            raise NoSuchElementException(css)
+        return object()
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise ConnectionError('chrome not reachable')
+        if 'usedJSHeapSize' in script:
+            return int(self.heap_mb * 1024 * 1024)
+        if 'transferSize' in script:
+            return dict(self.page_metrics)
+        if 'scrollTo(0, document.body.scrollHeight)' in script:
+            self.scrolls += 1
+            return None
+        if 'querySelectorAll' in script:
+            return self._at(self.rows) + 10 * min(self.scrolls, self.scroll_rows)
+        if 'readyState' in script:
+            state = 'complete' if self._elapsed() >= self.ready_after else 'loading'
+            return [state, self._at(self.resources)]
+        if script.strip() == 'return 1':
+            return 1
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        if not self.cdp:
+            raise AttributeError('execute_cdp_cmd')
+        self.commands.append((cmd, params))
+
+    def quit(self):
+        self.quit_called = True
@@ -0,0 +1,181 @@
+"""
+FIXTURE CACHE - Dzienna lista meczów na dysku (SQLite)
+======================================================
+
+scrape_and_notify.py, livesport_h2h_scraper.py --mode auto i api_server
+(oraz kolejne .bat tego samego dnia: home-focus, away-focus, O/U, premium)
+zbierały linki meczów dla TEJ SAMEJ daty od nowa - za każdym razem Chrome
+odwiedzał strony list wszystkich sportów. Cache trzyma listę linków per:
+
+    (data, sport, filtr lig)
+
+Polityka świeżości:
+- dzień w przeszłości: lista się nie zmienia -> ważna PAST_TTL (7 dni)
+- dzisiaj / przyszłość: ważna do końca dnia pobrania, ale nie dłużej niż TTL
+  (domyślnie 12h) - organizatorzy dopisują mecze, więc następnego dnia od nowa
+- pusta lista nie jest zapisywana (zwykle strona się nie załadowała)
+
+Konfiguracja (zmienne środowiskowe):
+    LIVESPORT_FIXTURE_CACHE=0        - wyłącz cache
+    LIVESPORT_FIXTURE_CACHE_PATH     - ścieżka pliku (domyślnie outputs/fixture_cache.db)
+    LIVESPORT_FIXTURE_CACHE_TTL      - TTL w sekundach dla dziś/przyszłości (domyślnie 43200)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date as date_cls
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_CACHE_PATH = os.path.join('outputs', 'fixture_cache.db')
+DEFAULT_TTL = 12 * 3600          # dziś / przyszłość
+DEFAULT_PAST_TTL = 7 * 24 * 3600  # zakończone dni
+
+
+def leagues_key(leagues: Optional[Sequence[str]]) -> str:
+    """Filtr lig -> stabilny klucz (kolejność i wielkość liter bez znaczenia)"""
+    return ','.join(sorted({league.lower() for league in leagues})) if leagues else ''
+
+
+class FixtureCache:
+    """Cache list linków meczów dnia z polityką świeżości"""
+
+    def __init__(self,
+                 db_path: str = DEFAULT_CACHE_PATH,
+                 ttl: float = DEFAULT_TTL,
+                 past_ttl: float = DEFAULT_PAST_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.past_ttl = past_ttl
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_table()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Osobne połączenie per wątek (linki sportów zbierane są równolegle)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_table(self):
+        conn = self._conn()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS fixture_lists (
+                match_date TEXT NOT NULL,
+                sport TEXT NOT NULL,
+                leagues TEXT NOT NULL,
+                links TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (match_date, sport, leagues)
+            )
+        ''')
+        conn.commit()
+
+    def expires_at(self, match_date: str, fetched_at: float) -> float:
+        """Koniec ważności listy pobranej w chwili fetched_at"""
+        fetched = datetime.fromtimestamp(fetched_at)
+        try:
+            day = date_cls.fromisoformat(match_date)
+        except ValueError:
+            day = fetched.date()
+        if day < fetched.date():
+            return fetched_at + self.past_ttl
+        end_of_day = datetime.combine(fetched.date() + timedelta(days=1), datetime.min.time()).timestamp()
+        return min(fetched_at + self.ttl, end_of_day)
+
+    def get(self, match_date: str, sport: str, leagues: Optional[Sequence[str]] = None) -> Optional[List[str]]:
+        """
+        Returns:
+            Lista linków lub None (brak / nieświeża)
+        """
+        try:
+            row = self._conn().execute(
+                'SELECT links, expires_at FROM fixture_lists WHERE match_date=? AND sport=? AND leagues=?',
+                (match_date, sport, leagues_key(leagues))
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+
+        with self._lock:
+            if row is None or row[1] < time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, match_date: str, sport: str, leagues: Optional[Sequence[str]], links: List[str]):
+        """Zapisz listę linków (pusta lista jest pomijana)"""
+        if not links:
+            return
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                'INSERT OR REPLACE INTO fixture_lists (match_date, sport, leagues, links, fetched_at, expires_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (match_date, sport, leagues_key(leagues), json.dumps(links), now, self.expires_at(match_date, now))
+            )
+            conn.execute('DELETE FROM fixture_lists WHERE expires_at < ?', (now,))
+            conn.commit()
+        except sqlite3.Error:
+            return
+
+    def invalidate(self, match_date: Optional[str] = None):
+        """Usuń listy dnia (lub wszystkie) - wymuszenie ponownego zebrania linków"""
+        conn = self._conn()
+        if match_date:
+            conn.execute('DELETE FROM fixture_lists WHERE match_date=?', (match_date,))
+        else:
+            conn.execute('DELETE FROM fixture_lists')
+        conn.commit()
+
+    def stats(self) -> Dict:
+        """Liczniki hit/miss (bieżący proces) + liczba list w pliku"""
+        try:
+            entries = self._conn().execute('SELECT COUNT(*) FROM fixture_lists').fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+
+_default_cache: Optional[FixtureCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_fixture_cache() -> Optional[FixtureCache]:
+    """
+    Współdzielony cache procesu (konfiguracja ze zmiennych środowiskowych).
+
+    Returns:
+        FixtureCache lub None jeśli wyłączony (LIVESPORT_FIXTURE_CACHE=0) / niedostępny
+    """
+    global _default_cache
+    if os.environ.get('LIVESPORT_FIXTURE_CACHE', '1') == '0':
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = FixtureCache(
+                    db_path=os.environ.get('LIVESPORT_FIXTURE_CACHE_PATH', DEFAULT_CACHE_PATH),
+                    ttl=float(os.environ.get('LIVESPORT_FIXTURE_CACHE_TTL', DEFAULT_TTL)),
+                )
+            except (sqlite3.Error, OSError) as e:
+                print(f"   ⚠️ Cache listy meczów niedostępny: {e}")
+                return None
+        return _default_cache
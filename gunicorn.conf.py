@@ -0,0 +1,36 @@
+"""
+Konfiguracja gunicorn dla api_server (tryb produkcyjny, Linux)
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+    python scrape_worker.py   # osobno: wykonywanie zadań scrapowania
+
+Zmienne środowiskowe:
+    PORT             - port (domyślnie 5000)
+    WEB_CONCURRENCY  - liczba procesów (domyślnie 2 * CPU + 1, max 8)
+    WEB_THREADS      - wątki na proces (domyślnie 4)
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# Wątki: strumienie SSE (/api/scrape/stream) trzymają połączenie, nie mogą blokować procesu
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', 4))
+
+# SSE wysyła keep-alive co 15 s - timeout musi być dłuższy
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+# Restart procesów co N zapytań - ogranicza narastanie pamięci (pandas / cache tabel)
+max_requests = 2000
+max_requests_jitter = 200
+
+raw_env = ['SCRAPE_MODE=worker']
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
@@ -0,0 +1,320 @@
+"""
+H2H FETCH ENGINE - Pobieranie danych H2H BEZ przeglądarki
+=========================================================
+
+Zamiast renderować całą stronę /h2h/ogolem/ w Chrome (ok. 3s na mecz),
+pobieramy surowe dane H2H bezpośrednio z feedu Livesport przez
+współdzielony requests.Session (connection pooling - tak jak LiveSportOddsAPI).
+
+Backendy (ustawiane przez --fetch-backend):
+- 'auto'     : najpierw HTTP, przy błędzie/niepełnych danych fallback do Selenium (domyślnie)
+- 'selenium' : stara metoda - zawsze pełny render w Chrome
+
+Format feedu Livesport:
+- rekordy oddzielone znakiem '~'
+- pola w rekordzie oddzielone znakiem '¬'
+- klucz i wartość oddzielone znakiem '÷'
+
+Zwracany format jest zgodny z parse_h2h_from_soup():
+    {
+        'home_team': 'Legia Warszawa',
+        'away_team': 'Cracovia',
+        'match_time': '05.10.2025 18:00',
+        'h2h': [{'date': ..., 'home': ..., 'away': ..., 'score': '3-1', 'winner': 'home', 'raw': ...}],
+        'form': {'home_form_overall': ['W', 'D', ...], 'home_form_home': [...],
+                 'away_form_overall': [...], 'away_form_away': [...]}
+    }
+
+Feed H2H zawiera wszystkie 3 zakładki (ogółem / u siebie / na wyjeździe), więc
+forma drużyn nie wymaga osobnych nawigacji Selenium (parse_form_feed).
+"""
+
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+
+from livesport_odds_api_client import extract_event_id_from_url
+
+FETCH_BACKENDS = ['auto', 'selenium']
+
+# Endpoint feedu i podpis (można nadpisać zmiennymi środowiskowymi, gdy Livesport je zmieni)
+FEED_BASE_URL = os.environ.get('LIVESPORT_FEED_URL', 'https://www.livesport.com/x/feed/')
+FEED_SIGN = os.environ.get('LIVESPORT_FEED_SIGN', 'SW9D1eZo')
+FEED_TIMEOUT = 8  # sekundy
+
+# Klucze feedu H2H (df_hh_1_<event_id>)
+KEY_TAB = 'KA'          # Zakładka: Ogółem / U siebie / Na wyjeździe
+KEY_GROUP = 'KB'        # Grupa: "Ostatnie mecze: X" / "Pojedynki bezpośrednie"
+KEY_TIMESTAMP = 'KC'    # Data meczu (unix timestamp)
+KEY_HOME = 'KJ'         # Gospodarz (prefiks '*' = zwycięzca)
+KEY_AWAY = 'KK'         # Gość (prefiks '*' = zwycięzca)
+KEY_SCORE = 'KL'        # Wynik "3 : 1"
+
+# Klucze feedu szczegółów meczu (dc_1_<event_id>)
+KEY_START_TIME = 'DC'   # Czas rozpoczęcia (unix timestamp)
+
+H2H_GROUP_MARKERS = ['pojedynki', 'bezpośrednie', 'head-to-head', 'head to head']
+
+
+def _split_feed(raw: str) -> List[Dict[str, str]]:
+    """Parsuje surowy feed Livesport na listę rekordów {klucz: wartość}"""
+    records = []
+    for chunk in raw.split('~'):
+        record = {}
+        for field in chunk.split('¬'):
+            if '÷' not in field:
+                continue
+            key, value = field.split('÷', 1)
+            record[key] = value
+        if record:
+            records.append(record)
+    return records
+
+
+def _clean_name(name: str) -> str:
+    return name.lstrip('*').strip()
+
+
+def parse_h2h_feed(raw: str) -> Dict:
+    """
+    Parsuje feed H2H (tylko pierwsza zakładka = ogółem).
+
+    Returns:
+        {'home_team', 'away_team', 'h2h'} - nazwy drużyn z grup "Ostatnie mecze: X"
+    """
+    result = {'home_team': None, 'away_team': None, 'h2h': []}
+
+    tab_index = -1
+    group_title = ''
+    last_match_groups = []
+
+    for record in _split_feed(raw):
+        if KEY_TAB in record:
+            tab_index += 1
+            if tab_index > 0:
+                break  # Interesuje nas tylko zakładka "Ogółem"
+            continue
+
+        if KEY_GROUP in record:
+            group_title = record[KEY_GROUP]
+            # "Ostatnie mecze: Legia Warszawa" -> nazwa drużyny
+            if ':' in group_title and not any(m in group_title.lower() for m in H2H_GROUP_MARKERS):
+                last_match_groups.append(group_title.split(':', 1)[1].strip())
+            continue
+
+        if not any(m in group_title.lower() for m in H2H_GROUP_MARKERS):
+            continue
+
+        home = _clean_name(record.get(KEY_HOME, ''))
+        away = _clean_name(record.get(KEY_AWAY, ''))
+        score_match = re.search(r'(\d+)\s*[:\-–—]\s*(\d+)', record.get(KEY_SCORE, ''))
+        if not home or not away or not score_match or len(result['h2h']) >= 5:
+            continue
+
+        goals_home = int(score_match.group(1))
+        goals_away = int(score_match.group(2))
+        winner = 'home' if goals_home > goals_away else ('away' if goals_away > goals_home else 'draw')
+
+        date = ''
+        if record.get(KEY_TIMESTAMP, '').isdigit():
+            date = datetime.fromtimestamp(int(record[KEY_TIMESTAMP])).strftime('%d.%m.%y')
+
+        score = f"{goals_home}-{goals_away}"
+        result['h2h'].append({
+            'date': date,
+            'home': home,
+            'away': away,
+            'score': score,
+            'winner': winner,
+            'raw': f"{date} {home} {score} {away}"
+        })
+
+    if len(last_match_groups) >= 2:
+        result['home_team'] = last_match_groups[0]
+        result['away_team'] = last_match_groups[1]
+
+    return result
+
+
+def _same_team(a: str, b: str) -> bool:
+    a, b = a.lower().strip(), b.lower().strip()
+    return bool(a and b) and (a == b or a in b or b in a)
+
+
+def _team_result(record: Dict[str, str], team: str) -> Optional[str]:
+    """Wynik meczu z perspektywy drużyny: 'W' / 'D' / 'L' (None = nie da się ustalić)"""
+    home_raw, away_raw = record.get(KEY_HOME, ''), record.get(KEY_AWAY, '')
+    home, away = _clean_name(home_raw), _clean_name(away_raw)
+    if _same_team(team, home):
+        team_is_home = True
+    elif _same_team(team, away):
+        team_is_home = False
+    else:
+        return None
+
+    # '*' = zwycięzca (obejmuje dogrywki/karne, gdy wynik jest remisowy)
+    if home_raw.startswith('*') or away_raw.startswith('*'):
+        return 'W' if home_raw.startswith('*') == team_is_home else 'L'
+
+    score_match = re.search(r'(\d+)\s*[:\-–—]\s*(\d+)', record.get(KEY_SCORE, ''))
+    if not score_match:
+        return None
+    goals_home, goals_away = int(score_match.group(1)), int(score_match.group(2))
+    if goals_home == goals_away:
+        return 'D'
+    return 'W' if (goals_home > goals_away) == team_is_home else 'L'
+
+
+def parse_form_feed(raw: str, home_team: str, away_team: str) -> Dict[str, List[str]]:
+    """
+    Forma drużyn (ostatnie 5 meczów) ze wszystkich zakładek feedu H2H.
+
+    Zakładki: 0 = ogółem, 1 = u siebie, 2 = na wyjeździe. W każdej zakładce grupy
+    "Ostatnie mecze: <drużyna>" - wybieramy grupę po nazwie drużyny.
+
+    Returns:
+        {'home_form_overall', 'away_form_overall', 'home_form_home', 'away_form_away'}
+    """
+    groups: Dict[tuple, List[str]] = {}  # (zakładka, drużyna) -> forma
+    tab_index = -1
+    current = None
+
+    for record in _split_feed(raw):
+        if KEY_TAB in record:
+            tab_index += 1
+            current = None
+            continue
+
+        if KEY_GROUP in record:
+            title = record[KEY_GROUP]
+            current = None
+            if ':' in title and not any(m in title.lower() for m in H2H_GROUP_MARKERS):
+                current = (tab_index, title.split(':', 1)[1].strip())
+                groups.setdefault(current, [])
+            continue
+
+        if current is None or len(groups[current]) >= 5:
+            continue
+        result = _team_result(record, current[1])
+        if result:
+            groups[current].append(result)
+
+    def form_for(tab: int, team: str) -> List[str]:
+        for (group_tab, group_team), form in groups.items():
+            if group_tab == tab and _same_team(group_team, team or ''):
+                return form
+        return []
+
+    return {
+        'home_form_overall': form_for(0, home_team),
+        'away_form_overall': form_for(0, away_team),
+        'home_form_home': form_for(1, home_team),
+        'away_form_away': form_for(2, away_team),
+    }
+
+
+def parse_start_time_feed(raw: str) -> Optional[str]:
+    """Wyciąga czas rozpoczęcia meczu z feedu dc_1 (format jak na stronie: DD.MM.YYYY HH:MM)"""
+    for record in _split_feed(raw):
+        value = record.get(KEY_START_TIME, '')
+        if value.isdigit():
+            return datetime.fromtimestamp(int(value)).strftime('%d.%m.%Y %H:%M')
+    return None
+
+
+class HttpH2HFetcher:
+    """Pobiera dane H2H przez HTTP (bez przeglądarki) z connection pooling"""
+
+    def __init__(self, base_url: str = FEED_BASE_URL, sign: str = FEED_SIGN, timeout: float = FEED_TIMEOUT):
+        self.base_url = base_url.rstrip('/') + '/'
+        self.sign = sign
+        self.timeout = timeout
+        # Osobny Session per wątek (tryb --parallel), każdy z własną pulą połączeń
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.http_ok = 0
+        self.http_failed = 0
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+                'Accept': '*/*',
+                'Accept-Language': 'pl-PL,pl;q=0.9,en;q=0.8',
+                'Origin': 'https://www.livesport.com',
+                'Referer': 'https://www.livesport.com/',
+                'x-fsign': self.sign,
+            })
+            self._local.session = session
+        return session
+
+    def _get_feed(self, feed_name: str) -> Optional[str]:
+        response = self._session().get(self.base_url + feed_name, timeout=self.timeout)
+        if response.status_code != 200 or not response.text:
+            return None
+        return response.text
+
+    def fetch(self, match_url: str) -> Optional[Dict]:
+        """
+        Pobierz dane H2H dla meczu.
+
+        Returns:
+            Słownik (patrz docstring modułu) lub None - wtedy trzeba użyć Selenium
+        """
+        event_id = extract_event_id_from_url(match_url)
+        if not event_id:
+            return None
+
+        try:
+            raw_h2h = self._get_feed(f"df_hh_1_{event_id}")
+            if not raw_h2h:
+                raise ValueError('pusty feed H2H')
+
+            data = parse_h2h_feed(raw_h2h)
+            # Bez nazw drużyn nie policzymy zwycięstw - niech Selenium spróbuje
+            if not data['home_team'] or not data['away_team']:
+                raise ValueError('brak nazw drużyn w feedzie')
+
+            # Forma z zakładek feedu (ten sam dokument - bez dodatkowych zapytań)
+            data['form'] = parse_form_feed(raw_h2h, data['home_team'], data['away_team'])
+
+            # Czas meczu jest opcjonalny - brak feedu dc_1 nie unieważnia danych H2H
+            data['match_time'] = None
+            try:
+                raw_details = self._get_feed(f"dc_1_{event_id}")
+                if raw_details:
+                    data['match_time'] = parse_start_time_feed(raw_details)
+            except requests.exceptions.RequestException:
+                pass
+
+            with self._lock:
+                self.http_ok += 1
+            return data
+
+        except Exception:
+            with self._lock:
+                self.http_failed += 1
+            return None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'http_ok': self.http_ok, 'http_failed': self.http_failed}
+
+
+_default_fetcher: Optional[HttpH2HFetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_http_fetcher() -> HttpH2HFetcher:
+    """Współdzielona instancja fetchera (jedna pula połączeń na proces)"""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = HttpH2HFetcher()
+        return _default_fetcher
@@ -0,0 +1,114 @@
+"""
+HTTP CACHE - ETag / 304 Not Modified / kompresja dla api_server
+===============================================================
+
+Klienci (aplikacja mobilna, frontend) odpytują API co kilka sekund, a odpowiedź
+zwykle się nie zmienia. Zamiast za każdym razem wysyłać pełny JSON:
+
+- endpointy z "wersją danych" (plik CSV: mtime + rozmiar) sprawdzają If-None-Match
+  PRZED budowaniem odpowiedzi -> 304 bez żadnej pracy (check_not_modified)
+- pozostałe odpowiedzi JSON dostają ETag z treści (after_request) -> 304 gdy bez zmian
+- duże odpowiedzi JSON są kompresowane: brotli (jeśli zainstalowany) lub gzip
+
+Użycie:
+    init_http_cache(app)
+
+    @app.route('/api/matches')
+    def get_matches():
+        etag = make_etag(table.file, table.version)
+        not_modified = check_not_modified(etag)
+        if not_modified:
+            return not_modified
+        ...
+        return with_etag(jsonify(...), etag)
+"""
+
+import gzip
+import hashlib
+
+from flask import Response, request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# Mniejszych odpowiedzi nie opłaca się kompresować
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/csv', 'text/plain')
+
+
+def make_etag(*parts) -> str:
+    """
+    ETag z wersji danych + parametrów zapytania (różne filtry = różne odpowiedzi)
+    """
+    source = '|'.join(str(p) for p in parts) + '|' + request.full_path
+    return hashlib.md5(source.encode('utf-8')).hexdigest()
+
+
+def check_not_modified(etag: str):
+    """
+    Odpowiedź 304, jeśli klient ma aktualną wersję (If-None-Match), inaczej None
+    """
+    if request.if_none_match and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+
+def with_etag(response_or_tuple, etag: str):
+    """Dodaj ETag do odpowiedzi endpointu (obsługuje zwrot (response, status))"""
+    response = response_or_tuple[0] if isinstance(response_or_tuple, tuple) else response_or_tuple
+    response.set_etag(etag, weak=True)
+    return response_or_tuple
+
+
+def _accepted_encoding() -> str:
+    accepted = request.accept_encodings
+    if BROTLI_AVAILABLE and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return ''
+
+
+def _after_request(response: Response) -> Response:
+    # Strumienie (SSE, send_file) - nie buforujemy treści
+    if (request.method != 'GET' or response.status_code != 200
+            or response.direct_passthrough or response.is_streamed):
+        return response
+
+    # ETag z treści dla odpowiedzi bez ETagu z wersji danych
+    if response.mimetype == 'application/json' and not response.get_etag()[0]:
+        response.add_etag(weak=True)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_BYTES:
+        return response
+
+    encoding = _accepted_encoding()
+    if encoding == 'br':
+        compressed = brotli.compress(body, quality=5)
+    elif encoding == 'gzip':
+        compressed = gzip.compress(body, compresslevel=6)
+    else:
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_http_cache(app):
+    """Zarejestruj ETag/304 + kompresję dla wszystkich odpowiedzi aplikacji"""
+    app.after_request(_after_request)
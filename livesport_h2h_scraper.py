@@ -41,6 +41,7 @@ import csv
 import re
 import json
 import gc  # Garbage collector dla zarządzania pamięcią
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -60,14 +61,25 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import NoSuchElementException, SessionNotCreatedException, TimeoutException, WebDriverException
 
 # Retry logic dla zwiększenia niezawodności API calls
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 # Import własnych modułów
 import over_under_analyzer
+from h2h_fetch_engine import FETCH_BACKENDS, get_http_fetcher
+from page_context import get_page_context
+from odds_cache import get_odds_cache
+from odds_pipeline import OddsPrefetcher
+from result_sink import BatchForwarder, ResultSink
+from fixture_cache import get_fixture_cache
+from browser_memory import RecyclePolicy, RecycleStats
+from browser_service import (attach_to_service, invalidate_chromedriver_cache, resolve_chromedriver,
+                             service_address, service_alive)
+from browser_profile import apply_lean_options, apply_url_blocking, get_page_stats, lean_enabled
+from wait_utils import get_adaptive_timeouts, scroll_and_settle, wait_for_network_idle, wait_for_page
+from sharding import parse_shard, shard_output_path, shard_urls
 
 # Database Manager (opcjonalny - dla integracji z aplikacją webową)
 try:
@@ -85,6 +97,12 @@ except ImportError:
 # Globalna zmienna kontrolująca poziom szczegółowości logów
 VERBOSE = False  # Domyślnie wyłączone, włączane przez --verbose
 
+# Backend pobierania H2H: 'auto' (HTTP z fallbackiem do Selenium) lub 'selenium'
+H2H_FETCH_BACKEND = 'auto'  # Ustawiane przez --fetch-backend
+
+# Pobieranie kursów od wielu bukmacherów: 'concurrent' (wszystkie naraz) lub 'sequential'
+ODDS_FETCH_MODE = 'concurrent'  # Ustawiane przez --odds-mode
+
 # Mapowanie sportów na URLe Livesport
 SPORT_URLS = {
     'football': 'https://www.livesport.com/pl/pilka-nozna/',
@@ -98,6 +116,12 @@ SPORT_URLS = {
     'tennis': 'https://www.livesport.com/pl/tenis/',
 }
 
+# Selektory gotowości stron (wait_utils) - czekamy na to, co potem parsujemy
+H2H_READY_SELECTOR = 'div[class*="h2h"], section[class*="h2h"]'
+H2H_ROWS_SELECTOR = 'div.h2h__row'
+FORM_BADGE_SELECTOR = 'div.h2h__section [class*="badgeform"]'
+MATCH_LINK_SELECTOR = 'a[href*="/mecz/"], a[href*="/match/"]'
+
 # Sporty indywidualne (inna logika kwalifikacji)
 INDIVIDUAL_SPORTS = ['tennis']
 
@@ -139,7 +163,28 @@ POPULAR_LEAGUES = {
 H2H_TAB_TEXT_OPTIONS = ["H2H", "Head-to-Head", "Bezpośrednie", "Bezpośrednie spotkania", "H2H"]
 
 
-def start_driver(headless: bool = True) -> webdriver.Chrome:
+def start_driver(headless: bool = True, lean: Optional[bool] = None) -> webdriver.Chrome:
+    """
+    Uruchom Chrome. Domyślnie lekki profil (browser_profile) - bez obrazków,
+    fontów, reklam i trackerów; lean=False lub LIVESPORT_LEAN_BROWSER=0 = pełny profil.
+
+    Ścieżka chromedrivera z cache (browser_service) - bez sieci przy restartach.
+    Jeśli działa ciepły Chrome (BROWSER_SERVICE_ADDRESS), sesja dostaje w nim
+    nową kartę zamiast uruchamiać nowy proces.
+    """
+    if lean is None:
+        lean = lean_enabled()
+
+    address = service_address()
+    if address and service_alive(address):
+        try:
+            driver = attach_to_service(address, Service(resolve_chromedriver()))
+            if lean:
+                apply_url_blocking(driver)
+            return driver
+        except WebDriverException as e:
+            print(f"   ⚠️ Nie udało się podłączyć do Chrome {address} ({e.msg}) - nowy proces")
+
     chrome_options = Options()
     if headless:
         chrome_options.add_argument("--headless=new")
@@ -153,8 +198,20 @@ def start_driver(headless: bool = True) -> webdriver.Chrome:
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     )
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    if lean:
+        apply_lean_options(chrome_options)
+
+    driver_path = resolve_chromedriver()
+    try:
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    except SessionNotCreatedException:
+        # Sterownik z cache nie pasuje do (zaktualizowanego) Chrome - pobierz ponownie
+        if driver_path is None or os.environ.get('CHROMEDRIVER_PATH'):
+            raise
+        invalidate_chromedriver_cache()
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver(refresh=True)), options=chrome_options)
+    if lean:
+        apply_url_blocking(driver)
     return driver
 
 
@@ -338,86 +395,38 @@ def _parse_h2h_rows(match_rows: list, debug_url: str = None) -> List[Dict]:
     return results
 
 
-def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = False, sport: str = None) -> Dict:
-    """Odwiedza stronę meczu, otwiera H2H i zwraca informację we właściwym formacie.
-    
-    Args:
-        url: URL meczu
-        driver: Selenium WebDriver
-        away_team_focus: Jeśli True, liczy zwycięstwa GOŚCI w H2H zamiast gospodarzy
-        sport: Sport type (volleyball, handball, football, basketball, etc.) for dynamic betType
-    """
-    out = {
-        'match_url': url,
-        'home_team': None,
-        'away_team': None,
-        'match_time': None,
-        'h2h_last5': [],
-        'home_wins_in_h2h_last5': 0,
-        'away_wins_in_h2h_last5': 0,  # NOWE: dla trybu away_team_focus
-        'h2h_count': 0,
-        'win_rate': 0.0,  # % wygranych gospodarzy/gości w H2H (zależnie od trybu)
-        'qualifies': False,
-        'home_form': [],  # Forma gospodarzy: ['W', 'L', 'W', 'D', 'W']
-        'away_form': [],  # Forma gości: ['L', 'L', 'W', 'L', 'W']
-        'home_odds': None,  # Kursy bukmacherskie (info dodatkowa)
-        'away_odds': None,
-        'focus_team': 'away' if away_team_focus else 'home',  # NOWE: który tryb
-    }
-
-    # KLUCZOWE: Przekieruj URL na stronę H2H (zamiast szczegoly)
-    # POPRAWKA: Obsługa URL z parametrem ?mid=
-    
-    # Wyciągnij część bazową i parametry
-    if '?' in url:
-        base_url, params = url.split('?', 1)
-        params = '?' + params
-    else:
-        base_url = url
-        params = ''
-    
-    # Usuń końcowy slash jeśli istnieje
-    base_url = base_url.rstrip('/')
-    
-    # Zamień /szczegoly/ na /h2h/ogolem/ lub dodaj /h2h/ogolem/
-    if '/szczegoly' in base_url:
-        base_url = base_url.replace('/szczegoly', '/h2h/ogolem')
-    elif '/h2h/' not in base_url:
-        base_url = base_url + '/h2h/ogolem'
-    
-    # Połącz z powrotem: base_url + params
-    h2h_url = base_url + params
-    
+def _open_h2h_page(driver: webdriver.Chrome, h2h_url: str) -> bool:
+    """Otwiera stronę H2H w przeglądarce i czeka na render (False = błąd nawigacji)"""
     try:
-        driver.get(h2h_url)
+        get_page_context(driver).navigate(h2h_url)
         
-        # OPTYMALIZACJA: Czekaj tylko na kluczowe elementy (max 5s)
-        try:
-            wait = WebDriverWait(driver, 5)  # Zmniejszone z 8s na 5s
-            # Czekaj aż załaduje się JAKAKOLWIEK zawartość H2H
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div[class*="h2h"], section[class*="h2h"]')))
-        except TimeoutException:
-            pass  # Kontynuuj mimo timeout
+        # Czekaj na sekcję H2H i aż wiersze przestaną przybywać (limit adaptacyjny,
+        # zamiast stałego 1s)
+        if not wait_for_page(driver, 'h2h', H2H_READY_SELECTOR, rows_selector=H2H_ROWS_SELECTOR):
+            # Jedna ponowna nawigacja (już z dłuższym limitem) zamiast parsowania pustego DOM
+            get_page_context(driver).navigate(h2h_url)
+            wait_for_page(driver, 'h2h', H2H_READY_SELECTOR, rows_selector=H2H_ROWS_SELECTOR)
         
-        # Krótki dodatkowy czas na renderowanie (zredukowany z 2s na 1s)
-        time.sleep(1.0)
+        # Scroll w dół i w górę - lazy-loading dociąga wiersze
+        scroll_and_settle(driver, H2H_ROWS_SELECTOR, rounds=1)
         
-        # Scroll raz w dół i raz w górę (szybko)
-        try:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.15)  # Zmniejszone z 0.3s na 0.15s
-            driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.15)  # Zmniejszone z 0.3s na 0.15s
-        except:
-            pass
-            
     except WebDriverException as e:
         print(f"   ❌ Błąd: {e}")
-        return out
+        return False
+
+    return True
+
+
+def _parse_h2h_page(driver: webdriver.Chrome, out: Dict, h2h_url: str):
+    """Wyciąga nazwy drużyn, czas meczu i H2H z otwartej strony H2H.
+
+    Uzupełnia `out` (home_team, away_team, match_time) i zwraca (soup, h2h).
+    """
+    # Jeden sparsowany dokument dla całej strony H2H (współdzielony z ekstraktorami)
+    soup = get_page_context(driver).soup()
 
     # pobierz tytuł strony jako fallback na nazwy druzyn
     try:
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
         # spróbuj wyciągnąć nazwy drużyn z nagłówka
         title = soup.title.string if soup.title else ''
         if title:
@@ -432,8 +441,6 @@ def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = Fa
 
     # NIE MUSIMY KLIKAĆ H2H - już jesteśmy na stronie /h2h/ogolem/
     # Zawartość już została załadowana przez WebDriverWait powyżej
-    
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
 
     # try to extract team names from the page header - NOWE SELEKTORY
     try:
@@ -491,6 +498,136 @@ def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = Fa
 
     # parse H2H
     h2h = parse_h2h_from_soup(soup, out['home_team'] or '', debug_url=h2h_url)
+    return soup, h2h
+
+
+def _detect_odds_sport(url: str, sport: str = None) -> str:
+    """Sport dla kursów 1X2 (dynamic betType: HOME_AWAY vs HOME_DRAW_AWAY)"""
+    if sport:
+        return sport
+    if '/siatkowka/' in url or '/volleyball/' in url:
+        return 'volleyball'
+    elif '/pilka-reczna/' in url or '/handball/' in url:
+        return 'handball'
+    elif '/koszykowka/' in url or '/basketball/' in url:
+        return 'basketball'
+    return 'football'  # default
+
+
+def _detect_ou_sport(url: str) -> str:
+    """Sport dla analizy Over/Under (linie i typ linii zależą od sportu)"""
+    url = url.lower()
+    if 'koszykowka' in url or 'basketball' in url:
+        return 'basketball'
+    elif 'siatkowka' in url or 'volleyball' in url:
+        return 'volleyball'
+    elif 'pilka-reczna' in url or 'handball' in url:
+        return 'handball'
+    elif 'hokej' in url or 'hockey' in url:
+        return 'hockey'
+    elif 'tenis' in url or 'tennis' in url:
+        return 'tennis'
+    return 'football'
+
+
+def _fetch_ou_btts_odds(url: str, sport: str) -> tuple:
+    """Kursy O/U i BTTS (tylko football) z API -> (ou_odds, btts_odds)"""
+    from livesport_odds_api_client import LiveSportOddsAPI, get_shared_session
+    odds_client = LiveSportOddsAPI(session=get_shared_session())
+    event_id = odds_client.extract_event_id_from_url(url)
+    if not event_id:
+        return None, None
+    
+    ou_odds = odds_client.get_over_under_odds(event_id, sport)
+    btts_odds = odds_client.get_btts_odds(event_id) if sport == 'football' else None
+    return ou_odds, btts_odds
+
+
+def fetch_match_odds(url: str, sport: str = None) -> Dict:
+    """
+    Kursy 1X2 meczu z API (BEZ przeglądarki) - używane przez OddsPrefetcher.
+    
+    O/U i BTTS NIE są pobierane z góry - process_match dociąga je dopiero dla
+    meczów z co najmniej 5 H2H (tylko tam są analizowane).
+    
+    Returns:
+        {'odds': wynik extract_betting_odds_with_api}
+    """
+    return {
+        'odds': extract_betting_odds_with_api(url, use_multi_bookmaker=True, sport=_detect_odds_sport(url, sport)),
+    }
+
+
+def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = False, sport: str = None,
+                  odds_prefetcher=None) -> Dict:
+    """Odwiedza stronę meczu, otwiera H2H i zwraca informację we właściwym formacie.
+    
+    Args:
+        url: URL meczu
+        driver: Selenium WebDriver
+        away_team_focus: Jeśli True, liczy zwycięstwa GOŚCI w H2H zamiast gospodarzy
+        sport: Sport type (volleyball, handball, football, basketball, etc.) for dynamic betType
+        odds_prefetcher: OddsPrefetcher (odds_pipeline) - kursy pobrane w tle; None = pobierz inline
+    """
+    out = {
+        'match_url': url,
+        'home_team': None,
+        'away_team': None,
+        'match_time': None,
+        'h2h_last5': [],
+        'home_wins_in_h2h_last5': 0,
+        'away_wins_in_h2h_last5': 0,  # NOWE: dla trybu away_team_focus
+        'h2h_count': 0,
+        'win_rate': 0.0,  # % wygranych gospodarzy/gości w H2H (zależnie od trybu)
+        'qualifies': False,
+        'home_form': [],  # Forma gospodarzy: ['W', 'L', 'W', 'D', 'W']
+        'away_form': [],  # Forma gości: ['L', 'L', 'W', 'L', 'W']
+        'home_odds': None,  # Kursy bukmacherskie (info dodatkowa)
+        'away_odds': None,
+        'focus_team': 'away' if away_team_focus else 'home',  # NOWE: który tryb
+    }
+
+    # KLUCZOWE: Przekieruj URL na stronę H2H (zamiast szczegoly)
+    # POPRAWKA: Obsługa URL z parametrem ?mid=
+    
+    # Wyciągnij część bazową i parametry
+    if '?' in url:
+        base_url, params = url.split('?', 1)
+        params = '?' + params
+    else:
+        base_url = url
+        params = ''
+    
+    # Usuń końcowy slash jeśli istnieje
+    base_url = base_url.rstrip('/')
+    
+    # Zamień /szczegoly/ na /h2h/ogolem/ lub dodaj /h2h/ogolem/
+    if '/szczegoly' in base_url:
+        base_url = base_url.replace('/szczegoly', '/h2h/ogolem')
+    elif '/h2h/' not in base_url:
+        base_url = base_url + '/h2h/ogolem'
+    
+    # Połącz z powrotem: base_url + params
+    h2h_url = base_url + params
+    
+    # KROK 1: Backend HTTP - surowy feed H2H bez renderowania strony w Chrome
+    soup = None
+    http_data = None
+    if H2H_FETCH_BACKEND != 'selenium':
+        http_data = get_http_fetcher().fetch(url)
+
+    if http_data:
+        if VERBOSE:
+            print(f"   ⚡ H2H pobrane przez HTTP (bez przeglądarki)")
+        out['home_team'] = http_data['home_team']
+        out['away_team'] = http_data['away_team']
+        out['match_time'] = http_data.get('match_time')
+        h2h = http_data['h2h']
+    else:
+        # KROK 2 (fallback): pełny render strony H2H w Selenium
+        if not _open_h2h_page(driver, h2h_url):
+            return out
+        soup, h2h = _parse_h2h_page(driver, out, h2h_url)
     out['h2h_last5'] = h2h
 
     # count home AND away wins in H2H list
@@ -586,7 +723,8 @@ def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = Fa
         print(f"   📊 Podstawowo kwalifikuje ({'GOŚCIE' if away_team_focus else 'GOSPODARZE'}: {team_name}, H2H: {win_rate*100:.0f}%) - sprawdzam formę...")
         try:
             # ZAAWANSOWANA ANALIZA FORMY (3 źródła)
-            advanced_form = extract_advanced_team_form(url, driver)
+            advanced_form = extract_advanced_team_form(url, driver,
+                                                       feed_form=http_data.get('form') if http_data else None)
             
             out['home_form_overall'] = advanced_form['home_form_overall']
             out['home_form_home'] = advanced_form['home_form_home']
@@ -629,6 +767,8 @@ def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = Fa
             out['qualifies'] = basic_qualifies
             # Pobierz formę starą metodą
             try:
+                if soup is None and _open_h2h_page(driver, h2h_url):
+                    soup = get_page_context(driver).soup()
                 home_form = extract_team_form(soup, driver, 'home', out.get('home_team'))
                 away_form = extract_team_form(soup, driver, 'away', out.get('away_team'))
                 out['home_form'] = home_form
@@ -644,20 +784,16 @@ def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = Fa
     # V4: Dodano tenacity @retry + fallback handling
     # V5: FALLBACK SELENIUM dla volleyball/tennis/handball (API nie ma pokrycia)
     # V6: Przekaż sport do API dla dynamic betType (HOME_AWAY vs HOME_DRAW_AWAY)
+    # V8: Kursy mogły już zostać pobrane w tle (OddsPrefetcher) - dołącz po event_id
+    prefetched = odds_prefetcher.get(url) if odds_prefetcher else None
     try:
         # ✅ V6: Detect sport from URL if not provided
-        detected_sport = sport
-        if not detected_sport:
-            if '/siatkowka/' in url or '/volleyball/' in url:
-                detected_sport = 'volleyball'
-            elif '/pilka-reczna/' in url or '/handball/' in url:
-                detected_sport = 'handball'
-            elif '/koszykowka/' in url or '/basketball/' in url:
-                detected_sport = 'basketball'
-            else:
-                detected_sport = 'football'  # default
+        detected_sport = _detect_odds_sport(url, sport)
         
-        odds = extract_betting_odds_with_api(url, use_multi_bookmaker=True, sport=detected_sport)  # V6: Sport param
+        if prefetched is not None:
+            odds = prefetched['odds']
+        else:
+            odds = extract_betting_odds_with_api(url, use_multi_bookmaker=True, sport=detected_sport)  # V6: Sport param
         
         # ✅ V7 FALLBACK 1: Supabase (Polish bookmakers from local scraper)
         if not odds.get('home_odds') and not odds.get('away_odds'):
@@ -679,6 +815,8 @@ def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = Fa
         if not odds.get('home_odds') and not odds.get('away_odds'):
             if VERBOSE:
                 print(f"   ⚠️ Supabase failed - trying Selenium scraping (last resort)...")
+            if soup is None and _open_h2h_page(driver, h2h_url):
+                soup = get_page_context(driver).soup()
             odds = extract_betting_odds_selenium(soup, driver, url)  # V5: Nowa funkcja Selenium
         
         out['home_odds'] = odds.get('home_odds')
@@ -720,40 +858,24 @@ def process_match(url: str, driver: webdriver.Chrome, away_team_focus: bool = Fa
     out['btts_no_odds'] = None
     
     # Wykryj sport z URL
-    sport = 'football'
-    if 'koszykowka' in url.lower() or 'basketball' in url.lower():
-        sport = 'basketball'
-    elif 'siatkowka' in url.lower() or 'volleyball' in url.lower():
-        sport = 'volleyball'
-    elif 'pilka-reczna' in url.lower() or 'handball' in url.lower():
-        sport = 'handball'
-    elif 'hokej' in url.lower() or 'hockey' in url.lower():
-        sport = 'hockey'
-    elif 'tenis' in url.lower() or 'tennis' in url.lower():
-        sport = 'tennis'
+    sport = _detect_ou_sport(url)
     
     # KROK 1: Pobierz kursy O/U z API (dynamiczna linia)
     api_line = None
     if url and '?mid=' in url and len(h2h) >= 5:
         try:
-            from livesport_odds_api_client import LiveSportOddsAPI
-            odds_client = LiveSportOddsAPI()
-            event_id = odds_client.extract_event_id_from_url(url)
-            
-            if event_id:
-                # Kursy O/U
-                ou_odds = odds_client.get_over_under_odds(event_id, sport)
-                if ou_odds:
-                    out['over_odds'] = ou_odds.get('over_odds')
-                    out['under_odds'] = ou_odds.get('under_odds')
-                    api_line = ou_odds.get('line')  # Rzeczywista linia z API!
-                
-                # Kursy BTTS (tylko football)
-                if sport == 'football':
-                    btts_odds = odds_client.get_btts_odds(event_id)
-                    if btts_odds:
-                        out['btts_yes_odds'] = btts_odds.get('btts_yes')
-                        out['btts_no_odds'] = btts_odds.get('btts_no')
+            ou_odds, btts_odds = _fetch_ou_btts_odds(url, sport)  # Tylko mecze z analizą O/U
+            
+            # Kursy O/U
+            if ou_odds:
+                out['over_odds'] = ou_odds.get('over_odds')
+                out['under_odds'] = ou_odds.get('under_odds')
+                api_line = ou_odds.get('line')  # Rzeczywista linia z API!
+            
+            # Kursy BTTS (tylko football)
+            if btts_odds:
+                out['btts_yes_odds'] = btts_odds.get('btts_yes')
+                out['btts_no_odds'] = btts_odds.get('btts_no')
         except Exception as e:
             if VERBOSE:
                 print(f"   ⚠️ Błąd pobierania kursów O/U: {e}")
@@ -852,13 +974,67 @@ def format_form(form_list: List[str]) -> str:
     return ' '.join([f"{r}{emoji_map.get(r, '')}" for r in form_list])
 
 
-def extract_advanced_team_form(match_url: str, driver: webdriver.Chrome) -> Dict:
+# Zakładki H2H: slug URL -> kontekst formy
+H2H_FORM_TABS = {'ogolem': 'overall', 'u-siebie': 'home', 'na-wyjezdzie': 'away'}
+
+
+def _h2h_tab_url(match_url: str, tab: str) -> str:
+    """URL zakładki H2H meczu (ogolem / u-siebie / na-wyjezdzie)"""
+    base_url = match_url.split('?')[0].rstrip('/')
+    # Usuń końcówkę "/szczegoly" lub inną podstronę, jeśli istnieje
+    base_url = base_url.replace('/szczegoly', '')
+    if '/h2h/' in base_url:
+        base_url = base_url.split('/h2h/')[0]
+    mid = match_url.split('mid=')[1] if 'mid=' in match_url else ''
+    return f"{base_url}/h2h/{tab}/?mid={mid}" if mid else f"{base_url}/h2h/{tab}/"
+
+
+def _is_current_page(page_url: Optional[str], url: str) -> bool:
+    """Czy przeglądarka jest już na tej stronie (ignoruje końcowy slash)"""
+    if not page_url:
+        return False
+    page_base, _, page_query = page_url.partition('?')
+    base, _, query = url.partition('?')
+    return page_base.rstrip('/') == base.rstrip('/') and page_query == query
+
+
+def _switch_h2h_tab(driver: webdriver.Chrome, tab: str, timeout: float = 4.0) -> bool:
+    """
+    Przełącz podzakładkę H2H w obrębie załadowanej strony (kliknięcie, bez driver.get).
+
+    Returns:
+        True gdy zakładka się przełączyła i sekcje H2H się odświeżyły
+    """
+    first_section_js = "var s = document.querySelector('div.h2h__section'); return s ? s.innerText : '';"
+    try:
+        before = driver.execute_script(first_section_js)
+        link = driver.find_element(By.CSS_SELECTOR, f'a[href*="/h2h/{tab}"]')
+        driver.execute_script("arguments[0].click();", link)
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: f'/h2h/{tab}' in d.current_url and d.execute_script(first_section_js) not in ('', before)
+        )
+    except (NoSuchElementException, TimeoutException, WebDriverException):
+        return False
+
+    page = get_page_context(driver)
+    page.invalidate()  # DOM się zmienił
+    page.url = driver.current_url
+    return True
+
+
+def extract_advanced_team_form(match_url: str, driver: webdriver.Chrome, feed_form: Optional[Dict] = None) -> Dict:
     """
     Ekstraktuje zaawansowaną formę drużyn z 3 źródeł:
     1. Forma ogólna (ostatnie 5 meczów)
     2. Forma u siebie (gospodarze)
     3. Forma na wyjeździe (goście)
     
+    Kolejność źródeł (od najtańszego):
+    - feed_form: forma z feedu H2H (backend HTTP) - zero nawigacji
+    - strona /h2h/ogolem/ już otwarta w przeglądarce (process_match) - ponowne użycie
+      DOM, zakładki u siebie / na wyjeździe przełączane kliknięciem w obrębie strony
+    - fallback: osobna nawigacja na każdą zakładkę (stara metoda)
+    
     Returns:
         {
             'home_form_overall': ['W', 'L', 'D', 'W', 'W'],
@@ -877,42 +1053,39 @@ def extract_advanced_team_form(match_url: str, driver: webdriver.Chrome) -> Dict
     }
     
     try:
-        # Konwertuj URL meczu na URL H2H
-        # Z: /mecz/pilka-nozna/team1/team2/?mid=XXX
-        # Na: /mecz/pilka-nozna/team1/team2/h2h/ogolem/?mid=XXX (lub /u-siebie/, /na-wyjezdzie/)
+        if feed_form and feed_form.get('home_form_overall') and feed_form.get('away_form_overall'):
+            # 0. FORMA Z FEEDU HTTP (wszystkie zakładki w jednym dokumencie)
+            for key in ('home_form_overall', 'home_form_home', 'away_form_overall', 'away_form_away'):
+                result[key] = list(feed_form.get(key) or [])[:5]
+            if VERBOSE:
+                print(f"      ⚡ Forma z feedu H2H (bez nawigacji)")
         
-        if '/match/' in match_url or '/mecz/' in match_url:
-            base_url = match_url.split('?')[0]  # Usuń query params
-            
-            # Usuń końcówkę "/szczegoly" lub inną stronę, jeśli istnieje
-            base_url = base_url.rstrip('/')
-            if base_url.endswith('/szczegoly') or base_url.endswith('/szczegoly/'):
-                base_url = base_url.replace('/szczegoly', '')
-            
-            mid = match_url.split('mid=')[1] if 'mid=' in match_url else ''
-            
-            # 1. FORMA OGÓLNA
-            h2h_overall_url = f"{base_url}/h2h/ogolem/?mid={mid}"
-            result['home_form_overall'], result['away_form_overall'] = _extract_form_from_h2h_page(
-                h2h_overall_url, driver, 'overall'
-            )
+        elif '/match/' in match_url or '/mecz/' in match_url:
+            page = get_page_context(driver)
             
-            # 2. FORMA U SIEBIE (gospodarze)
-            h2h_home_url = f"{base_url}/h2h/u-siebie/?mid={mid}"
-            result['home_form_home'], _ = _extract_form_from_h2h_page(
-                h2h_home_url, driver, 'home'
-            )
-            
-            # 3. FORMA NA WYJEŹDZIE (goście)
-            h2h_away_url = f"{base_url}/h2h/na-wyjezdzie/?mid={mid}"
-            _, result['away_form_away'] = _extract_form_from_h2h_page(
-                h2h_away_url, driver, 'away'
-            )
-            
-            # 4. ANALIZA PRZEWAGI FORMY
-            result['form_advantage'] = _analyze_form_advantage(result)
-            # 5. ANALIZA PRZEWAGI GOŚCI (dla trybu away_team_focus)
-            result['away_advantage'] = _analyze_away_form_advantage(result)
+            # 1. FORMA OGÓLNA - strona zwykle już otwarta przez process_match
+            h2h_overall_url = _h2h_tab_url(match_url, 'ogolem')
+            if _is_current_page(page.url, h2h_overall_url):
+                result['home_form_overall'], result['away_form_overall'] = _parse_form_from_soup(page.soup(), 'overall')
+            else:
+                result['home_form_overall'], result['away_form_overall'] = _extract_form_from_h2h_page(
+                    h2h_overall_url, driver, 'overall'
+                )
+            
+            # 2. FORMA U SIEBIE (gospodarze) / 3. NA WYJEŹDZIE (goście)
+            # Kliknięcie podzakładki w obrębie strony, nawigacja tylko gdy się nie uda
+            for tab, key, side in (('u-siebie', 'home_form_home', 0), ('na-wyjezdzie', 'away_form_away', 1)):
+                context = H2H_FORM_TABS[tab]
+                if _switch_h2h_tab(driver, tab):
+                    forms = _parse_form_from_soup(page.soup(), context)
+                else:
+                    forms = _extract_form_from_h2h_page(_h2h_tab_url(match_url, tab), driver, context)
+                result[key] = forms[side]
+        
+        # 4. ANALIZA PRZEWAGI FORMY
+        result['form_advantage'] = _analyze_form_advantage(result)
+        # 5. ANALIZA PRZEWAGI GOŚCI (dla trybu away_team_focus)
+        result['away_advantage'] = _analyze_away_form_advantage(result)
             
     except Exception as e:
         print(f"   ⚠️ extract_advanced_team_form error: {e}")
@@ -932,109 +1105,121 @@ def _extract_form_from_h2h_page(url: str, driver: webdriver.Chrome, context: str
     Returns:
         (home_form, away_form) - każda to lista ['W', 'L', 'D', ...]
     """
-    home_form = []
-    away_form = []
-    
     try:
-        driver.get(url)
-        time.sleep(1.5)  # Zmniejszone z 3.0s na 1.5s - czas na załadowanie dynamicznych elementów
+        page = get_page_context(driver)
+        page.navigate(url)
+        # Czekaj na sekcje formy zamiast stałych 1.5s + 0.5s
+        wait_for_page(driver, 'form', 'div.h2h__section', rows_selector=FORM_BADGE_SELECTOR)
         
         # Scroll down to trigger lazy-loading content
-        try:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5)  # Zmniejszone z 1.0s na 0.5s
-        except:
-            pass
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        # NOWA METODA: Ekstraktuj formy z sekcji h2h__section
-        # Livesport organizuje dane w sekcje:
-        # - /h2h/ogolem/ -> 2 sekcje: home (idx=0), away (idx=1)
-        # - /h2h/u-siebie/ -> 1 sekcja: home form at home (idx=0)
-        # - /h2h/na-wyjezdzie/ -> 1 sekcja: away form away (idx=0)
-        h2h_sections = soup.find_all('div', class_='h2h__section')
+        scroll_and_settle(driver, H2H_ROWS_SELECTOR, rounds=1)
         
-        for idx, section in enumerate(h2h_sections[:2]):  # Pierwsz 2 sekcje (home, away)
-            # Szukaj wszystkich form badges w tej sekcji
-            badges = section.find_all('div', class_='wcl-badgeform_AKaAR')
-            
-            temp_form = []
-            for badge in badges[:5]:  # Max 5 wyników
-                text = badge.get_text().strip()
-                title = badge.get('title', '')
-                
-                # Konwersja: Z->W, R->D, P->L
-                if 'Zwyci' in title or text == 'Z':
-                    temp_form.append('W')
-                elif 'Remis' in title or text == 'R':
-                    temp_form.append('D')
-                elif 'Pora' in title or text == 'P':
-                    temp_form.append('L')
-            
-            # Przypisanie zależy od kontekstu:
-            if context == 'overall':
-                # Na stronie /h2h/ogolem/ są 2 sekcje
-                if idx == 0:
-                    home_form = temp_form
-                elif idx == 1:
-                    away_form = temp_form
-            elif context == 'home':
-                # Na stronie /h2h/u-siebie/ jest 1 sekcja (gospodarze u siebie)
-                if idx == 0:
-                    home_form = temp_form
-            elif context == 'away':
-                # Na stronie /h2h/na-wyjezdzie/ jest 1 sekcja (goście na wyjeździe)
-                if idx == 0:
-                    away_form = temp_form
-        
-        # Debug: Pokaż znalezione formy
-        if context == 'away' and away_form:
-            print(f"      ✓ Forma gości NA WYJEŹDZIE: {away_form}")
-        
-        # FALLBACK: Jeśli powyższa metoda nie zadziała, spróbuj starej metody
-        # Warunek zależy od kontekstu:
-        needs_fallback = False
-        if context == 'overall' and (not home_form or not away_form):
-            needs_fallback = True
-        elif context == 'home' and not home_form:
-            needs_fallback = True
-        elif context == 'away' and not away_form:
-            needs_fallback = True
-        
-        if needs_fallback:
-            h2h_rows = soup.select('div.h2h__row, tr.h2h')
-            
-            for row in h2h_rows[:5]:
-                # Sprawdź wynik meczu
-                score_elem = row.select_one('div[class*="score"], span[class*="score"]')
-                if score_elem:
-                    score_text = score_elem.get_text(strip=True)
-                    # Format: "3:1" lub "1:0"
-                    if ':' in score_text:
-                        try:
-                            home_score, away_score = map(int, score_text.split(':'))
-                            if home_score > away_score:
-                                if context in ['overall', 'home']:
-                                    home_form.append('W')
-                                if context in ['overall', 'away']:
-                                    away_form.append('L')
-                            elif away_score > home_score:
-                                if context in ['overall', 'home']:
-                                    home_form.append('L')
-                                if context in ['overall', 'away']:
-                                    away_form.append('W')
-                            else:
-                                if context in ['overall', 'home']:
-                                    home_form.append('D')
-                                if context in ['overall', 'away']:
-                                    away_form.append('D')
-                        except:
-                            continue
-                            
+        return _parse_form_from_soup(page.soup(), context)
+    
     except Exception as e:
         print(f"      ⚠️ _extract_form_from_h2h_page error ({context}): {e}")
     
+    return ([], [])
+
+
+def _parse_form_from_soup(soup: BeautifulSoup, context: str) -> tuple:
+    """
+    Forma z już sparsowanej strony H2H (ogółem / u siebie / na wyjeździe).
+    
+    Args:
+        soup: Dokument strony H2H (np. z PageContext - bez ponownej nawigacji)
+        context: 'overall', 'home', lub 'away'
+    
+    Returns:
+        (home_form, away_form) - każda to lista ['W', 'L', 'D', ...]
+    """
+    home_form = []
+    away_form = []
+    
+    # NOWA METODA: Ekstraktuj formy z sekcji h2h__section
+    # Livesport organizuje dane w sekcje:
+    # - /h2h/ogolem/ -> 2 sekcje: home (idx=0), away (idx=1)
+    # - /h2h/u-siebie/ -> 1 sekcja: home form at home (idx=0)
+    # - /h2h/na-wyjezdzie/ -> 1 sekcja: away form away (idx=0)
+    h2h_sections = soup.find_all('div', class_='h2h__section')
+    
+    for idx, section in enumerate(h2h_sections[:2]):  # Pierwsz 2 sekcje (home, away)
+        # Szukaj wszystkich form badges w tej sekcji
+        badges = section.find_all('div', class_='wcl-badgeform_AKaAR')
+    
+        temp_form = []
+        for badge in badges[:5]:  # Max 5 wyników
+            text = badge.get_text().strip()
+            title = badge.get('title', '')
+    
+            # Konwersja: Z->W, R->D, P->L
+            if 'Zwyci' in title or text == 'Z':
+                temp_form.append('W')
+            elif 'Remis' in title or text == 'R':
+                temp_form.append('D')
+            elif 'Pora' in title or text == 'P':
+                temp_form.append('L')
+    
+        # Przypisanie zależy od kontekstu:
+        if context == 'overall':
+            # Na stronie /h2h/ogolem/ są 2 sekcje
+            if idx == 0:
+                home_form = temp_form
+            elif idx == 1:
+                away_form = temp_form
+        elif context == 'home':
+            # Na stronie /h2h/u-siebie/ jest 1 sekcja (gospodarze u siebie)
+            if idx == 0:
+                home_form = temp_form
+        elif context == 'away':
+            # Na stronie /h2h/na-wyjezdzie/ jest 1 sekcja (goście na wyjeździe)
+            if idx == 0:
+                away_form = temp_form
+    
+    # Debug: Pokaż znalezione formy
+    if context == 'away' and away_form:
+        print(f"      ✓ Forma gości NA WYJEŹDZIE: {away_form}")
+    
+    # FALLBACK: Jeśli powyższa metoda nie zadziała, spróbuj starej metody
+    # Warunek zależy od kontekstu:
+    needs_fallback = False
+    if context == 'overall' and (not home_form or not away_form):
+        needs_fallback = True
+    elif context == 'home' and not home_form:
+        needs_fallback = True
+    elif context == 'away' and not away_form:
+        needs_fallback = True
+    
+    if needs_fallback:
+        h2h_rows = soup.select('div.h2h__row, tr.h2h')
+    
+        for row in h2h_rows[:5]:
+            # Sprawdź wynik meczu
+            score_elem = row.select_one('div[class*="score"], span[class*="score"]')
+            if score_elem:
+                score_text = score_elem.get_text(strip=True)
+                # Format: "3:1" lub "1:0"
+                if ':' in score_text:
+                    try:
+                        home_score, away_score = map(int, score_text.split(':'))
+                        if home_score > away_score:
+                            if context in ['overall', 'home']:
+                                home_form.append('W')
+                            if context in ['overall', 'away']:
+                                away_form.append('L')
+                        elif away_score > home_score:
+                            if context in ['overall', 'home']:
+                                home_form.append('L')
+                            if context in ['overall', 'away']:
+                                away_form.append('W')
+                        else:
+                            if context in ['overall', 'home']:
+                                home_form.append('D')
+                            if context in ['overall', 'away']:
+                                away_form.append('D')
+                    except:
+                        continue
+    
     return (home_form[:5], away_form[:5])
 
 
@@ -1388,6 +1573,12 @@ def extract_betting_odds_with_api(url: str, use_multi_bookmaker: bool = True, sp
     - Rate limiting (200ms między bukmacherami)
     - Optymalizacja: Skip jeśli STS zwrócił pełne kursy
     
+    WERSJA V8 (RÓWNOLEGLE) - ODDS_FETCH_MODE = 'concurrent' (domyślnie):
+    - Zapytania do WSZYSTKICH bukmacherów naraz (fetch_odds_from_bookmakers)
+    - Współdzielona pula połączeń + globalny limit równoległości i rate limit
+    - Scalanie najlepszych kursów w kolejności priorytetu bukmacherów
+    - ODDS_FETCH_MODE = 'sequential' przywraca starą pętlę (STS-first + 200ms przerwy)
+    
     Args:
         url: URL meczu z Livesport
         use_multi_bookmaker: Jeśli True, próbuje wielu bukmacherów (wolniejsze ale lepsze pokrycie)
@@ -1403,7 +1594,7 @@ def extract_betting_odds_with_api(url: str, use_multi_bookmaker: bool = True, sp
         }
     """
     try:
-        from livesport_odds_api_client import LiveSportOddsAPI
+        from livesport_odds_api_client import LiveSportOddsAPI, fetch_odds_from_bookmakers, get_shared_session
         
         # Lista bukmacherów (ROZSZERZONA - 8 bukmacherów!)
         # ZMIANA: STS jako PIERWSZY (polski rynek ma priorytet)
@@ -1432,71 +1623,83 @@ def extract_betting_odds_with_api(url: str, use_multi_bookmaker: bool = True, sp
             'all_odds': {}  # {bookmaker_name: {home, away, draw}}
         }
         
-        best_home = 0
-        best_away = 0
+        # Zbierz kursy od bukmacherów: (nazwa, odds) w kolejności priorytetu
+        collected = []
         
-        for bm_id, bm_name in bookmakers_to_try:
-            try:
-                # Inicjalizuj klienta dla tego bukmachera
-                client = LiveSportOddsAPI(bookmaker_id=bm_id, geo_ip_code="PL")
-                
-                # Pobierz kursy z 3 próbami (ZMIANA: 3 zamiast 2)
-                odds = None
-                for attempt in range(3):
-                    try:
-                        # ✅ V6: Przekaż sport do API dla dynamic betType selection
-                        odds = client.get_odds_from_url(url, sport=sport)
-                        if odds and (odds.get('home_odds') or odds.get('away_odds')):
-                            break
-                        if attempt < 2:
-                            time.sleep(0.5 * (attempt + 1))  # Exponential backoff
-                    except Exception as e:
-                        if VERBOSE:
-                            print(f"   ⚠️ {bm_name} attempt {attempt+1} failed: {e}")
-                        if attempt < 2:
-                            time.sleep(0.8 * (attempt + 1))
-                        continue
-                
-                if odds and (odds.get('home_odds') or odds.get('away_odds')):
-                    result['bookmakers_found'].append(bm_name)
-                    result['all_odds'][bm_name] = {
-                        'home': odds.get('home_odds'),
-                        'away': odds.get('away_odds'),
-                        'draw': odds.get('draw_odds')
-                    }
+        if use_multi_bookmaker and ODDS_FETCH_MODE == 'concurrent':
+            # V8: Wszystkie zapytania naraz (współdzielona pula połączeń + globalny limit)
+            fetched = fetch_odds_from_bookmakers(url, bookmakers_to_try, sport=sport)
+            collected = [(bm_name, fetched[bm_name]) for _, bm_name in bookmakers_to_try if bm_name in fetched]
+        else:
+            for bm_id, bm_name in bookmakers_to_try:
+                try:
+                    # Inicjalizuj klienta dla tego bukmachera (współdzielony Session)
+                    client = LiveSportOddsAPI(bookmaker_id=bm_id, geo_ip_code="PL", session=get_shared_session())
                     
-                    # Sprawdź czy to najlepsze kursy
-                    if odds.get('home_odds') and odds['home_odds'] > best_home:
-                        best_home = odds['home_odds']
-                        result['home_odds'] = odds['home_odds']
-                        result['best_home_bookmaker'] = bm_name
+                    # Pobierz kursy z 3 próbami (ZMIANA: 3 zamiast 2)
+                    odds = None
+                    for attempt in range(3):
+                        try:
+                            # ✅ V6: Przekaż sport do API dla dynamic betType selection
+                            odds = client.get_odds_from_url(url, sport=sport)
+                            if odds and (odds.get('home_odds') or odds.get('away_odds')):
+                                break
+                            if attempt < 2:
+                                time.sleep(0.5 * (attempt + 1))  # Exponential backoff
+                        except Exception as e:
+                            if VERBOSE:
+                                print(f"   ⚠️ {bm_name} attempt {attempt+1} failed: {e}")
+                            if attempt < 2:
+                                time.sleep(0.8 * (attempt + 1))
+                            continue
                     
-                    if odds.get('away_odds') and odds['away_odds'] > best_away:
-                        best_away = odds['away_odds']
-                        result['away_odds'] = odds['away_odds']
-                        result['best_away_bookmaker'] = bm_name
+                    if odds and (odds.get('home_odds') or odds.get('away_odds')):
+                        collected.append((bm_name, odds))
+                        
+                        # OPTYMALIZACJA: Jeśli STS zwrócił pełne kursy, nie szukaj dalej
+                        if bm_name == "STS" and odds.get('home_odds') and odds.get('away_odds'):
+                            if VERBOSE:
+                                print(f"   ✅ STS zwrócił pełne kursy - pomijam pozostałych bukmacherów (oszczędność czasu)")
+                            break
                     
-                    # Draw odds - weź pierwszy dostępny
-                    if odds.get('draw_odds') and not result['draw_odds']:
-                        result['draw_odds'] = odds['draw_odds']
+                    # Rate limiting (ZMIANA: 200ms zamiast 150ms - mniej agresywne)
+                    if use_multi_bookmaker:
+                        time.sleep(0.2)
                     
+                except Exception as e:
                     if VERBOSE:
-                        print(f"   💰 {bm_name}: H={odds.get('home_odds')} A={odds.get('away_odds')}")
-                    
-                    # OPTYMALIZACJA: Jeśli STS zwrócił pełne kursy, nie szukaj dalej
-                    if bm_name == "STS" and odds.get('home_odds') and odds.get('away_odds'):
-                        if VERBOSE:
-                            print(f"   ✅ STS zwrócił pełne kursy - pomijam pozostałych bukmacherów (oszczędność czasu)")
-                        break
-                
-                # Rate limiting (ZMIANA: 200ms zamiast 150ms - mniej agresywne)
-                if use_multi_bookmaker:
-                    time.sleep(0.2)
-                
-            except Exception as e:
-                if VERBOSE:
-                    print(f"   ⚠️ {bm_name} error: {e}")
-                continue
+                        print(f"   ⚠️ {bm_name} error: {e}")
+                    continue
+        
+        # Scal kursy - najlepsze home/away spośród wszystkich bukmacherów
+        best_home = 0
+        best_away = 0
+        
+        for bm_name, odds in collected:
+            result['bookmakers_found'].append(bm_name)
+            result['all_odds'][bm_name] = {
+                'home': odds.get('home_odds'),
+                'away': odds.get('away_odds'),
+                'draw': odds.get('draw_odds')
+            }
+            
+            # Sprawdź czy to najlepsze kursy
+            if odds.get('home_odds') and odds['home_odds'] > best_home:
+                best_home = odds['home_odds']
+                result['home_odds'] = odds['home_odds']
+                result['best_home_bookmaker'] = bm_name
+            
+            if odds.get('away_odds') and odds['away_odds'] > best_away:
+                best_away = odds['away_odds']
+                result['away_odds'] = odds['away_odds']
+                result['best_away_bookmaker'] = bm_name
+            
+            # Draw odds - weź pierwszy dostępny
+            if odds.get('draw_odds') and not result['draw_odds']:
+                result['draw_odds'] = odds['draw_odds']
+            
+            if VERBOSE:
+                print(f"   💰 {bm_name}: H={odds.get('home_odds')} A={odds.get('away_odds')}")
         
         if result['bookmakers_found']:
             if VERBOSE:
@@ -1559,8 +1762,10 @@ def extract_betting_odds_selenium(soup: BeautifulSoup, driver: webdriver.Chrome,
             odds_tabs = driver.find_elements(By.XPATH, "//a[contains(text(), 'Kursy') or contains(text(), 'Odds')]")
             if odds_tabs:
                 odds_tabs[0].click()
-                time.sleep(1.5)  # Poczekaj na załadowanie
-                soup = BeautifulSoup(driver.page_source, 'html.parser')  # Odśwież soup
+                wait_for_network_idle(driver, get_adaptive_timeouts().timeout('tab'))  # Poczekaj na załadowanie
+                page = get_page_context(driver)
+                page.invalidate()  # Kliknięcie zmieniło DOM
+                soup = page.soup()  # Odśwież soup
         except:
             pass
         
@@ -2339,14 +2544,15 @@ def process_match_tennis(url: str, driver: webdriver.Chrome) -> Dict:
     # Połącz z powrotem
     h2h_url = base_url + params
     
+    page = get_page_context(driver)
     try:
-        driver.get(h2h_url)
-        time.sleep(1.5)  # Zmniejszone z 3.0s na 1.5s - Tennis wymaga czasu na załadowanie
+        page.navigate(h2h_url)
+        wait_for_page(driver, 'h2h:tennis', H2H_READY_SELECTOR, rows_selector=H2H_ROWS_SELECTOR)
     except WebDriverException as e:
         print(f"Błąd otwierania {h2h_url}: {e}")
         return out
 
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    soup = page.soup()
 
     # Wydobądź nazwy zawodników
     try:
@@ -2512,8 +2718,8 @@ def process_match_tennis(url: str, driver: webdriver.Chrome) -> Dict:
                 # Pobierz kursy O/U z API
                 if url and '?mid=' in url:
                     try:
-                        from livesport_odds_api_client import LiveSportOddsAPI
-                        odds_client = LiveSportOddsAPI()
+                        from livesport_odds_api_client import LiveSportOddsAPI, get_shared_session
+                        odds_client = LiveSportOddsAPI(session=get_shared_session())
                         event_id = odds_client.extract_event_id_from_url(url)
                         
                         if event_id:
@@ -2634,125 +2840,200 @@ def process_match_tennis(url: str, driver: webdriver.Chrome) -> Dict:
     return out
 
 
-def get_match_links_from_day(driver: webdriver.Chrome, date: str, sports: List[str] = None, leagues: List[str] = None) -> List[str]:
+# Ile przeglądarek zbiera linki jednocześnie (każda = osobny Chrome)
+LINK_DISCOVERY_WORKERS = int(os.environ.get('LINK_DISCOVERY_WORKERS', 3))
+
+
+def _collect_sport_links(driver: webdriver.Chrome, sport: str, date: str, leagues: List[str] = None) -> List[str]:
+    """Linki meczów jednego sportu ze strony listy dnia (jedna nawigacja)."""
+    sport_url = SPORT_URLS[sport]
+    print(f"\n🔍 Zbieranie linków dla: {sport}")
+    
+    # Dodaj datę do URL aby pobrać mecze z konkretnego dnia
+    date_url = f"{sport_url}?date={date}"
+    print(f"   URL: {date_url}")
+    page = get_page_context(driver)
+    page.navigate(date_url)
+    
+    # Czekaj na linki meczów i aż lista przestanie rosnąć. Limit adaptacyjny per
+    # sport (volleyball/handball/rugby ładują się wolniej, GitHub Actions też) -
+    # zamiast stałych 1.2-3.5s
+    if not wait_for_page(driver, f'listing:{sport}', MATCH_LINK_SELECTOR, rows_selector=MATCH_LINK_SELECTOR):
+        # Jedna ponowna nawigacja (już z dłuższym limitem); pusta lista = brak meczów tego dnia
+        page.navigate(date_url)
+        wait_for_page(driver, f'listing:{sport}', MATCH_LINK_SELECTOR, rows_selector=MATCH_LINK_SELECTOR)
+    
+    # Scroll w dół aby załadować więcej meczów - kończy, gdy scroll nic nie dociąga
+    scroll_and_settle(driver, MATCH_LINK_SELECTOR, rounds=3)
+    
+    soup = page.soup()
+    anchors = soup.find_all('a', href=True)
+    
+    sport_links = []
+    debug_patterns_found = {'/match/': 0, '/mecz/': 0, '/#/match/': 0, '/#id/': 0}
+    
+    for a in anchors:
+        href = a['href']
+        # Szukamy linków do meczów
+        patterns_match = ['/match/', '/mecz/', '/#/match/', '/#id/']
+        matched = False
+        
+        for pattern in patterns_match:
+            if pattern in href:
+                debug_patterns_found[pattern] += 1
+                matched = True
+                break
+        
+        if matched:
+            # Normalizacja URLa
+            if href.startswith('/'):
+                href = 'https://www.livesport.com' + href
+            elif href.startswith('#'):
+                href = sport_url + href
+            
+            # Filtrowanie po ligach (jeśli podano)
+            if leagues:
+                # Sprawdź czy któraś z lig jest w URLu
+                if not any(league.lower() in href.lower() for league in leagues):
+                    # Sprawdź też tekst linku
+                    link_text = a.get_text(strip=True).lower()
+                    if not any(league.lower() in link_text for league in leagues):
+                        continue
+            
+            if href not in sport_links:
+                sport_links.append(href)
+    
+    # Debug info gdy nic nie znaleziono (dla wszystkich sportów)
+    if len(sport_links) == 0:
+        print(f"   ⚠️  BRAK MECZÓW dla {sport} - DEBUG:")
+        print(f"   ⚠️  Wzorce znalezione: {debug_patterns_found}")
+        print(f"   ⚠️  Wszystkich linków na stronie: {len(anchors)}")
+        # Pokaż przykładowe hrefs (pierwsze 10)
+        sample_hrefs = [a['href'] for a in anchors[:20] if a.get('href')]
+        if sample_hrefs:
+            print(f"   ⚠️  Przykładowe hrefs (pierwsze 5):")
+            for idx, href in enumerate(sample_hrefs[:5], 1):
+                print(f"      {idx}. {href[:100]}...")
+        else:
+            print(f"   ⚠️  NIE znaleziono ŻADNYCH linków <a href=...> na stronie!")
+            print(f"   💡 Możliwe przyczyny:")
+            print(f"      - Strona wymaga więcej czasu na załadowanie (JavaScript)")
+            print(f"      - Data jest w przyszłości lub przeszłości bez meczów")
+            print(f"      - Livesport zmienił strukturę strony")
+    else:
+        print(f"   ✓ Znaleziono {len(sport_links)} meczów dla {sport}")
+    
+    return sport_links
+
+
+def _sport_page_key(sport: str) -> str:
+    """Klucz cache listy meczów - slug strony sportu (aliasy football/soccer = jeden wpis)"""
+    return SPORT_URLS[sport].rstrip('/').rsplit('/', 1)[-1]
+
+
+def _collect_sport_links_safe(driver: webdriver.Chrome, sport: str, date: str,
+                              leagues: Optional[List[str]]) -> Optional[List[str]]:
+    try:
+        return _collect_sport_links(driver, sport, date, leagues)
+    except Exception as e:
+        print(f"   ✗ Błąd przy zbieraniu linków dla {sport}: {e}")
+        return None
+
+
+def _collect_chunk_on_new_driver(sports: List[str], date: str, leagues: Optional[List[str]]) -> Dict[str, Optional[List[str]]]:
+    """Osobna przeglądarka dla części sportów (wątek zbierania linków)"""
+    try:
+        driver = start_driver(headless=True)
+    except Exception as e:
+        print(f"   ⚠️  Nie udało się uruchomić dodatkowej przeglądarki ({e}) - sporty {sports} sekwencyjnie")
+        return {}
+    try:
+        return {sport: _collect_sport_links_safe(driver, sport, date, leagues) for sport in sports}
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def get_match_links_from_day(driver: webdriver.Chrome, date: str, sports: List[str] = None, leagues: List[str] = None,
+                             workers: Optional[int] = None, refresh: bool = False) -> List[str]:
     """Zbiera linki do meczów z głównej strony dla danego dnia.
     
+    Sporty są zbierane równolegle: pierwszy na przekazanym driverze, pozostałe
+    na dodatkowych przeglądarkach (maks. `workers`, domyślnie LINK_DISCOVERY_WORKERS).
+    Listy są zapisywane w fixture_cache (per data, sport, ligi) i współdzielone
+    przez wszystkie skrypty uruchamiane tego samego dnia.
+    
     Args:
         driver: Selenium WebDriver
         date: Data w formacie 'YYYY-MM-DD'
         sports: Lista sportów do przetworzenia (np. ['football', 'basketball'])
         leagues: Lista slug-ów lig do filtrowania (np. ['ekstraklasa', 'premier-league'])
+        workers: Liczba przeglądarek zbierających linki jednocześnie (1 = sekwencyjnie)
+        refresh: Pomiń cache i zbierz linki od nowa (wynik nadpisuje cache)
     
     Returns:
-        Lista URLi do meczów
+        Lista URLi do meczów (bez duplikatów, w kolejności sportów)
     """
     if not sports:
         sports = ['football']  # domyślnie piłka nożna
     
-    all_links = []
-    
+    # Nieznane sporty i aliasy tej samej strony (football/soccer, hockey/ice-hockey)
+    known_sports = []
+    seen_urls = set()
     for sport in sports:
         if sport not in SPORT_URLS:
             print(f"Ostrzeżenie: nieznany sport '{sport}', pomijam")
             continue
+        if SPORT_URLS[sport] not in seen_urls:
+            seen_urls.add(SPORT_URLS[sport])
+            known_sports.append(sport)
+    
+    cache = get_fixture_cache()
+    results: Dict[str, List[str]] = {}
+    if cache and not refresh:
+        for sport in known_sports:
+            cached = cache.get(date, _sport_page_key(sport), leagues)
+            if cached is not None:
+                results[sport] = cached
+    if results:
+        print(f"\n♻️  Linki z cache listy meczów: {', '.join(f'{s} ({len(results[s])})' for s in results)}")
+    
+    pending = [sport for sport in known_sports if sport not in results]
+    workers = max(1, min(workers or LINK_DISCOVERY_WORKERS, len(pending) or 1))
+    
+    if pending:
+        start_time = time.time()
+        # Sporty rozdzielone między przeglądarki; chunk 0 = przekazany driver
+        chunks = [pending[i::workers] for i in range(workers)]
+        collected: Dict[str, Optional[List[str]]] = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='links') as executor:
+            futures = [executor.submit(_collect_chunk_on_new_driver, chunk, date, leagues) for chunk in chunks[1:]]
+            for sport in chunks[0]:
+                collected[sport] = _collect_sport_links_safe(driver, sport, date, leagues)
+            for future in futures:
+                collected.update(future.result())
+        
+        # Sporty, dla których nie wystartowała dodatkowa przeglądarka
+        for sport in pending:
+            if sport not in collected:
+                collected[sport] = _collect_sport_links_safe(driver, sport, date, leagues)
+        
+        for sport, links in collected.items():
+            if links is None:
+                continue
+            results[sport] = links
+            if cache:
+                cache.set(date, _sport_page_key(sport), leagues, links)
         
-        sport_url = SPORT_URLS[sport]
-        print(f"\n🔍 Zbieranie linków dla: {sport}")
-        
-        try:
-            # Dodaj datę do URL aby pobrać mecze z konkretnego dnia
-            date_url = f"{sport_url}?date={date}"
-            print(f"   URL: {date_url}")
-            driver.get(date_url)
-            
-            # Volleyball i niektóre sporty potrzebują więcej czasu na załadowanie
-            # ZWIĘKSZONE dla GitHub Actions - strona ładuje się wolniej w chmurze
-            is_github = os.environ.get('GITHUB_ACTIONS') == 'true'
-            if is_github:
-                # GitHub Actions: dłuższy timeout dla ładowania
-                if sport in ['volleyball', 'handball', 'rugby']:
-                    time.sleep(3.5)
-                else:
-                    time.sleep(2.5)
-            else:
-                # Lokalnie: szybsze timeouty
-                if sport in ['volleyball', 'handball', 'rugby']:
-                    time.sleep(2.0)
-                else:
-                    time.sleep(1.2)
-            
-            # Scroll w dół aby załadować więcej meczów (więcej razy dla pewności)
-            for _ in range(3):  # Zwiększone z 2 na 3
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(0.5)  # Zwiększone z 0.3s na 0.5s
-            
-            # Scroll do góry aby zobaczyć wszystkie mecze
-            driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.3)  # Zmniejszone z 0.5s na 0.3s
-            
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            anchors = soup.find_all('a', href=True)
-            
-            sport_links = []
-            debug_patterns_found = {'/match/': 0, '/mecz/': 0, '/#/match/': 0, '/#id/': 0}
-            
-            for a in anchors:
-                href = a['href']
-                # Szukamy linków do meczów
-                patterns_match = ['/match/', '/mecz/', '/#/match/', '/#id/']
-                matched = False
-                
-                for pattern in patterns_match:
-                    if pattern in href:
-                        debug_patterns_found[pattern] += 1
-                        matched = True
-                        break
-                
-                if matched:
-                    # Normalizacja URLa
-                    if href.startswith('/'):
-                        href = 'https://www.livesport.com' + href
-                    elif href.startswith('#'):
-                        href = sport_url + href
-                    
-                    # Filtrowanie po ligach (jeśli podano)
-                    if leagues:
-                        # Sprawdź czy któraś z lig jest w URLu
-                        if not any(league.lower() in href.lower() for league in leagues):
-                            # Sprawdź też tekst linku
-                            link_text = a.get_text(strip=True).lower()
-                            if not any(league.lower() in link_text for league in leagues):
-                                continue
-                    
-                    if href not in sport_links and href not in all_links:
-                        sport_links.append(href)
-            
-            # Debug info gdy nic nie znaleziono (dla wszystkich sportów)
-            if len(sport_links) == 0:
-                print(f"   ⚠️  BRAK MECZÓW dla {sport} - DEBUG:")
-                print(f"   ⚠️  Wzorce znalezione: {debug_patterns_found}")
-                print(f"   ⚠️  Wszystkich linków na stronie: {len(anchors)}")
-                # Pokaż przykładowe hrefs (pierwsze 10)
-                sample_hrefs = [a['href'] for a in anchors[:20] if a.get('href')]
-                if sample_hrefs:
-                    print(f"   ⚠️  Przykładowe hrefs (pierwsze 5):")
-                    for idx, href in enumerate(sample_hrefs[:5], 1):
-                        print(f"      {idx}. {href[:100]}...")
-                else:
-                    print(f"   ⚠️  NIE znaleziono ŻADNYCH linków <a href=...> na stronie!")
-                    print(f"   💡 Możliwe przyczyny:")
-                    print(f"      - Strona wymaga więcej czasu na załadowanie (JavaScript)")
-                    print(f"      - Data jest w przyszłości lub przeszłości bez meczów")
-                    print(f"      - Livesport zmienił strukturę strony")
-            else:
-                print(f"   ✓ Znaleziono {len(sport_links)} meczów dla {sport}")
-            all_links.extend(sport_links)
-            
-        except Exception as e:
-            print(f"   ✗ Błąd przy zbieraniu linków dla {sport}: {e}")
-            continue
+        if workers > 1:
+            print(f"\n⏱️  Linki {len(pending)} sportów zebrane w {time.time() - start_time:.1f}s ({workers} przeglądarki)")
     
-    return all_links
+    all_links = []
+    for sport in known_sports:
+        all_links.extend(results.get(sport, []))
+    return list(dict.fromkeys(all_links))
 
 
 def get_match_links_advanced(driver: webdriver.Chrome, date: str, sports: List[str] = None) -> List[str]:
@@ -2781,19 +3062,21 @@ def get_match_links_advanced(driver: webdriver.Chrome, date: str, sports: List[s
             # Niektóre sporty obsługują date w URLu
             date_url = f"{base_url}?date={date}"
             
-            driver.get(date_url)
-            time.sleep(1.5)  # Zmniejszone z 2.5s na 1.5s
+            page = get_page_context(driver)
+            page.navigate(date_url)
+            wait_for_page(driver, f'listing:{sport}', MATCH_LINK_SELECTOR, rows_selector=MATCH_LINK_SELECTOR)
             
             # Próbuj kliknąć datę w kalendarzu (jeśli istnieje)
             try:
                 calendar_btn = driver.find_element(By.XPATH, "//button[contains(@class, 'calendar') or contains(@aria-label, 'calendar')]")
                 calendar_btn.click()
-                time.sleep(0.5)  # Zmniejszone z 1.0s na 0.5s
+                wait_for_network_idle(driver, get_adaptive_timeouts().timeout('tab'))
             except:
                 pass
             
             # Zbierz linki
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            page.invalidate()  # Kliknięcie kalendarza mogło zmienić DOM
+            soup = page.soup()
             for a in soup.find_all('a', href=True):
                 href = a['href']
                 if any(p in href for p in ['/match/', '/mecz/']):
@@ -2854,11 +3137,27 @@ Przykłady użycia:
                        help='Szczegółowe logi (debug mode) - pokazuje wszystkie kroki scrapowania')
     parser.add_argument('--app-url', help='URL aplikacji UI do wysyłki danych (np. http://localhost:3001 lub https://twoja-app.herokuapp.com)')
     parser.add_argument('--app-api-key', help='API Key do autoryzacji w aplikacji UI')
+    parser.add_argument('--fetch-backend', choices=FETCH_BACKENDS, default='auto',
+                       help='Pobieranie H2H: auto (HTTP bez przeglądarki, fallback Selenium) lub selenium (zawsze Chrome)')
+    parser.add_argument('--odds-workers', type=int, default=4,
+                       help='Wątki pobierające kursy w tle równolegle z przeglądarką (0 = kursy inline)')
+    parser.add_argument('--odds-mode', choices=['concurrent', 'sequential'], default='concurrent',
+                       help='Kursy: concurrent (wszyscy bukmacherzy naraz) lub sequential (po kolei, STS-first)')
+    parser.add_argument('--parquet', action='store_true',
+                       help='Zapisz wyniki także jako Parquet (typy zagnieżdżone, wymaga pyarrow)')
+    parser.add_argument('--shard', type=parse_shard, default=None, metavar='K/N',
+                       help='Przetwórz tylko shard K z N (podział po haszu event_id, np. 3/8)')
+    parser.add_argument('--link-workers', type=int, default=LINK_DISCOVERY_WORKERS,
+                       help='Przeglądarki zbierające linki sportów równolegle w trybie auto (1 = sekwencyjnie)')
+    parser.add_argument('--refresh-fixtures', action='store_true',
+                       help='Zbierz listę meczów od nowa (pomiń dzienny cache listy meczów)')
     args = parser.parse_args()
 
     # Ustaw VERBOSE globalnie
-    global VERBOSE
+    global VERBOSE, H2H_FETCH_BACKEND, ODDS_FETCH_MODE
     VERBOSE = args.verbose
+    H2H_FETCH_BACKEND = args.fetch_backend
+    ODDS_FETCH_MODE = args.odds_mode
 
     # Walidacja
     if args.mode == 'urls' and not args.input:
@@ -2896,7 +3195,14 @@ Przykłady użycia:
         if args.advanced:
             urls = get_match_links_advanced(driver, args.date, args.sports)
         else:
-            urls = get_match_links_from_day(driver, args.date, args.sports, args.leagues)
+            urls = get_match_links_from_day(driver, args.date, args.sports, args.leagues, workers=args.link_workers,
+                                            refresh=args.refresh_fixtures)
+
+    if args.shard:
+        shard_index, shard_total = args.shard
+        total_urls = len(urls)
+        urls = shard_urls(urls, shard_index, shard_total)
+        print(f'\n🧩 Shard {shard_index}/{shard_total}: {len(urls)} z {total_urls} meczów')
 
     print(f'\n✅ Znaleziono {len(urls)} meczów do sprawdzenia')
     
@@ -2913,19 +3219,75 @@ Przykłady użycia:
     print('🔄 Rozpoczynam przetwarzanie meczów...')
     print('='*60)
     
-    rows = []
     qualifying_count = 0
     
-    # KLUCZOWE: Na GitHub Actions używaj krótszego interwału (mniej RAM)
-    # Wykryj środowisko GitHub Actions
-    is_github_actions = os.environ.get('GITHUB_ACTIONS') == 'true'
-    if is_github_actions:
-        RESTART_INTERVAL = 30  # GitHub Actions: restart co 30 meczów (oszczędność pamięci)
-        print("🔧 Wykryto GitHub Actions - używam skróconego interwału restartu (30 meczów)")
-    else:
-        RESTART_INTERVAL = 80  # Lokalnie: restart co 80 meczów
+    # Restart przeglądarki tylko po przekroczeniu budżetu pamięci (RSS Chrome / sterta JS)
+    recycle_policy = RecyclePolicy()
+    recycle_stats = RecycleStats()
+    uses_since_restart = 0
+    
+    # Nazwa pliku z opcjonalnym sufixem
+    suffix = f'_{args.output_suffix}' if args.output_suffix else ''
+    if args.sports and len(args.sports) == 1:
+        suffix = f'_{args.sports[0]}{suffix}'
     
-    CHECKPOINT_INTERVAL = 20  # Checkpoint co 20 meczów (zwiększona częstotliwość dla bezpieczeństwa)
+    # Dodaj sufiks dla trybu away_team_focus
+    if args.away_team_focus:
+        suffix = f'{suffix}_AWAY_FOCUS'
+    
+    outfn = os.path.join('outputs', f'livesport_h2h_{args.date}{suffix}.csv')
+    result_file = os.path.basename(outfn)  # Nazwa wyniku dnia (przy --shard po scaleniu shardów)
+    if args.shard:
+        outfn = shard_output_path(outfn, *args.shard)
+    
+    # Wyniki zapisywane strumieniowo (wiersz po wierszu) - przerwany przebieg zostawia kompletny CSV
+    sink = ResultSink(outfn, parquet_path=outfn.replace('.csv', '.parquet') if args.parquet else None)
+    
+    # Baza danych (wiersz po wierszu - indeks /api/match/<id> aktualny w trakcie przebiegu)
+    # i aplikacja UI (paczkami) - w pamięci nie rośnie lista wszystkich wyników (2500+ meczów)
+    forwarders = []
+    db = None
+    db_saved = 0
+    if DB_AVAILABLE:
+        try:
+            db = MatchDatabase()
+        except Exception as e:
+            print(f'⚠️ Baza danych niedostępna: {e}')
+    # Wyniki process_match nie zawierają daty/sportu - bez nich filtr po dacie w API nic nie znajdzie
+    db_sport = args.sports[0] if args.sports and len(args.sports) == 1 else ''
+    
+    # NOWE V4: Wysyłka danych do aplikacji UI (Heroku/Railway)
+    app_forward = None
+    if args.app_url:
+        try:
+            from app_integrator import AppIntegrator
+            
+            integrator = AppIntegrator(app_url=args.app_url, api_key=args.app_api_key)
+            print(f'\n🔍 Testuję połączenie z aplikacją...')
+            print(f'   URL: {args.app_url}')
+            if integrator.test_connection():
+                print(f'   ✅ Połączenie działa!')
+            else:
+                print(f'   ⚠️  Nie udało się połączyć, ale próbuję wysyłać dane...')
+            app_sport = args.sports[0] if args.sports else 'unknown'
+            app_forward = BatchForwarder(lambda batch: integrator.send_matches(batch, args.date, app_sport),
+                                         batch_size=100, name='aplikacja UI')
+            forwarders.append(app_forward)
+        except ImportError:
+            print(f'⚠️  app_integrator.py nie znaleziony - pomijam wysyłkę do aplikacji')
+    
+    def emit(info: Dict):
+        nonlocal db_saved
+        sink.write(info)
+        if db and db.insert_result(info, args.date, db_sport, source_file=result_file) != -1:
+            db_saved += 1
+        for forwarder in forwarders:
+            forwarder.write(info)
+    
+    # Kursy pobierane w tle (osobna pula I/O), równolegle z pracą przeglądarki
+    odds_prefetcher = OddsPrefetcher(max_workers=args.odds_workers) if args.odds_workers > 0 else None
+    if odds_prefetcher:
+        odds_prefetcher.submit(urls)
     
     for i, url in enumerate(urls, 1):
         if VERBOSE:
@@ -2940,7 +3302,7 @@ Przykłady użycia:
             if is_tennis:
                 # Użyj dedykowanej funkcji dla tenisa (ADVANCED)
                 info = process_match_tennis(url, driver)
-                rows.append(info)
+                emit(info)
                 
                 if info['qualifies']:
                     qualifying_count += 1
@@ -2985,8 +3347,9 @@ Przykłady użycia:
                         print(f'   ❌ Nie kwalifikuje (H2H: {player_a_wins}-{player_b_wins}, Score: {advanced_score:.1f}/100)')
             else:
                 # Sporty drużynowe (football, basketball, etc.)
-                info = process_match(url, driver, away_team_focus=args.away_team_focus)
-                rows.append(info)
+                info = process_match(url, driver, away_team_focus=args.away_team_focus,
+                                     odds_prefetcher=odds_prefetcher)
+                emit(info)
                 
                 if info['qualifies']:
                     qualifying_count += 1
@@ -3039,21 +3402,25 @@ Przykłady użycia:
             if VERBOSE:
                 print(f'   ⚠️  Błąd: {e}')
         
-        # AUTO-RESTART przeglądarki co N meczów (zapobiega crashom)
-        if i % RESTART_INTERVAL == 0 and i < len(urls):
-            print(f'\n🔄 AUTO-RESTART: Restartowanie przeglądarki po {i} meczach...')
-            print(f'   ✅ Przetworzone dane ({len(rows)} meczów) są bezpieczne w pamięci!')
+        # AUTO-RESTART przeglądarki gdy przekroczy budżet pamięci (zapobiega crashom/OOM)
+        uses_since_restart += 1
+        restart_reason = recycle_policy.check(driver, uses_since_restart, recycle_stats) if i < len(urls) else None
+        if restart_reason:
+            print(f'\n🔄 AUTO-RESTART: Restartowanie przeglądarki po {uses_since_restart} meczach ({restart_reason})...')
+            print(f'   ✅ Przetworzone dane ({sink.rows_written} meczów) są już zapisane w {outfn}!')
+            restart_started = time.time()
             try:
                 driver.quit()
                 # Wymuś garbage collection dla zwolnienia pamięci (ważne na GitHub Actions)
                 gc.collect()
-                time.sleep(2)
                 driver = start_driver(headless=args.headless)
                 print(f'   ✅ Przeglądarka zrestartowana! Kontynuuję od meczu {i+1}...\n')
             except Exception as e:
                 print(f'   ⚠️  Błąd restartu: {e}')
                 gc.collect()  # Wyczyść pamięć mimo błędu
                 driver = start_driver(headless=args.headless)
+            recycle_stats.record(restart_reason, time.time() - restart_started)
+            uses_since_restart = 0
         
         # Rate limiting - adaptacyjny (zoptymalizowany)
         elif i < len(urls):
@@ -3061,55 +3428,27 @@ Przykłady użycia:
             time.sleep(delay)
 
     driver.quit()
+    if odds_prefetcher:
+        odds_prefetcher.close()
 
     # Wyczyść progress indicator z trybu normalnego
     if not VERBOSE:
         print()  # Nowa linia po progress indicator
     
-    # Zapisywanie wyników
+    # Zamknięcie pliku wyników (wiersze zapisywane na bieżąco przez ResultSink)
     print('\n' + '='*60)
     print('💾 Zapisywanie wyników...')
     print('='*60)
     
-    os.makedirs('outputs', exist_ok=True)
-    
-    # Nazwa pliku z opcjonalnym sufixem
-    suffix = f'_{args.output_suffix}' if args.output_suffix else ''
-    if args.sports and len(args.sports) == 1:
-        suffix = f'_{args.sports[0]}{suffix}'
-    
-    # Dodaj sufiks dla trybu away_team_focus
-    if args.away_team_focus:
-        suffix = f'{suffix}_AWAY_FOCUS'
-    
-    outfn = os.path.join('outputs', f'livesport_h2h_{args.date}{suffix}.csv')
-
-    # Przygotowanie DataFrame
-    df = pd.DataFrame(rows)
-    
-    # Konwersja h2h_last5 (lista słowników) na string dla CSV
-    if 'h2h_last5' in df.columns:
-        df['h2h_last5'] = df['h2h_last5'].apply(lambda x: str(x) if x else '')
-    
-    # Konwersja all_odds (słownik) na JSON string dla CSV (NOWE V3)
-    if 'all_odds' in df.columns:
-        import json
-        df['all_odds'] = df['all_odds'].apply(lambda x: json.dumps(x, ensure_ascii=False) if x else '')
-    
-    # Konwersja bookmakers_found (lista) na string dla CSV (NOWE V3)
-    if 'bookmakers_found' in df.columns:
-        df['bookmakers_found'] = df['bookmakers_found'].apply(lambda x: ', '.join(x) if isinstance(x, list) else str(x) if x else '')
-    
-    df.to_csv(outfn, index=False, encoding='utf-8-sig')
+    sink.close()
+    if sink.parquet_path:
+        print(f'   Parquet: {sink.parquet_path}')
 
-    # NOWE V3: Zapisz do bazy danych SQLite (dla aplikacji webowej)
-    if DB_AVAILABLE and rows:
+    # NOWE V3: Baza danych SQLite (dla aplikacji webowej) - zapisywana w trakcie przebiegu
+    processed = sink.rows_written
+    if db:
+        print(f'\n✅ Zapisano {db_saved}/{processed} meczów do bazy danych')
         try:
-            print('\n💾 Zapisywanie do bazy danych...')
-            db = MatchDatabase()
-            inserted = db.insert_matches_batch(rows)
-            print(f'✅ Zapisano {inserted}/{len(rows)} meczów do bazy danych')
-            
             # Pokaż statystyki bazy
             stats = db.get_stats()
             print(f'📊 Statystyki bazy danych:')
@@ -3118,48 +3457,38 @@ Przykłady użycia:
             print(f'   Sportów: {stats["unique_sports"]}')
             print(f'   Ostatnia aktualizacja: {stats["last_update"]}')
         except Exception as e:
-            print(f'⚠️ Błąd zapisu do bazy danych: {e}')
-
-    # NOWE V4: Wysyłka danych do aplikacji UI (Heroku/Railway)
-    if args.app_url and rows:
-        try:
-            print('\n🔗 KROK 4/4: Wysyłanie danych do aplikacji UI...')
-            print('='*70)
-            from app_integrator import AppIntegrator
-            
-            integrator = AppIntegrator(app_url=args.app_url, api_key=args.app_api_key)
-            
-            # Test połączenia
-            print(f'\n🔍 Testuję połączenie z aplikacją...')
-            print(f'   URL: {args.app_url}')
-            if integrator.test_connection():
-                print(f'   ✅ Połączenie działa!')
-            else:
-                print(f'   ⚠️  Nie udało się połączyć, ale próbuję wysłać dane...')
-            
-            # Wysyłka danych
-            print(f'\n📤 Wysyłam dane do aplikacji...')
-            sport = args.sports[0] if args.sports else 'unknown'
-            
-            if integrator.send_matches(rows, args.date, sport):
-                print(f'✅ Synchronizacja z aplikacją ukończona!')
-            else:
-                print(f'⚠️  Nie udało się wysłać danych (ale scraping się powiedł)')
-                
-        except ImportError:
-            print(f'⚠️  app_integrator.py nie znaleziony - pomijam wysyłkę do aplikacji')
-        except Exception as e:
-            print(f'⚠️  Błąd podczas wysyłki do aplikacji: {e}')
-    elif args.app_url and not rows:
-        print(f'\n⚠️  Brak danych do wysłania do aplikacji UI')
+            print(f'⚠️ Błąd odczytu statystyk bazy danych: {e}')
+
+    if app_forward:
+        app_forward.close()
+        if app_forward.batches_failed == 0 and app_forward.rows_sent:
+            print(f'✅ Synchronizacja z aplikacją ukończona! ({app_forward.rows_sent} meczów)')
+        elif app_forward.rows_sent or app_forward.batches_failed:
+            print(f'⚠️  Nie udało się wysłać {app_forward.batches_failed} paczek do aplikacji '
+                  f'(wysłano {app_forward.rows_sent} meczów, scraping się powiódł)')
+        else:
+            print(f'\n⚠️  Brak danych do wysłania do aplikacji UI')
     elif not args.app_url:
         print(f'\n💡 TIP: Użyj --app-url aby automatycznie wysyłać dane do aplikacji UI')
 
     # Podsumowanie
     print(f'\n📊 PODSUMOWANIE:')
-    print(f'   Przetworzono meczów: {len(rows)}')
-    print(f'   Kwalifikujących się: {qualifying_count} ({qualifying_count/len(rows)*100:.1f}%)' if rows else '   Brak danych')
+    print(f'   Przetworzono meczów: {processed}')
+    print(f'   Kwalifikujących się: {qualifying_count} ({qualifying_count/processed*100:.1f}%)' if processed else '   Brak danych')
     print(f'   Zapisano do: {outfn}')
+    odds_cache = get_odds_cache()
+    if odds_cache:
+        cache_stats = odds_cache.stats()
+        print(f'   Cache kursów: {cache_stats["hits"]} hit / {cache_stats["misses"]} miss '
+              f'({cache_stats["hit_rate"]*100:.0f}%)')
+    restarts = recycle_stats.summary(processed)
+    print(f'   Restarty przeglądarki: {restarts["restarts"]} (łącznie {restarts["restart_s"]}s, '
+          f'powody: {restarts["reasons"] or "-"}, szczyt RSS Chrome: {restarts["peak_rss_mb"]} MB)')
+    page_stats = get_page_stats()
+    if page_stats and page_stats.pages:
+        summary = page_stats.summary()
+        print(f'   Strony: {summary["pages"]}, średnio {summary["avg_kb"]} KB / '
+              f'{summary["avg_requests"]} zapytań / {summary["avg_load_ms"]} ms')
     print('\n✨ Gotowe!')
 
 
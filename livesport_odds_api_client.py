@@ -11,19 +11,179 @@ POPRAWKI V2 (2025-11-01):
 - 12 bukmacherów w mapowaniu (w tym polskie: STS, Fortuna, Superbet)
 - Rate limiting (200ms między requestami)
 
+POPRAWKI V3:
+- Współdzielony Session z dużą pulą połączeń (get_shared_session)
+- Globalny limit równoległych requestów + token bucket (rate limit) dla WSZYSTKICH klientów
+- fetch_odds_from_bookmakers(): równoległe zapytania do wielu bukmacherów naraz
+- Cache odpowiedzi na dysku (odds_cache.py) - klucz (event_id, bukmacher, betType, betScope), TTL
+- iter_odds_for_matches(): batch wielu meczów równolegle (generator, deadline per mecz, 1X2 + O/U + BTTS)
+- Błędy transportu (sieć, HTTP != 200, 429) -> OddsFetchError, NIE są zapisywane w cache jako "brak kursów"
+
 Źródło: Zintegrowane z livesportscraper repository
 """
 
 import requests
 import re
-from typing import Dict, Optional, List
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from typing import Dict, Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 import time
+from requests.adapters import HTTPAdapter
+
+from odds_cache import MISS, get_odds_cache
+
+
+# ============================================================================
+# WSPÓŁDZIELONA PULA POŁĄCZEŃ + LIMITY (wspólne dla wszystkich klientów i wątków)
+# ============================================================================
+
+# Maksymalna liczba równoległych requestów do API (cały proces)
+API_MAX_CONCURRENCY = int(os.environ.get('LIVESPORT_API_MAX_CONCURRENCY', '8'))
+# Maksymalna liczba requestów na sekundę (token bucket)
+API_RATE_LIMIT = float(os.environ.get('LIVESPORT_API_RATE_LIMIT', '10'))
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Accept': '*/*',
+    'Accept-Language': 'pl-PL,pl;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br, zstd',
+    'Origin': 'https://www.livesport.com',
+    'Referer': 'https://www.livesport.com/',
+    'sec-ch-ua': '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'cross-site',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache',
+}
+
+
+class OddsFetchError(Exception):
+    """Błąd transportu (sieć, HTTP != 200, 429, zły JSON) - odpowiedź NIE trafia do cache"""
+
+
+class TokenBucket:
+    """Prosty, wątkowo bezpieczny rate limiter (token bucket)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokeny na sekundę (<= 0 = bez limitu)
+            capacity: Maksymalny "zapas" tokenów (domyślnie = rate, min. 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Pobierz token (czeka, jeśli limit został wyczerpany)"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_api_slots = threading.BoundedSemaphore(max(1, API_MAX_CONCURRENCY))
+_api_rate = TokenBucket(API_RATE_LIMIT)
+
+_shared_session: Optional[requests.Session] = None
+_odds_executor: Optional[ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """Jeden Session (keep-alive, pula połączeń) współdzielony przez wszystkich klientów"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, API_MAX_CONCURRENCY * 2))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _shared_session = session
+        return _shared_session
+
+
+def _get_odds_executor() -> ThreadPoolExecutor:
+    global _odds_executor
+    with _shared_lock:
+        if _odds_executor is None:
+            _odds_executor = ThreadPoolExecutor(max_workers=max(1, API_MAX_CONCURRENCY),
+                                                thread_name_prefix='odds-api')
+        return _odds_executor
+
+
+def extract_event_id_from_url(url: str) -> Optional[str]:
+    """
+    Ekstraktuje event_id z URL meczu Livesport.
+    
+    Formaty URL:
+    - https://www.livesport.com/pl/pilka-nozna/polska/ekstraklasa/legia-warszawa-gornik-zabrze/UveDRb0k/?mid=KdfeT8U2
+    - https://www.livesport.com/match/abc123/?mid=xyz789
+    
+    Returns:
+        Event ID (np. "KdfeT8U2") lub None
+    """
+    try:
+        # Metoda 1: Parametr ?mid= w URL
+        parsed = urlparse(url)
+        query_params = parse_qs(parsed.query)
+        
+        if 'mid' in query_params:
+            event_id = query_params['mid'][0]
+            if event_id:
+                return event_id
+        
+        # Metoda 2: ID w ścieżce URL (przed parametrami)
+        # Format: /druzyna1-druzyna2/EVENT_ID/?...
+        path_parts = parsed.path.rstrip('/').split('/')
+        if len(path_parts) >= 2:
+            # Ostatnia część ścieżki (przed ?)
+            potential_id = path_parts[-1]
+            # Event ID zazwyczaj: 8 znaków alfanumeryczne
+            if re.match(r'^[A-Za-z0-9]{8}$', potential_id):
+                return potential_id
+        
+        return None
+    
+    except Exception as e:
+        print(f"   ⚠️ extract_event_id error: {e}")
+        return None
+
+
+def detect_sport_from_url(match_url: str) -> Optional[str]:
+    """Wykrywa sport bez remisu z URL meczu (None = domyślny betType z remisem)"""
+    if '/siatkowka/' in match_url or '/volleyball/' in match_url:
+        return 'volleyball'
+    elif '/pilka-reczna/' in match_url or '/handball/' in match_url:
+        return 'handball'
+    elif '/tenis/' in match_url or '/tennis/' in match_url:
+        return 'tennis'
+    elif '/rugby/' in match_url:
+        return 'rugby'
+    return None
+
 
 class LiveSportOddsAPI:
     """Klient do pobierania kursów bukmacherskich z LiveSport GraphQL API"""
     
-    def __init__(self, bookmaker_id: str = "167", geo_ip_code: str = "PL", geo_subdivision: str = "PL10"):
+    def __init__(self, bookmaker_id: str = "167", geo_ip_code: str = "PL", geo_subdivision: str = "PL10",
+                 session: Optional[requests.Session] = None, use_cache: bool = True):
         """
         Inicjalizuje klienta API
         
@@ -31,34 +191,24 @@ class LiveSportOddsAPI:
             bookmaker_id: ID bukmachera (domyślnie "167" = STS dla Polski)
             geo_ip_code: Kod kraju (PL)
             geo_subdivision: Kod regionu (PL10 = Mazowieckie)
+            session: Współdzielony Session (np. get_shared_session()) - domyślnie własny
+            use_cache: Czy używać cache kursów na dysku (odds_cache, TTL)
         """
         self.bookmaker_id = bookmaker_id
         self.geo_ip_code = geo_ip_code
         self.geo_subdivision = geo_subdivision
+        self.use_cache = use_cache
         
         # PRAWDZIWY Endpoint GraphQL API Livesport
         self.api_url = "https://global.ds.lsapp.eu/odds/pq_graphql"
         
-        # Stwórz session z connection pooling
-        self.session = requests.Session()
-        
-        # POPRAWIONE NAGŁÓWKI V2 - bardziej realistyczne (Chrome 131)
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'Accept': '*/*',
-            'Accept-Language': 'pl-PL,pl;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Origin': 'https://www.livesport.com',
-            'Referer': 'https://www.livesport.com/',
-            'sec-ch-ua': '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'cross-site',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache',
-        })
+        # Stwórz session z connection pooling (lub użyj współdzielonego)
+        if session is not None:
+            self.session = session
+        else:
+            self.session = requests.Session()
+            # POPRAWIONE NAGŁÓWKI V2 - bardziej realistyczne (Chrome 131)
+            self.session.headers.update(DEFAULT_HEADERS)
         
         # Mapowanie ID bukmacherów (ROZSZERZONE - 12 bukmacherów!)
         self.bookmaker_names = {
@@ -77,42 +227,40 @@ class LiveSportOddsAPI:
         }
     
     
-    def extract_event_id_from_url(self, url: str) -> Optional[str]:
-        """
-        Ekstraktuje event_id z URL meczu Livesport.
+    def _api_get(self, params: Dict, timeout: float) -> requests.Response:
+        """GET do API z globalnym limitem równoległości i rate limitem"""
+        with _api_slots:
+            _api_rate.acquire()
+            return self.session.get(self.api_url, params=params, timeout=timeout)
+    
+    
+    def _cached(self, event_id: str, bet_type: str, bet_scope: str, fetch):
+        """Zwróć odpowiedź z cache kursów (odds_cache) albo pobierz ją z API i zapamiętaj"""
+        cache = get_odds_cache() if self.use_cache else None
+        if cache is None:
+            try:
+                return fetch()
+            except OddsFetchError:
+                return None
         
-        Formaty URL:
-        - https://www.livesport.com/pl/pilka-nozna/polska/ekstraklasa/legia-warszawa-gornik-zabrze/UveDRb0k/?mid=KdfeT8U2
-        - https://www.livesport.com/match/abc123/?mid=xyz789
+        key = (event_id, self.bookmaker_id, bet_type, bet_scope)
+        cached = cache.get(key)
+        if cached is not MISS:
+            return cached
         
-        Returns:
-            Event ID (np. "KdfeT8U2") lub None
-        """
         try:
-            # Metoda 1: Parametr ?mid= w URL
-            parsed = urlparse(url)
-            query_params = parse_qs(parsed.query)
-            
-            if 'mid' in query_params:
-                event_id = query_params['mid'][0]
-                if event_id:
-                    return event_id
-            
-            # Metoda 2: ID w ścieżce URL (przed parametrami)
-            # Format: /druzyna1-druzyna2/EVENT_ID/?...
-            path_parts = parsed.path.rstrip('/').split('/')
-            if len(path_parts) >= 2:
-                # Ostatnia część ścieżki (przed ?)
-                potential_id = path_parts[-1]
-                # Event ID zazwyczaj: 8 znaków alfanumeryczne
-                if re.match(r'^[A-Za-z0-9]{8}$', potential_id):
-                    return potential_id
-            
-            return None
-        
-        except Exception as e:
-            print(f"   ⚠️ extract_event_id error: {e}")
+            result = fetch()
+        except OddsFetchError:
+            # Chwilowy błąd (sieć / 429) to nie "brak kursów" - bez zapisu,
+            # kolejna próba (retry wywołującego) znowu pyta API
             return None
+        cache.set(key, result)
+        return result
+    
+    
+    def extract_event_id_from_url(self, url: str) -> Optional[str]:
+        """Ekstraktuje event_id z URL meczu (patrz: extract_event_id_from_url)"""
+        return extract_event_id_from_url(url)
     
     
     def get_odds_for_event(self, event_id: str, sport: str = None) -> Optional[Dict]:
@@ -136,6 +284,22 @@ class LiveSportOddsAPI:
         else:
             bet_type = 'HOME_DRAW_AWAY'  # Z remisem (Football, Basketball, etc.)
         
+        return self._cached(event_id, bet_type, 'FULL_TIME',
+                            lambda: self._fetch_odds_for_event(event_id, bet_type))
+    
+    def _fetch_odds_for_event(self, event_id: str, bet_type: str) -> Optional[Dict]:
+        """
+        Pobiera kursy 1X2 z API (bez cache) - 3 próby + fallback
+        
+        Raises:
+            OddsFetchError: ostatnia próba zawiodła na transporcie, a fallback nic nie dał
+        """
+        def _fallback_or_fail(transport_error: Optional[str] = None) -> Optional[Dict]:
+            result = self._get_odds_fallback(event_id)
+            if result is None and transport_error:
+                raise OddsFetchError(transport_error)
+            return result
+        
         # PRÓBA 1-3: Główny endpoint (3 próby z exponential backoff)
         for attempt in range(3):
             try:
@@ -149,11 +313,7 @@ class LiveSportOddsAPI:
                 }
                 
                 # GET request do prawdziwego API
-                response = self.session.get(
-                    self.api_url,
-                    params=params,
-                    timeout=10
-                )
+                response = self._api_get(params, timeout=10)
                 
                 # Sprawdź status
                 if response.status_code != 200:
@@ -161,7 +321,7 @@ class LiveSportOddsAPI:
                         time.sleep(0.5 * (attempt + 1))  # Exponential backoff: 0.5s, 1.0s
                         continue
                     # Ostatnia próba - spróbuj fallback
-                    return self._get_odds_fallback(event_id)
+                    return _fallback_or_fail(f'HTTP {response.status_code}')
                 
                 # Parsuj JSON
                 try:
@@ -170,7 +330,7 @@ class LiveSportOddsAPI:
                     if attempt < 2:
                         time.sleep(0.5 * (attempt + 1))
                         continue
-                    return self._get_odds_fallback(event_id)
+                    return _fallback_or_fail(f'niepoprawny JSON: {json_err}')
                 
                 # Sprawdź czy data nie jest None
                 if not data or not isinstance(data, dict):
@@ -230,7 +390,7 @@ class LiveSportOddsAPI:
                 if attempt < 2:
                     time.sleep(0.5 * (attempt + 1))
                     continue
-                return self._get_odds_fallback(event_id)
+                return _fallback_or_fail(str(e))
             
             except (KeyError, ValueError, TypeError) as e:
                 if attempt < 2:
@@ -275,11 +435,7 @@ class LiveSportOddsAPI:
             
             for alt_params in alt_params_list:
                 try:
-                    response = self.session.get(
-                        self.api_url,
-                        params=alt_params,
-                        timeout=8
-                    )
+                    response = self._api_get(alt_params, timeout=8)
                     
                     if response.status_code == 200:
                         data = response.json()
@@ -343,14 +499,7 @@ class LiveSportOddsAPI:
         """
         # ✅ NOWE: Wykryj sport z URL jeśli nie podano
         if not sport:
-            if '/siatkowka/' in match_url or '/volleyball/' in match_url:
-                sport = 'volleyball'
-            elif '/pilka-reczna/' in match_url or '/handball/' in match_url:
-                sport = 'handball'
-            elif '/tenis/' in match_url or '/tennis/' in match_url:
-                sport = 'tennis'
-            elif '/rugby/' in match_url:
-                sport = 'rugby'
+            sport = detect_sport_from_url(match_url)
         
         # Wydobądź Event ID z URL
         event_id = self.extract_event_id_from_url(match_url)
@@ -382,6 +531,12 @@ class LiveSportOddsAPI:
                 'line_type': 'goals'
             }
         """
+        return self._cached(event_id, 'OVER_UNDER', 'FULL_TIME',
+                            lambda: self._fetch_over_under_odds(event_id, sport))
+    
+    
+    def _fetch_over_under_odds(self, event_id: str, sport: str = 'football') -> Optional[Dict]:
+        """Pobiera kursy O/U z API (bez cache)"""
         try:
             # Parametry dla Over/Under
             params = {
@@ -393,22 +548,18 @@ class LiveSportOddsAPI:
             }
             
             # GET request
-            response = self.session.get(
-                self.api_url,
-                params=params,
-                timeout=10
-            )
+            response = self._api_get(params, timeout=10)
             
             if response.status_code != 200:
                 print(f"   ⚠️ API O/U ERROR {response.status_code}: {response.text[:200]}")
-                return None
+                raise OddsFetchError(f'HTTP {response.status_code}')
             
             # Parsuj JSON
             try:
                 data = response.json()
             except (ValueError, TypeError) as json_err:
                 print(f"   ⚠️ Błąd parsowania O/U JSON: {json_err}")
-                return None
+                raise OddsFetchError(f'niepoprawny JSON: {json_err}')
             
             # Sprawdź czy data nie jest None
             if not data:
@@ -464,7 +615,7 @@ class LiveSportOddsAPI:
         
         except requests.exceptions.RequestException as e:
             print(f"   ⚠️ Błąd API O/U request: {e}")
-            return None
+            raise OddsFetchError(str(e))
         
         except (KeyError, ValueError, TypeError) as e:
             print(f"   ⚠️ Błąd parsowania O/U: {e}")
@@ -481,6 +632,12 @@ class LiveSportOddsAPI:
                 'btts_no': 2.05
             }
         """
+        return self._cached(event_id, 'BOTH_TEAMS_SCORE', 'FULL_TIME',
+                            lambda: self._fetch_btts_odds(event_id))
+    
+    
+    def _fetch_btts_odds(self, event_id: str) -> Optional[Dict]:
+        """Pobiera kursy BTTS z API (bez cache)"""
         try:
             params = {
                 '_hash': 'ope2',
@@ -490,20 +647,16 @@ class LiveSportOddsAPI:
                 'betScope': 'FULL_TIME'
             }
             
-            response = self.session.get(
-                self.api_url,
-                params=params,
-                timeout=10
-            )
+            response = self._api_get(params, timeout=10)
             
             if response.status_code != 200:
-                return None
+                raise OddsFetchError(f'HTTP {response.status_code}')
             
             # Parsuj JSON
             try:
                 data = response.json()
-            except (ValueError, TypeError):
-                return None
+            except (ValueError, TypeError) as json_err:
+                raise OddsFetchError(f'niepoprawny JSON: {json_err}')
             
             # Sprawdź czy data nie jest None
             if not data:
@@ -538,7 +691,10 @@ class LiveSportOddsAPI:
             
             return None
         
-        except Exception as e:
+        except requests.exceptions.RequestException as e:
+            raise OddsFetchError(str(e))
+        
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
             print(f"   ⚠️ Błąd BTTS: {e}")
             return None
     
@@ -566,8 +722,8 @@ class LiveSportOddsAPI:
         """
         result = {}
         
-        # 1. Pobierz kursy 1X2
-        main_odds = self.get_odds_for_event(event_id)
+        # 1. Pobierz kursy 1X2 (betType zależny od sportu)
+        main_odds = self.get_odds_for_event(event_id, sport=sport)
         if main_odds:
             result.update(main_odds)
         
@@ -593,56 +749,213 @@ class LiveSportOddsAPI:
 # HELPER FUNCTIONS
 # ============================================================================
 
+def fetch_odds_from_bookmakers(match_url: str, bookmakers: List[Tuple[str, str]], sport: str = None,
+                               attempts: int = 3, geo_ip_code: str = "PL") -> Dict[str, Dict]:
+    """
+    Pobiera kursy 1X2 od WIELU bukmacherów RÓWNOLEGLE (jeden mecz).
+    
+    Wszystkie zapytania lecą naraz przez współdzielony Session; globalny limit
+    (API_MAX_CONCURRENCY + API_RATE_LIMIT) obowiązuje dla całego procesu.
+    
+    Args:
+        match_url: URL meczu z Livesport
+        bookmakers: Lista (bookmaker_id, nazwa) - np. [("167", "STS"), ("171", "Fortuna")]
+        sport: Sport (dla dynamicznego betType)
+        attempts: Liczba prób na bukmachera
+    
+    Returns:
+        {nazwa_bukmachera: odds_dict} - tylko bukmacherzy, którzy zwrócili kursy
+    """
+    session = get_shared_session()
+    
+    def _fetch_one(bm_id: str) -> Optional[Dict]:
+        client = LiveSportOddsAPI(bookmaker_id=bm_id, geo_ip_code=geo_ip_code, session=session)
+        for attempt in range(attempts):
+            try:
+                odds = client.get_odds_from_url(match_url, sport=sport)
+                if odds and (odds.get('home_odds') or odds.get('away_odds')):
+                    return odds
+            except Exception:
+                pass
+            if attempt < attempts - 1:
+                time.sleep(0.5 * (attempt + 1))  # Exponential backoff
+        return None
+    
+    executor = _get_odds_executor()
+    futures = {executor.submit(_fetch_one, bm_id): bm_name for bm_id, bm_name in bookmakers}
+    
+    results = {}
+    for future in as_completed(futures):
+        try:
+            odds = future.result()
+        except Exception:
+            odds = None
+        if odds:
+            results[futures[future]] = odds
+    return results
+
+
+def iter_odds_for_matches(match_urls: List[str], bookmaker_id: str = "165",
+                          max_workers: int = API_MAX_CONCURRENCY, deadline: Optional[float] = 30.0,
+                          all_markets: bool = True, rate_limit: Optional[float] = None):
+    """
+    Generator: pobiera kursy dla wielu meczów RÓWNOLEGLE i oddaje wyniki
+    w miarę ich nadejścia (kolejność NIE jest zachowana).
+    
+    Zamiast stałego sleep między meczami - ograniczona liczba zadań w locie
+    (max_workers) + token bucket (globalny API_RATE_LIMIT, opcjonalnie rate_limit).
+    
+    Args:
+        match_urls: Lista URL-i meczów
+        bookmaker_id: ID bukmachera
+        max_workers: Maksymalna liczba meczów pobieranych jednocześnie
+        deadline: Limit czasu na JEDEN mecz w sekundach, liczony od startu pobierania
+                  (None = bez limitu). Mecz po terminie jest oddawany jako błąd, a jego
+                  wątek do zakończenia requestu zajmuje miejsce w oknie max_workers
+        all_markets: True = 1X2 + O/U + BTTS w jednym przebiegu (get_complete_odds), False = tylko 1X2
+        rate_limit: Dodatkowy limit meczów na sekundę dla tej partii (None = tylko limit globalny)
+    
+    Yields:
+        {'match_url': ..., 'event_id': ..., 'odds': dict lub None, 'error': None / opis błędu}
+    """
+    client = LiveSportOddsAPI(bookmaker_id=bookmaker_id, session=get_shared_session())
+    limiter = TokenBucket(rate_limit) if rate_limit else None
+    max_workers = max(1, max_workers)
+    
+    def _fetch(url: str, started: List[float]) -> Dict:
+        if limiter:
+            limiter.acquire()
+        started.append(time.monotonic())  # Limit czasu liczony od startu, nie od zlecenia
+        event_id = extract_event_id_from_url(url)
+        if not event_id:
+            return {'match_url': url, 'event_id': None, 'odds': None, 'error': 'brak event_id w URL'}
+        
+        sport = detect_sport_from_url(url) or 'football'
+        if all_markets:
+            odds = client.get_complete_odds(event_id, sport=sport)
+        else:
+            odds = client.get_odds_for_event(event_id, sport=sport)
+        return {'match_url': url, 'event_id': event_id, 'odds': odds or None, 'error': None}
+    
+    def _deadline_at(started: List[float]) -> Optional[float]:
+        return started[0] + deadline if deadline and started else None
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='odds-batch')
+    pending = {}  # future -> (url, started) - started wypełnia wątek w chwili startu
+    abandoned = set()  # Po terminie, ale wątek wciąż pracuje - zajmuje miejsce w oknie
+    remaining = iter(match_urls)
+    exhausted = False
+    
+    try:
+        while True:
+            abandoned = {f for f in abandoned if not f.done()}
+            
+            # Dopełnij "okno" zadań w locie (porzucone po terminie też zajmują wątek)
+            while not exhausted and len(pending) + len(abandoned) < max_workers:
+                try:
+                    url = next(remaining)
+                except StopIteration:
+                    exhausted = True
+                    break
+                started = []
+                pending[executor.submit(_fetch, url, started)] = (url, started)
+            
+            if not pending:
+                if exhausted or not abandoned:
+                    break
+                # Wszystkie wątki zajęte przez porzucone mecze - czekaj aż któryś się zwolni
+                wait(abandoned, timeout=deadline, return_when=FIRST_COMPLETED)
+                continue
+            
+            deadlines = [d for d in (_deadline_at(started) for _, started in pending.values()) if d is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            if any(not started for _, started in pending.values()):
+                # Zadanie jeszcze nie wystartowało (token bucket) - sprawdź ponownie gdy ruszy
+                timeout = min(timeout, 0.1) if timeout is not None else 0.1
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                url, _ = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield {'match_url': url, 'event_id': None, 'odds': None, 'error': str(e)}
+            
+            # Mecze po terminie - oddaj jako błąd (wątek dokończy request w tle)
+            now = time.monotonic()
+            for future, (url, started) in list(pending.items()):
+                deadline_at = _deadline_at(started)
+                if deadline_at is not None and deadline_at <= now and not future.done():
+                    del pending[future]
+                    abandoned.add(future)
+                    yield {'match_url': url, 'event_id': None, 'odds': None,
+                           'error': f'przekroczono limit czasu ({deadline}s)'}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def get_odds_for_matches_batch(match_urls: list, bookmaker_id: str = "165", 
-                                delay: float = 0.5, verbose: bool = True) -> list:
+                                delay: Optional[float] = None, verbose: bool = True,
+                                max_workers: int = API_MAX_CONCURRENCY,
+                                deadline: Optional[float] = 30.0) -> list:
     """
     Pobiera kursy dla listy URL-i meczów (batch processing)
     
+    V3: Równolegle (iter_odds_for_matches) zamiast stałego sleep między meczami.
+    Jeden przebieg na mecz pobiera 1X2 + O/U + BTTS.
+    
     Args:
         match_urls: Lista URL-i meczów
         bookmaker_id: ID bukmachera (domyślnie "165" = Nordic Bet)
-        delay: Opóźnienie między requestami (w sekundach)
+        delay: (przestarzałe) jeśli podane - limit 1/delay meczów na sekundę
         verbose: Czy wyświetlać logi
+        max_workers: Maksymalna liczba meczów pobieranych jednocześnie
+        deadline: Limit czasu na jeden mecz (sekundy)
     
     Returns:
-        Lista słowników z danymi meczów + kursami
+        Lista słowników z danymi meczów + kursami (w kolejności match_urls)
     """
     if verbose:
         print(f"🎲 Rozpoczynam pobieranie kursów dla {len(match_urls)} meczów...")
-        print(f"📊 Bukmacher: {bookmaker_id}")
+        print(f"📊 Bukmacher: {bookmaker_id} | równolegle: {max_workers}")
     
-    client = LiveSportOddsAPI(bookmaker_id=bookmaker_id)
+    order = {url: i for i, url in enumerate(match_urls)}
     results = []
+    done_count = 0
     
-    for i, url in enumerate(match_urls, 1):
-        if verbose:
-            print(f"\n[{i}/{len(match_urls)}] {url}")
+    for item in iter_odds_for_matches(match_urls, bookmaker_id=bookmaker_id, max_workers=max_workers,
+                                      deadline=deadline, rate_limit=(1.0 / delay) if delay else None):
+        done_count += 1
+        url = item['match_url']
+        odds = item['odds']
         
-        odds = client.get_odds_from_url(url)
+        if verbose:
+            print(f"\n[{done_count}/{len(match_urls)}] {url}")
         
-        if odds:
+        if odds and odds.get('home_odds') and odds.get('away_odds'):
             result = {
                 'match_url': url,
                 'home_odds': odds['home_odds'],
-                'draw_odds': odds['draw_odds'],
+                'draw_odds': odds.get('draw_odds'),
                 'away_odds': odds['away_odds'],
-                'bookmaker_name': odds['bookmaker_name'],
-                'source': odds['source']
+                'bookmaker_name': odds.get('bookmaker_name'),
+                'source': odds.get('source')
             }
+            for key in ('over_odds', 'under_odds', 'ou_line', 'ou_line_type', 'btts_yes', 'btts_no'):
+                if odds.get(key) is not None:
+                    result[key] = odds[key]
             results.append(result)
             
             if verbose:
                 print(f"   ✅ Home: {odds['home_odds']}, ", end='')
-                if odds['draw_odds']:
+                if odds.get('draw_odds'):
                     print(f"Draw: {odds['draw_odds']}, ", end='')
                 print(f"Away: {odds['away_odds']}")
         else:
             if verbose:
-                print(f"   ⚠️ Brak kursów")
-        
-        # Rate limiting - nie spamuj API
-        if i < len(match_urls):
-            time.sleep(delay)
+                print(f"   ⚠️ Brak kursów" + (f" ({item['error']})" if item.get('error') else ''))
+    
+    results.sort(key=lambda r: order.get(r['match_url'], 0))
     
     if verbose:
         print(f"\n{'='*70}")
@@ -0,0 +1,263 @@
+"""
+MATCH STORE - Wczytane wyniki scrapowania w pamięci (dla api_server)
+====================================================================
+
+Wcześniej KAŻDY request /api/matches robił glob + pd.read_csv + iterrows
+z ast.literal_eval na każdym wierszu, a /api/match/<id> czytał wszystkie CSV
+z danego dnia. Klienci mobilni odpytują API co kilka sekund - każde odpytanie
+kosztowało pełne parsowanie pliku.
+
+MatchStore trzyma per plik CSV gotową tabelę:
+- rekordy meczów już przekonwertowane do formatu JSON API (formy, H2H sparsowane raz)
+- indeks id -> rekord (event_id z ?mid= oraz klucz z URL - match_ids)
+
+/api/match/<id> czyta rekord z indeksu w bazie (db_manager.match_records,
+zapisywany przez scrapery wiersz po wierszu - result_to_match); tabele CSV
+są tylko zapasem dla plików sprzed indeksu.
+
+Unieważnianie:
+- automatycznie, gdy zmieni się mtime/rozmiar pliku (ResultSink dopisuje wiersze
+  w trakcie scrapowania) lub pojawi się nowszy plik dla daty
+- ręcznie: invalidate(date) po zakończeniu scrapowania
+
+Pliki częściowe nie są wynikami dnia: shardy (_shardKofN - sharding.py scala je
+do pliku bez sufiksu) i pliki zadań API w toku (_API_<job_id> - po zakończeniu
+zadania zmieniane na _API.csv). Pomija je files_for_date (latest, find_match).
+"""
+
+import ast
+import glob
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from livesport_odds_api_client import extract_event_id_from_url
+from result_sink import csv_values
+
+# Pliki częściowe: wynik jednego shardu / zadania API w toku (patrz docstring modułu)
+PARTIAL_OUTPUT_RE = re.compile(r'_(shard\d+of\d+|API_[0-9a-f]+)\.csv$')
+
+
+# Pola tylko w widoku szczegółów (/api/match/<id>), nie w liście /api/matches
+DETAIL_ONLY_FIELDS = ('form_a', 'form_b')
+
+
+def _int(value, default: int = 0) -> int:
+    return int(value) if pd.notna(value) else default
+
+
+def _literal(value):
+    """Kolumny list/słowników z CSV (str(lista)) -> obiekt Pythona lub None"""
+    if pd.isna(value):
+        return None
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def url_match_key(url: str) -> str:
+    """Ostatni segment ścieżki URL meczu (bez ?mid=) - .../a-b/XyZaBcDe/?mid=Qw12Er34 -> XyZaBcDe"""
+    return url.split('?')[0].rstrip('/').split('/')[-1] if url else ''
+
+
+def match_ids(url: str) -> List[str]:
+    """Identyfikatory, pod którymi można pobrać mecz: event_id (?mid=), klucz z URL, id z listy API"""
+    ids = [extract_event_id_from_url(url) if url else None, url_match_key(url), url.split('/')[-1] if url else '']
+    return list(dict.fromkeys(i for i in ids if i))
+
+
+def row_to_match(row: Dict) -> Dict:
+    """Wiersz CSV -> pełny rekord meczu w formacie API"""
+    # Wykryj czy to tenis (ma kolumnę 'favorite' lub 'advanced_score')
+    is_tennis = pd.notna(row.get('favorite')) or pd.notna(row.get('advanced_score'))
+    match_url = row.get('match_url') if pd.notna(row.get('match_url')) else ''
+
+    match = {
+        'id': match_url.split('/')[-1],
+        'home_team': row.get('home_team', ''),
+        'away_team': row.get('away_team', ''),
+        'match_time': row.get('match_time', ''),
+        'home_wins': _int(row.get('home_wins_in_h2h_last5')),
+        'h2h_count': _int(row.get('h2h_count')),
+        'match_url': match_url,
+        'qualifies': bool(row.get('qualifies', False)) if pd.notna(row.get('qualifies')) else False,
+        'is_tennis': is_tennis
+    }
+
+    # Kursy bukmacherskie
+    if pd.notna(row.get('home_odds')):
+        match['home_odds'] = float(row['home_odds'])
+    if pd.notna(row.get('away_odds')):
+        match['away_odds'] = float(row['away_odds'])
+
+    # Tennis-specific data
+    if is_tennis:
+        if pd.notna(row.get('advanced_score')):
+            match['advanced_score'] = float(row['advanced_score'])
+        if pd.notna(row.get('favorite')):
+            match['favorite'] = row['favorite']
+        if pd.notna(row.get('ranking_a')):
+            match['ranking_a'] = int(row['ranking_a'])
+        if pd.notna(row.get('ranking_b')):
+            match['ranking_b'] = int(row['ranking_b'])
+        if pd.notna(row.get('surface')):
+            match['surface'] = row['surface']
+        for field in ('form_a', 'form_b'):
+            value = _literal(row.get(field))
+            if value is not None:
+                match[field] = value
+
+    # Forma drużyn/zawodników
+    for field in ('home_form_overall', 'away_form_overall', 'home_form_home', 'away_form_away'):
+        value = _literal(row.get(field))
+        if value is not None:
+            match[field] = value
+
+    # Przewaga formy i win rate
+    if pd.notna(row.get('form_advantage')):
+        match['form_advantage'] = bool(row['form_advantage'])
+    if pd.notna(row.get('win_rate')):
+        match['win_rate'] = float(row['win_rate'])
+
+    # Szczegóły H2H
+    if pd.notna(row.get('h2h_last5')):
+        match['h2h_details'] = _literal(row['h2h_last5']) or []
+
+    return match
+
+
+def result_to_match(result: Dict) -> Dict:
+    """Wynik process_match -> rekord API identyczny z odczytanym z CSV (row_to_match)"""
+    return row_to_match({name: (None if value == '' else value) for name, value in csv_values(result).items()})
+
+
+class MatchTable:
+    """Jeden plik CSV wczytany i zindeksowany"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = os.path.basename(path)
+        self.version = ''
+
+        df = pd.read_csv(path)
+        self.total = len(df)
+        self.matches: List[Dict] = [row_to_match(row) for row in df.to_dict('records')]
+        self.qualified_count = sum(1 for m in self.matches if m['qualifies'])
+
+        # Indeks id -> rekord (event_id z ?mid=, klucz z URL)
+        self.by_id: Dict[str, Dict] = {}
+        for match in self.matches:
+            for match_id in match_ids(match['match_url']):
+                self.by_id.setdefault(match_id, match)
+
+    def find(self, match_id: str) -> Optional[Dict]:
+        """Mecz po ID (tylko indeks - bez przeszukiwania wszystkich wierszy)"""
+        return self.by_id.get(match_id)
+
+    def query(self,
+              sport: Optional[str] = None,
+              min_wins: int = 0,
+              sort_by: str = 'time',
+              limit: Optional[int] = None) -> List[Dict]:
+        """Kwalifikujące się mecze z filtrami /api/matches (widok listy)"""
+        matches = [m for m in self.matches if m['qualifies']]
+        if sport:
+            matches = [m for m in matches if sport in m['match_url']]
+        # Tennis ma advanced_score zamiast prostego liczenia wygranych
+        if min_wins > 0:
+            matches = [m for m in matches if m['home_wins'] >= min_wins]
+
+        if sort_by == 'time':
+            matches.sort(key=lambda m: (pd.isna(m['match_time']), str(m['match_time'])))
+        elif sort_by == 'wins':
+            matches.sort(key=lambda m: m['home_wins'], reverse=True)
+        elif sort_by == 'team':
+            matches.sort(key=lambda m: str(m['home_team']))
+
+        if limit:
+            matches = matches[:limit]
+        return [{k: v for k, v in m.items() if k not in DETAIL_ONLY_FIELDS} for m in matches]
+
+
+def is_partial_output(path: str) -> bool:
+    """Plik shardu lub zadania API w toku - nie jest wynikiem dnia"""
+    return PARTIAL_OUTPUT_RE.search(os.path.basename(path)) is not None
+
+
+class MatchStore:
+    """Cache tabel meczów per plik, unieważniany po mtime/rozmiarze pliku"""
+
+    def __init__(self, outputs_dir: str = 'outputs'):
+        self.outputs_dir = outputs_dir
+        self._tables: Dict[str, tuple] = {}  # path -> (mtime_ns, size, MatchTable)
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def files_for_date(self, date: str) -> List[str]:
+        """Pliki wyników dla daty (najnowsze pierwsze, bez plików częściowych)"""
+        files = glob.glob(os.path.join(self.outputs_dir, f'livesport_h2h_{date}*.csv'))
+        return sorted((f for f in files if not is_partial_output(f)), key=os.path.getmtime, reverse=True)
+
+    def table(self, path: str) -> MatchTable:
+        """Tabela pliku - wczytana ponownie tylko po zmianie mtime/rozmiaru"""
+        stat = os.stat(path)
+        with self._lock:
+            cached = self._tables.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        table = MatchTable(path)
+        table.version = f'{stat.st_mtime_ns}-{stat.st_size}'  # Do ETagów API
+        with self._lock:
+            self._tables[path] = (stat.st_mtime_ns, stat.st_size, table)
+            self.loads += 1
+        return table
+
+    def latest(self, date: str) -> Optional[MatchTable]:
+        """Tabela najnowszego pliku dla daty (None = brak danych)"""
+        files = self.files_for_date(date)
+        return self.table(files[0]) if files else None
+
+    def find_match(self, date: str, match_id: str) -> Optional[tuple]:
+        """
+        Szukaj meczu we wszystkich plikach daty.
+
+        Returns:
+            (rekord meczu, nazwa pliku) lub None
+        """
+        for path in self.files_for_date(date):
+            try:
+                match = self.table(path).find(match_id)
+            except Exception as e:
+                print(f'Błąd przy wczytywaniu {path}: {e}')
+                continue
+            if match is not None:
+                return match, os.path.basename(path)
+        return None
+
+    def invalidate(self, date: Optional[str] = None):
+        """Usuń z cache tabele dla daty (None = wszystkie) - np. po zakończeniu scrapowania"""
+        with self._lock:
+            if date is None:
+                self._tables.clear()
+                return
+            prefix = f'livesport_h2h_{date}'
+            for path in [p for p in self._tables if os.path.basename(p).startswith(prefix)]:
+                del self._tables[path]
+
+
+_store: Optional[MatchStore] = None
+_store_lock = threading.Lock()
+
+
+def get_match_store() -> MatchStore:
+    """Wspólny MatchStore procesu API"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MatchStore()
+        return _store
@@ -0,0 +1,219 @@
+"""
+ODDS CACHE - Cache kursów bukmacherskich na dysku (SQLite)
+==========================================================
+
+Kolejne uruchomienia tego samego dnia (restart po crashu, tryb away-focus po
+home-focus, ponowny run z GitHub Actions) pytały API o DOKŁADNIE te same
+wydarzenia. Cache trzyma odpowiedzi API per:
+
+    (event_id, bookmaker_id, betType, betScope)
+
+Funkcje:
+- TTL (domyślnie 1h) - kursy się zmieniają, więc stare wpisy wygasają
+- krótszy TTL dla "brak kursów" (None) - bukmacher może je jeszcze wystawić
+- LRU: po przekroczeniu limitu usuwane są najdawniej używane wpisy
+- plik SQLite (WAL) współdzielony przez wiele procesów (np. --parallel, shardy)
+- liczniki hit/miss
+
+Konfiguracja (zmienne środowiskowe):
+    LIVESPORT_ODDS_CACHE=0              - wyłącz cache
+    LIVESPORT_ODDS_CACHE_PATH           - ścieżka pliku (domyślnie outputs/odds_cache.db)
+    LIVESPORT_ODDS_CACHE_TTL            - TTL w sekundach (domyślnie 3600)
+    LIVESPORT_ODDS_CACHE_MAX_ENTRIES    - limit wpisów LRU (domyślnie 50000)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Znacznik "brak w cache" (None to poprawna, zapamiętana odpowiedź "brak kursów")
+MISS = object()
+
+DEFAULT_CACHE_PATH = os.path.join('outputs', 'odds_cache.db')
+DEFAULT_TTL = 3600           # 1h
+DEFAULT_NEGATIVE_TTL = 600   # 10 min dla "brak kursów"
+DEFAULT_MAX_ENTRIES = 50000
+
+CacheKey = Tuple[str, str, str, str]  # (event_id, bookmaker_id, bet_type, bet_scope)
+
+
+class OddsCache:
+    """Cache odpowiedzi Odds API z TTL i eviction LRU"""
+
+    def __init__(self,
+                 db_path: str = DEFAULT_CACHE_PATH,
+                 ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.negative_ttl = min(negative_ttl, ttl)
+        self.max_entries = max_entries
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_evict = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_table()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Osobne połączenie per wątek (sqlite3 nie lubi współdzielenia między wątkami)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_table(self):
+        conn = self._conn()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS odds_cache (
+                event_id TEXT NOT NULL,
+                bookmaker_id TEXT NOT NULL,
+                bet_type TEXT NOT NULL,
+                bet_scope TEXT NOT NULL,
+                payload TEXT,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (event_id, bookmaker_id, bet_type, bet_scope)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_odds_cache_accessed ON odds_cache(accessed_at)')
+        conn.commit()
+
+    def get(self, key: CacheKey):
+        """
+        Returns:
+            Zapamiętana odpowiedź (dict lub None) albo MISS
+        """
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                'SELECT payload, expires_at FROM odds_cache '
+                'WHERE event_id=? AND bookmaker_id=? AND bet_type=? AND bet_scope=?',
+                key
+            ).fetchone()
+
+            if row is None or row[1] < now:
+                with self._lock:
+                    self.misses += 1
+                return MISS
+
+            # LRU - odśwież czas ostatniego użycia
+            conn.execute(
+                'UPDATE odds_cache SET accessed_at=? '
+                'WHERE event_id=? AND bookmaker_id=? AND bet_type=? AND bet_scope=?',
+                (now,) + tuple(key)
+            )
+            conn.commit()
+        except sqlite3.Error:
+            # Zablokowana/uszkodzona baza nie może zatrzymać scrapera - traktuj jak miss
+            with self._lock:
+                self.misses += 1
+            return MISS
+
+        with self._lock:
+            self.hits += 1
+        return json.loads(row[0]) if row[0] is not None else None
+
+    def set(self, key: CacheKey, value: Optional[Dict]):
+        """Zapisz odpowiedź API (None = "brak kursów", krótszy TTL)"""
+        now = time.time()
+        ttl = self.ttl if value else self.negative_ttl
+        payload = json.dumps(value) if value is not None else None
+        try:
+            conn = self._conn()
+            conn.execute(
+                'INSERT OR REPLACE INTO odds_cache '
+                '(event_id, bookmaker_id, bet_type, bet_scope, payload, expires_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                tuple(key) + (payload, now + ttl, now)
+            )
+            conn.commit()
+        except sqlite3.Error:
+            return
+
+        with self._lock:
+            self._writes_since_evict += 1
+            evict = self._writes_since_evict >= 100
+            if evict:
+                self._writes_since_evict = 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Usuń wygasłe wpisy i najdawniej używane ponad limit (LRU)"""
+        try:
+            conn = self._conn()
+            deleted = conn.execute('DELETE FROM odds_cache WHERE expires_at < ?', (time.time(),)).rowcount
+            count = conn.execute('SELECT COUNT(*) FROM odds_cache').fetchone()[0]
+            if count > self.max_entries:
+                deleted += conn.execute(
+                    'DELETE FROM odds_cache WHERE rowid IN ('
+                    'SELECT rowid FROM odds_cache ORDER BY accessed_at ASC LIMIT ?)',
+                    (count - self.max_entries,)
+                ).rowcount
+            conn.commit()
+            return deleted
+        except sqlite3.Error:
+            return 0
+
+    def clear(self):
+        """Wyczyść cały cache"""
+        conn = self._conn()
+        conn.execute('DELETE FROM odds_cache')
+        conn.commit()
+
+    def stats(self) -> Dict:
+        """Liczniki hit/miss (bieżący proces) + liczba wpisów w pliku"""
+        try:
+            entries = self._conn().execute('SELECT COUNT(*) FROM odds_cache').fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'entries': entries,
+            }
+
+
+_default_cache: Optional[OddsCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_odds_cache() -> Optional[OddsCache]:
+    """
+    Współdzielony cache procesu (konfiguracja ze zmiennych środowiskowych).
+
+    Returns:
+        OddsCache lub None jeśli wyłączony (LIVESPORT_ODDS_CACHE=0) / niedostępny
+    """
+    global _default_cache
+    if os.environ.get('LIVESPORT_ODDS_CACHE', '1') == '0':
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = OddsCache(
+                    db_path=os.environ.get('LIVESPORT_ODDS_CACHE_PATH', DEFAULT_CACHE_PATH),
+                    ttl=float(os.environ.get('LIVESPORT_ODDS_CACHE_TTL', DEFAULT_TTL)),
+                    max_entries=int(os.environ.get('LIVESPORT_ODDS_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)),
+                )
+            except (sqlite3.Error, OSError) as e:
+                print(f"   ⚠️ Cache kursów niedostępny: {e}")
+                return None
+        return _default_cache
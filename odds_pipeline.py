@@ -0,0 +1,148 @@
+"""
+ODDS PIPELINE - Pobieranie kursów RÓWNOLEGLE z przetwarzaniem w przeglądarce
+===========================================================================
+
+Wcześniej process_match pobierał kursy (multi-bookmaker 1X2, O/U, BTTS) inline,
+a przeglądarka w tym czasie stała bezczynnie - opóźnienia sieci i Chrome się sumowały.
+
+Pipeline etapowy:
+1. get_match_links_from_day() -> lista URL-i (event_id w ?mid=)
+2. OddsPrefetcher.submit(urls) - osobna pula wątków I/O pobiera kursy 1X2 w tle
+3. Przeglądarka scrapuje H2H/formę, a process_match(..., odds_prefetcher=...)
+   dołącza gotowe kursy po event_id (gdy jeszcze nie gotowe - czeka na nie;
+   gdy nieudane - pobiera inline jak dawniej)
+
+Z góry pobierany jest tylko rynek 1X2 (potrzebny dla każdego meczu). O/U i BTTS
+process_match dociąga sam, tylko dla meczów z co najmniej 5 H2H - prefetch
+wszystkich rynków dla całej listy to 3x więcej zapytań, w większości zbędnych.
+
+Użycie:
+    with OddsPrefetcher(max_workers=4) as prefetcher:
+        prefetcher.submit(urls)
+        for url in urls:
+            info = process_match(url, driver, odds_prefetcher=prefetcher)
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+from livesport_odds_api_client import extract_event_id_from_url
+
+
+class OddsPrefetcher:
+    """Pula I/O pobierająca kursy dla meczów zanim dotrze do nich przeglądarka"""
+
+    def __init__(self,
+                 max_workers: int = 4,
+                 fetch_fn: Optional[Callable[[str], Dict]] = None,
+                 timeout: float = 60.0):
+        """
+        Args:
+            max_workers: Liczba wątków I/O (mecze pobierane jednocześnie)
+            fetch_fn: Funkcja url -> kursy (domyślnie fetch_match_odds ze scrapera)
+            timeout: Maksymalny czas oczekiwania na kursy jednego meczu w get()
+        """
+        self._fetch_fn = fetch_fn or self._default_fetch
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='odds-prefetch')
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.hits = 0
+        self.misses = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    @staticmethod
+    def _default_fetch(url: str) -> Dict:
+        # Import lokalny - unikamy cyklicznego importu ze scraperem
+        from livesport_h2h_scraper import fetch_match_odds
+        return fetch_match_odds(url)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """Klucz łączenia: event_id (ten sam mecz pod różnymi URL-ami) lub sam URL"""
+        return extract_event_id_from_url(url) or url
+
+    # ------------------------------------------------------------------
+    # Etap 1: zlecanie pobierania
+    # ------------------------------------------------------------------
+
+    def submit(self, urls: Iterable[str]) -> int:
+        """
+        Zleć pobranie kursów w tle (kolejność = kolejność przetwarzania w przeglądarce).
+
+        Returns:
+            Liczba nowo zleconych meczów
+        """
+        count = 0
+        with self._lock:
+            for url in urls:
+                # Tenis ma osobną ścieżkę (process_match_tennis) - nie używa tych kursów
+                if '/tenis/' in url.lower() or '/tennis/' in url.lower():
+                    continue
+                key = self._key(url)
+                if key in self._futures:
+                    continue
+                self._futures[key] = self._executor.submit(self._fetch_fn, url)
+                count += 1
+            self.submitted += count
+        return count
+
+    # ------------------------------------------------------------------
+    # Etap 3: łączenie z wynikami przeglądarki
+    # ------------------------------------------------------------------
+
+    def get(self, url: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Kursy pobrane w tle dla meczu.
+
+        Returns:
+            Wynik fetch_fn lub None (mecz nie był zlecony / błąd / timeout)
+            - wtedy process_match pobiera kursy inline
+        """
+        with self._lock:
+            future = self._futures.pop(self._key(url), None)
+            if future is None:
+                self.misses += 1
+                return None
+
+        try:
+            result = future.result(timeout=timeout if timeout is not None else self.timeout)
+        except Exception as e:
+            print(f"   ⚠️ Prefetch kursów nieudany ({e}) - pobieram inline")
+            with self._lock:
+                self.failed += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'hits': self.hits,
+                'misses': self.misses,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'pending': sum(1 for f in self._futures.values() if not f.done()),
+            }
+
+    def close(self):
+        """Zatrzymaj pulę - niepobrane jeszcze kursy są anulowane (trwające zapytania kończą się w tle)"""
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+            self.cancelled += sum(1 for future in futures if future.cancel())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
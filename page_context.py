@@ -0,0 +1,74 @@
+"""
+PAGE CONTEXT - Jednokrotne parsowanie DOM strony
+================================================
+
+Strona H2H Livesport ma 1-2 MB HTML. Wcześniej każdy ekstraktor
+(nazwy drużyn, H2H, forma, kursy Selenium) budował własny
+BeautifulSoup(driver.page_source) - ten sam dokument parsowany 3-4 razy na mecz.
+
+PageContext trzyma sparsowany dokument dla AKTUALNEJ strony przeglądarki:
+- soup jest budowany leniwie (przy pierwszym użyciu) i współdzielony
+- unieważniany TYLKO po nawigacji (navigate) lub zmianie DOM (invalidate - np. kliknięcie zakładki)
+- parser lxml jeśli zainstalowany (kilka razy szybszy), inaczej html.parser
+
+Użycie:
+    ctx = get_page_context(driver)
+    ctx.navigate(h2h_url)
+    soup = ctx.soup()    # parsowanie
+    soup = ctx.soup()    # ten sam obiekt - bez ponownego parsowania
+"""
+
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+from browser_profile import get_page_stats, measure_page
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+class PageContext:
+    """Sparsowany dokument aktualnej strony jednej przeglądarki"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.url: Optional[str] = None
+        self._soup: Optional[BeautifulSoup] = None
+        self.parses = 0  # Licznik parsowań (diagnostyka)
+
+    def navigate(self, url: str):
+        """Przejdź na stronę i unieważnij sparsowany dokument"""
+        # Pomiar opuszczanej strony (z lazy-loadingiem) - tylko gdy LIVESPORT_PAGE_STATS=1
+        stats = get_page_stats()
+        if stats is not None and self.url is not None:
+            stats.record(measure_page(self.driver))
+        self.invalidate()
+        self.url = url
+        self.driver.get(url)
+
+    def invalidate(self):
+        """DOM się zmienił (nawigacja, kliknięcie zakładki) - następne soup() parsuje od nowa"""
+        self._soup = None
+
+    def soup(self) -> BeautifulSoup:
+        """Sparsowany dokument aktualnej strony (parsowany najwyżej raz na nawigację)"""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.driver.page_source, HTML_PARSER)
+            self.parses += 1
+        return self._soup
+
+
+def get_page_context(driver) -> PageContext:
+    """
+    Kontekst przypięty do przeglądarki - każdy driver (też w BrowserPool)
+    ma własny, więc wątki nie współdzielą dokumentów.
+    """
+    ctx = getattr(driver, '_page_context', None)
+    if ctx is None or ctx.driver is not driver:
+        ctx = PageContext(driver)
+        driver._page_context = ctx
+    return ctx
@@ -0,0 +1,137 @@
+"""
+PROGRESS BUS - Postęp zadań scrapowania na żywo (Server-Sent Events)
+====================================================================
+
+Klienci odpytywali GET /api/scrape/status co kilka sekund. Teraz zadanie
+scrapowania PUBLIKUJE zdarzenia do kolejki w procesie (bez HTTP na gorącej
+ścieżce), a GET /api/scrape/stream przekazuje je klientom jako SSE:
+
+    event: status   {"job_id": ..., "progress": 12, "total": 80, ...}
+    event: match    {"job_id": ..., "home_team": ..., "qualifies": true, ...}
+    event: done     {"job_id": ..., "status": "completed"}
+
+- publish() nigdy nie blokuje: kolejka subskrybenta ma limit, przy przepełnieniu
+  najstarsze zdarzenie jest odrzucane (wolny klient nie spowalnia scrapera)
+- nowy subskrybent dostaje ostatnie zdarzenia zadania (replay), więc nie czeka
+  na kolejny mecz, żeby zobaczyć stan
+
+Przeglądarka:
+    const es = new EventSource('/api/scrape/stream?job=3f2a9c1d4e5b');
+    es.addEventListener('match', e => console.log(JSON.parse(e.data)));
+"""
+
+import itertools
+import json
+import queue
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+
+TERMINAL_EVENT = 'done'
+
+
+class Subscription:
+    """Kolejka zdarzeń jednego klienta SSE"""
+
+    def __init__(self, bus: 'ProgressBus', job_id: Optional[str], maxsize: int):
+        self.bus = bus
+        self.job_id = job_id
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, event: Dict):
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()  # Odrzuć najstarsze
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float = 15.0) -> Optional[Dict]:
+        """Następne zdarzenie lub None po timeoucie (czas na heartbeat)"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ProgressBus:
+    """Publish/subscribe zdarzeń postępu w obrębie procesu"""
+
+    def __init__(self, replay: int = 20, subscriber_queue_size: int = 500):
+        """
+        Args:
+            replay: Ile ostatnich zdarzeń zadania dostaje nowy subskrybent
+            subscriber_queue_size: Limit kolejki klienta (potem odrzucane najstarsze)
+        """
+        self.replay = replay
+        self.subscriber_queue_size = subscriber_queue_size
+        self._subscribers = set()
+        self._history: Dict[str, deque] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, job_id: str, event: str, data: Dict):
+        """Opublikuj zdarzenie zadania (nieblokujące)"""
+        message = {'id': next(self._ids), 'event': event, 'data': dict(data, job_id=job_id)}
+        with self._lock:
+            history = self._history.setdefault(job_id, deque(maxlen=self.replay))
+            history.append(message)
+            subscribers = [s for s in self._subscribers if s.job_id in (None, job_id)]
+        for subscription in subscribers:
+            subscription.put(message)
+
+    def subscribe(self, job_id: Optional[str] = None) -> Subscription:
+        """
+        Subskrybuj zdarzenia zadania (None = wszystkie zadania)
+        """
+        subscription = Subscription(self, job_id, self.subscriber_queue_size)
+        with self._lock:
+            if job_id is not None:
+                for message in self._history.get(job_id, ()):
+                    subscription.put(message)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def forget(self, job_id: str):
+        """Usuń historię zakończonego zadania"""
+        with self._lock:
+            self._history.pop(job_id, None)
+
+
+def sse_format(message: Dict) -> str:
+    """Zdarzenie -> ramka text/event-stream"""
+    data = json.dumps(message['data'], ensure_ascii=False, default=str)
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {data}\n\n"
+
+
+_bus: Optional[ProgressBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Wspólna szyna postępu procesu"""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = ProgressBus()
+        return _bus
@@ -0,0 +1,328 @@
+"""
+RESULT SINK - Strumieniowy zapis wyników scrapowania (CSV + opcjonalnie Parquet)
+===============================================================================
+
+Wcześniej oba skrypty (livesport_h2h_scraper.main, scrape_and_send_email)
+budowały na końcu jeden duży DataFrame ze WSZYSTKICH wyników i dopiero wtedy
+zapisywały CSV. ResultSink zapisuje każdy wiersz od razu po przetworzeniu meczu:
+
+- STAŁY schemat kolumn (RESULT_SCHEMA) - ta sama kolejność i zestaw kolumn w każdym pliku
+- CSV kompatybilny z dotychczasowymi czytnikami (api_server, email_notifier):
+    h2h_last5 / formy -> str(lista)   (ast.literal_eval)
+    all_odds          -> JSON         (json.loads)
+    bookmakers_found  -> "STS, Fortuna"
+- Parquet (jeśli zainstalowany pyarrow) z PRAWDZIWYMI typami zagnieżdżonymi:
+    h2h_last5 -> list<struct>, formy -> list<string>, all_odds -> map<string, struct>
+- flush co `flush_every` wierszy (CSV: flush pliku, Parquet: jedna row group)
+
+BatchForwarder przekazuje te same wiersze dalej (baza, aplikacja UI, Supabase)
+paczkami po `batch_size` - w pamięci jest najwyżej jedna paczka, a nie lista
+wszystkich wyników przebiegu.
+
+Użycie:
+    with ResultSink('outputs/wynik.csv', parquet_path='outputs/wynik.parquet') as sink:
+        for url in urls:
+            sink.write(process_match(url, driver))
+
+    db_forward = BatchForwarder(db.insert_matches_batch, batch_size=100)
+    db_forward.write(row)   # wysyła co 100 wierszy
+    db_forward.close()      # reszta
+"""
+
+import csv
+import json
+import math
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+# (kolumna, typ) - typy: str, int, float, bool, list (lista stringów), bookmakers,
+#                        h2h (lista meczów H2H), odds_map (kursy per bukmacher), json
+RESULT_SCHEMA: List[Tuple[str, str]] = [
+    ('match_url', 'str'),
+    ('home_team', 'str'),
+    ('away_team', 'str'),
+    ('match_time', 'str'),
+    ('h2h_last5', 'h2h'),
+    ('home_wins_in_h2h_last5', 'int'),
+    ('away_wins_in_h2h_last5', 'int'),
+    ('h2h_count', 'int'),
+    ('win_rate', 'float'),
+    ('qualifies', 'bool'),
+    ('home_form', 'list'),
+    ('away_form', 'list'),
+    ('home_odds', 'float'),
+    ('away_odds', 'float'),
+    ('draw_odds', 'float'),
+    ('focus_team', 'str'),
+    ('home_form_overall', 'list'),
+    ('home_form_home', 'list'),
+    ('away_form_overall', 'list'),
+    ('away_form_away', 'list'),
+    ('form_advantage', 'bool'),
+    ('bookmakers_found', 'bookmakers'),
+    ('best_home_bookmaker', 'str'),
+    ('best_away_bookmaker', 'str'),
+    ('all_odds', 'odds_map'),
+    ('ou_qualifies', 'bool'),
+    ('ou_recommendation', 'str'),
+    ('ou_line', 'str'),
+    ('ou_line_type', 'str'),
+    ('ou_h2h_percentage', 'float'),
+    ('over_odds', 'float'),
+    ('under_odds', 'float'),
+    ('btts_qualifies', 'bool'),
+    ('btts_h2h_percentage', 'float'),
+    ('btts_yes_odds', 'float'),
+    ('btts_no_odds', 'float'),
+    ('avg_home_goals', 'float'),
+    ('avg_away_goals', 'float'),
+    # Tenis (process_match_tennis)
+    ('away_wins_in_h2h', 'int'),
+    ('ranking_a', 'int'),
+    ('ranking_b', 'int'),
+    ('form_a', 'list'),
+    ('form_b', 'list'),
+    ('surface', 'str'),
+    ('advanced_score', 'float'),
+    ('favorite', 'str'),
+    ('score_breakdown', 'json'),
+]
+
+H2H_FIELDS = ['date', 'home', 'away', 'score', 'winner', 'raw']
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+# ----------------------------------------------------------------------
+# CSV - format zgodny z dotychczasowym pd.DataFrame(rows).to_csv(...)
+# ----------------------------------------------------------------------
+
+def _to_csv_value(value, kind: str):
+    if _is_missing(value):
+        return ''
+    if kind in ('h2h', 'list'):
+        return str(value) if value else ''
+    if kind == 'bookmakers':
+        return ', '.join(value) if isinstance(value, list) else str(value)
+    if kind in ('odds_map', 'json'):
+        return json.dumps(value, ensure_ascii=False, default=str) if value else ''
+    return value
+
+
+# ----------------------------------------------------------------------
+# Parquet - typy zagnieżdżone
+# ----------------------------------------------------------------------
+
+def _arrow_type(kind: str):
+    if kind == 'int':
+        return pa.int64()
+    if kind == 'float':
+        return pa.float64()
+    if kind == 'bool':
+        return pa.bool_()
+    if kind in ('list', 'bookmakers'):
+        return pa.list_(pa.string())
+    if kind == 'h2h':
+        return pa.list_(pa.struct([(f, pa.string()) for f in H2H_FIELDS]))
+    if kind == 'odds_map':
+        return pa.map_(pa.string(), pa.struct([('home', pa.float64()), ('away', pa.float64()), ('draw', pa.float64())]))
+    return pa.string()  # str, json
+
+
+def _to_arrow_value(value, kind: str):
+    if _is_missing(value):
+        return None
+    try:
+        if kind == 'int':
+            return int(value)
+        if kind == 'float':
+            return float(value)
+        if kind == 'bool':
+            return bool(value)
+        if kind in ('list', 'bookmakers'):
+            if isinstance(value, str):
+                value = [v.strip() for v in value.split(',') if v.strip()]
+            return [str(v) for v in value]
+        if kind == 'h2h':
+            return [{f: (str(m[f]) if m.get(f) is not None else None) for f in H2H_FIELDS}
+                    for m in value if isinstance(m, dict)]
+        if kind == 'odds_map':
+            return [(str(bm), {k: (float(v) if v is not None else None) for k, v in odds.items()
+                               if k in ('home', 'away', 'draw')})
+                    for bm, odds in value.items()]
+        if kind == 'json':
+            return json.dumps(value, ensure_ascii=False, default=str)
+        return str(value)
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def csv_values(row: Dict, schema: List[Tuple[str, str]] = RESULT_SCHEMA) -> Dict:
+    """Wynik meczu -> {kolumna: wartość} dokładnie tak, jak trafia do CSV"""
+    return {name: _to_csv_value(row.get(name), kind) for name, kind in schema}
+
+
+class ResultSink:
+    """Strumieniowy zapis wyników meczów (wiersz po wierszu)"""
+
+    def __init__(self,
+                 csv_path: str,
+                 parquet_path: Optional[str] = None,
+                 schema: List[Tuple[str, str]] = RESULT_SCHEMA,
+                 flush_every: int = 25):
+        """
+        Args:
+            csv_path: Plik CSV (nadpisywany)
+            parquet_path: Opcjonalny plik Parquet (wymaga pyarrow)
+            schema: Lista (kolumna, typ) - stały schemat wyjścia
+            flush_every: Co ile wierszy zapisywać bufor na dysk
+        """
+        self.csv_path = csv_path
+        self.schema = schema
+        self.columns = [name for name, _ in schema]
+        self.flush_every = max(1, flush_every)
+        self.rows_written = 0
+
+        self._lock = threading.Lock()  # Tryb --parallel
+        self._pending = 0
+        self._closed = False
+
+        directory = os.path.dirname(csv_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._csv_file = open(csv_path, 'w', encoding='utf-8-sig', newline='')
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(self.columns)
+
+        self.parquet_path = None
+        self._parquet_writer = None
+        self._parquet_buffer: List[Dict] = []
+        if parquet_path:
+            if PARQUET_AVAILABLE:
+                self.parquet_path = parquet_path
+                self._arrow_schema = pa.schema([(name, _arrow_type(kind)) for name, kind in schema])
+            else:
+                print("⚠️ pyarrow nie zainstalowany - zapis Parquet wyłączony (pip install pyarrow)")
+
+    def write(self, row: Dict):
+        """Zapisz wynik jednego meczu"""
+        with self._lock:
+            if self._closed:
+                raise ValueError('ResultSink jest już zamknięty')
+            self._csv.writerow(list(csv_values(row, self.schema).values()))
+            if self.parquet_path:
+                self._parquet_buffer.append(
+                    {name: _to_arrow_value(row.get(name), kind) for name, kind in self.schema}
+                )
+            self.rows_written += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self._csv_file.flush()
+        if self.parquet_path and self._parquet_buffer:
+            table = pa.Table.from_pylist(self._parquet_buffer, schema=self._arrow_schema)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.parquet_path, self._arrow_schema)
+            self._parquet_writer.write_table(table)
+            self._parquet_buffer = []
+        self._pending = 0
+
+    def flush(self):
+        with self._lock:
+            if not self._closed:
+                self._flush_locked()
+
+    def close(self):
+        """Zapisz bufory i zamknij pliki (bezpieczne przy wielokrotnym wywołaniu)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._csv_file.close()
+            if self.parquet_path and self._parquet_writer is None:
+                # Brak wierszy - zapisz pusty plik ze schematem
+                pq.write_table(self._arrow_schema.empty_table(), self.parquet_path)
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class BatchForwarder:
+    """Przekazywanie wierszy dalej paczkami (stała pamięć niezależnie od liczby meczów)"""
+
+    def __init__(self, send: Callable[[List[Dict]], object], batch_size: int = 100, name: str = ''):
+        """
+        Args:
+            send: Funkcja wysyłająca paczkę wierszy (wynik False / 0 / wyjątek = paczka nieudana)
+            batch_size: Ile wierszy w jednej paczce
+            name: Nazwa celu w komunikatach błędów
+        """
+        self.send = send
+        self.batch_size = max(1, batch_size)
+        self.name = name
+        self.rows_sent = 0
+        self.batches_sent = 0
+        self.batches_failed = 0
+
+        self._lock = threading.Lock()  # Tryb --parallel
+        self._batch: List[Dict] = []
+
+    def write(self, row: Dict):
+        """Dodaj wiersz (pełna paczka jest wysyłana od razu)"""
+        with self._lock:
+            self._batch.append(row)
+            if len(self._batch) >= self.batch_size:
+                self._send_locked()
+
+    def write_all(self, rows: Iterable[Dict]):
+        for row in rows:
+            self.write(row)
+
+    def _send_locked(self):
+        batch, self._batch = self._batch, []
+        try:
+            ok = self.send(batch)
+        except Exception as e:
+            print(f"⚠️ {self.name or 'BatchForwarder'}: błąd wysyłki paczki ({len(batch)} wierszy): {e}")
+            ok = False
+        if ok is False or ok == 0:
+            self.batches_failed += 1
+        else:
+            self.batches_sent += 1
+            self.rows_sent += len(batch)
+
+    def flush(self):
+        """Wyślij niepełną paczkę"""
+        with self._lock:
+            if self._batch:
+                self._send_locked()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
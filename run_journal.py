@@ -0,0 +1,148 @@
+"""
+RUN JOURNAL - Dziennik przebiegu scrapowania (wznawianie po crashu/timeoucie)
+============================================================================
+
+Każdy przetworzony mecz jest DOPISYWANY jako jedna linia JSON do pliku
+<wynik>.journal.jsonl (klucz: match_url). Zamiast co N meczów przepisywać
+cały CSV (koszt rośnie z każdym checkpointem), zapis jest stały per mecz.
+
+Przy ponownym uruchomieniu z --resume:
+- mecze z dziennika NIE są scrapowane drugi raz
+- ich wyniki trafiają na początek finalnego CSV (CSV / email są kompletne)
+
+W pamięci trzymane są tylko URL-e - wyniki są czytane z pliku strumieniowo
+(iter_rows), więc pamięć nie rośnie z liczbą meczów w przebiegu.
+
+Format linii: {"match_url": ..., "recorded_at": ..., "row": {...wynik process_match...}}
+Ucięta ostatnia linia (crash w trakcie zapisu) jest usuwana z pliku przy load().
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Set
+
+
+def journal_path_for(output_path: str) -> str:
+    """outputs/wynik.csv -> outputs/wynik.journal.jsonl"""
+    base, _ = os.path.splitext(output_path)
+    return f"{base}.journal.jsonl"
+
+
+class RunJournal:
+    """Append-only dziennik wyników (JSONL) kluczowany po match_url"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()  # Tryb --parallel: zapisy z wielu wątków
+        self._urls: Set[str] = set()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> List[Dict]:
+        """
+        Wczytaj wyniki z poprzedniego (przerwanego) przebiegu.
+
+        Returns:
+            Lista wierszy (ostatni wpis wygrywa, jeśli URL wystąpił kilka razy)
+        """
+        return list(self.iter_rows())
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """
+        Wyniki z dziennika jeden po drugim (bez wczytywania całego pliku).
+
+        Kolejność pierwszego wystąpienia URL-a, treść z jego ostatniego wpisu.
+        """
+        offsets = self._scan()
+        with self._lock:
+            self._urls = set(offsets)
+        if not offsets:
+            return
+        with open(self.path, 'rb') as f:
+            for offset in offsets.values():
+                f.seek(offset)
+                yield json.loads(f.readline())['row']
+
+    def _scan(self) -> Dict[str, int]:
+        """Pozycja (bajt) ostatniego poprawnego wpisu każdego URL-a"""
+        offsets: Dict[str, int] = {}
+        if not os.path.exists(self.path):
+            return offsets
+
+        self._truncate_partial_line()
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                start, offset = offset, offset + len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Uszkodzona linia
+                url = entry.get('match_url')
+                if url and isinstance(entry.get('row'), dict):
+                    offsets[url] = start
+        return offsets
+
+    def _truncate_partial_line(self):
+        """
+        Crash w trakcie zapisu zostawia ostatnią linię bez '\n' - utnij ją,
+        inaczej pierwszy wpis dopisany po --resume skleiłby się z nią
+        (i przepadł przy kolejnym load).
+        """
+        with open(self.path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b'\n':
+                return
+            # Szukaj ostatniego '\n' od końca (bez czytania całego pliku)
+            pos = end
+            while pos > 0:
+                start = max(0, pos - 64 * 1024)
+                f.seek(start)
+                newline = f.read(pos - start).rfind(b'\n')
+                if newline != -1:
+                    f.truncate(start + newline + 1)
+                    return
+                pos = start
+            f.truncate(0)
+
+    def reset(self):
+        """Nowy przebieg (bez --resume) - zacznij dziennik od zera"""
+        with self._lock:
+            self._urls = set()
+            open(self.path, 'w', encoding='utf-8').close()
+
+    @property
+    def done_urls(self) -> Set[str]:
+        with self._lock:
+            return set(self._urls)
+
+    def record(self, row: Dict):
+        """Dopisz wynik meczu (flush od razu - przetrwa kill procesu)"""
+        url = row.get('match_url')
+        if not url:
+            return
+        entry = {
+            'match_url': url,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'row': row,
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+            self._urls.add(url)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._urls)
@@ -10,20 +10,36 @@ import gc  # Garbage collector dla zarządzania pamięcią
 import signal  # Obsługa timeoutów
 import psutil  # Monitoring pamięci
 from datetime import datetime
+from browser_memory import RecyclePolicy, RecycleStats, browser_rss_mb
 from livesport_h2h_scraper import start_driver, get_match_links_from_day, process_match, process_match_tennis
 from email_notifier import send_email_notification
 from app_integrator import AppIntegrator, create_integrator_from_config
 from supabase_scraper import get_supabase_integrator
+from browser_pool import BrowserPool
+from h2h_fetch_engine import FETCH_BACKENDS
+from odds_cache import get_odds_cache
+from odds_pipeline import OddsPrefetcher
+from run_journal import RunJournal, journal_path_for
+from result_sink import BatchForwarder, ResultSink
+from sharding import parse_shard, shard_output_path, shard_urls
+import livesport_h2h_scraper
 import pandas as pd
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tenacity import retry, stop_after_attempt, wait_exponential
 import threading
 
+try:
+    from db_manager import MatchDatabase
+    DB_AVAILABLE = True
+except ImportError:
+    DB_AVAILABLE = False
+
 # 🚀 Konfiguracja optymalizacji
 MAX_PARALLEL_WORKERS = 8  # Przetwarzaj 8 meczów jednocześnie (ZMIENIONE z 5 na 8 - PHASE 3)
 RETRY_ATTEMPTS = 3  # Spróbuj 3 razy przy błędzie
 ODDS_FETCH_TIMEOUT = 15  # Czekaj max 15 sekund na kursy
+SYNC_BATCH_SIZE = 100  # Supabase / aplikacja UI dostają mecze paczkami (stała pamięć)
 
 # ⏱️ TIMEOUT & MEMORY CONFIG (dla GitHub Actions)
 TIMEOUT_MINUTES = 330  # 5.5 godzin = 330 minut (zostaw 30 min marginesu przed 6h limitem)
@@ -45,7 +61,7 @@ class ProgressCounter:
             return self.count
 
 
-def process_single_match_with_retry(url, driver, away_team_focus=False):
+def process_single_match_with_retry(url, driver, away_team_focus=False, odds_prefetcher=None):
     """
     Przetwarza JEDEN mecz z retry logic - może być uruchomiona równolegle
     
@@ -76,7 +92,8 @@ def process_single_match_with_retry(url, driver, away_team_focus=False):
             if is_tennis:
                 info = process_match_tennis(url, driver)
             else:
-                info = process_match(url, driver, away_team_focus=away_team_focus, sport=detected_sport)
+                info = process_match(url, driver, away_team_focus=away_team_focus, sport=detected_sport,
+                                     odds_prefetcher=odds_prefetcher)
             
             return (info, info.get('qualifies', False))
             
@@ -131,6 +148,181 @@ def check_memory_usage():
         return 0.0
 
 
+def send_notifications(
+    csv_file: str,
+    journal: RunJournal,
+    date: str,
+    sports: list,
+    to_email: str,
+    from_email: str,
+    password: str,
+    provider: str = 'gmail',
+    sort_by: str = 'time',
+    app_url: str = None,
+    app_api_key: str = None,
+    only_form_advantage: bool = False,
+    skip_no_odds: bool = False,
+    only_over_under: bool = False
+):
+    """
+    Powiadomienia po przebiegu: email, Supabase, aplikacja UI.
+    
+    Wywoływane raz na przebieg - przy --shard dopiero po scaleniu shardów
+    (notify_merged), żeby odbiorca nie dostał N częściowych maili.
+    
+    Mecze czytane strumieniowo z dziennika przebiegu (email czyta CSV),
+    Supabase / aplikacja UI dostają je paczkami po SYNC_BATCH_SIZE.
+    """
+    qualifying_count = sum(1 for r in journal.iter_rows() if r.get('qualifies'))
+    total_count = len(journal)
+    sport_name = '_'.join(sports) if len(sports) <= 2 else 'multi'
+    
+    # KROK 3: Wyślij email (tylko jeśli są kwalifikujące się mecze)
+    if qualifying_count > 0:
+        print(f"\n📧 KROK 3/4: Wysyłanie powiadomienia email...")
+        print("="*70)
+        
+        # Buduj tytuł emaila dynamicznie
+        subject_parts = []
+        if only_form_advantage:
+            subject_parts.append("🔥 PRZEWAGA FORMY")
+        if skip_no_odds:
+            subject_parts.append("💰 Z KURSAMI")
+        
+        if subject_parts:
+            subject = f"Mecze ({' + '.join(subject_parts)}) - {date}"
+        else:
+            subject = f"🏆 {qualifying_count} kwalifikujących się meczów - {date}"
+        
+        send_email_notification(
+            csv_file=csv_file,
+            to_email=to_email,
+            from_email=from_email,
+            password=password,
+            provider=provider,
+            subject=subject,
+            sort_by=sort_by,
+            only_form_advantage=only_form_advantage,
+            skip_no_odds=skip_no_odds,
+            only_over_under=only_over_under
+        )
+        
+        print("\n✅ SUKCES! Email wysłany.")
+    else:
+        # Komunikat o braku meczów
+        msg_parts = []
+        if only_form_advantage:
+            msg_parts.append("PRZEWAGĄ FORMY")
+        if skip_no_odds:
+            msg_parts.append("KURSAMI")
+        
+        if msg_parts:
+            print(f"\n⚠️  Brak kwalifikujących się meczów z {' i '.join(msg_parts)} - email nie został wysłany")
+        else:
+            print(f"\n⚠️  Brak kwalifikujących się meczów - email nie został wysłany")
+    
+    # ✅ KROK 3.5: SUPABASE - Wyślij do cloud database (NOWE!)
+    if total_count > 0:
+        print(f"\n{'='*70}")
+        print(f"☁️  SUPABASE: Wysyłanie do cloud database")
+        print(f"{'='*70}")
+        
+        try:
+            supabase_integrator = get_supabase_integrator()
+            totals = {'saved': 0, 'duplicates': 0}
+            errors = []
+            
+            def send_supabase(batch):
+                result = supabase_integrator.send_matches(matches=batch, date=date, sport=sport_name)
+                if not result.get('success'):
+                    errors.append(result.get('error', 'Unknown error'))
+                    return False
+                totals['saved'] += result.get('saved', 0)
+                totals['duplicates'] += result.get('duplicates', 0)
+                return True
+            
+            with BatchForwarder(send_supabase, batch_size=SYNC_BATCH_SIZE, name='Supabase') as forward:
+                forward.write_all(journal.iter_rows())
+            
+            if forward.batches_failed == 0:
+                print(f"✅ Supabase sync successful!")
+            else:
+                print(f"⚠️  Supabase sync failed for {forward.batches_failed} batch(es): "
+                      f"{errors[0] if errors else 'Unknown error'}")
+            print(f"   💾 Saved: {totals['saved']}")
+            print(f"   🔄 Duplicates: {totals['duplicates']}")
+        
+        except Exception as e:
+            print(f"❌ Supabase error: {e}")
+            import traceback
+            traceback.print_exc()
+            print(f"💡 Continuing with webhook fallback...")
+    
+    # KROK 4: Wyślij dane do aplikacji UI (WEBHOOK FALLBACK - jeśli skonfigurowane)
+    if app_url:
+        print(f"\n🔗 KROK 4/4: Wysyłanie danych do aplikacji UI...")
+        print("="*70)
+        print(f"   📍 APP_URL: {app_url}")
+        print(f"   🔑 API_KEY: {'[SET]' if app_api_key else '[NOT SET]'}")
+        print(f"   📊 Mecze do wysłania: {total_count}")
+        
+        try:
+            # Utwórz integrator
+            integrator = AppIntegrator(app_url=app_url, api_key=app_api_key)
+            
+            # Testuj połączenie
+            print(f"   🔍 Testuję połączenie...")
+            connection_ok = integrator.test_connection()
+            print(f"   {'✅' if connection_ok else '❌'} Test połączenia: {'OK' if connection_ok else 'FAILED'}")
+            
+            if connection_ok:
+                # Wyślij mecze do aplikacji
+                print(f"   📤 Wysyłam {total_count} meczów (paczki po {SYNC_BATCH_SIZE})...")
+                success = _send_to_app(integrator, journal, date, sport_name)
+                
+                if success:
+                    print("   ✅ Dane wysłane do aplikacji pomyślnie!")
+                else:
+                    print("   ⚠️  Nie udało się wysłać danych do aplikacji")
+            else:
+                print("   ❌ Połączenie nieudane - pomijam wysyłanie danych")
+        
+        except Exception as e:
+            print(f"   ⚠️  Błąd wysyłania do aplikacji: {e}")
+            print("   💡 Scraping i email zakończone pomyślnie")
+    else:
+        # Spróbuj załadować z pliku konfiguracyjnego
+        integrator = create_integrator_from_config()
+        if integrator and integrator.test_connection():
+            print(f"\n🔗 BONUS: Wysyłanie danych do aplikacji z konfiguracji...")
+            _send_to_app(integrator, journal, date, sport_name)
+
+
+def _send_to_app(integrator: AppIntegrator, journal: RunJournal, date: str, sport_name: str) -> bool:
+    """Mecze z dziennika do aplikacji UI paczkami (True = wszystkie paczki wysłane)"""
+    with BatchForwarder(lambda batch: integrator.send_matches(matches=batch, date=date, sport=sport_name),
+                        batch_size=SYNC_BATCH_SIZE, name='aplikacja UI') as forward:
+        forward.write_all(journal.iter_rows())
+    return forward.batches_failed == 0
+
+
+def notify_merged(csv_file: str, **kwargs):
+    """
+    Wyślij powiadomienia dla scalonego wyniku shardów (--notify-from).
+    
+    Wiersze (z zagnieżdżonymi typami) pochodzą ze scalonego dziennika przebiegu
+    (sharding.merge_shard_outputs), email czyta scalony CSV.
+    """
+    journal = RunJournal(journal_path_for(csv_file))
+    print(f"📨 Powiadomienia dla scalonego wyniku: {csv_file}")
+    try:
+        send_notifications(csv_file, journal, **kwargs)
+    except Exception as e:
+        print(f"\n❌ Błąd: {e}")
+        import traceback
+        traceback.print_exc()
+
+
 def scrape_and_send_email(
     date: str,
     sports: list,
@@ -147,7 +339,12 @@ def scrape_and_send_email(
     skip_no_odds: bool = False,
     only_over_under: bool = False,
     away_team_focus: bool = False,
-    parallel: bool = False  # 🚀 NOWY parametr
+    parallel: bool = False,  # 🚀 NOWY parametr
+    odds_workers: int = 4,
+    resume: bool = False,
+    parquet: bool = False,
+    shard: tuple = None,
+    refresh_fixtures: bool = False
 ):
     """
     Scrapuje mecze i automatycznie wysyła email z wynikami
@@ -166,6 +363,11 @@ def scrape_and_send_email(
         skip_no_odds: Pomijaj mecze bez kursów bukmacherskich (💰)
         only_over_under: Wysyłaj tylko mecze z OVER/UNDER statistics (💰)
         away_team_focus: Szukaj meczów gdzie GOŚCIE mają ≥60% H2H (zamiast gospodarzy) (🏃)
+        odds_workers: Wątki pobierające kursy w tle, równolegle z przeglądarką (0 = kursy inline)
+        resume: Wznów przerwany przebieg - pomiń mecze zapisane w dzienniku (.journal.jsonl)
+        parquet: Zapisz dodatkowo wyniki w formacie Parquet (wymaga pyarrow)
+        shard: (K, N) - przetwórz tylko shard K z N (podział po haszu event_id)
+        refresh_fixtures: Zbierz listę meczów od nowa zamiast z dziennego cache
     """
     global start_time, timeout_triggered
     
@@ -201,53 +403,108 @@ def scrape_and_send_email(
     print("="*70)
     
     driver = start_driver(headless=headless)
+    odds_prefetcher = None
+    sink = None
     
     try:
         # KROK 1: Zbierz linki
         print("\n🔍 KROK 1/3: Zbieranie linków do meczów...")
-        urls = get_match_links_from_day(driver, date, sports=sports, leagues=None)
+        urls = get_match_links_from_day(driver, date, sports=sports, leagues=None, refresh=refresh_fixtures)
         print(f"✅ Znaleziono {len(urls)} meczów")
         
+        if shard:
+            total_urls = len(urls)
+            urls = shard_urls(urls, *shard)
+            print(f"🧩 Shard {shard[0]}/{shard[1]}: {len(urls)} z {total_urls} meczów")
+        
         if max_matches and len(urls) > max_matches:
             urls = urls[:max_matches]
             print(f"⚠️  Ograniczono do {max_matches} meczów (tryb testowy)")
         
-        # KROK 2: Przetwórz mecze
-        print(f"\n🔄 KROK 2/3: Przetwarzanie {len(urls)} meczów...")
-        print("="*70)
-        
-        rows = []
-        qualifying_count = 0
-        
-        # KLUCZOWE: Na GitHub Actions używaj krótszych interwałów (ograniczone zasoby)
-        is_github_actions = os.environ.get('GITHUB_ACTIONS') == 'true'
-        if is_github_actions:
-            RESTART_INTERVAL = 25  # GitHub Actions: restart co 25 meczów (oszczędność RAM)
-            CHECKPOINT_INTERVAL = 15  # GitHub Actions: checkpoint co 15 meczów (częstsze zapisywanie)
-            print("🔧 Wykryto GitHub Actions - używam skróconych interwałów dla stabilności")
-            print(f"   └─ Restart: co {RESTART_INTERVAL} meczów | Checkpoint: co {CHECKPOINT_INTERVAL} meczów")
-        else:
-            RESTART_INTERVAL = 40  # Lokalnie: restart co 40 meczów
-            CHECKPOINT_INTERVAL = 30  # Lokalnie: checkpoint co 30 meczów
-        
         # Przygotuj nazwę pliku
         sport_suffix = '_'.join(sports) if len(sports) <= 2 else 'multi'
         if away_team_focus:
             outfn = f'outputs/livesport_h2h_{date}_{sport_suffix}_AWAY_FOCUS_EMAIL.csv'
         else:
             outfn = f'outputs/livesport_h2h_{date}_{sport_suffix}_EMAIL.csv'
+        result_file = os.path.basename(outfn)  # Nazwa wyniku dnia (przy --shard po scaleniu shardów)
+        if shard:
+            outfn = shard_output_path(outfn, *shard)
         os.makedirs('outputs', exist_ok=True)
         
+        # 📓 Dziennik przebiegu (append-only JSONL) - wznawianie po crashu/timeoucie
+        journal = RunJournal(journal_path_for(outfn))
+        qualifying_count = 0
+        if not resume:
+            journal.reset()
+        
+        # 💾 Wyniki zapisywane strumieniowo (wiersz po wierszu, stały schemat kolumn).
+        # W pamięci tylko liczniki - wiersze są w CSV i dzienniku, nie na liście
+        sink = ResultSink(outfn, parquet_path=outfn.replace('.csv', '.parquet') if parquet else None)
+        if resume:
+            for row in journal.iter_rows():
+                sink.write(row)  # --resume: wyniki z dziennika na początek pliku
+                if row.get('qualifies'):
+                    qualifying_count += 1
+            done_urls = journal.done_urls
+            urls = [u for u in urls if u not in done_urls]
+            print(f"📓 Wznawiam przebieg: {sink.rows_written} meczów już przetworzonych "
+                  f"({qualifying_count} kwalifikujących) - pozostało {len(urls)}")
+        
+        # 🗄️ Baza danych wiersz po wierszu - indeks /api/match/<id> aktualny w trakcie przebiegu
+        db = None
+        if DB_AVAILABLE:
+            try:
+                db = MatchDatabase()
+            except Exception as e:
+                print(f"⚠️ Baza danych niedostępna: {e}")
+        db_sport = sports[0] if len(sports) == 1 else ''
+        
+        def save_result(info):
+            journal.record(info)
+            sink.write(info)
+            if db:
+                db.insert_result(info, date, db_sport, source_file=result_file)
+        
+        # Kursy pobierane w tle (osobna pula I/O) - przeglądarka w tym czasie scrapuje H2H
+        if odds_workers > 0:
+            odds_prefetcher = OddsPrefetcher(max_workers=odds_workers)
+            odds_prefetcher.submit(urls)
+            print(f"💰 Pobieranie kursów w tle: {odds_workers} wątków")
+        
+        # KROK 2: Przetwórz mecze
+        print(f"\n🔄 KROK 2/3: Przetwarzanie {len(urls)} meczów...")
+        print("="*70)
+        
+        # Restart przeglądarki tylko po przekroczeniu budżetu pamięci (RSS Chrome / sterta JS),
+        # a nie co stałą liczbę meczów (checkpointy nie są potrzebne - dziennik przebiegu)
+        recycle_policy = RecyclePolicy()
+        recycle_stats = RecycleStats()
+        print(f"🔄 Restart przeglądarki gdy: {recycle_policy.describe()}")
+        
         # 🚀 PARALLEL MODE - Przetwarzaj 8 meczów jednocześnie
         if parallel:
-            print(f"\n🚀 TRYB RÓWNOLEGŁY: Przetwarzam {MAX_PARALLEL_WORKERS} meczów jednocześnie...")
-            print("   ⚡ To przyspieszy proces 5-8x! (było 3-4x przy 5 workers)")
+            pool_size = max(1, min(MAX_PARALLEL_WORKERS, len(urls)))
+            print(f"\n🚀 TRYB RÓWNOLEGŁY: Przetwarzam {pool_size} meczów jednocześnie...")
+            print(f"   🌐 Pula {pool_size} przeglądarek (1 przeglądarka = 1 wątek)")
+            
+            # Przeglądarka z kroku 1 nie jest już potrzebna - każdy wątek ma własną
+            try:
+                driver.quit()
+            except:
+                pass
+            driver = None
             
             progress = ProgressCounter(len(urls))
+            pool = BrowserPool(size=pool_size, headless=headless, policy=recycle_policy)
+            pool.start()
             
             # Funkcja do przetwarzania w threads
             def process_url_wrapper(url):
-                result, qualifies = process_single_match_with_retry(url, driver, away_team_focus)
+                with pool.lease() as worker_driver:
+                    result, qualifies = process_single_match_with_retry(url, worker_driver, away_team_focus,
+                                                                        odds_prefetcher)
+                pool.record_result(result is not None)
                 current = progress.increment()
                 
                 if result:
@@ -260,35 +517,46 @@ def scrape_and_send_email(
                 return (result, qualifies)
             
             # Przetwarzaj równolegle
-            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS) as executor:
-                futures = {executor.submit(process_url_wrapper, url): url for url in urls}
-                
-                for future in as_completed(futures):
-                    try:
-                        result, qualifies = future.result(timeout=60)
-                        if result:
-                            rows.append(result)
-                            if qualifies:
-                                qualifying_count += 1
-                    except Exception as e:
-                        print(f"   ❌ Błąd podczas przetwarzania: {e}")
+            try:
+                with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                    futures = {executor.submit(process_url_wrapper, url): url for url in urls}
+                    
+                    for future in as_completed(futures):
+                        try:
+                            result, qualifies = future.result()  # Gotowy (as_completed) - lease ma własny limit czasu
+                            if result:
+                                save_result(result)
+                                if qualifies:
+                                    qualifying_count += 1
+                        except Exception as e:
+                            print(f"   ❌ Błąd podczas przetwarzania: {e}")
+            finally:
+                pool_stats = pool.stats()
+                pool.close()
             
-            print(f"\n✅ Przetworzono {len(rows)} meczów równolegle!")
+            print(f"\n✅ Przetworzono {sink.rows_written} meczów równolegle!")
+            print(f"   ⚡ Przepustowość: {pool_stats['matches_per_minute']} meczów/min "
+                  f"({pool_stats['browsers']} przeglądarek, {pool_stats['restarts']} restartów, "
+                  f"{pool_stats['failed']} błędów)")
+            recycle_stats = pool.recycle_stats
         
         else:
             # ORIGINAL SEQUENTIAL MODE
+            uses_since_restart = 0
             for i, url in enumerate(urls, 1):
                 # ⏱️ Sprawdź timeout (działa na Windows i Linux)
                 if check_timeout():
                     print(f"\n⚠️  Timeout! Przerywam scraping po {i-1} meczach...")
-                    print(f"   💾 Zapisuję częściowe dane ({len(rows)} meczów)...")
+                    print(f"   💾 Zapisuję częściowe dane ({sink.rows_written} meczów)...")
                     break
                 
                 # 💾 Sprawdź pamięć i timeout co 10 meczów
                 if i % 10 == 0:
                     mem_usage = check_memory_usage()
+                    chrome_mb = browser_rss_mb(driver)
+                    chrome_str = f" | Chrome: {chrome_mb:.0f}MB" if chrome_mb is not None else ""
                     elapsed = (time.time() - start_time) / 60
-                    print(f"\n📊 Status: Mecz {i}/{len(urls)} | Pamięć: {mem_usage:.2f}GB | Czas: {elapsed:.1f}min")
+                    print(f"\n📊 Status: Mecz {i}/{len(urls)} | Pamięć: {mem_usage:.2f}GB{chrome_str} | Czas: {elapsed:.1f}min")
                     check_timeout()  # Dodatkowy check na Windows
                 
                 print(f"\n[{i}/{len(urls)}] Przetwarzam...")
@@ -319,7 +587,7 @@ def scrape_and_send_email(
                         if is_tennis:
                             # Użyj dedykowanej funkcji dla tenisa (ADVANCED)
                             info = process_match_tennis(url, driver)
-                            rows.append(info)
+                            save_result(info)
                             
                             if info['qualifies']:
                                 qualifying_count += 1
@@ -348,8 +616,9 @@ def scrape_and_send_email(
                         
                         else:
                             # Sporty drużynowe
-                            info = process_match(url, driver, away_team_focus=away_team_focus, sport=detected_sport)
-                            rows.append(info)
+                            info = process_match(url, driver, away_team_focus=away_team_focus, sport=detected_sport,
+                                                 odds_prefetcher=odds_prefetcher)
+                            save_result(info)
                             
                             if info['qualifies']:
                                 qualifying_count += 1
@@ -398,57 +667,54 @@ def scrape_and_send_email(
                             except:
                                 pass
                             time.sleep(3)
+                            restart_started = time.time()
                             driver = start_driver(headless=headless)
+                            recycle_stats.record('error', time.time() - restart_started)
+                            uses_since_restart = 0
                         else:
                             print(f"   ❌ Błąd po {max_retries} próbach: {str(e)[:100]}")
                             print(f"   ⏭️  Pomijam ten mecz i kontynuuję...")
             
-            # CHECKPOINT - zapisz co 30 meczów (bezpieczeństwo danych!)
-            if i % CHECKPOINT_INTERVAL == 0 and len(rows) > 0:
-                print(f"\n💾 CHECKPOINT: Zapisywanie postępu ({i}/{len(urls)} meczów)...")
-                try:
-                    df_checkpoint = pd.DataFrame(rows)
-                    if 'h2h_last5' in df_checkpoint.columns:
-                        df_checkpoint['h2h_last5'] = df_checkpoint['h2h_last5'].apply(lambda x: str(x) if x else '')
-                    df_checkpoint.to_csv(outfn, index=False, encoding='utf-8-sig')
-                    print(f"   ✅ Checkpoint zapisany! ({len(rows)} meczów, {qualifying_count} kwalifikujących)")
-                except Exception as e:
-                    print(f"   ⚠️  Błąd zapisu checkpointu: {e}")
-            
-            # AUTO-RESTART przeglądarki co N meczów (zapobiega crashom)
-            if i % RESTART_INTERVAL == 0 and i < len(urls):
-                print(f"\n🔄 AUTO-RESTART: Restartowanie przeglądarki po {i} meczach...")
-                print(f"   ✅ Przetworzone dane ({len(rows)} meczów) są bezpieczne w pamięci i na dysku!")
+            # AUTO-RESTART przeglądarki gdy przekroczy budżet pamięci (zapobiega crashom/OOM)
+            uses_since_restart += 1
+            restart_reason = recycle_policy.check(driver, uses_since_restart, recycle_stats) if i < len(urls) else None
+            if restart_reason:
+                print(f"\n🔄 AUTO-RESTART: Restartowanie przeglądarki po {uses_since_restart} meczach ({restart_reason})...")
+                print(f"   ✅ Przetworzone dane ({sink.rows_written} meczów) są bezpieczne w dzienniku przebiegu!")
+                restart_started = time.time()
                 try:
                     driver.quit()
                     # Wymuś garbage collection dla zwolnienia pamięci (ważne na GitHub Actions)
                     gc.collect()
-                    time.sleep(2)
                     driver = start_driver(headless=headless)
                     print(f"   ✅ Przeglądarka zrestartowana! Pamięć zwolniona! Kontynuuję od meczu {i+1}...\n")
                 except Exception as e:
                     print(f"   ⚠️  Błąd restartu: {e}")
                     gc.collect()  # Wyczyść pamięć mimo błędu
                     driver = start_driver(headless=headless)
+                recycle_stats.record(restart_reason, time.time() - restart_started)
+                uses_since_restart = 0
             
             # Rate limiting (zoptymalizowany)
             elif i < len(urls):
                 time.sleep(1.0)  # Zmniejszone z 1.5s na 1.0s
         
-        # Zapisz finalne wyniki (plik już istnieje jeśli były checkpointy)
-        print("\n💾 Zapisywanie finalnych wyników...")
-        
-        df = pd.DataFrame(rows)
-        if 'h2h_last5' in df.columns:
-            df['h2h_last5'] = df['h2h_last5'].apply(lambda x: str(x) if x else '')
+        # Zamknij plik wyników (wiersze były zapisywane na bieżąco)
+        sink.close()
+        print(f"\n💾 Zapisano {sink.rows_written} wyników do: {outfn}")
+        if sink.parquet_path:
+            print(f"   📦 Parquet: {sink.parquet_path}")
         
-        df.to_csv(outfn, index=False, encoding='utf-8-sig')
-        print(f"✅ Zapisano do: {outfn}")
+        odds_cache = get_odds_cache()
+        if odds_cache:
+            cache_stats = odds_cache.stats()
+            print(f"   💾 Cache kursów: {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+                  f"({cache_stats['hit_rate']*100:.0f}%)")
         
         # Zapisz przewidywania do JSON (dla późniejszej weryfikacji)
         if qualifying_count > 0:
             predictions_file = outfn.replace('.csv', '_predictions.json')
-            qualifying_rows = [r for r in rows if r.get('qualifies', False)]
+            qualifying_rows = [r for r in journal.iter_rows() if r.get('qualifies', False)]
             
             with open(predictions_file, 'w', encoding='utf-8') as f:
                 json.dump(qualifying_rows, f, ensure_ascii=False, indent=2)
@@ -456,130 +722,37 @@ def scrape_and_send_email(
         
         # Podsumowanie scrapingu
         print("\n📊 PODSUMOWANIE SCRAPINGU:")
-        print(f"   Przetworzono: {len(rows)} meczów")
+        processed = sink.rows_written
+        print(f"   Przetworzono: {processed} meczów")
         print(f"   Kwalifikujących się: {qualifying_count}")
-        if rows:
-            percent = (qualifying_count / len(rows)) * 100
+        if processed:
+            percent = (qualifying_count / processed) * 100
             print(f"   Procent: {percent:.1f}%")
+        restarts = recycle_stats.summary(processed)
+        print(f"   Restarty przeglądarek: {restarts['restarts']} (łącznie {restarts['restart_s']}s, "
+              f"powody: {restarts['reasons'] or '-'}, szczyt RSS Chrome: {restarts['peak_rss_mb']} MB)")
         
-        # KROK 3: Wyślij email (tylko jeśli są kwalifikujące się mecze)
-        if qualifying_count > 0:
-            print(f"\n📧 KROK 3/4: Wysyłanie powiadomienia email...")
-            print("="*70)
-            
-            # Buduj tytuł emaila dynamicznie
-            subject_parts = []
-            if only_form_advantage:
-                subject_parts.append("🔥 PRZEWAGA FORMY")
-            if skip_no_odds:
-                subject_parts.append("💰 Z KURSAMI")
-            
-            if subject_parts:
-                subject = f"Mecze ({' + '.join(subject_parts)}) - {date}"
-            else:
-                subject = f"🏆 {qualifying_count} kwalifikujących się meczów - {date}"
-            
-            send_email_notification(
+        # KROK 3-4: Powiadomienia - przy --shard raz, po scaleniu shardów
+        if shard:
+            print(f"\n🧩 Shard {shard[0]}/{shard[1]}: powiadomienia (email, Supabase, aplikacja) "
+                  f"zostaną wysłane raz po scaleniu shardów (sharding.py / --notify-from)")
+        else:
+            send_notifications(
                 csv_file=outfn,
+                journal=journal,
+                date=date,
+                sports=sports,
                 to_email=to_email,
                 from_email=from_email,
                 password=password,
                 provider=provider,
-                subject=subject,
                 sort_by=sort_by,
+                app_url=app_url,
+                app_api_key=app_api_key,
                 only_form_advantage=only_form_advantage,
                 skip_no_odds=skip_no_odds,
                 only_over_under=only_over_under
             )
-            
-            print("\n✅ SUKCES! Email wysłany.")
-        else:
-            # Komunikat o braku meczów
-            msg_parts = []
-            if only_form_advantage:
-                msg_parts.append("PRZEWAGĄ FORMY")
-            if skip_no_odds:
-                msg_parts.append("KURSAMI")
-            
-            if msg_parts:
-                print(f"\n⚠️  Brak kwalifikujących się meczów z {' i '.join(msg_parts)} - email nie został wysłany")
-            else:
-                print(f"\n⚠️  Brak kwalifikujących się meczów - email nie został wysłany")
-        
-        # ✅ KROK 3.5: SUPABASE - Wyślij do cloud database (NOWE!)
-        if len(rows) > 0:
-            print(f"\n{'='*70}")
-            print(f"☁️  SUPABASE: Wysyłanie do cloud database")
-            print(f"{'='*70}")
-            
-            try:
-                supabase_integrator = get_supabase_integrator()
-                sport_name = '_'.join(sports) if len(sports) <= 2 else 'multi'
-                
-                result = supabase_integrator.send_matches(
-                    matches=rows,
-                    date=date,
-                    sport=sport_name
-                )
-                
-                if result.get('success'):
-                    print(f"✅ Supabase sync successful!")
-                    print(f"   💾 Saved: {result.get('saved', 0)}")
-                    print(f"   🔄 Duplicates: {result.get('duplicates', 0)}")
-                else:
-                    print(f"⚠️  Supabase sync failed: {result.get('error', 'Unknown error')}")
-            
-            except Exception as e:
-                print(f"❌ Supabase error: {e}")
-                import traceback
-                traceback.print_exc()
-                print(f"💡 Continuing with webhook fallback...")
-        
-        # KROK 4: Wyślij dane do aplikacji UI (WEBHOOK FALLBACK - jeśli skonfigurowane)
-        if app_url:
-            print(f"\n🔗 KROK 4/4: Wysyłanie danych do aplikacji UI...")
-            print("="*70)
-            print(f"   📍 APP_URL: {app_url}")
-            print(f"   🔑 API_KEY: {'[SET]' if app_api_key else '[NOT SET]'}")
-            print(f"   📊 Mecze do wysłania: {len(rows)}")
-            
-            try:
-                # Utwórz integrator
-                integrator = AppIntegrator(app_url=app_url, api_key=app_api_key)
-                
-                # Testuj połączenie
-                print(f"   🔍 Testuję połączenie...")
-                connection_ok = integrator.test_connection()
-                print(f"   {'✅' if connection_ok else '❌'} Test połączenia: {'OK' if connection_ok else 'FAILED'}")
-                
-                if connection_ok:
-                    # Wyślij mecze do aplikacji
-                    sport_name = '_'.join(sports) if len(sports) <= 2 else 'multi'
-                    
-                    print(f"   📤 Wysyłam {len(rows)} meczów...")
-                    success = integrator.send_matches(
-                        matches=rows,
-                        date=date,
-                        sport=sport_name
-                    )
-                    
-                    if success:
-                        print("   ✅ Dane wysłane do aplikacji pomyślnie!")
-                    else:
-                        print("   ⚠️  Nie udało się wysłać danych do aplikacji")
-                else:
-                    print("   ❌ Połączenie nieudane - pomijam wysyłanie danych")
-            
-            except Exception as e:
-                print(f"   ⚠️  Błąd wysyłania do aplikacji: {e}")
-                print("   💡 Scraping i email zakończone pomyślnie")
-        else:
-            # Spróbuj załadować z pliku konfiguracyjnego
-            integrator = create_integrator_from_config()
-            if integrator and integrator.test_connection():
-                print(f"\n🔗 BONUS: Wysyłanie danych do aplikacji z konfiguracji...")
-                sport_name = '_'.join(sports) if len(sports) <= 2 else 'multi'
-                integrator.send_matches(rows, date, sport_name)
         
     except Exception as e:
         print(f"\n❌ Błąd: {e}")
@@ -587,7 +760,12 @@ def scrape_and_send_email(
         traceback.print_exc()
     
     finally:
-        driver.quit()
+        if sink:
+            sink.close()
+        if odds_prefetcher:
+            odds_prefetcher.close()
+        if driver:
+            driver.quit()
         print("\n🔒 Przeglądarka zamknięta")
 
 
@@ -658,14 +836,52 @@ WAŻNE dla Gmail:
     parser.add_argument('--away-team-focus', action='store_true',
                        help='🏃 Szukaj meczów gdzie GOŚCIE mają >=60%% H2H (zamiast gospodarzy)')
     parser.add_argument('--parallel', action='store_true',
-                       help='🚀 Tryb równoległy - przetwarzaj 5 meczów jednocześnie (3-4x szybciej!)')
+                       help='🚀 Tryb równoległy - pula przeglądarek, 8 meczów jednocześnie (1 Chrome na wątek)')
     parser.add_argument('--app-url', default=None,
                        help='URL aplikacji UI do wysyłania danych (np. http://localhost:3000)')
     parser.add_argument('--app-api-key', default=None,
                        help='API key dla aplikacji UI (opcjonalne)')
+    parser.add_argument('--fetch-backend', default='auto', choices=FETCH_BACKENDS,
+                       help='⚡ Pobieranie H2H: auto (HTTP bez przeglądarki, fallback Selenium) lub selenium')
+    parser.add_argument('--resume', action='store_true',
+                       help='📓 Wznów przerwany przebieg - pomiń mecze już zapisane w dzienniku')
+    parser.add_argument('--odds-workers', type=int, default=4,
+                       help='💰 Wątki pobierające kursy w tle równolegle z przeglądarką (0 = kursy inline)')
+    parser.add_argument('--odds-mode', default='concurrent', choices=['concurrent', 'sequential'],
+                       help='💰 Kursy: concurrent (wszyscy bukmacherzy naraz) lub sequential (po kolei)')
+    parser.add_argument('--parquet', action='store_true',
+                       help='📦 Zapisz wyniki także jako Parquet (typy zagnieżdżone, wymaga pyarrow)')
+    parser.add_argument('--shard', type=parse_shard, default=None, metavar='K/N',
+                       help='🧩 Przetwórz tylko shard K z N (podział po haszu event_id, np. 3/8)')
+    parser.add_argument('--refresh-fixtures', action='store_true',
+                       help='🔄 Zbierz listę meczów od nowa (pomiń dzienny cache listy meczów)')
+    parser.add_argument('--notify-from', default=None, metavar='CSV',
+                       help='🧩 Bez scrapowania: wyślij powiadomienia dla scalonego wyniku shardów')
     
     args = parser.parse_args()
     
+    # Backend H2H i tryb kursów ustawiane globalnie w module scrapera (process_match je odczytuje)
+    livesport_h2h_scraper.H2H_FETCH_BACKEND = args.fetch_backend
+    livesport_h2h_scraper.ODDS_FETCH_MODE = args.odds_mode
+    
+    if args.notify_from:
+        notify_merged(
+            args.notify_from,
+            date=args.date,
+            sports=args.sports,
+            to_email=args.to,
+            from_email=args.from_email,
+            password=args.password,
+            provider=args.provider,
+            sort_by=args.sort,
+            app_url=args.app_url,
+            app_api_key=args.app_api_key,
+            only_form_advantage=args.only_form_advantage,
+            skip_no_odds=args.skip_no_odds,
+            only_over_under=args.only_over_under
+        )
+        return
+    
     scrape_and_send_email(
         date=args.date,
         sports=args.sports,
@@ -682,7 +898,12 @@ WAŻNE dla Gmail:
         skip_no_odds=args.skip_no_odds,
         only_over_under=args.only_over_under,
         away_team_focus=args.away_team_focus,
-        parallel=args.parallel  # 🚀 NOWY parametr
+        parallel=args.parallel,  # 🚀 NOWY parametr
+        odds_workers=args.odds_workers,
+        resume=args.resume,
+        parquet=args.parquet,
+        shard=args.shard,
+        refresh_fixtures=args.refresh_fixtures
     )
     
     print("\n✨ ZAKOŃCZONO!")
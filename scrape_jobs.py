@@ -0,0 +1,455 @@
+"""
+SCRAPE JOBS - Kolejka zadań scrapowania dla api_server
+======================================================
+
+Wcześniej POST /api/scrape uruchamiał goły threading.Thread, który aktualizował
+JEDEN globalny słownik scraping_status: tylko jeden scraping naraz, a postęp
+kolejnych uruchomień nadpisywał się nawzajem.
+
+JobManager:
+- każde zadanie ma własne ID (uuid) i własny status/postęp
+- ograniczona pula wątków (SCRAPE_MAX_JOBS, domyślnie 2 - każde zadanie to osobny Chrome)
+- anulowanie: zadanie w kolejce nie wystartuje, uruchomione kończy się po bieżącym meczu
+- zadania zapisane w SQLite (outputs/scrape_jobs.db) - status przetrwa restart serwera
+- max_workers=0: serwer WWW tylko dodaje zadania do bazy, a wykonuje je osobny
+  proces (scrape_worker.py -> JobManager.serve), więc Chrome/parsowanie nie
+  konkuruje z obsługą zapytań o GIL
+- zdarzenia JobContext.publish (wynik meczu, restart przeglądarki) z osobnego
+  procesu nie trafią do szyny postępu API - worker (persist_events=True)
+  dopisuje je do tabeli scrape_job_events, którą /api/scrape/stream czyta
+  od ostatniego id (events())
+
+Runner zadania (np. api_server.run_scraping_task) dostaje JobContext:
+    def runner(job: JobContext, date, sports, max_matches) -> output_file:
+        job.update(total=len(urls))
+        for i, url in enumerate(urls, 1):
+            job.check_cancelled()
+            ...
+            job.update(progress=i, current_match=url)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+
+ACTIVE_STATUSES = ('queued', 'running')
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+# Kolumny aktualizowane przez JobContext.update()
+_UPDATABLE = {'status', 'progress', 'total', 'current_match', 'qualifying_count',
+              'error', 'output_file', 'start_time', 'finished_at'}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        import psutil
+        return psutil.pid_exists(pid)
+    except ImportError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+        return True
+
+
+class JobCancelled(Exception):
+    """Zadanie anulowane przez użytkownika (DELETE /api/scrape/<id>)"""
+
+
+class JobContext:
+    """Uchwyt zadania przekazywany do runnera"""
+
+    def __init__(self, manager: 'JobManager', job_id: str):
+        self.manager = manager
+        self.id = job_id
+
+    def update(self, **fields):
+        self.manager._update(self.id, **fields)
+
+    def publish(self, event: str, data: Dict):
+        """Zdarzenie dla klientów strumienia postępu (np. wynik meczu)"""
+        if self.manager.persist_events:
+            self.manager._record_event(self.id, event, data)
+        if self.manager.bus:
+            self.manager.bus.publish(self.id, event, data)
+
+    def cancelled(self) -> bool:
+        return self.manager._cancel_requested(self.id)
+
+    def check_cancelled(self):
+        if self.cancelled():
+            raise JobCancelled(self.id)
+
+
+def with_progress(job: Dict) -> Dict:
+    """Status zadania + procent postępu i szacowany pozostały czas"""
+    job = dict(job)
+    job['is_running'] = job['status'] == 'running'
+
+    if job['total'] > 0:
+        job['percent'] = round((job['progress'] / job['total']) * 100, 1)
+    else:
+        job['percent'] = 0
+
+    if job['is_running'] and job['start_time'] and job['progress'] > 0:
+        start = datetime.fromisoformat(job['start_time'])
+        elapsed = (datetime.now() - start).total_seconds()
+        avg_time_per_match = elapsed / job['progress']
+        remaining_matches = job['total'] - job['progress']
+        estimated_seconds = remaining_matches * avg_time_per_match
+        job['estimated_time_remaining'] = f"{int(estimated_seconds // 60)}m {int(estimated_seconds % 60)}s"
+
+    return job
+
+
+class JobManager:
+    """Kolejka zadań scrapowania z ograniczoną pulą wątków i zapisem w SQLite"""
+
+    def __init__(self,
+                 runner: Callable,
+                 db_path: str = 'outputs/scrape_jobs.db',
+                 max_workers: int = 2,
+                 bus=None,
+                 recover: bool = True,
+                 persist_events: bool = False):
+        """
+        Args:
+            runner: Funkcja (JobContext, date, sports, max_matches) -> plik wyników
+            db_path: Baza SQLite z zadaniami
+            max_workers: Maksymalna liczba zadań uruchomionych jednocześnie
+                         (0 = tylko kolejka, zadania wykonuje scrape_worker.py)
+            bus: Opcjonalny ProgressBus - każda zmiana statusu publikowana na żywo
+            recover: Oznacz niedokończone zadania jako przerwane (tryb w jednym procesie)
+            persist_events: Zapisuj zdarzenia publish() w bazie (worker w osobnym procesie -
+                            API czyta je przez events())
+        """
+        self.runner = runner
+        self.db_path = db_path
+        self.bus = bus
+        self.max_workers = max_workers
+        self.external = max_workers == 0
+        self.persist_events = persist_events
+        self._local = threading.local()
+        self._executor = None
+        if not self.external:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape-job')
+        self._futures = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_tables(recover and not self.external)
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_tables(self, recover: bool):
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_jobs (
+                    id TEXT PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    sports TEXT NOT NULL,
+                    max_matches INTEGER,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    progress INTEGER DEFAULT 0,
+                    total INTEGER DEFAULT 0,
+                    current_match TEXT DEFAULT '',
+                    qualifying_count INTEGER DEFAULT 0,
+                    error TEXT,
+                    output_file TEXT,
+                    cancel_requested INTEGER DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    start_time TEXT,
+                    finished_at TEXT
+                )
+            """)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(scrape_jobs)")}
+            if 'worker_pid' not in columns:
+                conn.execute("ALTER TABLE scrape_jobs ADD COLUMN worker_pid INTEGER")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scrape_jobs_created ON scrape_jobs(created_at DESC)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_job_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scrape_job_events_job ON scrape_job_events(job_id, id)")
+            if recover:
+                # Zadania przerwane restartem procesu - nikt ich już nie dokończy
+                conn.execute("""
+                    UPDATE scrape_jobs SET status = 'failed', error = 'Przerwane (restart serwera)',
+                           finished_at = ?
+                    WHERE status IN ('queued', 'running')
+                """, (datetime.now().isoformat(),))
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job['sports'] = json.loads(job['sports'])
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        job['job_id'] = job['id']
+        return job
+
+    def _update(self, job_id: str, **fields):
+        unknown = set(fields) - _UPDATABLE
+        if unknown:
+            raise ValueError(f"Nieznane pola zadania: {', '.join(sorted(unknown))}")
+        if 'current_match' in fields and fields['current_match']:
+            fields['current_match'] = fields['current_match'][:80]
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        conn = self._connect()
+        with conn:
+            conn.execute(f"UPDATE scrape_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+        if self.bus:
+            self.bus.publish(job_id, 'status', fields)
+            if fields.get('status') in TERMINAL_STATUSES:
+                self.bus.publish(job_id, 'done', self.get(job_id))
+
+    def _record_event(self, job_id: str, event: str, data: Dict):
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT INTO scrape_job_events (job_id, event, data, created_at) VALUES (?, ?, ?, ?)",
+                         (job_id, event, json.dumps(dict(data, job_id=job_id), ensure_ascii=False, default=str),
+                          datetime.now().isoformat()))
+
+    def _cancel_requested(self, job_id: str) -> bool:
+        row = self._connect().execute("SELECT cancel_requested FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def submit(self, date: str, sports: List[str], max_matches: Optional[int] = None) -> Dict:
+        """Dodaj zadanie do kolejki (wystartuje, gdy zwolni się miejsce w puli lub w workerze)"""
+        job_id = uuid.uuid4().hex[:12]
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                INSERT INTO scrape_jobs (id, date, sports, max_matches, status, created_at, current_match)
+                VALUES (?, ?, ?, ?, 'queued', ?, 'W kolejce...')
+            """, (job_id, date, json.dumps(sports), max_matches, datetime.now().isoformat()))
+
+        if not self.external:
+            with self._lock:
+                self._futures[job_id] = self._executor.submit(self._run, job_id)
+        return self.get(job_id)
+
+    def _claim(self, job_id: str) -> bool:
+        """Atomowo przejmij zadanie z kolejki (queued -> running)"""
+        conn = self._connect()
+        with conn:
+            claimed = conn.execute("""
+                UPDATE scrape_jobs SET status = 'running', start_time = ?, current_match = 'Start...',
+                       worker_pid = ?
+                WHERE id = ? AND status = 'queued' AND cancel_requested = 0
+            """, (datetime.now().isoformat(), os.getpid(), job_id)).rowcount == 1
+        if claimed and self.bus:
+            self.bus.publish(job_id, 'status', {'status': 'running', 'current_match': 'Start...'})
+        return claimed
+
+    def _run(self, job_id: str):
+        if self._claim(job_id):
+            self._run_claimed(job_id)
+        else:
+            with self._lock:
+                self._futures.pop(job_id, None)
+
+    def _run_claimed(self, job_id: str):
+        try:
+            self._execute(job_id)
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+
+    def _execute(self, job_id: str):
+        job = JobContext(self, job_id)
+        row = self.get(job_id)
+        try:
+            output_file = self.runner(job, row['date'], row['sports'], row['max_matches'])
+            job.update(status='completed', output_file=output_file, current_match='Zakończono!',
+                       finished_at=datetime.now().isoformat())
+        except JobCancelled:
+            job.update(status='cancelled', current_match='Anulowano', finished_at=datetime.now().isoformat())
+        except Exception as e:
+            job.update(status='failed', error=str(e), current_match='Błąd!', finished_at=datetime.now().isoformat())
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._connect().execute("SELECT * FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, limit: int = 20, active_only: bool = False) -> List[Dict]:
+        query = "SELECT * FROM scrape_jobs"
+        if active_only:
+            query += " WHERE status IN ('queued', 'running')"
+        query += " ORDER BY created_at DESC LIMIT ?"
+        return [self._row_to_job(row) for row in self._connect().execute(query, (limit,))]
+
+    def events(self, job_id: Optional[str] = None, after_id: int = 0, tail: Optional[int] = None) -> List[Dict]:
+        """
+        Zdarzenia zapisane przez workera (persist_events) w formacie ProgressBus.
+
+        Args:
+            job_id: ID zadania (None = wszystkie zadania)
+            after_id: Tylko zdarzenia nowsze niż to id (ostatnie już wysłane klientowi)
+            tail: Tylko tyle ostatnich zdarzeń (replay dla nowego klienta)
+
+        Returns:
+            Lista {'id', 'event', 'data'} rosnąco po id
+        """
+        query = "SELECT id, event, data FROM scrape_job_events WHERE id > ?"
+        params: list = [after_id]
+        if job_id is not None:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        if tail:
+            query += " ORDER BY id DESC LIMIT ?"
+            params.append(tail)
+        else:
+            query += " ORDER BY id"
+        rows = self._connect().execute(query, params).fetchall()
+        if tail:
+            rows.reverse()
+        return [{'id': row['id'], 'event': row['event'], 'data': json.loads(row['data'])} for row in rows]
+
+    def last_event_id(self) -> int:
+        row = self._connect().execute("SELECT MAX(id) FROM scrape_job_events").fetchone()
+        return row[0] or 0
+
+    def prune_events(self, max_age_hours: float = 24) -> int:
+        """
+        Usuń zdarzenia zadań zakończonych dawniej niż max_age_hours
+
+        Returns:
+            Liczba usuniętych zdarzeń
+        """
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+        conn = self._connect()
+        with conn:
+            return conn.execute("""
+                DELETE FROM scrape_job_events WHERE job_id IN (
+                    SELECT id FROM scrape_jobs WHERE status IN ('completed', 'failed', 'cancelled')
+                    AND finished_at < ?)
+            """, (cutoff,)).rowcount
+
+    def find_active(self, date: str, sports: List[str]) -> Optional[Dict]:
+        """Aktywne zadanie dla tej samej daty i sportów (duplikat)"""
+        for job in self.list_jobs(limit=100, active_only=True):
+            if job['date'] == date and sorted(job['sports']) == sorted(sports):
+                return job
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Anuluj zadanie.
+
+        Returns:
+            False jeśli zadanie nie istnieje lub już się zakończyło
+        """
+        job = self.get(job_id)
+        if not job or job['status'] not in ACTIVE_STATUSES:
+            return False
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE scrape_jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            # Jeszcze w kolejce - nie wystartuje wcale (żaden proces go już nie przejmie)
+            still_queued = conn.execute("""
+                UPDATE scrape_jobs SET status = 'cancelled', current_match = 'Anulowano', finished_at = ?
+                WHERE id = ? AND status = 'queued'
+            """, (datetime.now().isoformat(), job_id)).rowcount == 1
+
+        with self._lock:
+            future = self._futures.pop(job_id, None) if still_queued else None
+        if future:
+            future.cancel()
+        if still_queued and self.bus:
+            self.bus.publish(job_id, 'status', {'status': 'cancelled', 'current_match': 'Anulowano'})
+            self.bus.publish(job_id, 'done', self.get(job_id))
+        return True
+
+    # ------------------------------------------------------------------
+    # Osobny proces wykonujący zadania (scrape_worker.py)
+    # ------------------------------------------------------------------
+
+    def recover_orphans(self) -> int:
+        """
+        Zadania 'running', których proces workera już nie żyje -> failed
+
+        Returns:
+            Liczba oznaczonych zadań
+        """
+        conn = self._connect()
+        orphans = [row['id'] for row in conn.execute(
+            "SELECT id, worker_pid FROM scrape_jobs WHERE status = 'running'")
+            if not row['worker_pid'] or not _pid_alive(row['worker_pid'])]
+        for job_id in orphans:
+            self._update(job_id, status='failed', error='Przerwane (restart workera)', current_match='Błąd!',
+                         finished_at=datetime.now().isoformat())
+        return len(orphans)
+
+    def claim_next(self) -> Optional[str]:
+        """Przejmij najstarsze zadanie z kolejki (bezpieczne przy kilku workerach)"""
+        conn = self._connect()
+        for row in conn.execute("""
+            SELECT id FROM scrape_jobs WHERE status = 'queued' AND cancel_requested = 0
+            ORDER BY created_at LIMIT 5
+        """).fetchall():
+            if self._claim(row['id']):
+                return row['id']
+        return None
+
+    def serve(self, poll_interval: float = 2.0, stop: Optional[threading.Event] = None):
+        """
+        Pętla workera: przejmuj zadania z bazy, dopóki są wolne miejsca w puli
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            with self._lock:
+                free_slots = self.max_workers - len(self._futures)
+            started = False
+            if free_slots > 0:
+                job_id = self.claim_next()
+                if job_id:
+                    with self._lock:
+                        self._futures[job_id] = self._executor.submit(self._run_claimed, job_id)
+                    started = True
+                    if self.persist_events:
+                        self.prune_events()
+            if not started:
+                stop.wait(poll_interval)
+
+    def cancel_local(self) -> List[str]:
+        """Anuluj zadania wykonywane przez ten proces (zamknięcie workera)"""
+        with self._lock:
+            job_ids = list(self._futures)
+        return [job_id for job_id in job_ids if self.cancel(job_id)]
+
+    def shutdown(self, wait: bool = False):
+        if self._executor:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
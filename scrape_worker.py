@@ -0,0 +1,74 @@
+"""
+SCRAPE WORKER - Osobny proces wykonujący zadania scrapowania
+============================================================
+
+W trybie produkcyjnym (SCRAPE_MODE=worker, wsgi.py) api_server tylko zapisuje
+zadania w outputs/scrape_jobs.db. Ten proces przejmuje je z bazy i uruchamia
+run_scraping_task - Chrome i parsowanie nie spowalniają obsługi API.
+
+Kilka workerów może działać równolegle (przejęcie zadania jest atomowe).
+Status/postęp/anulowanie działają przez tę samą bazę (GET /api/scrape/status,
+DELETE /api/scrape/<id>). Zdarzenia match/restart worker zapisuje w tabeli
+scrape_job_events - GET /api/scrape/stream w procesie API czyta je z bazy.
+
+Użycie:
+    python scrape_worker.py                  # 2 zadania jednocześnie
+    python scrape_worker.py --max-jobs 1 --poll 5
+"""
+
+import argparse
+import os
+import signal
+import threading
+
+# Przed importem api_server - jego własny JobManager tylko kolejkuje
+os.environ.setdefault('SCRAPE_MODE', 'worker')
+
+from api_server import run_scraping_task  # noqa: E402
+from scrape_jobs import JobManager  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Worker zadań scrapowania dla api_server')
+    parser.add_argument('--max-jobs', type=int, default=int(os.environ.get('SCRAPE_MAX_JOBS', 2)),
+                        help='Maksymalna liczba zadań jednocześnie (każde = osobny Chrome)')
+    parser.add_argument('--poll', type=float, default=2.0, help='Co ile sekund sprawdzać kolejkę')
+    parser.add_argument('--db', default='outputs/scrape_jobs.db', help='Baza zadań (ta sama co api_server)')
+    args = parser.parse_args()
+
+    manager = JobManager(run_scraping_task, db_path=args.db, max_workers=max(1, args.max_jobs), recover=False,
+                         persist_events=True)
+    orphans = manager.recover_orphans()
+
+    print('='*60)
+    print('🏭 SCRAPE WORKER')
+    print('='*60)
+    print(f'📂 Kolejka: {args.db}')
+    print(f'⚙️  Zadania jednocześnie: {manager.max_workers}, sprawdzanie co {args.poll}s (PID {os.getpid()})')
+    if orphans:
+        print(f'⚠️  Oznaczono {orphans} przerwanych zadań jako failed')
+    print()
+
+    stop = threading.Event()
+
+    def _stop(signum, frame):
+        print('\n🛑 Zatrzymywanie - bieżące zadania kończą się po aktualnym meczu...')
+        stop.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, _stop)
+
+    try:
+        manager.serve(poll_interval=args.poll, stop=stop)
+    finally:
+        cancelled = manager.cancel_local()
+        if cancelled:
+            print(f'   Anulowano: {", ".join(cancelled)}')
+        manager.shutdown(wait=True)
+        print('✅ Worker zatrzymany')
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
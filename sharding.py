@@ -0,0 +1,255 @@
+"""
+SHARDING - Podział listy meczów na shardy (wiele procesów / runnerów)
+=====================================================================
+
+Jeden proces = jedna przeglądarka dla CAŁEJ listy z get_match_links_from_day().
+Z --shard K/N każdy proces przetwarza tylko swoją część meczów:
+
+- podział DETERMINISTYCZNY po haszu event_id (md5, nie hash() - ten jest losowany
+  per proces), więc każdy runner macierzy GitHub Actions dostaje rozłączny zbiór
+  meczów bez żadnej koordynacji
+- plik wyjściowy dostaje sufiks _shardKofN (osobny CSV / dziennik przebiegu per shard)
+
+Lokalny launcher - N shardów jako osobne procesy + scalenie wyników:
+    python sharding.py --shards 8 -- --date 2025-10-05 --sports football --headless
+
+Macierz GitHub Actions:
+    python livesport_h2h_scraper.py --date ... --shard ${{ matrix.shard }}/8
+
+Scalanie (merge_shard_outputs) łączy CSV, dzienniki przebiegu (.journal.jsonl)
+i pliki Parquet shardów. scrape_and_notify.py z --shard NIE wysyła powiadomień -
+launcher wysyła je raz po scaleniu (scrape_and_notify.py ... --notify-from <scalony CSV>);
+w macierzy GitHub Actions robi to osobny krok po zebraniu artefaktów shardów.
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from livesport_odds_api_client import extract_event_id_from_url
+from run_journal import journal_path_for
+
+
+# Skrypty, które przy --shard pomijają powiadomienia i obsługują --notify-from
+NOTIFY_SCRIPTS = {'scrape_and_notify.py'}
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    '3/8' -> (3, 8)  (K numerowane od 1)
+
+    Raises:
+        argparse.ArgumentTypeError: niepoprawny format (komunikat dla argparse)
+    """
+    match = re.match(r'^\s*(\d+)\s*/\s*(\d+)\s*$', spec or '')
+    if not match:
+        raise argparse.ArgumentTypeError(f"Niepoprawny shard '{spec}' (oczekiwano K/N, np. 3/8)")
+    index, total = int(match.group(1)), int(match.group(2))
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"Niepoprawny shard '{spec}' (wymagane 1 <= K <= N)")
+    return index, total
+
+
+def shard_of(url: str, total: int) -> int:
+    """Numer shardu (1..N) dla meczu - stabilny między procesami i maszynami"""
+    key = extract_event_id_from_url(url) or url
+    digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+    return int(digest[:8], 16) % total + 1
+
+
+def shard_urls(urls: List[str], index: int, total: int) -> List[str]:
+    """Mecze należące do shardu K/N (kolejność zachowana)"""
+    if total <= 1:
+        return list(urls)
+    return [url for url in urls if shard_of(url, total) == index]
+
+
+def shard_output_path(outfn: str, index: int, total: int) -> str:
+    """outputs/wynik.csv -> outputs/wynik_shard3of8.csv"""
+    if total <= 1:
+        return outfn
+    base, ext = os.path.splitext(outfn)
+    return f"{base}_shard{index}of{total}{ext}"
+
+
+# ----------------------------------------------------------------------
+# Lokalny launcher
+# ----------------------------------------------------------------------
+
+def merge_shard_outputs(shard_files: List[str], merged_path: str) -> Dict:
+    """
+    Scal wyniki shardów w jeden przebieg:
+    - CSV (ten sam stały schemat - patrz result_sink)
+    - dzienniki przebiegu (.journal.jsonl) - wiersze z typami zagnieżdżonymi dla
+      powiadomień i --resume scalonego przebiegu
+    - Parquet (jeśli shardy go zapisały i pyarrow jest dostępny)
+
+    Returns:
+        Statystyki: {'rows': ..., 'qualifying': ..., 'per_shard': {plik: wiersze},
+                     'journal_rows': ..., 'parquet': ścieżka lub None}
+    """
+    stats = {'rows': 0, 'qualifying': 0, 'per_shard': {}}
+    header = None
+    with open(merged_path, 'w', encoding='utf-8-sig', newline='') as out:
+        writer = csv.writer(out)
+        for path in shard_files:
+            count = 0
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                shard_header = next(reader, None)
+                if shard_header is None:
+                    continue
+                if header is None:
+                    header = shard_header
+                    writer.writerow(header)
+                elif shard_header != header:
+                    print(f"⚠️ Inny schemat kolumn w {path} - pomijam")
+                    continue
+                qualifies_idx = header.index('qualifies') if 'qualifies' in header else None
+                for row in reader:
+                    writer.writerow(row)
+                    count += 1
+                    if qualifies_idx is not None and row[qualifies_idx] == 'True':
+                        stats['qualifying'] += 1
+            stats['per_shard'][path] = count
+            stats['rows'] += count
+
+    stats['journal_rows'] = _merge_journals(shard_files, merged_path)
+    stats['parquet'] = _merge_parquet(shard_files, merged_path)
+    return stats
+
+
+def _merge_journals(shard_files: List[str], merged_path: str) -> int:
+    """Połącz dzienniki shardów (kompletne linie JSONL) w dziennik scalonego pliku"""
+    count = 0
+    with open(journal_path_for(merged_path), 'w', encoding='utf-8') as out:
+        for path in shard_files:
+            try:
+                with open(journal_path_for(path), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.endswith('\n'):  # Ucięta ostatnia linia (crash shardu) pomijana
+                            out.write(line)
+                            count += 1
+            except OSError:
+                print(f"⚠️ Brak dziennika przebiegu dla {path}")
+    return count
+
+
+def _merge_parquet(shard_files: List[str], merged_path: str) -> Optional[str]:
+    """Połącz pliki Parquet shardów (None = shardy nie zapisały Parquet)"""
+    parts = [p for p in (os.path.splitext(f)[0] + '.parquet' for f in shard_files) if os.path.exists(p)]
+    if not parts:
+        return None
+    if not PYARROW_AVAILABLE:
+        print("⚠️ pyarrow nie zainstalowany - Parquet shardów nie został scalony")
+        return None
+    merged_parquet = os.path.splitext(merged_path)[0] + '.parquet'
+    pq.write_table(pa.concat_tables([pq.read_table(p) for p in parts]), merged_parquet)
+    return merged_parquet
+
+
+def _find_shard_output(index: int, total: int, started_at: float) -> Optional[str]:
+    """CSV zapisany przez shard w tym przebiegu (nazwa zależy od daty/sportów scrapera)"""
+    candidates = [p for p in glob.glob(os.path.join('outputs', f'*_shard{index}of{total}.csv'))
+                  if os.path.getmtime(p) >= started_at]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def launch_shards(script: str, script_args: List[str], total: int) -> int:
+    """
+    Uruchom N shardów skryptu jako osobne procesy i scal ich wyniki.
+
+    Returns:
+        Kod wyjścia (0 = wszystkie shardy OK)
+    """
+    os.makedirs(os.path.join('outputs', 'shard_logs'), exist_ok=True)
+    started_at = time.time()
+
+    print(f"🚀 Uruchamiam {total} shardów: {script} {' '.join(script_args)}")
+    processes = []
+    for index in range(1, total + 1):
+        log_path = os.path.join('outputs', 'shard_logs', f'shard{index}of{total}.log')
+        log_file = open(log_path, 'w', encoding='utf-8')
+        cmd = [sys.executable, script, *script_args, '--shard', f'{index}/{total}']
+        proc = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT)
+        processes.append((index, proc, log_file, log_path, time.time()))
+
+    exit_code = 0
+    durations = {}
+    for index, proc, log_file, log_path, proc_start in processes:
+        returncode = proc.wait()
+        log_file.close()
+        durations[index] = time.time() - proc_start
+        status = '✅' if returncode == 0 else f'❌ (kod {returncode})'
+        print(f"   Shard {index}/{total}: {status} w {durations[index]:.0f}s - log: {log_path}")
+        if returncode != 0:
+            exit_code = 1
+
+    shard_files = []
+    for index in range(1, total + 1):
+        path = _find_shard_output(index, total, started_at)
+        if path:
+            shard_files.append(path)
+        else:
+            print(f"⚠️ Shard {index}/{total}: brak pliku wyników")
+
+    if not shard_files:
+        print("❌ Żaden shard nie zapisał wyników")
+        return 1
+
+    merged_path = re.sub(r'_shard\d+of\d+(\.csv)$', r'\1', shard_files[0])
+    stats = merge_shard_outputs(shard_files, merged_path)
+
+    print(f"\n📊 PODSUMOWANIE ({len(shard_files)}/{total} shardów):")
+    print(f"   Przetworzono meczów: {stats['rows']}")
+    if stats['rows']:
+        print(f"   Kwalifikujących się: {stats['qualifying']} ({stats['qualifying']/stats['rows']*100:.1f}%)")
+    print(f"   Najwolniejszy shard: {max(durations.values()):.0f}s")
+    print(f"   Scalono do: {merged_path}")
+    if stats['parquet']:
+        print(f"   📦 Parquet: {stats['parquet']}")
+
+    if os.path.basename(script) in NOTIFY_SCRIPTS:
+        # Shardy pominęły powiadomienia - jeden email / push dla całego przebiegu
+        cmd = [sys.executable, script, *script_args, '--notify-from', merged_path]
+        if subprocess.run(cmd).returncode != 0:
+            exit_code = 1
+    return exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Uruchom scraper w N procesach (shardach) i scal wyniki',
+        epilog='Przykład: python sharding.py --shards 8 -- --date 2025-10-05 --sports football --headless'
+    )
+    parser.add_argument('--shards', type=int, default=os.cpu_count() or 2,
+                       help='Liczba shardów/procesów (domyślnie: liczba rdzeni CPU)')
+    parser.add_argument('--script', default='livesport_h2h_scraper.py',
+                       help='Skrypt uruchamiany per shard (musi obsługiwać --shard K/N)')
+    parser.add_argument('script_args', nargs=argparse.REMAINDER,
+                       help='Argumenty przekazywane do skryptu (po --)')
+    args = parser.parse_args()
+
+    script_args = args.script_args
+    if script_args and script_args[0] == '--':
+        script_args = script_args[1:]
+
+    return launch_shards(args.script, script_args, max(1, args.shards))
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -18,6 +18,7 @@ from selenium.common.exceptions import WebDriverException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from wait_utils import wait_for_page
 
 
 # ==========================================
@@ -27,6 +28,9 @@ from selenium.webdriver.support import expected_conditions as EC
 PLAYER_URL_CACHE = {}
 PLAYER_DATA_CACHE = {}
 
+# Wiersze meczów na stronie wyników zawodnika (czekanie + parsowanie)
+PLAYER_RESULTS_SELECTOR = 'div.sportName, div[class*="result"], div[class*="match"]'
+
 
 # ==========================================
 # 1. H2H Z DATAMI I SZCZEGÓŁAMI
@@ -225,12 +229,12 @@ def extract_player_detailed_form(driver: webdriver.Chrome, player_name: str, pla
         results_url = player_url.rstrip('/') + '/wyniki/'
         
         driver.get(results_url)
-        time.sleep(2)
+        wait_for_page(driver, 'player', PLAYER_RESULTS_SELECTOR, rows_selector=PLAYER_RESULTS_SELECTOR)
         
         soup = BeautifulSoup(driver.page_source, 'html.parser')
         
         # 3. Parsuj ostatnie mecze
-        match_rows = soup.select('div.sportName, div[class*="result"], div[class*="match"]')[:10]
+        match_rows = soup.select(PLAYER_RESULTS_SELECTOR)[:10]
         
         for row in match_rows:
             match_info = {}
@@ -308,7 +312,7 @@ def find_player_url_from_search(driver: webdriver.Chrome, player_name: str) -> O
         search_url = f"https://www.livesport.com/pl/szukaj/?q={player_name.replace(' ', '+')}"
         
         driver.get(search_url)
-        time.sleep(1.5)
+        wait_for_page(driver, 'player:search', 'a[href*="/gracz/"]')
         
         soup = BeautifulSoup(driver.page_source, 'html.parser')
         
@@ -368,7 +372,7 @@ def extract_surface_statistics(driver: webdriver.Chrome, player_url: str) -> Dic
         stats_url = player_url.rstrip('/') + '/statystyki/'
         
         driver.get(stats_url)
-        time.sleep(2)
+        wait_for_page(driver, 'player:stats', 'div[class*="surface"], section[class*="surface"]')
         
         soup = BeautifulSoup(driver.page_source, 'html.parser')
         
@@ -0,0 +1,149 @@
+"""
+Test restartów przeglądarki sterowanych pamięcią (browser_memory + BrowserPool)
+
+Sprawdza:
+1. RSS drzewa procesów (psutil) ponad budżet -> restart ('rss ...')
+2. Sterta JS karty, wolna pamięć systemu i awaryjny limit meczów
+3. Przeglądarka w budżecie pracuje dalej (brak restartu co N meczów)
+4. Pula restartuje tylko przeglądarkę ponad budżet; koszt i powody w stats()
+5. Ciepły Chrome (BROWSER_SERVICE_ADDRESS): mierzone drzewo procesu z service_pid
+"""
+
+import os
+import subprocess
+import sys
+
+import browser_memory
+from browser_memory import RecyclePolicy, RecycleStats, browser_rss_mb
+from browser_pool import BrowserPool
+from fake_driver import FakeDriver
+
+
+def _policy(**kwargs):
+    params = dict(rss_budget_mb=100000, heap_budget_mb=400, min_free_mb=0, max_uses=0)
+    params.update(kwargs)
+    return RecyclePolicy(**params)
+
+
+def test_rss_of_process_tree():
+    child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'])
+    try:
+        own = browser_rss_mb(FakeDriver(pid=os.getpid()))
+        assert own and own > 1
+        # Proces potomny liczy się do drzewa (renderery Chrome są dziećmi chromedrivera)
+        assert browser_rss_mb(FakeDriver()) > browser_rss_mb(FakeDriver(pid=child.pid))
+    finally:
+        child.kill()
+
+    stats = RecycleStats()
+    reason = _policy(rss_budget_mb=1).check(FakeDriver(), uses=3, stats=stats)
+    assert reason.startswith('rss ')
+    assert stats.peak_rss_mb > 1
+
+
+def test_rss_of_attached_chrome():
+    chrome = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'])
+    driver = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'])
+    try:
+        # Chrome z browser_service nie jest dzieckiem chromedrivera - liczony osobno
+        alone = browser_rss_mb(FakeDriver(pid=driver.pid))
+        attached = browser_rss_mb(FakeDriver(pid=driver.pid, service_pid=chrome.pid))
+        assert attached > alone * 1.5
+
+        chrome.kill()
+        chrome.wait()
+        # Chrome zakończony -> zostaje pomiar chromedrivera, bez błędu
+        assert browser_rss_mb(FakeDriver(pid=driver.pid, service_pid=chrome.pid)) > 1
+    finally:
+        chrome.kill()
+        driver.kill()
+
+
+def test_heap_free_and_uses(monkeypatch):
+    assert _policy().check(FakeDriver(heap_mb=600), uses=1).startswith('heap ')
+
+    monkeypatch.setattr(browser_memory, 'system_free_mb', lambda: 200.0)
+    assert _policy(min_free_mb=500).check(FakeDriver(), uses=1).startswith('free ')
+    monkeypatch.setattr(browser_memory, 'system_free_mb', lambda: 4000.0)
+
+    assert _policy(max_uses=500).check(FakeDriver(), uses=500).startswith('uses ')
+
+
+def test_healthy_browser_is_kept():
+    policy = _policy(max_uses=500)
+    driver = FakeDriver()
+    assert all(policy.check(driver, uses) is None for uses in range(1, 200))
+
+
+def test_pool_recycles_only_over_budget():
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver(heap_mb=50))
+        return drivers[-1]
+
+    pool = BrowserPool(size=1, policy=_policy(), driver_factory=factory)
+    pool.start()
+    for _ in range(100):
+        with pool.lease():
+            pass
+    assert pool.stats()['restarts'] == 0  # Wcześniej: restart co 40 meczów
+
+    drivers[0].heap_mb = 900  # Ciężka strona
+    with pool.lease():
+        pass
+    stats = pool.stats()
+    assert stats['restarts'] == 1 and drivers[0].quit_called and len(drivers) == 2
+    assert stats['restart_reasons'] == {'heap': 1}
+    assert stats['restart_s'] >= 0
+    pool.close()
+
+
+class _MonkeyPatch:
+    """Minimalny odpowiednik fixture monkeypatch dla uruchomienia bez pytest"""
+
+    def __init__(self):
+        self._undo = []
+
+    def setattr(self, target, name, value):
+        self._undo.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def undo(self):
+        for target, name, value in reversed(self._undo):
+            setattr(target, name, value)
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Restart przeglądarki wg budżetu pamięci")
+    print("="*70)
+
+    tests = [test_rss_of_process_tree, test_rss_of_attached_chrome, test_heap_free_and_uses, test_healthy_browser_is_kept,
+             test_pool_recycles_only_over_budget]
+    failed = 0
+    for test in tests:
+        monkeypatch = _MonkeyPatch()
+        try:
+            if test.__code__.co_argcount:
+                test(monkeypatch)
+            else:
+                test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+        finally:
+            monkeypatch.undo()
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
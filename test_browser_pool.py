@@ -0,0 +1,208 @@
+"""
+Test puli przeglądarek dla trybu równoległego (browser_pool.py)
+
+Sprawdza:
+1. Każdy wątek dostaje własną przeglądarkę (lease na wyłączność)
+2. Martwa przeglądarka (health check) jest restartowana przed wydaniem
+3. Start częściowo nieudany -> pula mniejsza; żadna przeglądarka -> RuntimeError
+4. stats(): mecze, błędy, użycia per przeglądarka
+5. Nieudany restart: przeglądarka wraca do puli jako martwa, kolejny lease ją
+   restartuje; gdy i to zawodzi - pula się zmniejsza, pusta pula -> RuntimeError
+6. lease() z limitem czasu zgłasza RuntimeError zamiast czekać w nieskończoność
+"""
+
+import threading
+import time
+
+from browser_memory import RecyclePolicy
+from browser_pool import BrowserPool
+from fake_driver import FakeDriver
+
+
+def _pool(size, factory=FakeDriver, max_uses=0):
+    policy = RecyclePolicy(rss_budget_mb=100000, heap_budget_mb=400, min_free_mb=0, max_uses=max_uses)
+    pool = BrowserPool(size=size, policy=policy, driver_factory=factory)
+    pool.restart_retry_delay = 0
+    return pool
+
+
+def test_lease_is_exclusive():
+    pool = _pool(3)
+    assert pool.start() == 3
+    leased = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(3)
+
+    def worker():
+        with pool.lease(timeout=5) as driver:
+            with lock:
+                leased.append(driver)
+            barrier.wait(timeout=5)  # Wszystkie trzy wypożyczone jednocześnie
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(driver) for driver in leased}) == 3
+    pool.close()
+    assert all(driver.quit_called for driver in leased)
+
+
+def test_dead_browser_restarted_on_lease():
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    pool = _pool(1, factory)
+    pool.start()
+    drivers[0].alive = False
+    with pool.lease() as driver:
+        assert driver is drivers[1]
+    assert drivers[0].quit_called
+    stats = pool.stats()
+    assert stats['restarts'] == 1
+    assert stats['restart_reasons'] == {'health': 1}
+    pool.close()
+
+
+def test_partial_start():
+    created = []
+    lock = threading.Lock()
+
+    def flaky():
+        with lock:
+            created.append(1)
+            failing = len(created) % 2 == 0
+        if failing:
+            raise RuntimeError('port zajęty')
+        return FakeDriver()
+
+    pool = _pool(4, flaky)
+    assert pool.start() == 2
+    pool.close()
+
+    def broken():
+        raise RuntimeError('brak Chrome')
+
+    try:
+        _pool(2, broken).start()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError('Pula bez przeglądarek powinna zgłosić RuntimeError')
+
+
+def test_stats():
+    pool = _pool(2)
+    pool.start()
+    for i in range(6):
+        with pool.lease():
+            pass
+        pool.record_result(success=i != 5)
+    time.sleep(0.01)
+
+    stats = pool.stats()
+    assert stats['browsers'] == 2
+    assert stats['completed'] == 5 and stats['failed'] == 1
+    assert sum(stats['per_browser'].values()) == 6
+    assert stats['restarts'] == 0
+    assert stats['matches_per_minute'] > 0
+    pool.close()
+
+
+def test_failed_restart_keeps_slot():
+    state = {'fail': False, 'created': 0}
+
+    def factory():
+        if state['fail']:
+            raise RuntimeError('brak Chrome')
+        state['created'] += 1
+        return FakeDriver(name=f"chrome-{state['created']}")
+
+    pool = _pool(1, factory, max_uses=1)  # Restart po każdym meczu
+    pool.start()
+    state['fail'] = True
+    with pool.lease(timeout=1):
+        pass  # Restart po zwrocie nieudany (dwie próby)
+
+    state['fail'] = False
+    with pool.lease(timeout=1) as driver:  # Miejsce wróciło do puli, martwa przeglądarka restartowana
+        assert driver is not None and driver.name == 'chrome-2'
+    assert pool.stats()['browsers'] == 1
+    pool.close()
+
+
+def test_unrecoverable_slots_shrink_pool():
+    state = {'fail': False}
+
+    def factory():
+        if state['fail']:
+            raise RuntimeError('brak Chrome')
+        return FakeDriver()
+
+    pool = _pool(2, factory, max_uses=1)
+    pool.start()
+    state['fail'] = True
+    for _ in range(2):
+        with pool.lease(timeout=1):
+            pass
+    assert pool.stats()['browsers'] == 2  # Obie martwe, ale wciąż w puli
+
+    try:
+        with pool.lease(timeout=1):
+            pass
+    except RuntimeError as e:
+        assert 'pusta' in str(e)
+    else:
+        raise AssertionError('Pusta pula powinna zgłosić RuntimeError')
+    assert pool.stats()['browsers'] == 0
+    pool.close()
+
+
+def test_lease_timeout():
+    pool = _pool(1)
+    pool.start()
+    with pool.lease(timeout=1):
+        start = time.monotonic()
+        try:
+            with pool.lease(timeout=0.2):
+                pass
+        except RuntimeError as e:
+            assert 'Brak wolnej przeglądarki' in str(e)
+        else:
+            raise AssertionError('lease() bez wolnej przeglądarki powinien zgłosić RuntimeError')
+        assert time.monotonic() - start < 1.0
+    pool.close()
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Pula przeglądarek (BrowserPool)")
+    print("="*70)
+
+    tests = [test_lease_is_exclusive, test_dead_browser_restarted_on_lease, test_partial_start, test_stats,
+             test_failed_restart_keeps_slot, test_unrecoverable_slots_shrink_pool, test_lease_timeout]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
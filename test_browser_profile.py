@@ -0,0 +1,98 @@
+"""
+Test lekkiego profilu Chrome (browser_profile)
+
+Sprawdza:
+1. Flagi i preferencje lekkiego profilu w ChromeOptions
+2. Blokowanie zasobów przez CDP (Network.enable + Network.setBlockedURLs),
+   przeglądarka bez CDP -> False zamiast wyjątku
+3. Pomiar strony (Performance API) i suma w PageLoadStats
+4. PageContext.navigate mierzy opuszczaną stronę tylko z LIVESPORT_PAGE_STATS=1
+"""
+
+import os
+
+from selenium.webdriver.chrome.options import Options
+
+import browser_profile
+from browser_profile import (BLOCKED_URL_PATTERNS, PageLoadStats, apply_lean_options, apply_url_blocking,
+                             measure_page)
+from fake_driver import FakeDriver
+from page_context import PageContext
+
+
+def test_lean_options():
+    options = apply_lean_options(Options())
+    assert '--disable-extensions' in options.arguments
+    assert '--disable-background-networking' in options.arguments
+    assert options.experimental_options['prefs']['profile.managed_default_content_settings.images'] == 2
+
+
+def test_url_blocking():
+    driver = FakeDriver()
+    assert apply_url_blocking(driver)
+    assert driver.commands[0][0] == 'Network.enable'
+    cmd, params = driver.commands[1]
+    assert cmd == 'Network.setBlockedURLs'
+    assert '*.woff2' in params['urls'] and '*google-analytics.com*' in params['urls']
+    assert not any('livesport' in pattern for pattern in BLOCKED_URL_PATTERNS)
+
+    assert apply_url_blocking(FakeDriver(cdp=False)) is False
+
+
+def test_measure_and_stats():
+    stats = PageLoadStats()
+    stats.record(measure_page(FakeDriver()))
+    stats.record({'bytes': 50 * 1024, 'requests': 4, 'load_ms': None})
+    stats.record(None)
+    assert stats.summary() == {'pages': 2, 'avg_kb': 100.0, 'avg_requests': 8.0, 'avg_load_ms': 400}
+
+
+def test_navigate_records_previous_page():
+    old = os.environ.get('LIVESPORT_PAGE_STATS')
+    browser_profile._page_stats = None
+    try:
+        os.environ['LIVESPORT_PAGE_STATS'] = '0'
+        ctx = PageContext(FakeDriver())
+        ctx.navigate('https://www.livesport.com/pl/a/')
+        ctx.navigate('https://www.livesport.com/pl/b/')
+        assert browser_profile.get_page_stats() is None
+
+        os.environ['LIVESPORT_PAGE_STATS'] = '1'
+        ctx = PageContext(FakeDriver())
+        ctx.navigate('https://www.livesport.com/pl/a/')  # Brak poprzedniej strony
+        ctx.navigate('https://www.livesport.com/pl/b/')
+        assert browser_profile.get_page_stats().pages == 1
+    finally:
+        browser_profile._page_stats = None
+        if old is None:
+            os.environ.pop('LIVESPORT_PAGE_STATS', None)
+        else:
+            os.environ['LIVESPORT_PAGE_STATS'] = old
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Lekki profil Chrome")
+    print("="*70)
+
+    tests = [test_lean_options, test_url_blocking, test_measure_and_stats, test_navigate_records_previous_page]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,165 @@
+"""
+Test szybkiego startu przeglądarki (browser_service)
+
+Sprawdza:
+1. CHROMEDRIVER_PATH ma pierwszeństwo - bez ChromeDriverManager
+2. Ścieżka z cache na dysku - ChromeDriverManager tylko raz (też między procesami)
+3. Offline: przeterminowany cache zamiast błędu
+4. start_driver: sterownik z cache nie pasuje do Chrome -> odświeżenie i ponowna próba
+5. PID ciepłego Chrome z pliku stanu (pomiar RSS w browser_memory)
+"""
+
+import json
+import os
+import tempfile
+
+from selenium.common.exceptions import SessionNotCreatedException
+
+import browser_service
+import livesport_h2h_scraper as scraper
+
+
+def _setup(monkeypatch, install):
+    directory = tempfile.mkdtemp()
+    driver_file = os.path.join(directory, 'chromedriver')
+    open(driver_file, 'w').close()
+    calls = []
+
+    def fake_install():
+        calls.append(1)
+        return install(driver_file)
+
+    monkeypatch.setenv('CHROMEDRIVER_CACHE_PATH', os.path.join(directory, 'chromedriver.json'))
+    monkeypatch.delenv('CHROMEDRIVER_PATH', raising=False)
+    monkeypatch.delenv('BROWSER_SERVICE_ADDRESS', raising=False)
+    monkeypatch.setattr(browser_service, '_install_chromedriver', fake_install)
+    monkeypatch.setattr(browser_service, '_resolved_path', None)
+    return driver_file, calls
+
+
+def test_env_path_wins(monkeypatch):
+    _, calls = _setup(monkeypatch, lambda path: path)
+    monkeypatch.setenv('CHROMEDRIVER_PATH', '/opt/chromedriver')
+    assert browser_service.resolve_chromedriver() == '/opt/chromedriver'
+    assert calls == []
+
+
+def test_disk_cache(monkeypatch):
+    driver_file, calls = _setup(monkeypatch, lambda path: path)
+    assert browser_service.resolve_chromedriver() == driver_file
+    assert browser_service.resolve_chromedriver() == driver_file
+
+    browser_service._resolved_path = None  # Nowy proces - tylko plik cache
+    assert browser_service.resolve_chromedriver() == driver_file
+    assert len(calls) == 1
+
+    assert browser_service.resolve_chromedriver(refresh=True) == driver_file
+    assert len(calls) == 2
+
+
+def test_offline_uses_stale_cache(monkeypatch):
+    driver_file, calls = _setup(monkeypatch, lambda path: path)
+    browser_service.resolve_chromedriver()
+
+    def offline():
+        raise ConnectionError('brak sieci')
+
+    monkeypatch.setattr(browser_service, '_resolved_path', None)
+    monkeypatch.setattr(browser_service, '_install_chromedriver', offline)
+    monkeypatch.setenv('CHROMEDRIVER_CACHE_TTL', '0')
+    assert browser_service.resolve_chromedriver() == driver_file
+
+
+def test_start_driver_refreshes_stale_driver(monkeypatch):
+    driver_file, calls = _setup(monkeypatch, lambda path: path)
+    browser_service.resolve_chromedriver()
+    sessions = []
+
+    class FakeChrome:
+        def __init__(self, service, options):
+            sessions.append(service.path)
+            if len(sessions) == 1:
+                raise SessionNotCreatedException('This version of ChromeDriver only supports Chrome 120')
+
+        def execute_cdp_cmd(self, cmd, params):
+            pass
+
+    monkeypatch.setattr(scraper.webdriver, 'Chrome', FakeChrome)
+    driver = scraper.start_driver(headless=True)
+    assert isinstance(driver, FakeChrome)
+    assert sessions == [driver_file, driver_file]
+    assert len(calls) == 2  # Ponowne pobranie po nieudanej sesji
+
+
+def test_service_chrome_pid(monkeypatch):
+    state_path = os.path.join(tempfile.mkdtemp(), 'browser_service.json')
+    monkeypatch.setattr(browser_service, 'SERVICE_STATE_PATH', state_path)
+    assert browser_service.service_chrome_pid('127.0.0.1:9222') is None
+
+    with open(state_path, 'w', encoding='utf-8') as f:
+        json.dump({'address': '127.0.0.1:9222', 'pid': 4321, 'profile_dir': '/tmp/x'}, f)
+    assert browser_service.service_chrome_pid('127.0.0.1:9222') == 4321
+    assert browser_service.service_chrome_pid('127.0.0.1:9333') is None  # Inny Chrome
+
+
+class _MonkeyPatch:
+    """Minimalny odpowiednik fixture monkeypatch dla uruchomienia bez pytest"""
+
+    _MISSING = object()
+
+    def __init__(self):
+        self._undo = []
+        self._env = {}
+
+    def setattr(self, target, name, value):
+        self._undo.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def setenv(self, name, value):
+        self._env.setdefault(name, os.environ.get(name, self._MISSING))
+        os.environ[name] = value
+
+    def delenv(self, name, raising=False):
+        self._env.setdefault(name, os.environ.get(name, self._MISSING))
+        os.environ.pop(name, None)
+
+    def undo(self):
+        for target, name, value in reversed(self._undo):
+            setattr(target, name, value)
+        for name, value in self._env.items():
+            if value is self._MISSING:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Cache chromedrivera + szybki start przeglądarki")
+    print("="*70)
+
+    tests = [test_env_path_wins, test_disk_cache, test_offline_uses_stale_cache,
+             test_start_driver_refreshes_stale_driver, test_service_chrome_pid]
+    failed = 0
+    for test in tests:
+        monkeypatch = _MonkeyPatch()
+        try:
+            test(monkeypatch)
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+        finally:
+            monkeypatch.undo()
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,176 @@
+"""
+Test bazy meczów (db_manager.py)
+
+Sprawdza:
+1. Zapis batch w jednej transakcji (executemany) + upsert po match_url
+   (pusta data/sport nie kasuje zapisanych, insert_match zwraca id aktualizowanego meczu)
+2. Reużycie połączenia w wątku i tryb WAL
+3. Migracje schematu + EXPLAIN QUERY PLAN (indeksy złożone)
+4. Keyset pagination (kursor match_date, home_team, id)
+5. Wyszukiwanie meczu po event_id (?mid=)
+6. insert_result: wiersz w matches + pełny rekord API w indeksie match_records
+"""
+
+import os
+import tempfile
+
+from db_manager import MatchDatabase
+
+
+def _make_db() -> MatchDatabase:
+    return MatchDatabase(os.path.join(tempfile.mkdtemp(), 'matches.db'))
+
+
+def _match(i: int, **extra) -> dict:
+    match = {
+        'date': '2025-11-01',
+        'sport': 'football',
+        'home_team': f'Drużyna {i}',
+        'away_team': 'Rywal',
+        'match_url': f'https://test.com/match{i}',
+        'home_form': ['W', 'W', 'L'],
+        'all_odds': {'STS': {'home': 1.85, 'away': 4.2}},
+        'bookmakers_found': ['STS'],
+        'qualifies': i % 2 == 0,
+    }
+    match.update(extra)
+    return match
+
+
+def test_batch_upsert():
+    db = _make_db()
+    assert db.insert_matches_batch([_match(i) for i in range(500)]) == 500
+    assert db.get_stats()['qualifying_matches'] == 250
+
+    # Ten sam match_url drugi raz = aktualizacja, nie duplikat
+    db.insert_matches_batch([_match(1, qualifies=True, home_odds=2.1)])
+    stats = db.get_stats()
+    assert stats['total_matches'] == 500
+    assert stats['qualifying_matches'] == 251
+
+    match = [m for m in db.get_matches(limit=1000) if m['match_url'] == 'https://test.com/match1'][0]
+    assert match['home_odds'] == 2.1
+    assert match['home_form'] == ['W', 'W', 'L']
+    assert match['all_odds']['STS']['home'] == 1.85
+
+
+def test_upsert_fills_date_and_sport():
+    db = _make_db()
+    first = db.insert_match(_match(1, date='', sport=''))  # Zapis sprzed poprawki - bez daty/sportu
+    second = db.insert_match(_match(2))
+    assert first != second
+
+    assert db.insert_match(_match(1)) == first  # Aktualizacja -> id tego meczu, nie ostatniego INSERT
+    match = [m for m in db.get_matches(limit=10) if m['match_url'] == 'https://test.com/match1'][0]
+    assert match['match_date'] == '2025-11-01' and match['sport'] == 'football'
+
+    db.insert_match(_match(1, date='', sport=''))  # Pusta wartość nie kasuje zapisanej
+    match = [m for m in db.get_matches(limit=10) if m['match_url'] == 'https://test.com/match1'][0]
+    assert match['match_date'] == '2025-11-01' and match['sport'] == 'football'
+
+
+def test_connection_reuse_and_wal():
+    db = _make_db()
+    conn = db._connect()
+    db.insert_match(_match(1))
+    db.get_matches()
+    assert db._connect() is conn
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_migrations_and_query_plans():
+    db = _make_db()
+    assert db._connect().execute('PRAGMA user_version').fetchone()[0] >= 1
+    # Ponowne otwarcie tej samej bazy - migracje nie są wykonywane drugi raz
+    reopened = MatchDatabase(db.db_path)
+    assert reopened.check_query_plans() == []
+
+
+def test_keyset_pagination():
+    db = _make_db()
+    matches = [_match(i, date=f'2025-11-0{1 + i % 3}', home_team=f'Drużyna {i % 7}') for i in range(50)]
+    db.insert_matches_batch(matches)
+
+    seen = []
+    cursor = None
+    while True:
+        page = db.get_matches_page(limit=8, cursor=cursor)
+        seen.extend(m['match_url'] for m in page['matches'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+
+    assert len(seen) == 50
+    assert len(set(seen)) == 50
+    assert seen == [m['match_url'] for m in db.get_matches(limit=100)]
+
+
+def test_lookup_by_event_id():
+    db = _make_db()
+    db.insert_matches_batch([
+        _match(1, match_url='https://www.livesport.com/pl/mecz/a-b/AbCdEfGh/?mid=KdfeT8U2'),
+        _match(2, match_url='https://www.livesport.com/pl/mecz/c-d/XyZaBcDe/?mid=Qw12Er34'),
+    ])
+
+    match = db.get_match_by_event_id('Qw12Er34')
+    assert match['home_team'] == 'Drużyna 2'
+    assert match['match_date'] == '2025-11-01'
+    assert db.get_match_by_event_id('brak1234') is None
+    assert db.get_match_by_event_id('Qw12Er34', match_date='2025-11-01')['home_team'] == 'Drużyna 2'
+    assert db.get_match_by_event_id('Qw12Er34', match_date='2025-11-02') is None
+
+    plan = ' '.join(row[3] for row in db._connect().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM matches WHERE event_id = ?", ('Qw12Er34',)))
+    assert 'idx_matches_event_id' in plan
+
+
+def test_insert_result_record_index():
+    db = _make_db()
+    url = 'https://www.livesport.com/pl/mecz/c-d/XyZaBcDe/?mid=Qw12Er34'
+    result = {'match_url': url, 'home_team': 'Lech', 'away_team': 'Wisła', 'qualifies': True,
+              'home_form_home': ['W', 'D'], 'h2h_last5': [{'score': '2-1', 'winner': 'home'}]}
+    match_id = db.insert_result(result, '2025-11-01', 'football', source_file='wynik.csv')
+    assert match_id == db.insert_result(dict(result, home_odds=1.9), '2025-11-01', '', source_file='wynik.csv')
+
+    found = db.get_match_record('Qw12Er34')
+    assert found['source_file'] == 'wynik.csv' and found['match_date'] == '2025-11-01'
+    assert found['match']['home_form_home'] == ['W', 'D']
+    assert found['match']['h2h_details'][0]['score'] == '2-1'
+    assert found['match']['home_odds'] == 1.9
+    assert db.get_match_record('XyZaBcDe', match_date='2025-11-01') is not None
+    assert db.get_match_record('XyZaBcDe', match_date='2025-11-02') is None
+    assert db.get_match_by_event_id('Qw12Er34')['sport'] == 'football'  # Pusty sport nie kasuje
+
+    plan = ' '.join(row[3] for row in db._connect().execute(
+        "EXPLAIN QUERY PLAN SELECT record FROM match_records WHERE (event_id = ? OR match_key = ?)",
+        ('Qw12Er34', 'Qw12Er34')))
+    assert 'idx_match_records_event_id' in plan and 'idx_match_records_match_key' in plan
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Baza meczów (MatchDatabase)")
+    print("="*70)
+
+    tests = [test_batch_upsert, test_upsert_fills_date_and_sport, test_connection_reuse_and_wal, test_migrations_and_query_plans,
+             test_keyset_pagination, test_lookup_by_event_id, test_insert_result_record_index]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
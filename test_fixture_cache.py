@@ -0,0 +1,98 @@
+"""
+Test dziennego cache listy meczów (fixture_cache.py)
+
+Sprawdza:
+1. Zapis/odczyt per (data, sport, filtr lig), pusta lista nie jest zapisywana
+2. Polityka świeżości: dzień w przeszłości dłużej, dziś/przyszłość do końca dnia i max TTL
+3. Wspólny plik dla wielu procesów/skryptów (nowa instancja widzi wpisy)
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fixture_cache import FixtureCache, leagues_key
+
+
+LINKS = ['https://www.livesport.com/pl/mecz/pilka-nozna/a-b/?mid=KdfeT8U2',
+         'https://www.livesport.com/pl/mecz/pilka-nozna/c-d/?mid=Qw12Er34']
+
+
+def _make_cache(**kwargs) -> FixtureCache:
+    return FixtureCache(db_path=os.path.join(tempfile.mkdtemp(), 'fixture_cache.db'), **kwargs)
+
+
+def test_get_set_by_key():
+    cache = _make_cache()
+    assert cache.get('2025-11-01', 'pilka-nozna') is None
+
+    cache.set('2025-11-01', 'pilka-nozna', None, LINKS)
+    cache.set('2025-11-01', 'pilka-nozna', ['Premier-League', 'ekstraklasa'], LINKS[:1])
+    cache.set('2025-11-01', 'koszykowka', None, [])
+
+    assert cache.get('2025-11-01', 'pilka-nozna') == LINKS
+    assert cache.get('2025-11-01', 'pilka-nozna', ['ekstraklasa', 'premier-league']) == LINKS[:1]
+    assert cache.get('2025-11-01', 'koszykowka') is None
+    assert cache.get('2025-11-02', 'pilka-nozna') is None
+    assert leagues_key(['B', 'a', 'b']) == 'a,b'
+    assert cache.stats()['hits'] == 2
+
+
+def test_freshness_policy():
+    cache = _make_cache(ttl=12 * 3600, past_ttl=7 * 24 * 3600)
+    morning = datetime(2025, 11, 1, 8, 0).timestamp()
+    evening = datetime(2025, 11, 1, 20, 0).timestamp()
+
+    # Dzień w przeszłości - lista się nie zmieni
+    assert cache.expires_at('2025-10-30', morning) == morning + 7 * 24 * 3600
+    # Dziś rano - pełny TTL; wieczorem - tylko do północy
+    assert cache.expires_at('2025-11-01', morning) == morning + 12 * 3600
+    assert cache.expires_at('2025-11-01', evening) == datetime(2025, 11, 2).timestamp()
+    # Jutro - pobrane dziś, ważne najpóźniej do północy
+    assert cache.expires_at('2025-11-02', evening) == datetime(2025, 11, 2).timestamp()
+
+
+def test_expired_and_shared_between_instances():
+    path = os.path.join(tempfile.mkdtemp(), 'fixture_cache.db')
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    FixtureCache(db_path=path).set(today, 'tenis', None, LINKS)
+    assert FixtureCache(db_path=path).get(today, 'tenis') == LINKS  # np. kolejny .bat tego dnia
+
+    short = FixtureCache(db_path=path, ttl=0.1)
+    short.set(today, 'tenis', None, LINKS)
+    time.sleep(0.2)
+    assert short.get(today, 'tenis') is None
+
+    short.set((datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d'), 'tenis', None, LINKS)
+    short.invalidate()
+    assert short.stats()['entries'] == 0
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Dzienny cache listy meczów (FixtureCache)")
+    print("="*70)
+
+    tests = [test_get_set_by_key, test_freshness_policy, test_expired_and_shared_between_instances]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
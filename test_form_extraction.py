@@ -0,0 +1,155 @@
+"""
+Test ekstrakcji formy bez osobnych nawigacji (extract_advanced_team_form)
+
+Sprawdza:
+1. Forma ze wszystkich zakładek feedu H2H (parse_form_feed)
+2. Forma z backendu HTTP - zero nawigacji przeglądarki
+3. Strona /h2h/ogolem/ już otwarta - DOM użyty ponownie, podzakładki kliknięte
+   w obrębie strony; nieudane przełączenie -> nawigacja (stara metoda)
+"""
+
+import livesport_h2h_scraper as scraper
+from fake_driver import FakeDriver
+from h2h_fetch_engine import parse_form_feed
+from page_context import get_page_context
+
+MATCH_URL = 'https://www.livesport.com/pl/mecz/pilka-nozna/legia/gornik/?mid=KdfeT8U2'
+
+
+def _feed(*records):
+    return '~'.join('¬'.join(f'{k}÷{v}' for k, v in record.items()) for record in records) + '~'
+
+
+FEED = _feed(
+    {'KA': 'Ogółem'},
+    {'KB': 'Ostatnie mecze: Legia'},
+    {'KJ': '*Legia', 'KK': 'Lech', 'KL': '2 : 1'},
+    {'KJ': 'Raków', 'KK': 'Legia', 'KL': '1 : 1'},
+    {'KJ': '*Pogoń', 'KK': 'Legia', 'KL': '3 : 0'},
+    {'KB': 'Ostatnie mecze: Górnik'},
+    {'KJ': 'Górnik', 'KK': '*Piast', 'KL': '0 : 2'},
+    {'KJ': 'Motor', 'KK': '*Górnik', 'KL': '1 : 1'},  # Wygrana po karnych
+    {'KB': 'Pojedynki bezpośrednie'},
+    {'KJ': '*Legia', 'KK': 'Górnik', 'KL': '3 : 1'},
+    {'KA': 'U siebie'},
+    {'KB': 'Ostatnie mecze: Legia'},
+    {'KJ': '*Legia', 'KK': 'Lech', 'KL': '2 : 1'},
+    {'KA': 'Na wyjeździe'},
+    {'KB': 'Ostatnie mecze: Legia'},
+    {'KJ': '*Pogoń', 'KK': 'Legia', 'KL': '3 : 0'},
+    {'KB': 'Ostatnie mecze: Górnik'},
+    {'KJ': 'Motor', 'KK': '*Górnik', 'KL': '1 : 1'},
+)
+
+
+def _form_html(*sections):
+    badge = {'W': 'Zwycięstwo', 'D': 'Remis', 'L': 'Porażka'}
+    body = ''.join(
+        '<div class="h2h__section">' +
+        ''.join(f'<div class="wcl-badgeform_AKaAR" title="{badge[r]}">{r}</div>' for r in section) +
+        '</div>'
+        for section in sections
+    )
+    return f'<html><body>{body}</body></html>'
+
+
+def test_parse_form_feed():
+    form = parse_form_feed(FEED, 'Legia', 'Górnik')
+    assert form['home_form_overall'] == ['W', 'D', 'L']
+    assert form['away_form_overall'] == ['L', 'W']
+    assert form['home_form_home'] == ['W']
+    assert form['away_form_away'] == ['W']
+
+
+def test_feed_form_needs_no_navigation():
+    driver = FakeDriver()
+    result = scraper.extract_advanced_team_form(MATCH_URL, driver, feed_form=parse_form_feed(FEED, 'Legia', 'Górnik'))
+    assert driver.navigations == []
+    assert result['home_form_overall'] == ['W', 'D', 'L']
+    assert result['away_form_away'] == ['W']
+
+
+def test_reuses_loaded_overall_page(monkeypatch):
+    driver = FakeDriver(page_source=_form_html('WWDWW', 'LLWLD'))
+    page = get_page_context(driver)
+    page.navigate(MATCH_URL.replace('/?mid=', '/h2h/ogolem?mid='))  # Jak w process_match
+    navigations_before = len(driver.navigations)
+
+    tabs = {'u-siebie': _form_html('WWWDW'), 'na-wyjezdzie': _form_html('LLLDL')}
+
+    def fake_switch(driver, tab, timeout=4.0):
+        driver.page_source = tabs[tab]
+        get_page_context(driver).invalidate()
+        return True
+
+    monkeypatch.setattr(scraper, '_switch_h2h_tab', fake_switch)
+    result = scraper.extract_advanced_team_form(MATCH_URL, driver)
+
+    assert len(driver.navigations) == navigations_before  # Zero dodatkowych driver.get
+    assert result['home_form_overall'] == list('WWDWW')
+    assert result['away_form_overall'] == list('LLWLD')
+    assert result['home_form_home'] == list('WWWDW')
+    assert result['away_form_away'] == list('LLLDL')
+    assert result['form_advantage'] is True
+
+
+def test_falls_back_to_navigation(monkeypatch):
+    driver = FakeDriver(page_source=_form_html('WDW', 'LLL'))
+    monkeypatch.setattr(scraper, '_switch_h2h_tab', lambda driver, tab, timeout=4.0: False)
+    monkeypatch.setattr(scraper, 'wait_for_page', lambda *args, **kwargs: True)
+    monkeypatch.setattr(scraper, 'scroll_and_settle', lambda *args, **kwargs: 0)
+
+    result = scraper.extract_advanced_team_form(MATCH_URL, driver)
+    assert [url.split('/h2h/')[1] for url in driver.navigations] == [
+        'ogolem/?mid=KdfeT8U2', 'u-siebie/?mid=KdfeT8U2', 'na-wyjezdzie/?mid=KdfeT8U2']
+    assert result['home_form_overall'] == list('WDW')
+
+
+class _MonkeyPatch:
+    """Minimalny odpowiednik fixture monkeypatch dla uruchomienia bez pytest"""
+
+    def __init__(self):
+        self._undo = []
+
+    def setattr(self, target, name, value):
+        self._undo.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def undo(self):
+        for target, name, value in reversed(self._undo):
+            setattr(target, name, value)
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Forma drużyn bez dodatkowych nawigacji")
+    print("="*70)
+
+    tests = [test_parse_form_feed, test_feed_form_needs_no_navigation, test_reuses_loaded_overall_page,
+             test_falls_back_to_navigation]
+    failed = 0
+    for test in tests:
+        monkeypatch = _MonkeyPatch()
+        try:
+            if test.__code__.co_argcount:
+                test(monkeypatch)
+            else:
+                test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+        finally:
+            monkeypatch.undo()
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
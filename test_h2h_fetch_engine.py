@@ -0,0 +1,127 @@
+"""
+Test parsowania feedu Livesport bez przeglądarki (h2h_fetch_engine.py)
+
+Sprawdza:
+1. parse_h2h_feed: separatory wyniku (':', '-', '–'), '*' zwycięzcy, limit 5,
+   tylko zakładka "Ogółem", rekordy bez drużyny/wyniku pomijane
+2. Brak grup "Ostatnie mecze" -> brak nazw drużyn; fetch() oddaje wtedy None (fallback Selenium)
+3. parse_start_time_feed: timestamp DC, brak / nieliczbowa wartość -> None
+4. _split_feed: puste rekordy, pola bez '÷', '÷' w wartości
+"""
+
+from datetime import datetime
+
+from h2h_fetch_engine import HttpH2HFetcher, _split_feed, parse_h2h_feed, parse_start_time_feed
+
+TS = 1730000000
+URL = 'https://www.livesport.com/pl/mecz/pilka-nozna/a-b/AbCdEfGh/?mid=KdfeT8U2'
+
+
+def _record(**fields) -> str:
+    return '¬'.join(f'{key}÷{value}' for key, value in fields.items()) + '¬'
+
+
+def _feed(*records) -> str:
+    return '~'.join(records) + '~'
+
+
+def _h2h_feed(*h2h_records, teams=('Legia Warszawa', 'Cracovia')) -> str:
+    records = [_record(KA='Ogółem')]
+    for team in teams:
+        records.append(_record(KB=f'Ostatnie mecze: {team}'))
+        records.append(_record(KC=TS, KJ=team, KK='Ktoś', KL='1 : 0'))
+    records.append(_record(KB='Pojedynki bezpośrednie'))
+    records.extend(h2h_records)
+    records.append(_record(KA='U siebie'))
+    records.append(_record(KB='Pojedynki bezpośrednie'))
+    records.append(_record(KC=TS, KJ='Legia Warszawa', KK='Cracovia', KL='9 : 9'))
+    return _feed(*records)
+
+
+def test_parse_h2h_feed():
+    data = parse_h2h_feed(_h2h_feed(
+        _record(KC=TS, KJ='*Legia Warszawa', KK='Cracovia', KL='3 : 1'),
+        _record(KC=TS, KJ='Cracovia', KK='Legia Warszawa', KL='2-2'),
+        _record(KC=TS, KJ='Legia Warszawa', KK='*Cracovia', KL='0–1'),
+        _record(KC=TS, KJ='Legia Warszawa', KK='Cracovia', KL='przełożony'),  # Bez wyniku
+        _record(KC=TS, KJ='Legia Warszawa', KL='2 : 0'),                      # Bez gościa
+        _record(KC='?', KJ='Legia Warszawa', KK='Cracovia', KL='1:0'),
+        _record(KC=TS, KJ='Cracovia', KK='Legia Warszawa', KL='0 — 2'),
+        _record(KC=TS, KJ='Legia Warszawa', KK='Cracovia', KL='4 : 4'),       # Ponad limit 5
+    ))
+
+    assert data['home_team'] == 'Legia Warszawa'
+    assert data['away_team'] == 'Cracovia'
+    assert [m['score'] for m in data['h2h']] == ['3-1', '2-2', '0-1', '1-0', '0-2']
+    assert [m['winner'] for m in data['h2h']] == ['home', 'draw', 'away', 'home', 'away']
+    assert data['h2h'][0]['home'] == 'Legia Warszawa'  # '*' usunięty
+    assert data['h2h'][0]['date'] == datetime.fromtimestamp(TS).strftime('%d.%m.%y')
+    assert data['h2h'][3]['date'] == ''  # Nieliczbowy timestamp
+    assert '9-9' not in [m['score'] for m in data['h2h']]  # Zakładka "U siebie" pominięta
+
+
+def test_missing_teams():
+    data = parse_h2h_feed(_h2h_feed(
+        _record(KC=TS, KJ='Legia Warszawa', KK='Cracovia', KL='3 : 1'), teams=('Legia Warszawa',)))
+    assert data['home_team'] is None and data['away_team'] is None
+    assert len(data['h2h']) == 1
+
+    assert parse_h2h_feed('') == {'home_team': None, 'away_team': None, 'h2h': []}
+
+    fetcher = HttpH2HFetcher()
+    feeds = {'df_hh_1_KdfeT8U2': _h2h_feed(teams=('Legia Warszawa',))}
+    fetcher._get_feed = feeds.get
+    assert fetcher.fetch(URL) is None  # Bez nazw drużyn -> fallback Selenium
+    assert fetcher.stats() == {'http_ok': 0, 'http_failed': 1}
+
+
+def test_fetch_without_start_time():
+    fetcher = HttpH2HFetcher()
+    feeds = {'df_hh_1_KdfeT8U2': _h2h_feed(_record(KC=TS, KJ='Legia Warszawa', KK='Cracovia', KL='3 : 1'))}
+    fetcher._get_feed = feeds.get  # Brak feedu dc_1 nie unieważnia H2H
+    data = fetcher.fetch(URL)
+    assert data['match_time'] is None
+    assert data['home_team'] == 'Legia Warszawa' and len(data['h2h']) == 1
+    assert fetcher.fetch('https://www.livesport.com/pl/mecz/bez-mid/') is None
+
+
+def test_parse_start_time_feed():
+    assert parse_start_time_feed(_feed(_record(DA='x'), _record(DC=TS))) == \
+        datetime.fromtimestamp(TS).strftime('%d.%m.%Y %H:%M')
+    assert parse_start_time_feed(_feed(_record(DC='jutro'))) is None
+    assert parse_start_time_feed(_feed(_record(DA='x'))) is None
+    assert parse_start_time_feed('') is None
+
+
+def test_split_feed_separators():
+    records = _split_feed('~~SA÷1¬bez_separatora¬KL÷3÷1¬~¬~')
+    assert records == [{'SA': '1', 'KL': '3÷1'}]
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Parsowanie feedu H2H (h2h_fetch_engine)")
+    print("="*70)
+
+    tests = [test_parse_h2h_feed, test_missing_teams, test_fetch_without_start_time,
+             test_parse_start_time_feed, test_split_feed_separators]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
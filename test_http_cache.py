@@ -0,0 +1,90 @@
+"""
+Test cache HTTP dla API (http_cache.py)
+
+Sprawdza:
+1. ETag z wersji danych + 304 bez budowania odpowiedzi
+2. ETag z treści + kompresja gzip dla dużych odpowiedzi JSON
+"""
+
+import gzip
+import json
+
+from flask import Flask, jsonify
+
+from http_cache import check_not_modified, init_http_cache, make_etag, with_etag
+
+
+def _make_app():
+    app = Flask(__name__)
+    init_http_cache(app)
+    app.builds = 0
+
+    @app.route('/versioned')
+    def versioned():
+        etag = make_etag('plik.csv', 'v1')
+        not_modified = check_not_modified(etag)
+        if not_modified:
+            return not_modified
+        app.builds += 1
+        return with_etag(jsonify({'matches': []}), etag), 200
+
+    @app.route('/large')
+    def large():
+        return jsonify({'matches': [{'home_team': f'Drużyna {i}'} for i in range(200)]})
+
+    return app
+
+
+def test_versioned_etag_304():
+    app = _make_app()
+    client = app.test_client()
+
+    first = client.get('/versioned')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    second = client.get('/versioned', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert app.builds == 1
+
+    # Inne parametry zapytania = inny ETag
+    assert client.get('/versioned?sort=wins', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_content_etag_and_gzip():
+    client = _make_app().test_client()
+
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(json.loads(gzip.decompress(response.data))['matches']) == 200
+
+    cached = client.get('/large', headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Cache HTTP (ETag / 304 / gzip)")
+    print("="*70)
+
+    tests = [test_versioned_etag_304, test_content_etag_and_gzip]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
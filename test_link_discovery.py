@@ -0,0 +1,137 @@
+"""
+Test równoległego zbierania linków (get_match_links_from_day)
+
+Sprawdza:
+1. Sporty zbierane równolegle na osobnych przeglądarkach, wynik bez duplikatów
+   w kolejności sportów
+2. Cache listy meczów per (data, sport, ligi) - druga lista dnia bez nawigacji
+3. Brak dodatkowej przeglądarki -> sporty dokończone na przekazanym driverze
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import livesport_h2h_scraper as scraper
+from fake_driver import FakeDriver
+from fixture_cache import FixtureCache
+
+
+def _install_fakes(monkeypatch, fail_start=False):
+    calls = []
+    started = []
+    lock = threading.Lock()
+
+    def fake_collect(driver, sport, date, leagues=None):
+        with lock:
+            calls.append((driver.name, sport))
+        time.sleep(0.2)
+        # Ten sam mecz widoczny na dwóch listach (duplikat między sportami)
+        return [f'https://www.livesport.com/pl/mecz/{sport}/{i}/' for i in range(2)] + \
+               ['https://www.livesport.com/pl/mecz/wspolny/1/']
+
+    def fake_start_driver(headless=True):
+        if fail_start:
+            raise RuntimeError('brak Chrome')
+        driver = FakeDriver(f'extra{len(started)}')
+        started.append(driver)
+        return driver
+
+    monkeypatch.setattr(scraper, '_collect_sport_links', fake_collect)
+    monkeypatch.setattr(scraper, 'start_driver', fake_start_driver)
+    cache = FixtureCache(db_path=os.path.join(tempfile.mkdtemp(), 'fixture_cache.db'))
+    monkeypatch.setattr(scraper, 'get_fixture_cache', lambda: cache)
+    return calls, started
+
+
+def test_parallel_discovery_dedup(monkeypatch):
+    calls, started = _install_fakes(monkeypatch)
+    sports = ['football', 'soccer', 'basketball', 'volleyball', 'handball']
+
+    start = time.time()
+    links = scraper.get_match_links_from_day(FakeDriver('main'), '2025-11-01', sports, workers=4)
+    elapsed = time.time() - start
+
+    # football/soccer = ta sama strona -> 4 nawigacje, 4 przeglądarki po 0.2 s
+    assert len(calls) == 4
+    assert elapsed < 0.6
+    assert len(started) == 3 and all(d.quit_called for d in started)
+    assert links[0] == 'https://www.livesport.com/pl/mecz/football/0/'
+    assert links.count('https://www.livesport.com/pl/mecz/wspolny/1/') == 1
+    assert len(links) == 4 * 2 + 1
+
+
+def test_links_cached_per_day(monkeypatch):
+    calls, _ = _install_fakes(monkeypatch)
+    driver = FakeDriver('main')
+
+    scraper.get_match_links_from_day(driver, '2025-11-01', ['football', 'tennis'], workers=1)
+    assert len(calls) == 2
+    links = scraper.get_match_links_from_day(driver, '2025-11-01', ['tennis', 'basketball'], workers=1)
+    assert calls[2:] == [('main', 'basketball')]  # tennis z cache
+    assert links[0].startswith('https://www.livesport.com/pl/mecz/tennis/')
+
+    # Inna data / inne ligi = osobny wpis
+    scraper.get_match_links_from_day(driver, '2025-11-02', ['football'], workers=1)
+    scraper.get_match_links_from_day(driver, '2025-11-01', ['football'], leagues=['ekstraklasa'], workers=1)
+    assert len(calls) == 5
+
+    # Wymuszone odświeżenie omija cache
+    scraper.get_match_links_from_day(driver, '2025-11-01', ['tennis'], workers=1, refresh=True)
+    assert calls[-1] == ('main', 'tennis')
+
+
+def test_fallback_to_main_driver(monkeypatch):
+    calls, _ = _install_fakes(monkeypatch, fail_start=True)
+    links = scraper.get_match_links_from_day(FakeDriver('main'), '2025-11-01',
+                                             ['football', 'basketball', 'hockey'], workers=3)
+    assert sorted(sport for _, sport in calls) == ['basketball', 'football', 'hockey']
+    assert {name for name, _ in calls} == {'main'}
+    assert len(links) == 3 * 2 + 1
+
+
+class _MonkeyPatch:
+    """Minimalny odpowiednik fixture monkeypatch dla uruchomienia bez pytest"""
+
+    def __init__(self):
+        self._undo = []
+
+    def setattr(self, target, name, value):
+        self._undo.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def undo(self):
+        for target, name, value in reversed(self._undo):
+            setattr(target, name, value)
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Równoległe zbieranie linków + cache dnia")
+    print("="*70)
+
+    tests = [test_parallel_discovery_dedup, test_links_cached_per_day, test_fallback_to_main_driver]
+    failed = 0
+    for test in tests:
+        monkeypatch = _MonkeyPatch()
+        try:
+            test(monkeypatch)
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+        finally:
+            monkeypatch.undo()
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,158 @@
+"""
+Test cache wyników dla API (match_store.py)
+
+Sprawdza:
+1. Filtry i sortowanie /api/matches z tabeli w pamięci
+2. Wyszukiwanie meczu po event_id (indeks)
+3. Ponowne wczytanie dopiero po zmianie pliku
+4. /api/match/<id>: pełny rekord z indeksu w bazie (bez czytania CSV), ?date= respektowane,
+   CSV tylko jako zapas (wyszukiwanie po indeksie id, bez dopasowania fragmentu URL)
+5. latest() pomija pliki częściowe (shardy, zadania API w toku)
+"""
+
+import os
+import tempfile
+import time
+
+from db_manager import MatchDatabase
+from match_store import MatchStore
+from result_sink import ResultSink
+
+
+def _write_results(outputs_dir: str, rows, date: str = '2025-11-01', suffix: str = '') -> str:
+    path = os.path.join(outputs_dir, f'livesport_h2h_{date}_football{suffix}.csv')
+    with ResultSink(path) as sink:
+        for row in rows:
+            sink.write(row)
+    return path
+
+
+ROWS = [
+    {'match_url': 'https://www.livesport.com/pl/mecz/pilka-nozna/a-b/AbCdEfGh/?mid=KdfeT8U2',
+     'home_team': 'Legia', 'away_team': 'Górnik', 'match_time': '20:00', 'qualifies': True,
+     'home_wins_in_h2h_last5': 4, 'h2h_count': 5, 'home_form_overall': ['W', 'W', 'D']},
+    {'match_url': 'https://www.livesport.com/pl/mecz/pilka-nozna/c-d/XyZaBcDe/?mid=Qw12Er34',
+     'home_team': 'Lech', 'away_team': 'Wisła', 'match_time': '18:00', 'qualifies': True,
+     'home_wins_in_h2h_last5': 3, 'h2h_count': 5},
+    {'match_url': 'https://www.livesport.com/pl/mecz/pilka-nozna/e-f/QqQqQqQq/?mid=Zx98Cv76',
+     'home_team': 'Raków', 'away_team': 'Pogoń', 'qualifies': False, 'home_wins_in_h2h_last5': 1},
+]
+
+
+def test_query_filters_and_sort():
+    outputs_dir = tempfile.mkdtemp()
+    _write_results(outputs_dir, ROWS)
+    table = MatchStore(outputs_dir).latest('2025-11-01')
+
+    assert table.total == 3
+    assert [m['home_team'] for m in table.query(sort_by='time')] == ['Lech', 'Legia']
+    assert [m['home_team'] for m in table.query(sort_by='wins', min_wins=4)] == ['Legia']
+    assert [m['home_team'] for m in table.query(sort_by='time', limit=1)] == ['Lech']
+    assert table.query(sort_by='team')[1]['home_form_overall'] == ['W', 'W', 'D']
+
+
+def test_find_match_by_event_id():
+    outputs_dir = tempfile.mkdtemp()
+    _write_results(outputs_dir, ROWS)
+    store = MatchStore(outputs_dir)
+
+    match, found_in = store.find_match('2025-11-01', 'Qw12Er34')
+    assert match['home_team'] == 'Lech'
+    assert found_in == 'livesport_h2h_2025-11-01_football.csv'
+    assert store.find_match('2025-11-01', 'brak1234') is None
+    assert store.find_match('2025-11-01', 'XyZaBcDe')[0]['home_team'] == 'Lech'  # Klucz z URL
+    assert store.find_match('2025-11-01', 'pilka-nozna') is None  # Fragment URL to nie id
+
+
+def test_reload_only_after_file_change():
+    outputs_dir = tempfile.mkdtemp()
+    path = _write_results(outputs_dir, ROWS[:1])
+    store = MatchStore(outputs_dir)
+
+    assert store.latest('2025-11-01').total == 1
+    assert store.latest('2025-11-01').total == 1
+    assert store.loads == 1
+
+    time.sleep(0.01)
+    _write_results(outputs_dir, ROWS)
+    os.utime(path, ns=(time.time_ns(), time.time_ns()))
+    assert store.latest('2025-11-01').total == 3
+    assert store.loads == 2
+
+
+def test_latest_skips_partial_files():
+    outputs_dir = tempfile.mkdtemp()
+    final = _write_results(outputs_dir, ROWS, suffix='_EMAIL')
+    time.sleep(0.01)
+    _write_results(outputs_dir, ROWS[:1], suffix='_EMAIL_shard1of2')
+    _write_results(outputs_dir, ROWS[:1], suffix='_API_3f2a9c1b7e04')  # Zadanie w toku
+    store = MatchStore(outputs_dir)
+
+    assert store.files_for_date('2025-11-01') == [final]
+    assert store.latest('2025-11-01').total == 3
+
+    time.sleep(0.01)
+    job_final = _write_results(outputs_dir, ROWS[:2], suffix='_API')  # Zadanie zakończone
+    assert store.latest('2025-11-01').file == os.path.basename(job_final)
+
+
+def test_api_match_detail_from_index():
+    import api_server
+
+    outputs_dir = tempfile.mkdtemp()
+    result = dict(ROWS[1], home_form_home=['W', 'W'], away_form_away=['L', 'D'])
+    _write_results(outputs_dir, ROWS[:1], date='2025-11-02')
+    db = MatchDatabase(os.path.join(outputs_dir, 'matches.db'))
+    db.insert_result(result, '2025-11-01', 'football', source_file='livesport_h2h_2025-11-01_football.csv')
+
+    store = MatchStore(outputs_dir)
+    original = api_server._match_db, api_server.get_match_store
+    api_server._match_db, api_server.get_match_store = db, lambda: store
+    try:
+        client = api_server.app.test_client()
+        # Pełny rekord (forma dom/wyjazd) z indeksu - dla tej daty nie ma nawet pliku CSV
+        body = client.get('/api/match/Qw12Er34').get_json()
+        assert body['found_in'] == 'livesport_h2h_2025-11-01_football.csv'
+        assert body['match']['home_form_home'] == ['W', 'W']
+        assert body['match']['away_form_away'] == ['L', 'D']
+        assert store.loads == 0
+
+        # Identyfikator z URL (nie ?mid=) też trafia w indeks
+        assert client.get('/api/match/XyZaBcDe?date=2025-11-01').status_code == 200
+        # ?date= jest respektowane - mecz z innego dnia to 404
+        assert client.get('/api/match/Qw12Er34?date=2025-11-02').status_code == 404
+
+        # Mecz spoza indeksu (plik sprzed indeksu) - zapas z CSV po indeksie id
+        body = client.get('/api/match/KdfeT8U2?date=2025-11-02').get_json()
+        assert body['match']['home_team'] == 'Legia'
+    finally:
+        api_server._match_db, api_server.get_match_store = original
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Cache wyników API (MatchStore)")
+    print("="*70)
+
+    tests = [test_query_filters_and_sort, test_find_match_by_event_id, test_reload_only_after_file_change,
+             test_latest_skips_partial_files, test_api_match_detail_from_index]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,188 @@
+"""
+Test cache kursów (odds_cache.py)
+
+Sprawdza:
+1. Miss -> set -> hit (z licznikami)
+2. Zapamiętane "brak kursów" (None) odróżnione od MISS
+3. Wygasanie TTL
+4. Eviction LRU po przekroczeniu limitu
+5. Integrację z LiveSportOddsAPI (drugie zapytanie nie idzie do API)
+6. Błąd transportu (429 / wyjątek sieci) NIE jest zapamiętany jako "brak kursów"
+"""
+
+import os
+import tempfile
+import time
+
+from odds_cache import MISS, OddsCache
+
+
+def _make_cache(**kwargs) -> OddsCache:
+    path = os.path.join(tempfile.mkdtemp(), 'odds_cache.db')
+    return OddsCache(db_path=path, **kwargs)
+
+
+def test_hit_and_miss():
+    cache = _make_cache()
+    key = ('KQAaF7d2', '167', 'HOME_DRAW_AWAY', 'FULL_TIME')
+
+    assert cache.get(key) is MISS
+    cache.set(key, {'home_odds': 1.85, 'away_odds': 4.2})
+    assert cache.get(key) == {'home_odds': 1.85, 'away_odds': 4.2}
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+
+
+def test_negative_result_is_cached():
+    cache = _make_cache()
+    key = ('KQAaF7d2', '171', 'OVER_UNDER', 'FULL_TIME')
+
+    cache.set(key, None)
+    assert cache.get(key) is None
+
+
+def test_ttl_expiry():
+    cache = _make_cache(ttl=0.2, negative_ttl=0.2)
+    key = ('KQAaF7d2', '167', 'HOME_DRAW_AWAY', 'FULL_TIME')
+
+    cache.set(key, {'home_odds': 2.0, 'away_odds': 2.0})
+    assert cache.get(key) is not MISS
+    time.sleep(0.3)
+    assert cache.get(key) is MISS
+
+
+def test_lru_eviction():
+    cache = _make_cache(max_entries=2)
+    keys = [(f'event{i}', '167', 'HOME_DRAW_AWAY', 'FULL_TIME') for i in range(3)]
+
+    cache.set(keys[0], {'home_odds': 1.0})
+    time.sleep(0.01)
+    cache.set(keys[1], {'home_odds': 1.1})
+    time.sleep(0.01)
+    cache.get(keys[0])  # event0 używany ostatnio -> zostaje
+    time.sleep(0.01)
+    cache.set(keys[2], {'home_odds': 1.2})
+    cache.evict()
+
+    assert cache.get(keys[0]) is not MISS
+    assert cache.get(keys[1]) is MISS
+    assert cache.get(keys[2]) is not MISS
+
+
+def test_client_uses_cache():
+    import livesport_odds_api_client as client_module
+
+    cache = _make_cache()
+    original_get_cache = client_module.get_odds_cache
+    client_module.get_odds_cache = lambda: cache
+    try:
+        client = client_module.LiveSportOddsAPI(bookmaker_id='167')
+        calls = []
+
+        def fake_fetch(event_id, bet_type):
+            calls.append((event_id, bet_type))
+            return {'home_odds': 1.5, 'away_odds': 2.5}
+
+        client._fetch_odds_for_event = fake_fetch
+
+        first = client.get_odds_for_event('KQAaF7d2', sport='football')
+        second = client.get_odds_for_event('KQAaF7d2', sport='football')
+        assert first == second
+        assert len(calls) == 1
+
+        # Inny betType (siatkówka) = inny klucz cache
+        client.get_odds_for_event('KQAaF7d2', sport='volleyball')
+        assert len(calls) == 2
+    finally:
+        client_module.get_odds_cache = original_get_cache
+
+
+class _FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = ''
+
+    def json(self):
+        return self._payload
+
+
+def test_failed_fetch_is_not_cached():
+    import requests
+    import livesport_odds_api_client as client_module
+
+    cache = _make_cache()
+    original_get_cache = client_module.get_odds_cache
+    original_sleep = client_module.time.sleep
+    client_module.get_odds_cache = lambda: cache
+    client_module.time.sleep = lambda seconds: None
+    try:
+        client = client_module.LiveSportOddsAPI(bookmaker_id='167')
+        key = ('KQAaF7d2', '167', 'HOME_DRAW_AWAY', 'FULL_TIME')
+        responses = []
+
+        def fake_api_get(params, timeout):
+            response = responses.pop(0) if responses else _FakeResponse(429)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        client._api_get = fake_api_get
+
+        # Rate limit na wszystkich próbach i w fallbacku -> None, ale bez zapisu w cache
+        assert client.get_odds_for_event('KQAaF7d2', sport='football') is None
+        assert cache.get(key) is MISS
+
+        # Wyjątek sieci przy O/U / BTTS -> też bez zapisu
+        responses[:] = [requests.exceptions.ConnectionError('reset')]
+        assert client.get_over_under_odds('KQAaF7d2') is None
+        assert cache.get(('KQAaF7d2', '167', 'OVER_UNDER', 'FULL_TIME')) is MISS
+        responses[:] = [_FakeResponse(503)]
+        assert client.get_btts_odds('KQAaF7d2') is None
+        assert cache.get(('KQAaF7d2', '167', 'BOTH_TEAMS_SCORE', 'FULL_TIME')) is MISS
+
+        # Retry po błędzie idzie do API i dostaje kursy
+        odds = {'data': {'findPrematchOddsForBookmaker': {'home': {'value': '1.5'}, 'away': {'value': '2.5'}}}}
+        responses[:] = [_FakeResponse(200, odds)]
+        assert client.get_odds_for_event('KQAaF7d2', sport='football')['home_odds'] == 1.5
+
+        # Prawdziwe "brak kursów" (200, pusta odpowiedź) jest zapamiętane
+        empty = {'data': {'findPrematchOddsForBookmaker': None}}
+        responses[:] = [_FakeResponse(200, empty)] * 3
+        assert client.get_btts_odds('Xy12Ab34') is None
+        assert cache.get(('Xy12Ab34', '167', 'BOTH_TEAMS_SCORE', 'FULL_TIME')) is None
+    finally:
+        client_module.get_odds_cache = original_get_cache
+        client_module.time.sleep = original_sleep
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Cache kursów (odds_cache)")
+    print("="*70)
+
+    tests = [test_hit_and_miss, test_negative_result_is_cached, test_ttl_expiry,
+             test_lru_eviction, test_client_uses_cache, test_failed_fetch_is_not_cached]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,209 @@
+"""
+Test równoległego pobierania kursów (livesport_odds_api_client.py)
+
+Sprawdza:
+1. TokenBucket: zapas (capacity) bez czekania, potem tempo rate/s - też między wątkami
+2. fetch_odds_from_bookmakers: ponowienie po błędzie/pustych kursach, tylko
+   bukmacherzy z kursami w wyniku
+3. iter_odds_for_matches: wyniki w kolejności nadejścia, najwyżej max_workers
+   meczów w locie, mecz po terminie (deadline) oddany jako błąd bez czekania;
+   zawieszony mecz nie powoduje fałszywych timeoutów kolejnych (limit od startu,
+   porzucony wątek zajmuje miejsce w oknie)
+4. get_odds_for_matches_batch: wynik w kolejności wejściowej listy
+"""
+
+import threading
+import time
+
+import livesport_odds_api_client as odds_client
+from livesport_odds_api_client import (TokenBucket, fetch_odds_from_bookmakers, get_odds_for_matches_batch,
+                                       iter_odds_for_matches)
+
+URL = 'https://www.livesport.com/pl/mecz/pilka-nozna/a-b/AbCdEfGh/?mid=KdfeT8U2'
+
+
+def _match_url(event_id: str) -> str:
+    return f'https://www.livesport.com/pl/mecz/pilka-nozna/a-b/AbCdEfGh/?mid={event_id}'
+
+
+def _slow_complete_odds(delays, in_flight=None):
+    """get_complete_odds z opóźnieniem per event_id (i licznikiem meczów w locie)"""
+    lock = threading.Lock()
+    active = [0]
+
+    def fake(self, event_id, sport='football'):
+        with lock:
+            active[0] += 1
+            if in_flight is not None:
+                in_flight.append(active[0])
+        try:
+            time.sleep(delays.get(event_id, 0))
+            return {'home_odds': 2.0, 'away_odds': 3.0, 'event': event_id}
+        finally:
+            with lock:
+                active[0] -= 1
+    return fake
+
+
+def test_token_bucket_rate():
+    start = time.monotonic()
+    for _ in range(100):
+        TokenBucket(0).acquire()  # Bez limitu
+    assert time.monotonic() - start < 0.1
+
+    bucket = TokenBucket(rate=10, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05  # Zapas bez czekania
+
+    bucket.acquire()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.15  # Dalej 10/s
+
+
+def test_token_bucket_threads():
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.acquire()  # Zużyj zapas
+    start = time.monotonic()
+
+    def worker():
+        for _ in range(5):
+            bucket.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 20 / 50 * 0.9  # 20 tokenów przy 50/s, wspólny limit
+
+
+def test_bookmakers_retry(monkeypatch):
+    calls = {}
+    lock = threading.Lock()
+
+    def fake_get_odds_from_url(self, match_url, sport=None):
+        with lock:
+            calls[self.bookmaker_id] = calls.get(self.bookmaker_id, 0) + 1
+            attempt = calls[self.bookmaker_id]
+        if self.bookmaker_id == '167':
+            if attempt == 1:
+                raise ConnectionError('reset')  # Udane dopiero ponowienie
+            return {'home_odds': 1.9, 'away_odds': 3.8}
+        if self.bookmaker_id == '171':
+            return {'home_odds': None, 'away_odds': None}  # Puste kursy = ponów
+        return None
+
+    monkeypatch.setattr(odds_client.LiveSportOddsAPI, 'get_odds_from_url', fake_get_odds_from_url)
+    results = fetch_odds_from_bookmakers(URL, [('167', 'STS'), ('171', 'Fortuna'), ('165', 'Nordic')],
+                                         sport='football', attempts=2)
+
+    assert results == {'STS': {'home_odds': 1.9, 'away_odds': 3.8}}
+    assert calls == {'167': 2, '171': 2, '165': 2}
+
+
+def test_iter_odds_completion_order_and_window(monkeypatch):
+    in_flight = []
+    delays = {'Ev000001': 0.3, 'Ev000002': 0.0, 'Ev000003': 0.1, 'Ev000004': 0.0}
+    monkeypatch.setattr(odds_client.LiveSportOddsAPI, 'get_complete_odds', _slow_complete_odds(delays, in_flight))
+
+    urls = [_match_url(event_id) for event_id in delays] + ['https://www.livesport.com/pl/mecz/bez-mid/']
+    items = list(iter_odds_for_matches(urls, max_workers=2, deadline=5.0))
+
+    assert len(items) == 5
+    order = [item['event_id'] for item in items if item['event_id']]
+    assert order.index('Ev000002') < order.index('Ev000001')  # Szybszy mecz nie czeka na wolniejszy
+    assert order[-1] == 'Ev000001'
+    assert max(in_flight) <= 2
+    assert [item['error'] for item in items if not item['event_id']] == ['brak event_id w URL']
+
+
+def test_iter_odds_deadline(monkeypatch):
+    delays = {'Ev000001': 2.0, 'Ev000002': 0.0}
+    monkeypatch.setattr(odds_client.LiveSportOddsAPI, 'get_complete_odds', _slow_complete_odds(delays))
+
+    start = time.monotonic()
+    items = {item['event_id'] or item['match_url']: item
+             for item in iter_odds_for_matches([_match_url('Ev000001'), _match_url('Ev000002')],
+                                               max_workers=2, deadline=0.3)}
+    assert time.monotonic() - start < 1.0  # Nie czeka 2s na zawieszony mecz
+
+    assert items['Ev000002']['odds']['home_odds'] == 2.0
+    late = items[_match_url('Ev000001')]
+    assert late['odds'] is None and 'limit czasu' in late['error']
+
+
+def test_iter_odds_hung_event_no_false_timeouts(monkeypatch):
+    in_flight = []
+    delays = {'Ev000001': 1.2, 'Ev000002': 0.2, 'Ev000003': 0.2, 'Ev000004': 0.2, 'Ev000005': 0.2}
+    monkeypatch.setattr(odds_client.LiveSportOddsAPI, 'get_complete_odds', _slow_complete_odds(delays, in_flight))
+
+    items = {item['event_id'] or item['match_url']: item
+             for item in iter_odds_for_matches([_match_url(event_id) for event_id in delays],
+                                               max_workers=2, deadline=0.3)}
+
+    assert 'limit czasu' in items[_match_url('Ev000001')]['error']
+    for event_id in ('Ev000002', 'Ev000003', 'Ev000004', 'Ev000005'):
+        assert items[event_id]['odds']['home_odds'] == 2.0, event_id  # Bez fałszywego timeoutu
+    assert max(in_flight) <= 2  # Zawieszony wątek liczony do okna
+
+
+def test_batch_keeps_input_order(monkeypatch):
+    delays = {'Ev000001': 0.2, 'Ev000002': 0.1, 'Ev000003': 0.0}
+    monkeypatch.setattr(odds_client.LiveSportOddsAPI, 'get_complete_odds', _slow_complete_odds(delays))
+
+    urls = [_match_url(event_id) for event_id in delays]
+    results = get_odds_for_matches_batch(urls, verbose=False, max_workers=3)
+    assert [r['match_url'] for r in results] == urls
+
+
+class _MonkeyPatch:
+    """Minimalny odpowiednik fixture monkeypatch dla uruchomienia bez pytest"""
+
+    def __init__(self):
+        self._undo = []
+
+    def setattr(self, target, name, value):
+        self._undo.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def undo(self):
+        for target, name, value in reversed(self._undo):
+            setattr(target, name, value)
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Równoległe pobieranie kursów")
+    print("="*70)
+
+    tests = [test_token_bucket_rate, test_token_bucket_threads, test_bookmakers_retry,
+             test_iter_odds_completion_order_and_window, test_iter_odds_deadline,
+             test_iter_odds_hung_event_no_false_timeouts, test_batch_keeps_input_order]
+    failed = 0
+    for test in tests:
+        monkeypatch = _MonkeyPatch()
+        try:
+            if test.__code__.co_argcount:
+                test(monkeypatch)
+            else:
+                test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+        finally:
+            monkeypatch.undo()
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
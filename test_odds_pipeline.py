@@ -0,0 +1,137 @@
+"""
+Test pobierania kursów w tle (odds_pipeline.py)
+
+Sprawdza:
+1. submit: jeden prefetch na event_id (różne URL-e tego samego meczu), tenis pomijany
+2. get: kursy z tła (hit), niezlecony mecz (miss), błąd / timeout -> None (kursy inline)
+3. close: zlecone, jeszcze nierozpoczęte pobrania są anulowane
+4. fetch_match_odds pobiera z góry tylko 1X2 (O/U i BTTS dopiero w process_match)
+"""
+
+import threading
+
+import livesport_h2h_scraper as scraper
+from odds_pipeline import OddsPrefetcher
+
+
+def _url(event_id: str, sport: str = 'pilka-nozna') -> str:
+    return f'https://www.livesport.com/pl/mecz/{sport}/a-b/AbCdEfGh/?mid={event_id}'
+
+
+def test_submit_and_get():
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        if 'Ev000003' in url:
+            raise ConnectionError('reset')
+        return {'odds': {'home_odds': 2.0, 'url': url}}
+
+    with OddsPrefetcher(max_workers=2, fetch_fn=fetch) as prefetcher:
+        count = prefetcher.submit([_url('Ev000001'), _url('Ev000002'), _url('Ev000003'),
+                                   _url('Ev000001').replace('AbCdEfGh', 'inny-url'),  # Ten sam mecz
+                                   _url('Ev000004', sport='tenis')])
+        assert count == 3
+
+        assert prefetcher.get(_url('Ev000002'))['odds']['home_odds'] == 2.0
+        assert prefetcher.get(_url('Ev000003')) is None   # Błąd -> kursy inline
+        assert prefetcher.get(_url('Ev000004', sport='tenis')) is None  # Niezlecony
+        assert prefetcher.get(_url('Ev000002')) is None   # Już odebrany
+
+        stats = prefetcher.stats()
+        assert stats['submitted'] == 3 and stats['hits'] == 1
+        assert stats['failed'] == 1 and stats['misses'] == 2
+    assert len(fetched) == 3
+
+
+def test_get_timeout():
+    release = threading.Event()
+    prefetcher = OddsPrefetcher(max_workers=1, fetch_fn=lambda url: release.wait(5) and {'odds': {}})
+    prefetcher.submit([_url('Ev000001')])
+    assert prefetcher.get(_url('Ev000001'), timeout=0.1) is None
+    assert prefetcher.stats()['failed'] == 1
+    release.set()
+    prefetcher.close()
+
+
+def test_close_cancels_outstanding():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        return {'odds': {}}
+
+    prefetcher = OddsPrefetcher(max_workers=1, fetch_fn=fetch)
+    prefetcher.submit([_url(f'Ev00000{i}') for i in range(1, 5)])
+    assert started.wait(5)
+    prefetcher.close()
+    release.set()
+
+    assert prefetcher.stats()['cancelled'] == 3  # Pierwszy już trwał
+    assert prefetcher.stats()['pending'] == 0
+    assert len(calls) == 1
+
+
+def test_prefetch_only_main_market(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scraper, 'extract_betting_odds_with_api',
+                        lambda url, use_multi_bookmaker=True, sport=None: {'home_odds': 1.5, 'away_odds': 2.5})
+    monkeypatch.setattr(scraper, '_fetch_ou_btts_odds', lambda url, sport: calls.append(url) or (None, None))
+
+    result = scraper.fetch_match_odds(_url('Ev000001'))
+    assert result == {'odds': {'home_odds': 1.5, 'away_odds': 2.5}}
+    assert calls == []
+
+
+class _MonkeyPatch:
+    """Minimalny odpowiednik fixture monkeypatch dla uruchomienia bez pytest"""
+
+    def __init__(self):
+        self._undo = []
+
+    def setattr(self, target, name, value):
+        self._undo.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def undo(self):
+        for target, name, value in reversed(self._undo):
+            setattr(target, name, value)
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Kursy pobierane w tle (OddsPrefetcher)")
+    print("="*70)
+
+    tests = [test_submit_and_get, test_get_timeout, test_close_cancels_outstanding,
+             test_prefetch_only_main_market]
+    failed = 0
+    for test in tests:
+        monkeypatch = _MonkeyPatch()
+        try:
+            if test.__code__.co_argcount:
+                test(monkeypatch)
+            else:
+                test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+        finally:
+            monkeypatch.undo()
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
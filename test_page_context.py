@@ -0,0 +1,81 @@
+"""
+Test jednokrotnego parsowania DOM strony (page_context.py)
+
+Sprawdza:
+1. soup() parsuje dokument raz - kolejne wywołania zwracają ten sam obiekt
+2. navigate() i invalidate() unieważniają dokument (nowy page_source)
+3. get_page_context: jeden kontekst na przeglądarkę, osobne dla różnych driverów
+"""
+
+from fake_driver import FakeDriver
+from page_context import PageContext, get_page_context
+
+
+H2H_URL = 'https://test.com/h2h'
+
+
+def _driver() -> FakeDriver:
+    return FakeDriver(page_source='<html><body><p>start</p></body></html>',
+                      pages={H2H_URL: f'<html><body><p>{H2H_URL}</p></body></html>'})
+
+
+def test_soup_is_cached():
+    driver = _driver()
+    ctx = PageContext(driver)
+    first = ctx.soup()
+    assert ctx.soup() is first
+    assert ctx.parses == 1 and driver.page_source_reads == 1
+    assert first.p.text == 'start'
+
+
+def test_navigate_and_invalidate():
+    driver = _driver()
+    ctx = PageContext(driver)
+    before = ctx.soup()
+
+    ctx.navigate(H2H_URL)
+    assert driver.navigations == [H2H_URL] and ctx.url == H2H_URL
+    after = ctx.soup()
+    assert after is not before and after.p.text == H2H_URL
+
+    driver.page_source = '<html><body><p>zakładka</p></body></html>'  # Kliknięcie zmieniło DOM
+    assert ctx.soup().p.text == H2H_URL  # Bez invalidate - stary dokument
+    ctx.invalidate()
+    assert ctx.soup().p.text == 'zakładka'
+    assert ctx.parses == 3
+
+
+def test_context_per_driver():
+    first, second = _driver(), _driver()
+    ctx = get_page_context(first)
+    assert get_page_context(first) is ctx
+    assert get_page_context(second) is not ctx
+    assert get_page_context(second).driver is second
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Jednokrotne parsowanie strony (PageContext)")
+    print("="*70)
+
+    tests = [test_soup_is_cached, test_navigate_and_invalidate, test_context_per_driver]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,161 @@
+"""
+Test strumienia postępu zadań (progress_bus.py + /api/scrape/stream)
+
+Sprawdza:
+1. Replay ostatnich zdarzeń dla nowego subskrybenta + filtr po zadaniu
+2. Przepełniona kolejka wolnego klienta odrzuca najstarsze (publish nie blokuje)
+3. JobManager publikuje status/match/done, a endpoint SSE kończy strumień na 'done'
+4. SCRAPE_MODE=worker: zdarzenia match z osobnego workera (scrape_job_events) trafiają
+   do strumienia SSE API, stare zdarzenia zakończonych zadań są usuwane
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+from progress_bus import ProgressBus, sse_format
+from scrape_jobs import JobManager
+
+
+def _fake_runner(job, date, sports, max_matches):
+    job.update(total=2)
+    for i in range(1, 3):
+        job.update(progress=i, current_match=f'https://test.com/{i}')
+        job.publish('match', {'home_team': f'Drużyna {i}', 'qualifies': i == 2})
+    return 'wynik.csv'
+
+
+def _parse_sse(body: str):
+    events = []
+    for frame in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in frame.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_replay_and_job_filter():
+    bus = ProgressBus(replay=2)
+    bus.publish('a', 'status', {'progress': 1})
+    bus.publish('a', 'status', {'progress': 2})
+    bus.publish('a', 'status', {'progress': 3})
+    bus.publish('b', 'status', {'progress': 99})
+
+    with bus.subscribe('a') as subscription:
+        assert [subscription.get(0.1)['data']['progress'] for _ in range(2)] == [2, 3]
+        bus.publish('b', 'status', {'progress': 100})
+        assert subscription.get(0.05) is None
+
+    frame = sse_format({'id': 7, 'event': 'match', 'data': {'home_team': 'Legia'}})
+    assert frame == 'id: 7\nevent: match\ndata: {"home_team": "Legia"}\n\n'
+
+
+def test_slow_subscriber_drops_oldest():
+    bus = ProgressBus(subscriber_queue_size=3)
+    subscription = bus.subscribe()
+    for i in range(10):
+        bus.publish('a', 'match', {'n': i})
+    assert subscription.dropped == 7
+    assert [subscription.get(0.1)['data']['n'] for _ in range(3)] == [7, 8, 9]
+    subscription.close()
+    bus.publish('a', 'match', {'n': 10})
+    assert subscription.get(0.05) is None
+
+
+def test_job_events_and_sse_endpoint():
+    import api_server
+
+    bus = ProgressBus(replay=50)
+    manager = JobManager(_fake_runner, db_path=os.path.join(tempfile.mkdtemp(), 'jobs.db'), bus=bus)
+    original = api_server.job_manager, api_server.progress_bus
+    api_server.job_manager, api_server.progress_bus = manager, bus
+    try:
+        subscription = bus.subscribe()
+        job_id = manager.submit('2025-11-01', ['football'])['job_id']
+
+        client = api_server.app.test_client()
+        response = client.get(f'/api/scrape/stream?job={job_id}')
+        assert response.mimetype == 'text/event-stream'
+        events = _parse_sse(response.get_data(as_text=True))
+
+        names = [name for name, _ in events]
+        assert names[0] == 'status' and names[-1] == 'done'
+        assert [data['home_team'] for name, data in events if name == 'match'] == ['Drużyna 1', 'Drużyna 2']
+        assert events[-1][1]['status'] == 'completed'
+        assert 'Content-Encoding' not in response.headers
+
+        # Szyna globalna widzi te same zdarzenia z job_id
+        first = subscription.get(1.0)
+        assert first['data']['job_id'] == job_id
+        subscription.close()
+
+        assert client.get('/api/scrape/stream?job=brak').status_code == 404
+    finally:
+        api_server.job_manager, api_server.progress_bus = original
+
+
+def test_sse_worker_mode_streams_match_events():
+    import api_server
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'jobs.db')
+    bus = ProgressBus()
+    api = JobManager(_fake_runner, db_path=db_path, max_workers=0, bus=bus)
+    worker = JobManager(_fake_runner, db_path=db_path, max_workers=1, recover=False, persist_events=True)
+    original = api_server.job_manager, api_server.progress_bus, api_server.SSE_POLL_SECONDS
+    api_server.job_manager, api_server.progress_bus, api_server.SSE_POLL_SECONDS = api, bus, 0.02
+    stop = threading.Event()
+    thread = threading.Thread(target=worker.serve, kwargs={'poll_interval': 0.02, 'stop': stop})
+    try:
+        job_id = api.submit('2025-11-01', ['football'])['job_id']
+        client = api_server.app.test_client()
+        response = client.get(f'/api/scrape/stream?job={job_id}')  # Otwarty przed startem workera
+        thread.start()
+        events = _parse_sse(response.get_data(as_text=True))
+
+        assert [data['home_team'] for name, data in events if name == 'match'] == ['Drużyna 1', 'Drużyna 2']
+        assert all(data['job_id'] == job_id for _, data in events)
+        assert events[-1][0] == 'done' and events[-1][1]['status'] == 'completed'
+
+        # Nowy klient po zakończeniu: replay zdarzeń z bazy + done
+        events = _parse_sse(client.get(f'/api/scrape/stream?job={job_id}').get_data(as_text=True))
+        assert [name for name, _ in events] == ['status', 'match', 'match', 'done']
+
+        assert api.prune_events(max_age_hours=1) == 0
+        assert api.prune_events(max_age_hours=-1) == 2
+        assert api.events(job_id) == []
+    finally:
+        stop.set()
+        if thread.is_alive():
+            thread.join()
+        worker.shutdown(wait=True)
+        api_server.job_manager, api_server.progress_bus, api_server.SSE_POLL_SECONDS = original
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Strumień postępu zadań (SSE)")
+    print("="*70)
+
+    tests = [test_replay_and_job_filter, test_slow_subscriber_drops_oldest, test_job_events_and_sse_endpoint,
+             test_sse_worker_mode_streams_match_events]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
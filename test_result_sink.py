@@ -0,0 +1,120 @@
+"""
+Test strumieniowego zapisu wyników (result_sink.py)
+
+Sprawdza:
+1. Stały schemat kolumn (brakujące pola = puste, nadmiarowe pomijane)
+2. Format CSV zgodny z czytnikami (api_server: literal_eval, email_notifier: json.loads)
+3. Zapis na bieżąco (flush co N wierszy, zanim sink zostanie zamknięty)
+4. BatchForwarder: paczki po batch_size, reszta przy close(), nieudana paczka liczona
+"""
+
+import ast
+import csv
+import json
+import os
+import tempfile
+
+from result_sink import RESULT_SCHEMA, BatchForwarder, ResultSink
+
+
+def _csv_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), 'outputs', 'wynik.csv')
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_fixed_schema():
+    path = _csv_path()
+    with ResultSink(path) as sink:
+        sink.write({'match_url': 'https://test.com/match1', 'qualifies': True, 'nieznana_kolumna': 1})
+        sink.write({'match_url': 'https://test.com/match2', 'home_odds': float('nan')})
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        header = next(csv.reader(f))
+    assert header == [name for name, _ in RESULT_SCHEMA]
+
+    rows = _read(path)
+    assert len(rows) == 2
+    assert rows[0]['qualifies'] == 'True'
+    assert rows[1]['home_odds'] == ''
+    assert 'nieznana_kolumna' not in rows[0]
+
+
+def test_reader_compatible_encoding():
+    path = _csv_path()
+    with ResultSink(path) as sink:
+        sink.write({
+            'match_url': 'https://test.com/match1',
+            'h2h_last5': [{'date': '01.05.2025', 'score': '2-1', 'winner': 'home'}],
+            'home_form_overall': ['W', 'W', 'D'],
+            'all_odds': {'STS': {'home': 1.85, 'away': 4.2, 'draw': None}},
+            'bookmakers_found': ['STS', 'Fortuna'],
+        })
+
+    row = _read(path)[0]
+    assert ast.literal_eval(row['h2h_last5'])[0]['score'] == '2-1'
+    assert ast.literal_eval(row['home_form_overall']) == ['W', 'W', 'D']
+    assert json.loads(row['all_odds'])['STS']['home'] == 1.85
+    assert row['bookmakers_found'] == 'STS, Fortuna'
+
+
+def test_rows_flushed_before_close():
+    path = _csv_path()
+    sink = ResultSink(path, flush_every=2)
+    for i in range(3):
+        sink.write({'match_url': f'https://test.com/match{i}'})
+
+    # 2 wiersze już na dysku mimo otwartego sinka (np. crash procesu)
+    assert len(_read(path)) >= 2
+    sink.close()
+    sink.close()  # Drugie zamknięcie bez błędu
+    assert len(_read(path)) == 3
+    assert sink.rows_written == 3
+
+
+def test_batch_forwarder():
+    batches = []
+
+    def send(batch):
+        batches.append([row['id'] for row in batch])
+        if len(batches) == 2:
+            raise ConnectionError('timeout')  # Druga paczka nieudana
+        return True
+
+    with BatchForwarder(send, batch_size=2, name='test') as forward:
+        forward.write_all({'id': i} for i in range(5))
+        assert batches == [[0, 1], [2, 3]]  # Pełne paczki wysłane od razu
+    assert batches == [[0, 1], [2, 3], [4]]
+    assert forward.rows_sent == 3 and forward.batches_sent == 2 and forward.batches_failed == 1
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Strumieniowy zapis wyników (ResultSink)")
+    print("="*70)
+
+    tests = [test_fixed_schema, test_reader_compatible_encoding, test_rows_flushed_before_close,
+             test_batch_forwarder]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,103 @@
+"""
+Test dziennika przebiegu (run_journal.py) - podstawa dla --resume
+
+Sprawdza:
+1. Zapis i odczyt wyników (klucz: match_url)
+2. Pominięcie uciętej ostatniej linii (crash w trakcie zapisu)
+3. Wznowienie po uciętym zapisie - nowe wpisy nie sklejają się z uciętą linią
+4. reset() dla nowego przebiegu
+"""
+
+import os
+import tempfile
+
+from run_journal import RunJournal, journal_path_for
+
+
+def _make_journal() -> RunJournal:
+    return RunJournal(os.path.join(tempfile.mkdtemp(), 'run.journal.jsonl'))
+
+
+def test_journal_path():
+    assert journal_path_for('outputs/livesport_h2h_2025-10-11_football_EMAIL.csv') == \
+        'outputs/livesport_h2h_2025-10-11_football_EMAIL.journal.jsonl'
+
+
+def test_record_and_resume():
+    journal = _make_journal()
+    journal.record({'match_url': 'https://test.com/match1', 'qualifies': True,
+                    'h2h_last5': [{'score': '2-1', 'winner': 'home'}]})
+    journal.record({'match_url': 'https://test.com/match2', 'qualifies': False})
+    # Ten sam mecz drugi raz - ostatni wpis wygrywa
+    journal.record({'match_url': 'https://test.com/match2', 'qualifies': True})
+
+    resumed = RunJournal(journal.path)
+    rows = resumed.load()
+    assert resumed.done_urls == {'https://test.com/match1', 'https://test.com/match2'}
+    assert len(rows) == 2
+    assert all(r['qualifies'] for r in rows)
+    assert rows[0]['h2h_last5'][0]['score'] == '2-1'
+
+
+def test_truncated_line_is_skipped():
+    journal = _make_journal()
+    journal.record({'match_url': 'https://test.com/match1', 'qualifies': False})
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"match_url": "https://test.com/match2", "row": {"qual')
+
+    rows = RunJournal(journal.path).load()
+    assert [r['match_url'] for r in rows] == ['https://test.com/match1']
+
+
+def test_resume_after_partial_write():
+    journal = _make_journal()
+    journal.record({'match_url': 'https://test.com/match1', 'qualifies': False})
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"match_url": "https://test.com/match2", "row": {"qual')  # Crash w trakcie zapisu
+
+    resumed = RunJournal(journal.path)
+    resumed.load()
+    resumed.record({'match_url': 'https://test.com/match2', 'qualifies': True})
+    resumed.record({'match_url': 'https://test.com/match3', 'qualifies': False})
+
+    rows = RunJournal(journal.path).load()
+    assert [r['match_url'] for r in rows] == ['https://test.com/match1', 'https://test.com/match2',
+                                               'https://test.com/match3']
+    assert rows[1]['qualifies'] is True
+
+
+def test_reset():
+    journal = _make_journal()
+    journal.record({'match_url': 'https://test.com/match1'})
+    journal.reset()
+    assert len(journal) == 0
+    assert RunJournal(journal.path).load() == []
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Dziennik przebiegu (--resume)")
+    print("="*70)
+
+    tests = [test_journal_path, test_record_and_resume, test_truncated_line_is_skipped,
+             test_resume_after_partial_write, test_reset]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,138 @@
+"""
+Test kolejki zadań scrapowania (scrape_jobs.py)
+
+Sprawdza:
+1. Osobny status/postęp dla każdego zadania
+2. Anulowanie zadania uruchomionego i czekającego w kolejce
+3. Zadanie zakończone błędem
+4. Tryb z osobnym workerem: API tylko kolejkuje, worker przejmuje zadania z bazy
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from scrape_jobs import JobManager
+
+
+def _wait_for(manager, job_id, statuses=('completed', 'failed', 'cancelled'), timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'Zadanie {job_id} nie osiągnęło statusu {statuses}')
+
+
+def _make_manager(runner, max_workers=2) -> JobManager:
+    return JobManager(runner, db_path=os.path.join(tempfile.mkdtemp(), 'jobs.db'), max_workers=max_workers)
+
+
+def _fake_runner(job, date, sports, max_matches):
+    urls = [f'https://test.com/{sports[0]}/{i}' for i in range(max_matches or 3)]
+    job.update(total=len(urls))
+    for i, url in enumerate(urls, 1):
+        job.check_cancelled()
+        job.update(progress=i, current_match=url, qualifying_count=i // 2)
+        time.sleep(0.01)
+    return f'outputs/livesport_h2h_{date}_{sports[0]}.csv'
+
+
+def test_jobs_have_separate_progress():
+    manager = _make_manager(_fake_runner)
+    football = manager.submit('2025-11-01', ['football'], 4)
+    tennis = manager.submit('2025-11-01', ['tennis'], 6)
+
+    football = _wait_for(manager, football['job_id'])
+    tennis = _wait_for(manager, tennis['job_id'])
+    assert football['status'] == tennis['status'] == 'completed'
+    assert (football['progress'], football['total']) == (4, 4)
+    assert (tennis['progress'], tennis['total']) == (6, 6)
+    assert tennis['output_file'].endswith('_tennis.csv')
+
+
+def test_cancel_running_and_queued():
+    release = threading.Event()
+
+    def blocking_runner(job, date, sports, max_matches):
+        job.update(total=10)
+        while not release.is_set():
+            job.check_cancelled()
+            time.sleep(0.01)
+        return 'wynik.csv'
+
+    manager = _make_manager(blocking_runner, max_workers=1)
+    running = manager.submit('2025-11-01', ['football'])
+    queued = manager.submit('2025-11-02', ['football'])
+    _wait_for(manager, running['job_id'], statuses=('running',))
+
+    assert manager.cancel(queued['job_id'])
+    assert manager.get(queued['job_id'])['status'] == 'cancelled'
+    assert manager.cancel(running['job_id'])
+    assert _wait_for(manager, running['job_id'])['status'] == 'cancelled'
+    assert not manager.cancel(running['job_id'])  # Już zakończone
+
+
+def test_failed_job_keeps_error():
+    def failing_runner(job, date, sports, max_matches):
+        raise RuntimeError('Chrome nie wystartował')
+
+    manager = _make_manager(failing_runner)
+    job = _wait_for(manager, manager.submit('2025-11-01', ['football'])['job_id'])
+    assert job['status'] == 'failed'
+    assert job['error'] == 'Chrome nie wystartował'
+
+
+def test_external_worker_claims_jobs():
+    db_path = os.path.join(tempfile.mkdtemp(), 'jobs.db')
+    api = JobManager(_fake_runner, db_path=db_path, max_workers=0)
+    first = api.submit('2025-11-01', ['football'], 2)
+    second = api.submit('2025-11-02', ['tennis'], 2)
+    assert api.cancel(second['job_id'])
+    assert api.get(second['job_id'])['status'] == 'cancelled'
+
+    worker = JobManager(_fake_runner, db_path=db_path, max_workers=1, recover=False)
+    stop = threading.Event()
+    thread = threading.Thread(target=worker.serve, kwargs={'poll_interval': 0.02, 'stop': stop})
+    thread.start()
+    try:
+        job = _wait_for(api, first['job_id'])
+    finally:
+        stop.set()
+        thread.join()
+        worker.shutdown(wait=True)
+
+    assert job['status'] == 'completed' and job['progress'] == 2
+    assert job['worker_pid'] == os.getpid()
+    assert api.get(second['job_id'])['status'] == 'cancelled'  # Anulowane nie zostało przejęte
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Kolejka zadań scrapowania (JobManager)")
+    print("="*70)
+
+    tests = [test_jobs_have_separate_progress, test_cancel_running_and_queued, test_failed_job_keeps_error,
+             test_external_worker_claims_jobs]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,173 @@
+"""
+Test podziału meczów na shardy (sharding.py)
+
+Sprawdza:
+1. Parsowanie --shard K/N
+2. Shardy są rozłączne i razem pokrywają całą listę (stabilnie po event_id)
+3. Scalanie CSV i dzienników przebiegu shardów ze statystykami
+4. Powiadomienia dla scalonego wyniku - raz, z wierszy scalonego dziennika
+5. Supabase / aplikacja UI dostają mecze z dziennika paczkami (SYNC_BATCH_SIZE)
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+
+from run_journal import RunJournal, journal_path_for
+from sharding import merge_shard_outputs, parse_shard, shard_of, shard_output_path, shard_urls
+
+
+URLS = [f'https://www.livesport.com/pl/mecz/druzyna-a-druzyna-b/AbCd{i:04d}/?mid=Ev{i:06d}' for i in range(200)]
+
+
+def test_parse_shard():
+    assert parse_shard('3/8') == (3, 8)
+    for bad in ('0/8', '9/8', '3', 'a/b'):
+        try:
+            parse_shard(bad)
+        except argparse.ArgumentTypeError:
+            continue
+        raise AssertionError(f'{bad} powinien być odrzucony')
+
+
+def test_shards_partition_urls():
+    shards = [shard_urls(URLS, k, 4) for k in range(1, 5)]
+    merged = [url for shard in shards for url in shard]
+    assert sorted(merged) == sorted(URLS)
+    assert len(set(merged)) == len(URLS)
+    assert all(shards)  # 200 meczów - żaden shard nie jest pusty
+
+    # Ten sam mecz (event_id) pod innym URL-em trafia do tego samego shardu
+    assert shard_of('https://www.livesport.com/pl/mecz/x/?mid=Ev000007', 4) == shard_of(URLS[7], 4)
+
+
+def test_shard_output_path():
+    assert shard_output_path('outputs/wynik.csv', 3, 8) == 'outputs/wynik_shard3of8.csv'
+    assert shard_output_path('outputs/wynik.csv', 1, 1) == 'outputs/wynik.csv'
+
+
+def test_merge_shard_outputs():
+    directory = tempfile.mkdtemp()
+    files = []
+    for k, rows in enumerate([[('u1', 'True'), ('u2', 'False')], [('u3', 'True')]], 1):
+        path = os.path.join(directory, f'wynik_shard{k}of2.csv')
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['match_url', 'qualifies'])
+            writer.writerows(rows)
+        journal = RunJournal(journal_path_for(path))
+        for url, qualifies in rows:
+            journal.record({'match_url': url, 'qualifies': qualifies == 'True'})
+        files.append(path)
+    with open(journal_path_for(files[1]), 'a', encoding='utf-8') as f:
+        f.write('{"match_url": "u4", "row": {"qual')  # Ucięta linia po crashu shardu
+
+    merged = os.path.join(directory, 'wynik.csv')
+    stats = merge_shard_outputs(files, merged)
+    assert stats['rows'] == 3
+    assert stats['qualifying'] == 2
+    with open(merged, 'r', encoding='utf-8-sig', newline='') as f:
+        assert [r['match_url'] for r in csv.DictReader(f)] == ['u1', 'u2', 'u3']
+    assert stats['journal_rows'] == 3
+    assert stats['parquet'] is None  # Shardy bez --parquet
+    assert [r['match_url'] for r in RunJournal(journal_path_for(merged)).load()] == ['u1', 'u2', 'u3']
+
+
+def test_notify_merged_sends_once():
+    import scrape_and_notify
+
+    directory = tempfile.mkdtemp()
+    merged = os.path.join(directory, 'wynik.csv')
+    journal = RunJournal(journal_path_for(merged))
+    journal.record({'match_url': 'u1', 'qualifies': True, 'home_form': ['W', 'W']})
+    journal.record({'match_url': 'u2', 'qualifies': False})
+
+    calls = []
+    original = scrape_and_notify.send_notifications
+    scrape_and_notify.send_notifications = lambda csv_file, journal, **kwargs: calls.append((csv_file,
+                                                                                             journal.load()))
+    try:
+        scrape_and_notify.notify_merged(merged, date='2025-11-01', sports=['football'],
+                                        to_email='a@b.pl', from_email='a@b.pl', password='x')
+    finally:
+        scrape_and_notify.send_notifications = original
+    assert len(calls) == 1
+    assert calls[0][0] == merged
+    assert [r['match_url'] for r in calls[0][1]] == ['u1', 'u2']
+    assert calls[0][1][0]['home_form'] == ['W', 'W']
+
+
+def test_notifications_sent_in_batches():
+    import scrape_and_notify
+
+    directory = tempfile.mkdtemp()
+    merged = os.path.join(directory, 'wynik.csv')
+    journal = RunJournal(journal_path_for(merged))
+    for i in range(5):
+        journal.record({'match_url': f'u{i}', 'qualifies': i == 0})
+
+    sent = {'supabase': [], 'app': [], 'email': []}
+
+    class _Supabase:
+        def send_matches(self, matches, date, sport):
+            sent['supabase'].append(len(matches))
+            return {'success': True, 'saved': len(matches)}
+
+    class _App:
+        def __init__(self, app_url, api_key=None):
+            pass
+
+        def test_connection(self):
+            return True
+
+        def send_matches(self, matches, date, sport):
+            sent['app'].append(len(matches))
+            return True
+
+    patched = {'get_supabase_integrator': lambda: _Supabase(), 'AppIntegrator': _App,
+               'send_email_notification': lambda **kwargs: sent['email'].append(kwargs['csv_file']),
+               'SYNC_BATCH_SIZE': 2}
+    originals = {name: getattr(scrape_and_notify, name) for name in patched}
+    for name, value in patched.items():
+        setattr(scrape_and_notify, name, value)
+    try:
+        scrape_and_notify.send_notifications(merged, RunJournal(journal.path), date='2025-11-01',
+                                             sports=['football'], to_email='a@b.pl', from_email='a@b.pl',
+                                             password='x', app_url='https://app.test')
+    finally:
+        for name, value in originals.items():
+            setattr(scrape_and_notify, name, value)
+
+    assert sent['email'] == [merged]
+    assert sent['supabase'] == [2, 2, 1]
+    assert sent['app'] == [2, 2, 1]
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Sharding (--shard K/N)")
+    print("="*70)
+
+    tests = [test_parse_shard, test_shards_partition_urls, test_shard_output_path, test_merge_shard_outputs,
+             test_notify_merged_sends_once, test_notifications_sent_in_batches]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,122 @@
+"""
+Test czekania na zdarzenia zamiast stałych time.sleep (wait_utils)
+
+Sprawdza:
+1. Limit adaptacyjny: domyślny do MIN_SAMPLES pomiarów, potem p90 * margines
+   w granicach MIN_TIMEOUT..MAX_TIMEOUT; 'listing:volleyball' -> start z 'listing'
+2. wait_for_page kończy się, gdy tylko wiersze przestaną przybywać (nie po
+   stałym czasie) i zapisuje pomiar
+3. Brak elementu -> False po upływie limitu; ucięty pomiar podnosi limit
+   (po serii timeoutów limit rośnie ponad MIN_TIMEOUT)
+4. scroll_and_settle kończy, gdy scroll nic nie dociąga
+5. wait_for_network_idle czeka na readyState=complete i brak nowych zasobów
+"""
+
+import time
+
+from fake_driver import FakeDriver
+from wait_utils import (AdaptiveTimeouts, MAX_TIMEOUT, MIN_TIMEOUT, scroll_and_settle,
+                        wait_for_network_idle, wait_for_page)
+
+
+def test_adaptive_timeout():
+    timeouts = AdaptiveTimeouts(defaults={'h2h': 5.0, 'listing': 8.0})
+    assert timeouts.timeout('h2h') == 5.0
+    assert timeouts.timeout('listing:volleyball') == 8.0
+
+    for seconds in (0.4, 0.5, 0.6, 0.5, 1.0):
+        timeouts.record('h2h', seconds)
+    assert timeouts.timeout('h2h') == 2.0  # p90 (1.0) * margines 2.0
+
+    for _ in range(5):
+        timeouts.record('listing:volleyball', 0.1)
+        timeouts.record('form', 30.0)
+    assert timeouts.timeout('listing:volleyball') == MIN_TIMEOUT
+    assert timeouts.timeout('form') == MAX_TIMEOUT
+    assert timeouts.stats()['h2h']['samples'] == 5
+
+
+def test_wait_for_page_returns_when_rows_settle():
+    driver = FakeDriver(ready_after=0.2, rows=[(0.2, 3), (0.4, 8)])
+    timeouts = AdaptiveTimeouts(defaults={'h2h': 5.0})
+
+    start = time.monotonic()
+    assert wait_for_page(driver, 'h2h', 'div.h2h', rows_selector='div.h2h__row', timeouts=timeouts)
+    elapsed = time.monotonic() - start
+
+    assert 0.4 <= elapsed < 1.5  # Po ustabilizowaniu wierszy, nie po limicie 5s
+    assert timeouts.stats()['h2h']['samples'] == 1
+
+
+def test_wait_for_page_timeout():
+    driver = FakeDriver(ready_after=60)
+    timeouts = AdaptiveTimeouts(defaults={'result': 0.3})
+
+    start = time.monotonic()
+    assert not wait_for_page(driver, 'result', 'div.detailScore__wrapper', timeouts=timeouts)
+    assert time.monotonic() - start < 1.0
+    assert timeouts.stats()['result']['samples'] == 1  # Pomiar ucięty też się liczy
+
+
+def test_timeouts_raise_limit():
+    timeouts = AdaptiveTimeouts(defaults={'h2h': 5.0})
+    for _ in range(10):
+        timeouts.record('h2h', 0.2)  # Szybkie strony -> limit na MIN_TIMEOUT
+    assert timeouts.timeout('h2h') == MIN_TIMEOUT
+
+    limits = []
+    for _ in range(3):
+        limits.append(timeouts.timeout('h2h'))
+        timeouts.record_timeout('h2h', limits[-1])  # Jak wait_for_page po timeout (bez czekania)
+    assert timeouts.timeout('h2h') > limits[0]
+
+    # wait_for_page przy timeout zapisuje ucięty pomiar limit * margines
+    fast = AdaptiveTimeouts(defaults={'tab': 0.2})
+    assert not wait_for_page(FakeDriver(ready_after=60), 'tab', 'div.tab', timeouts=fast)
+    assert fast.stats()['tab']['p50'] == 0.4
+
+
+def test_scroll_and_settle_stops_early():
+    driver = FakeDriver(rows=[(0, 10)], scroll_rows=1)
+    count = scroll_and_settle(driver, 'a[href*="/mecz/"]', rounds=5, timeout=1.0)
+    assert count == 20
+    assert driver.scrolls == 2  # Drugi scroll nic nie dociągnął -> koniec
+
+
+def test_network_idle():
+    driver = FakeDriver(ready_after=0.1, resources=[(0, 5), (0.3, 9)])
+    start = time.monotonic()
+    assert wait_for_network_idle(driver, timeout=3.0, idle_for=0.3)
+    assert 0.6 <= time.monotonic() - start < 1.5
+
+    busy = FakeDriver(resources=[(i * 0.1, i) for i in range(100)])
+    assert not wait_for_network_idle(busy, timeout=0.5, idle_for=0.3)
+
+
+def main():
+    """Uruchom testy"""
+    print("="*70)
+    print("🧪 TEST: Czekanie na zdarzenia (wait_utils)")
+    print("="*70)
+
+    tests = [test_adaptive_timeout, test_wait_for_page_returns_when_rows_settle, test_wait_for_page_timeout,
+             test_timeouts_raise_limit, test_scroll_and_settle_stops_early, test_network_idle]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    if failed:
+        print(f"❌ {failed}/{len(tests)} testów nie przeszło")
+        return 1
+    print("✅ Wszystkie testy przeszły pomyślnie!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -27,9 +27,11 @@ from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 from email_notifier import send_email_notification
+from browser_service import resolve_chromedriver
+from browser_profile import apply_lean_options, apply_url_blocking, lean_enabled
+from wait_utils import wait_for_page
 
 
 class PredictionVerifier:
@@ -50,11 +52,15 @@ class PredictionVerifier:
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        if lean_enabled():
+            apply_lean_options(chrome_options)
         
         self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+            service=Service(resolve_chromedriver()),
             options=chrome_options
         )
+        if lean_enabled():
+            apply_url_blocking(self.driver)
         
     def load_predictions(self, date: str) -> Optional[List[Dict]]:
         """Wczytuje przewidywania z pliku JSON"""
@@ -91,7 +97,7 @@ class PredictionVerifier:
         """Scrapuje wynik zakończonego meczu"""
         try:
             self.driver.get(match_url)
-            time.sleep(2.0)
+            wait_for_page(self.driver, 'result', 'div.detailScore__wrapper, div.detailScore__status')
             
             soup = BeautifulSoup(self.driver.page_source, 'html.parser')
             
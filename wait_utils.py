@@ -0,0 +1,239 @@
+"""
+WAIT UTILS - Czekanie na zdarzenia zamiast stałych time.sleep
+=============================================================
+
+Scrapery Selenium czekały "na zapas": 1.0s po załadowaniu H2H, 1.5s + 0.5s na
+stronie formy, 1.2-3.5s na liście meczów sportu, 2s na stronie zawodnika...
+Przy 2500 meczach to godziny czekania, a na wolnym łączu i tak bywało za mało.
+
+Zamiast tego czekamy na WARUNEK i kończymy, gdy tylko jest spełniony:
+- wait_for_selector      - element (selektor CSS) jest w DOM
+- wait_for_stable_count  - liczba wierszy przestała rosnąć (lista dociągnięta)
+- wait_for_network_idle  - brak nowych zapytań sieciowych (Resource Timing API)
+- scroll_and_settle      - scroll + czekanie aż lazy-loading dociągnie wiersze
+
+Limity czasu są ADAPTACYJNE per rodzaj strony (h2h, form, listing:football...):
+AdaptiveTimeouts zapamiętuje ostatnie czasy ładowania i ustawia limit na
+p90 * margines (w granicach MIN_TIMEOUT..MAX_TIMEOUT). Szybka strona kończy
+czekanie po ~0.2s, wolna (GitHub Actions) dostaje dłuższy limit. Przekroczenie
+limitu też jest pomiarem (ucięty: "co najmniej limit" -> zapis limit * margines),
+więc po serii timeoutów limit rośnie zamiast utknąć na MIN_TIMEOUT.
+
+wait_for_page zwraca False po timeout - wywołujący ponawia nawigację raz,
+zamiast parsować na pół załadowany DOM.
+
+Użycie:
+    page.navigate(h2h_url)
+    wait_for_page(driver, 'h2h', 'div[class*="h2h"]', rows_selector='div.h2h__row')
+    scroll_and_settle(driver, 'div.h2h__row', rounds=1)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Limity startowe per rodzaj strony (s) - zanim zbierzemy pomiary
+DEFAULT_TIMEOUTS = {
+    'h2h': 5.0,
+    'form': 5.0,
+    'listing': 8.0,
+    'player': 5.0,
+    'result': 5.0,
+    'tab': 3.0,
+}
+FALLBACK_TIMEOUT = 5.0
+MIN_TIMEOUT = 1.5
+MAX_TIMEOUT = 15.0
+POLL_INTERVAL = 0.1
+MIN_SAMPLES = 5  # Pomiarów przed przejściem na limit adaptacyjny
+
+_COUNT_JS = "return document.querySelectorAll(arguments[0]).length;"
+_NETWORK_JS = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+
+class AdaptiveTimeouts:
+    """Limity czasu per rodzaj strony liczone z ostatnich czasów ładowania"""
+
+    def __init__(self, window: int = 30, margin: float = 2.0, defaults: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            window: Ile ostatnich pomiarów brać pod uwagę
+            margin: Mnożnik p90 (zapas na wolniejsze ładowanie)
+            defaults: Limity startowe per rodzaj strony
+        """
+        self.window = window
+        self.margin = margin
+        self.defaults = dict(defaults or DEFAULT_TIMEOUTS)
+        # GitHub Actions - strony ładują się wolniej w chmurze
+        if os.environ.get('GITHUB_ACTIONS') == 'true':
+            self.defaults = {kind: value * 1.5 for kind, value in self.defaults.items()}
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def _default(self, kind: str) -> float:
+        # 'listing:volleyball' -> osobne pomiary, ale limit startowy z 'listing'
+        return self.defaults.get(kind, self.defaults.get(kind.split(':')[0], FALLBACK_TIMEOUT))
+
+    def record(self, kind: str, seconds: float):
+        """Zapisz czas, po którym strona była gotowa"""
+        with self._lock:
+            self._samples.setdefault(kind, deque(maxlen=self.window)).append(seconds)
+
+    def record_timeout(self, kind: str, limit: float):
+        """
+        Strona nie była gotowa w `limit` sekund - prawdziwy czas jest nieznany
+        (co najmniej limit), więc zapisujemy limit * margines: limit rośnie.
+        """
+        self.record(kind, min(MAX_TIMEOUT, limit * self.margin))
+
+    def timeout(self, kind: str) -> float:
+        """Aktualny limit czasu dla rodzaju strony"""
+        with self._lock:
+            samples = sorted(self._samples.get(kind, ()))
+        if len(samples) < MIN_SAMPLES:
+            return self._default(kind)
+        p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+        return max(MIN_TIMEOUT, min(MAX_TIMEOUT, p90 * self.margin))
+
+    def stats(self) -> Dict[str, Dict]:
+        """Mediana czasu gotowości i bieżący limit per rodzaj strony"""
+        with self._lock:
+            kinds = {kind: sorted(samples) for kind, samples in self._samples.items()}
+        return {
+            kind: {
+                'samples': len(samples),
+                'p50': round(samples[len(samples) // 2], 2) if samples else None,
+                'timeout': round(self.timeout(kind), 2),
+            }
+            for kind, samples in kinds.items()
+        }
+
+
+_default_timeouts: Optional[AdaptiveTimeouts] = None
+_default_timeouts_lock = threading.Lock()
+
+
+def get_adaptive_timeouts() -> AdaptiveTimeouts:
+    """Współdzielone limity procesu (wszystkie przeglądarki uczą się razem)"""
+    global _default_timeouts
+    with _default_timeouts_lock:
+        if _default_timeouts is None:
+            _default_timeouts = AdaptiveTimeouts()
+        return _default_timeouts
+
+
+def wait_for_selector(driver, css: str, timeout: float) -> bool:
+    """Czekaj aż element pasujący do selektora CSS pojawi się w DOM"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, css))
+        )
+        return True
+    except (TimeoutException, WebDriverException):
+        return False
+
+
+def element_count(driver, css: str) -> int:
+    try:
+        return int(driver.execute_script(_COUNT_JS, css) or 0)
+    except WebDriverException:
+        return 0
+
+
+def wait_for_stable_count(driver, css: str, timeout: float, stable_for: float = 0.3, min_count: int = 1) -> int:
+    """
+    Czekaj aż liczba elementów przestanie się zmieniać przez `stable_for` sekund.
+
+    Returns:
+        Ostatnia liczba elementów (także po przekroczeniu limitu czasu)
+    """
+    deadline = time.monotonic() + timeout
+    last = element_count(driver, css)
+    stable_since = time.monotonic()
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        count = element_count(driver, css)
+        if count != last:
+            last = count
+            stable_since = time.monotonic()
+        elif count >= min_count and time.monotonic() - stable_since >= stable_for:
+            break
+    return last
+
+
+def wait_for_network_idle(driver, timeout: float, idle_for: float = 0.5) -> bool:
+    """
+    Czekaj aż strona przestanie pobierać zasoby (readyState=complete i brak nowych
+    wpisów Resource Timing przez `idle_for` sekund).
+    """
+    deadline = time.monotonic() + timeout
+    last_count = -1
+    idle_since = time.monotonic()
+    while time.monotonic() < deadline:
+        try:
+            ready_state, count = driver.execute_script(_NETWORK_JS)
+        except (WebDriverException, TypeError, ValueError):
+            return False
+        if ready_state != 'complete' or count != last_count:
+            last_count = count
+            idle_since = time.monotonic()
+        elif time.monotonic() - idle_since >= idle_for:
+            return True
+        time.sleep(POLL_INTERVAL)
+    return False
+
+
+def wait_for_page(driver, kind: str, ready_selector: str, rows_selector: Optional[str] = None,
+                  timeouts: Optional[AdaptiveTimeouts] = None) -> bool:
+    """
+    Czekaj aż strona będzie gotowa: element `ready_selector` w DOM, a jeśli podano
+    `rows_selector` - aż liczba wierszy się ustabilizuje. Czas gotowości zasila
+    limity adaptacyjne dla `kind`.
+
+    Returns:
+        False jeśli strona nie była gotowa przed upływem limitu (pomiar ucięty
+        trafia do limitów adaptacyjnych)
+    """
+    timeouts = timeouts or get_adaptive_timeouts()
+    limit = timeouts.timeout(kind)
+    start = time.monotonic()
+
+    if not wait_for_selector(driver, ready_selector, limit):
+        timeouts.record_timeout(kind, limit)
+        print(f"   ⚠️ Strona '{kind}' niegotowa po {limit:.1f}s")
+        return False
+    if rows_selector:
+        remaining = max(0.0, limit - (time.monotonic() - start))
+        wait_for_stable_count(driver, rows_selector, remaining, stable_for=0.25, min_count=1)
+
+    timeouts.record(kind, time.monotonic() - start)
+    return True
+
+
+def scroll_and_settle(driver, rows_selector: str, rounds: int = 3, timeout: float = 2.0) -> int:
+    """
+    Scroll na dół (lazy-loading) i czekanie aż wiersze przestaną przybywać,
+    kończy wcześniej gdy scroll nic nie dociągnął. Na koniec powrót na górę.
+
+    Returns:
+        Liczba wierszy po scrollowaniu
+    """
+    count = element_count(driver, rows_selector)
+    try:
+        for _ in range(rounds):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            new_count = wait_for_stable_count(driver, rows_selector, timeout, stable_for=0.25, min_count=0)
+            if new_count <= count:
+                break
+            count = new_count
+        driver.execute_script("window.scrollTo(0, 0);")
+    except WebDriverException:
+        pass
+    return count
@@ -0,0 +1,27 @@
+"""
+WSGI - Punkt wejścia api_server dla serwerów produkcyjnych
+==========================================================
+
+Serwer deweloperski Flask (python api_server.py) obsługuje zapytania w jednym
+procesie, a scraping (Chrome + parsowanie) działa w wątkach tego samego procesu
+i konkuruje z API o GIL. W produkcji:
+
+- API: gunicorn (Linux) lub waitress (Windows) - kilka procesów/wątków
+- scraping: osobny proces scrape_worker.py, zadania przekazywane przez
+  outputs/scrape_jobs.db (API tylko je kolejkuje)
+
+Użycie:
+    gunicorn -c gunicorn.conf.py wsgi:app
+    waitress-serve --port=5000 --threads=8 wsgi:app
+    python scrape_worker.py
+"""
+
+import os
+
+# Przed importem api_server - JobManager w trybie samej kolejki
+os.environ.setdefault('SCRAPE_MODE', 'worker')
+os.makedirs('outputs', exist_ok=True)
+
+from api_server import app  # noqa: E402
+
+application = app